@@ -107,6 +107,41 @@ def fetch_latest_bars(symbol, limit=100):
         st.error(f"Fehler beim Laden der Daten für {symbol}: {e}")
         return None
 
+# Bar-Statistiken aus bar_summaries (Bar Aggregator V2 mit data.bar_aggregator.mode = "database"):
+# wenige Rows über den Primary Key statt COUNT(*) über die ganze Bar-Tabelle
+SUMMARY_STATS_QUERY = """
+    SELECT
+        (SELECT COALESCE(SUM(bar_count), 0) FROM bar_summaries
+         WHERE symbol = %s AND timeframe = '1d') as total_bars,
+        (SELECT MAX(bucket) FROM bar_summaries
+         WHERE symbol = %s AND timeframe = '1m') as latest_bar,
+        (SELECT COUNT(*) FROM bar_summaries
+         WHERE symbol = %s AND timeframe = '1m' AND bucket >= NOW() - INTERVAL '1 hour') as bars_1h,
+        (SELECT COUNT(*) FROM bar_summaries
+         WHERE symbol = %s AND timeframe = '1m' AND bucket >= NOW() - INTERVAL '24 hours') as bars_24h
+"""
+
+def fetch_summary_stats(conn, symbol):
+    """Holt Statistiken aus bar_summaries (None wenn nicht vorhanden)"""
+    cur = conn.cursor()
+    try:
+        cur.execute("SELECT to_regclass('bar_summaries') IS NOT NULL")
+        if not cur.fetchone()[0]:
+            return None
+        cur.execute(SUMMARY_STATS_QUERY, (symbol,) * 4)
+        result = cur.fetchone()
+    finally:
+        cur.close()
+
+    if result is None or result[1] is None:
+        return None
+    return {
+        'total_bars': result[0],
+        'latest_bar': result[1],
+        'bars_1h': result[2],
+        'bars_24h': result[3]
+    }
+
 def fetch_stats(symbol):
     """Holt Statistiken für ein Symbol"""
     conn = get_db_connection()
@@ -114,6 +149,10 @@ def fetch_stats(symbol):
         return None
 
     try:
+        stats = fetch_summary_stats(conn, symbol)
+        if stats is not None:
+            return stats
+
         table_name = f"bars_{symbol.lower()}"
         query = f"""
             SELECT
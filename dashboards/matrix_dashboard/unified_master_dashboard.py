@@ -1519,12 +1519,29 @@ def api_ml_status():
             bar_count = 0
 
             symbols = ['eurusd', 'gbpusd', 'usdjpy', 'usdchf', 'audusd']
+
+            # Partitionierte Tabellen `ticks` / `ticks_compact`: ein Query,
+            # Pruning auf heutige Partition
+            cursor.execute("SELECT to_regclass('ticks') IS NOT NULL, to_regclass('ticks_compact') IS NOT NULL")
+            has_ticks, has_compact = cursor.fetchone()
+            partitioned = has_ticks or has_compact
+            if has_ticks:
+                cursor.execute("SELECT COUNT(*) FROM ticks WHERE timestamp >= CURRENT_DATE")
+                tick_count += cursor.fetchone()[0]
+            if has_compact:
+                cursor.execute("""
+                    SELECT COUNT(*) FROM ticks_compact
+                    WHERE time_msc >= (EXTRACT(EPOCH FROM CURRENT_DATE::timestamptz) * 1000)::bigint
+                """)
+                tick_count += cursor.fetchone()[0]
+
             for symbol in symbols:
-                try:
-                    cursor.execute(f"SELECT COUNT(*) FROM ticks_{symbol}_{today}")
-                    tick_count += cursor.fetchone()[0]
-                except:
-                    pass
+                if not partitioned:
+                    try:
+                        cursor.execute(f"SELECT COUNT(*) FROM ticks_{symbol}_{today}")
+                        tick_count += cursor.fetchone()[0]
+                    except:
+                        pass
 
                 try:
                     cursor.execute(f"SELECT COUNT(*) FROM bars_{symbol} WHERE timeframe='1m'")
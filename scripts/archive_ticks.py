@@ -0,0 +1,87 @@
+"""
+Tick Archive Job
+- Archiviert Tick-Tage älter als data.tick_storage_days als Parquet/Feather
+  (eine Datei pro Symbol und Tag, siehe src/data/tick_archive.py)
+- Quelltabellen werden erst nach Prüfung der Row-Counts gedroppt
+- --loop: läuft als Dienst (Intervall data.tick_archive.interval_minutes)
+
+Usage:
+    python scripts/archive_ticks.py                 # abgelaufene Tage archivieren
+    python scripts/archive_ticks.py --day 20251014  # einzelnen Tag archivieren
+    python scripts/archive_ticks.py --keep          # archivieren ohne zu droppen
+    python scripts/archive_ticks.py --list          # Manifest anzeigen
+"""
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import argparse
+import time
+from datetime import datetime
+
+from src.utils.logger import get_logger, log_exception
+from src.utils.config_loader import get_config
+from src.data.database_manager import get_database
+from src.data.tick_archive import TickArchiver
+
+logger = get_logger('archive_ticks')
+
+
+def print_manifest(archiver):
+    """Archivierte Symbol-Tage ausgeben"""
+    entries = archiver.manifest.entries
+    print(f"{'symbol/day':<20} {'rows':>10} {'bytes':>12} {'B/row':>7}  sources")
+    for key in sorted(entries):
+        entry = entries[key]
+        per_row = entry['bytes'] / entry['rows'] if entry['rows'] else 0
+        print(f"{key:<20} {entry['rows']:>10} {entry['bytes']:>12} {per_row:>7.1f}  {', '.join(entry['sources'])}")
+
+    stats = archiver.get_stats()
+    print(f"\n{stats['files']} files, {stats['archive_bytes'] / 1024 / 1024:.1f} MB in {archiver.directory}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Archive expired tick tables to Parquet/Feather')
+    parser.add_argument('--db', choices=['local', 'remote'], default='local', help='Database')
+    parser.add_argument('--day', help='Archive this day (YYYYMMDD) regardless of retention')
+    parser.add_argument('--keep', action='store_true', help='Do not drop tables after archiving')
+    parser.add_argument('--loop', action='store_true', help='Run periodically')
+    parser.add_argument('--list', action='store_true', help='Print manifest and exit')
+    args = parser.parse_args()
+
+    archiver = TickArchiver(get_database(args.db))
+
+    if args.list:
+        print_manifest(archiver)
+        return
+
+    if args.day:
+        day = datetime.strptime(args.day, '%Y%m%d').date()
+        archived = archiver.archive_day(day, drop=not args.keep)
+        logger.info(f"{day}: {sum(archived.values())} ticks archived ({len(archived)} symbols)")
+        return
+
+    interval = get_config().get('data.tick_archive.interval_minutes', 60) * 60
+    logger.info(f"Tick archive: {archiver.directory} ({archiver.format}/{archiver.compression}), "
+                f"retention {archiver.retention_days} days")
+
+    while True:
+        try:
+            archived = archiver.run(drop=not args.keep)
+            if archived:
+                logger.info(f"Archived days: {', '.join(str(day) for day in archived)}")
+            logger.info(f"Archive stats: {archiver.get_stats()}")
+        except Exception as e:
+            log_exception(logger, e, "Tick archive run failed")
+
+        if not args.loop:
+            break
+        time.sleep(interval)
+
+
+if __name__ == '__main__':
+    try:
+        main()
+    except KeyboardInterrupt:
+        logger.info("Stopping...")
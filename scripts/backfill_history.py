@@ -0,0 +1,105 @@
+"""
+Backfill History
+- Lädt M1 Rates (und Ticks innerhalb data.tick_storage_days) aus der MT5
+  Historie in Chunks und schreibt Bars aller Timeframes und Features
+- Fortschritt in backfill_progress: ein abgebrochener Lauf setzt beim nächsten
+  Start nach dem letzten erledigten Chunk fort
+- Läuft unter Linux gegen eine Tick-Aufzeichnung (--replay) oder synthetische
+  Ticks (--synthetic) über FakeMT5
+- Den Live-BarBuilder für den Zeitraum nicht gleichzeitig laufen lassen
+  (Backfill überschreibt Bars, der BarBuilder addiert auf)
+
+Usage:
+    python scripts/backfill_history.py --days 90
+    python scripts/backfill_history.py --symbols EURUSD --start 2025-07-01 --end 2025-10-01
+    python scripts/backfill_history.py --replay data/ticks.csv --no-ticks
+    python scripts/backfill_history.py --synthetic --days 14 --db local
+"""
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import argparse
+from datetime import datetime, timedelta, timezone
+
+from src.utils.logger import get_logger
+from src.utils.config_loader import get_config
+from src.data.backfill import Backfiller
+
+logger = get_logger('BackfillHistory')
+
+
+def parse_date(value):
+    """YYYY-MM-DD (UTC)"""
+    return datetime.strptime(value, '%Y-%m-%d').replace(tzinfo=timezone.utc)
+
+
+def main():
+    config = get_config()
+
+    parser = argparse.ArgumentParser(description='Backfill bars, ticks and features from MT5 history')
+    parser.add_argument('--symbols', nargs='+', help='Symbols (default: data.symbols)')
+    parser.add_argument('--days', type=int, default=config.get('data.history_days', 30),
+                        help='Days back from --end (default: data.history_days)')
+    parser.add_argument('--start', type=parse_date, help='Start date YYYY-MM-DD (UTC), overrides --days')
+    parser.add_argument('--end', type=parse_date, help='End date YYYY-MM-DD (UTC, exclusive), default now')
+    parser.add_argument('--db', choices=['local', 'remote'], default='local', help='Database')
+    parser.add_argument('--replay', help='Use recorded tick file via FakeMT5 instead of MetaTrader5')
+    parser.add_argument('--synthetic', action='store_true', help='Use synthetic FakeMT5 ticks (random walk)')
+    parser.add_argument('--no-ticks', action='store_true', help='Skip raw tick backfill')
+    parser.add_argument('--no-features', action='store_true', help='Skip feature calculation')
+    parser.add_argument('--chunk-days', type=int, help='Days per chunk (default: data.backfill.chunk_days)')
+    parser.add_argument('--workers', type=int, help='Symbols in parallel (default: data.backfill.workers)')
+    args = parser.parse_args()
+
+    symbols = args.symbols or config.get_symbols()
+    end = args.end or datetime.now(timezone.utc)
+    start = args.start or end - timedelta(days=args.days)
+
+    mt5_module = None
+    if args.replay or args.synthetic:
+        from src.data.fake_mt5 import FakeMT5, generate_ticks
+        if args.replay:
+            mt5_module = FakeMT5(args.replay, speed=None)
+        else:
+            ticks = generate_ticks(
+                {symbol: 1.0 + 0.1 * i for i, symbol in enumerate(symbols)},
+                int(start.timestamp() * 1000), int(end.timestamp() * 1000)
+            )
+            mt5_module = FakeMT5(ticks=ticks, speed=None)
+
+    stages = ['bars']
+    if not args.no_ticks:
+        stages.append('ticks')
+    if not args.no_features:
+        stages.append('features')
+
+    backfiller = Backfiller(
+        symbols=symbols,
+        db_type=args.db,
+        mt5_module=mt5_module,
+        chunk_days=args.chunk_days,
+        workers=args.workers,
+        stages=stages
+    )
+
+    if not backfiller.connect():
+        sys.exit(1)
+
+    try:
+        results = backfiller.run(start, end)
+    except KeyboardInterrupt:
+        logger.info("Interrupted - progress is saved, rerun to resume")
+        sys.exit(1)
+    finally:
+        backfiller.disconnect()
+
+    failed = [symbol for symbol, ok in results.items() if not ok]
+    if failed:
+        logger.error(f"Backfill incomplete for {', '.join(failed)} - rerun to resume")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
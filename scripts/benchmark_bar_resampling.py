@@ -0,0 +1,167 @@
+"""
+Bar Resampling Benchmark
+- Vergleicht die bisherige Aggregation des Bar Aggregators V2 (pro Timeframe
+  DataFrame-Kopie + apply(_round_timestamp_to_timeframe) + groupby, Rows per
+  iterrows) mit dem vektorisierten Pfad (Integer-Floor einmal pro Tick,
+  1m -> 5m -> 15m -> 1h -> 4h kaskadierend, Rows direkt aus numpy Arrays)
+- Prüft, dass beide Pfade identische Bar-Rows liefern
+- Synthetische Ticks (Mid-Preis Random Walk, Indikatoren mit NaN-Lücken),
+  keine Datenbank nötig
+
+Usage:
+    python scripts/benchmark_bar_resampling.py
+    python scripts/benchmark_bar_resampling.py --sizes 10000 100000 --repeat 5
+"""
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import argparse
+import math
+import time
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pandas as pd
+
+from scripts.start_bar_aggregator_v2 import BarAggregator, TICK_COLUMNS, INDICATOR_COLUMNS
+
+TIMEFRAMES = ['1m', '5m', '15m', '1h', '4h']
+
+
+def synthetic_ticks(count, seed=42):
+    """Tick-Rows wie von _tick_query (timestamp, bid, ask, volume, Indikatoren)"""
+    rng = np.random.default_rng(seed)
+    start = datetime(2025, 10, 14, tzinfo=timezone.utc)
+    offsets = np.cumsum(rng.integers(20, 400, count))  # ms
+    bid = 1.1 + np.cumsum(rng.normal(0, 0.00002, count))
+    ask = bid + 0.00012
+    volume = rng.integers(1, 10, count)
+    indicators = rng.normal(0, 1, (count, len(INDICATOR_COLUMNS)))
+    indicators[rng.random((count, len(INDICATOR_COLUMNS))) < 0.2] = np.nan
+
+    rows = []
+    for i in range(count):
+        rows.append((
+            start + timedelta(milliseconds=int(offsets[i])),
+            float(bid[i]), float(ask[i]), int(volume[i]),
+            *(None if math.isnan(v) else float(v) for v in indicators[i])
+        ))
+    return rows
+
+
+# --- Bisheriger Pfad (Stand vor der Vektorisierung) -------------------------
+
+def legacy_round(ts, timeframe):
+    if timeframe == '1m':
+        return ts.replace(second=0, microsecond=0)
+    elif timeframe == '5m':
+        return ts.replace(minute=(ts.minute // 5) * 5, second=0, microsecond=0)
+    elif timeframe == '15m':
+        return ts.replace(minute=(ts.minute // 15) * 15, second=0, microsecond=0)
+    elif timeframe == '1h':
+        return ts.replace(minute=0, second=0, microsecond=0)
+    elif timeframe == '4h':
+        return ts.replace(hour=(ts.hour // 4) * 4, minute=0, second=0, microsecond=0)
+    return ts
+
+
+def legacy_aggregate(df, timeframe):
+    df = df.copy()
+    df['bar_time'] = df['timestamp'].apply(lambda x: legacy_round(x, timeframe))
+    bars = df.groupby('bar_time').agg({
+        'price': ['first', 'max', 'min', 'last'],
+        'volume': 'sum',
+        'timestamp': 'count',
+        'rsi14': 'last',
+        'macd_main': 'last',
+        'bb_upper': 'last',
+        'bb_lower': 'last',
+        'atr14': 'last'
+    })
+    bars.columns = ['open', 'high', 'low', 'close', 'volume', 'tick_count'] + list(INDICATOR_COLUMNS)
+    bars = bars.reset_index()
+    bars.rename(columns={'bar_time': 'timestamp'}, inplace=True)
+    return bars
+
+
+def legacy_rows(timeframe, bars_df):
+    values = []
+    for _, row in bars_df.iterrows():
+        values.append((
+            row['timestamp'],
+            timeframe,
+            float(row['open']),
+            float(row['high']),
+            float(row['low']),
+            float(row['close']),
+            int(row['volume']) if pd.notna(row['volume']) else 0,
+            int(row['tick_count']),
+            *(float(row[name]) if pd.notna(row[name]) else None for name in INDICATOR_COLUMNS)
+        ))
+    return values
+
+
+def legacy_resample(ticks):
+    df = pd.DataFrame(ticks, columns=TICK_COLUMNS)
+    df['price'] = (df['bid'] + df['ask']) / 2
+    rows = []
+    for timeframe in TIMEFRAMES:
+        rows.extend(legacy_rows(timeframe, legacy_aggregate(df, timeframe)))
+    return rows
+
+
+# ---------------------------------------------------------------------------
+
+def same_rows(a, b):
+    """Vergleicht Bar-Rows (Floats mit Toleranz, Timestamps als Instant)"""
+    if len(a) != len(b):
+        return False
+    key = lambda row: (row[1], pd.Timestamp(row[0]))
+    for x, y in zip(sorted(a, key=key), sorted(b, key=key)):
+        if pd.Timestamp(x[0]) != pd.Timestamp(y[0]) or x[1] != y[1] or x[6:8] != y[6:8]:
+            return False
+        for u, v in zip(x[2:6] + x[8:], y[2:6] + y[8:]):
+            if (u is None) != (v is None) or (u is not None and abs(u - v) > 1e-12):
+                return False
+    return True
+
+
+def timed(func, repeat):
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark legacy vs vectorized bar resampling')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000, 1000000], help='Tick counts')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per measurement (best is reported)')
+    parser.add_argument('--legacy-max', type=int, default=1000000, help='Skip legacy path above this size')
+    args = parser.parse_args()
+
+    # Nur die Aggregation, ohne DB (__init__ legt Tabellen an)
+    aggregator = BarAggregator.__new__(BarAggregator)
+    aggregator.timeframes = TIMEFRAMES
+
+    print(f"{'ticks':>9} {'legacy s':>10} {'vector s':>10} {'speedup':>8} {'bars':>7}  match")
+    for size in args.sizes:
+        ticks = synthetic_ticks(size)
+
+        vector_s, (rows, _) = timed(lambda: aggregator._resample(ticks), args.repeat)
+
+        if size <= args.legacy_max:
+            legacy_s, legacy = timed(lambda: legacy_resample(ticks), 1 if size >= 1000000 else args.repeat)
+            match = 'yes' if same_rows(legacy, rows) else 'NO'
+            print(f"{size:>9} {legacy_s:>10.3f} {vector_s:>10.3f} {legacy_s / vector_s:>7.1f}x {len(rows):>7}  {match}")
+        else:
+            print(f"{size:>9} {'-':>10} {vector_s:>10.3f} {'-':>8} {len(rows):>7}  -")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,194 @@
+"""
+Bar Summaries Benchmark
+- Vergleicht die Aggregation des Bar Aggregators V2 in Python (merge +
+  cascade, data.bar_aggregator.mode = python) mit der In-Database
+  Aggregation über bar_summaries (mode = database)
+- Refresh-Kosten: Erstaufbau über alle Ticks und inkrementeller Refresh
+  nach wenigen neuen Ticks (nur die berührten Buckets)
+- Dashboard-Latenz: Bar-/Tick-Statistiken über bars_<symbol> bzw. die
+  Tick-Tabelle gegen die vorberechneten Summaries
+- Prüft, dass beide Pfade identische Bars schreiben
+- Nutzt das Symbol BENCH (ticks_bench_<heute>, bars_bench) und räumt danach auf
+
+Benötigt eine erreichbare lokale PostgreSQL Datenbank (config.json -> database.local)
+
+Usage:
+    python scripts/benchmark_bar_summaries.py
+    python scripts/benchmark_bar_summaries.py --ticks 200000 --live 500 --repeat 5
+"""
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import argparse
+import time
+from datetime import date, datetime, timedelta
+
+from scripts.start_bar_aggregator_v2 import BarAggregator, INDICATOR_COLUMNS
+from scripts.benchmark_bar_resampling import synthetic_ticks
+from src.data.bar_summaries import BarSummaries, SUMMARY_TABLE, BAR_STATS_SQL, TICK_STATS_SQL
+
+SYMBOL = 'BENCH'
+TICK_TABLE = f"ticks_{SYMBOL.lower()}_{date.today().strftime('%Y%m%d')}"
+BAR_TABLE = f"bars_{SYMBOL.lower()}"
+TICK_COLUMNS = ('mt5_ts', 'bid', 'ask', 'volume') + INDICATOR_COLUMNS
+
+# Bisherige Dashboard-Abfragen (live_dashboard.fetch_stats, matrix_control_center.dashboard_stats)
+OLD_BAR_STATS_SQL = f"""
+    SELECT
+        COUNT(*) as total_bars,
+        MAX(timestamp) as latest_bar,
+        (SELECT COUNT(*) FROM {BAR_TABLE}
+         WHERE timeframe='1m' AND timestamp >= NOW() - INTERVAL '1 hour') as bars_1h,
+        (SELECT COUNT(*) FROM {BAR_TABLE}
+         WHERE timeframe='1m' AND timestamp >= NOW() - INTERVAL '24 hours') as bars_24h
+    FROM {BAR_TABLE}
+    WHERE timeframe = '1m'
+"""
+OLD_TICK_STATS_SQL = f"""
+    SELECT COUNT(*) as total_ticks,
+           MIN(bid) as min_bid, MAX(bid) as max_bid,
+           MIN(ask) as min_ask, MAX(ask) as max_ask,
+           AVG((bid + ask) / 2) as avg_price,
+           AVG(ask - bid) as avg_spread
+    FROM {TICK_TABLE}
+"""
+
+
+def tick_rows(count, start, seed=42):
+    """Synthetische Tick-Rows ab start (mt5_ts, bid, ask, volume, Indikatoren)"""
+    rows = synthetic_ticks(count, seed)
+    shift = start - rows[0][0]
+    return [(row[0] + shift,) + tuple(row[1:]) for row in rows]
+
+
+def create_tick_table(db):
+    """Per-day Tick-Tabelle im Schema des Tick Collectors V2 (nur gelesene Spalten)"""
+    indicator_sql = ',\n'.join(f"{col} DOUBLE PRECISION" for col in INDICATOR_COLUMNS)
+    db.execute(f"""
+        DROP TABLE IF EXISTS {TICK_TABLE};
+        CREATE TABLE {TICK_TABLE} (
+            id SERIAL PRIMARY KEY,
+            mt5_ts TIMESTAMP WITH TIME ZONE,
+            bid DOUBLE PRECISION,
+            ask DOUBLE PRECISION,
+            volume BIGINT,
+            {indicator_sql}
+        );
+        CREATE INDEX idx_{TICK_TABLE}_ts ON {TICK_TABLE} (mt5_ts);
+    """)
+
+
+def reset(aggregator, db):
+    """Bars, Summaries und Watermarks von BENCH löschen"""
+    db.execute(f"TRUNCATE {BAR_TABLE}")
+    db.execute(f"DELETE FROM {SUMMARY_TABLE} WHERE symbol = %s", (SYMBOL,))
+    db.execute("DELETE FROM tick_watermarks WHERE symbol = %s", (SYMBOL,))
+    db.execute("DELETE FROM bar_watermarks WHERE symbol = %s", (SYMBOL,))
+    aggregator.positions.clear()
+    aggregator.rebuild_from.clear()
+    aggregator.summary_seeded.clear()
+
+
+def start_position(aggregator):
+    """Position vor dem ersten Tick (statt Seed eine Stunde zurück)"""
+    aggregator.positions[SYMBOL] = {
+        'symbol': SYMBOL, 'tick_table': TICK_TABLE,
+        'last_id': 0, 'last_ts': None, 'last_offset': 0
+    }
+
+
+def timed(func, repeat):
+    """Bestzeit in ms"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def stored_bars(db):
+    """Alle Bars von BENCH (für den Vergleich der Pfade)"""
+    return db.fetch_all(f"""
+        SELECT timestamp, timeframe, open, high, low, close, volume, tick_count,
+               {', '.join(INDICATOR_COLUMNS)}
+        FROM {BAR_TABLE}
+        ORDER BY timeframe, timestamp
+    """)
+
+
+def run_mode(aggregator, db, summaries, ticks, live, repeat):
+    """Erstaufbau + inkrementelle Refreshes für einen Modus"""
+    aggregator.summaries = summaries
+    reset(aggregator, db)
+    create_tick_table(db)
+    db.copy_rows(TICK_TABLE, TICK_COLUMNS, ticks)
+    start_position(aggregator)
+
+    start = time.perf_counter()
+    aggregator.aggregate_symbol(SYMBOL)
+    initial = (time.perf_counter() - start) * 1000
+
+    # Inkrementell: jeweils `live` neue Ticks nach dem letzten
+    increments = []
+    last = ticks[-1][0]
+    for i in range(repeat):
+        rows = tick_rows(live, last + timedelta(milliseconds=250), seed=100 + i)
+        last = rows[-1][0]
+        db.copy_rows(TICK_TABLE, TICK_COLUMNS, rows)
+        start = time.perf_counter()
+        aggregator.aggregate_symbol(SYMBOL)
+        increments.append((time.perf_counter() - start) * 1000)
+
+    return initial, min(increments), stored_bars(db)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark Python vs in-database bar aggregation')
+    parser.add_argument('--ticks', type=int, default=100000, help='Ticks for the initial build')
+    parser.add_argument('--live', type=int, default=200, help='New ticks per incremental refresh')
+    parser.add_argument('--repeat', type=int, default=3, help='Repetitions (best time)')
+    args = parser.parse_args()
+
+    aggregator = BarAggregator()
+    aggregator.compact = aggregator.partitioned = False  # per-day tick table
+    db = aggregator.db
+    aggregator._ensure_bar_table(SYMBOL)
+    summaries = BarSummaries(db, aggregator.timeframes, INDICATOR_COLUMNS)
+    summaries.ensure_table()
+
+    midnight = datetime.combine(date.today(), datetime.min.time()).astimezone()
+    ticks = tick_rows(args.ticks, midnight)
+
+    print(f"Ticks: {args.ticks:,} initial, {args.live} per incremental refresh, best of {args.repeat}")
+    print(f"{'mode':<10} {'initial ms':>12} {'refresh ms':>12}")
+
+    try:
+        results = {}
+        for mode, mode_summaries in (('python', None), ('database', summaries)):
+            initial, refresh, bars = run_mode(aggregator, db, mode_summaries, ticks, args.live, args.repeat)
+            results[mode] = bars
+            print(f"{mode:<10} {initial:>12.1f} {refresh:>12.1f}")
+
+        same = results['python'] == results['database']
+        print(f"Identical bars: {same} ({len(results['database'])} rows)")
+
+        # Dashboard-Latenz (Stand nach dem database-Lauf, beide Quellen gefüllt)
+        print(f"\n{'dashboard query':<22} {'old ms':>10} {'summaries ms':>14}")
+        old = timed(lambda: db.fetch_one(OLD_BAR_STATS_SQL), args.repeat)
+        new = timed(lambda: db.fetch_one(BAR_STATS_SQL, (SYMBOL,) * 4), args.repeat)
+        print(f"{'bar stats':<22} {old:>10.2f} {new:>14.2f}")
+        old = timed(lambda: db.fetch_one(OLD_TICK_STATS_SQL), args.repeat)
+        new = timed(lambda: db.fetch_one(TICK_STATS_SQL, (SYMBOL, date.today(), date.today())), args.repeat)
+        print(f"{'tick stats (day)':<22} {old:>10.2f} {new:>14.2f}")
+    finally:
+        aggregator.summaries = summaries
+        reset(aggregator, db)
+        db.execute(f"DROP TABLE IF EXISTS {TICK_TABLE}")
+        db.execute(f"DROP TABLE IF EXISTS {BAR_TABLE}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,137 @@
+"""
+Feature Calculator Benchmark
+- Vergleicht CPU-Zeit pro Zyklus im window-Modus (lookback_bars Bars pro
+  Zyklus neu berechnen, letzte 10 speichern) mit dem incremental-Modus
+  (nur Bars nach dem Watermark, Streaming-Zustand im Speicher)
+- Pro Zyklus kommt eine neue Bar hinzu, gemessen für mehrere Lookbacks
+- Prüft, dass der incremental-Modus dieselben Features schreibt wie
+  calculate_features über dieselbe Historie
+- Nutzt das Symbol BENCH in bars_1m/features und räumt danach auf
+
+Benötigt eine erreichbare lokale PostgreSQL Datenbank (config.json -> database.local)
+
+Usage:
+    python scripts/benchmark_feature_calculator.py
+    python scripts/benchmark_feature_calculator.py --lookbacks 200 1000 5000 --cycles 50
+"""
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import argparse
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from src.data.feature_calculator import FeatureCalculator, FEATURE_COLUMNS
+
+SYMBOL = 'BENCH'
+TIMEFRAME = '1m'
+START = datetime(2025, 1, 6)
+
+
+def synthetic_bars(count, seed=42):
+    """Random-Walk Bars (timestamp, open, high, low, close, volume) im Minutentakt"""
+    rng = np.random.default_rng(seed)
+    close = np.round(1.1 + np.cumsum(rng.normal(0, 1e-4, count)), 5)
+    high = np.round(close + np.abs(rng.normal(0, 5e-5, count)), 5)
+    low = np.round(close - np.abs(rng.normal(0, 5e-5, count)), 5)
+    return [
+        (START + timedelta(minutes=i), float(close[i]), float(high[i]), float(low[i]), float(close[i]), 1)
+        for i in range(count)
+    ]
+
+
+def insert_bars(db, bars):
+    db.insert_values(f"""
+        INSERT INTO bars_{TIMEFRAME} (timestamp, open, high, low, close, volume, symbol)
+        VALUES %s
+    """, [bar + (SYMBOL,) for bar in bars])
+
+
+def reset(db):
+    db.execute(f"DELETE FROM bars_{TIMEFRAME} WHERE symbol = %s", (SYMBOL,))
+    db.execute("DELETE FROM features WHERE symbol = %s", (SYMBOL,))
+
+
+def run_mode(calculator, db, mode, lookback, bars, cycles):
+    """Historie laden, dann pro Zyklus eine neue Bar; CPU-Zeit pro Zyklus (Median, ms)"""
+    reset(db)
+    calculator.mode = mode
+    calculator.lookback_bars = lookback
+    calculator.states.clear()
+
+    history, live = bars[:lookback], bars[lookback:lookback + cycles]
+    insert_bars(db, history)
+
+    def cycle():
+        if mode == 'incremental':
+            calculator.process_incremental()
+        else:
+            calculator.process_symbol_timeframe(SYMBOL, TIMEFRAME)
+
+    cycle()  # Warm-up bzw. erster Durchlauf
+    durations = []
+    for bar in live:
+        insert_bars(db, [bar])
+        start = time.process_time()
+        cycle()
+        durations.append(time.process_time() - start)
+    return float(np.median(durations)) * 1000
+
+
+def check_incremental(calculator, db, lookback):
+    """Gespeicherte Features gegen calculate_features über dieselbe Historie"""
+    stored = db.fetch_all(f"""
+        SELECT timestamp, {', '.join(FEATURE_COLUMNS)}
+        FROM features
+        WHERE symbol = %s AND timeframe = %s
+        ORDER BY timestamp
+    """, (SYMBOL, TIMEFRAME))
+    # Warm-up hat die gesamte Historie gelesen (lookback Bars), danach nur neue Bars
+    df = calculator.fetch_bars(SYMBOL, TIMEFRAME, limit=lookback * 2)
+    reference = calculator.calculate_features(df)[FEATURE_COLUMNS]
+
+    worst = 0.0
+    for row in stored:
+        if row[0] not in reference.index:
+            return False, len(stored), float('nan')
+        expected = reference.loc[row[0]].to_numpy()
+        worst = max(worst, float(np.max(np.abs(np.array(row[1:], dtype=float) - expected))))
+    # features ist DOUBLE PRECISION, die Bars DECIMAL(10, 5)
+    return worst < 1e-9, len(stored), worst
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark window vs incremental feature calculation')
+    parser.add_argument('--lookbacks', type=int, nargs='+', default=[200, 1000, 5000], help='Lookback bars')
+    parser.add_argument('--cycles', type=int, default=30, help='Cycles (one new bar each)')
+    args = parser.parse_args()
+
+    calculator = FeatureCalculator(symbols=[SYMBOL], timeframes=[TIMEFRAME])
+    db = calculator.db
+    bars = synthetic_bars(max(args.lookbacks) + args.cycles)
+
+    print(f"Cycles: {args.cycles} (one new bar each), CPU time per cycle (median)")
+    print(f"{'lookback':>10} {'window ms':>12} {'incremental ms':>16}")
+
+    ok = True
+    try:
+        for lookback in args.lookbacks:
+            window = run_mode(calculator, db, 'window', lookback, bars, args.cycles)
+            incremental = run_mode(calculator, db, 'incremental', lookback, bars, args.cycles)
+            print(f"{lookback:>10} {window:>12.2f} {incremental:>16.2f}")
+
+        same, rows, worst = check_incremental(calculator, db, args.lookbacks[-1])
+        ok = same
+        print(f"\nIncremental == calculate_features: {same} ({rows} rows, max diff {worst:.2e})")
+    finally:
+        reset(db)
+
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == '__main__':
+    main()
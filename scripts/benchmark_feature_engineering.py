@@ -0,0 +1,253 @@
+"""
+FeatureEngineer Check + Benchmark
+- Parität: add_all_features (fused, pro Symbol) gegen die bisherige
+  Implementierung (fünf Schritte mit df.copy()) angewendet pro Symbol;
+  gleiche Spalten in gleicher Reihenfolge, gleiche Werte
+- Symbolgrenzen: zählt die Zeilen, in denen die bisherige Implementierung
+  auf dem kombinierten Frame Returns/Volatilität über die Grenze rechnet;
+  prüft auch einen Frame mit verschränkten Symbols
+- Kernel: der numba-Kernel (ohne numba in Python ausgeführt, kleiner Frame)
+  gegen das NumPy-Backend
+- Benchmark: Laufzeit und Speicher-Peak (tracemalloc) über ein Jahr
+  1m-Bars pro Symbol, bisherige Implementierung gegen alle Backends
+
+Läuft ohne Datenbank (synthetische Bars im Format von
+DataLoader.load_training_data).
+
+Usage:
+    python scripts/benchmark_feature_engineering.py
+    python scripts/benchmark_feature_engineering.py --symbols 5 --bars 374400 --repeat 3
+"""
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import argparse
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from src import indicators
+from src.ml import feature_engineering
+from src.ml.feature_engineering import FeatureEngineer
+
+# Toleranz (absolut, bei |Wert| > 1 relativ)
+TOLERANCE = 1e-9
+
+# Ein Jahr 1m-Bars (52 Wochen x 5 Handelstage)
+YEAR_BARS = 52 * 5 * 1440
+
+
+def synthetic_frame(symbols, bars, seed=42):
+    """Bars mehrerer Symbols hintereinander (wie load_training_data)"""
+    rng = np.random.default_rng(seed)
+    frames = []
+    for i in range(symbols):
+        close = (1.1 + i) * np.exp(np.cumsum(rng.normal(0, 1e-4, bars)))
+        open_ = np.r_[close[0], close[:-1]]
+        spread = np.abs(rng.normal(0, 5e-5, (2, bars))) * close
+        high = np.maximum(open_, close) + spread[0]
+        low = np.minimum(open_, close) - spread[1]
+        upper, _, lower = indicators.bollinger_bands(close, 20, 2.0)
+        frames.append(pd.DataFrame({
+            'timestamp': pd.date_range('2025-01-06', periods=bars, freq='min'),
+            'timeframe': '1m',
+            'open': open_,
+            'high': high,
+            'low': low,
+            'close': close,
+            'volume': rng.integers(1, 200, bars).astype(np.float64),
+            'tick_count': rng.integers(1, 50, bars),
+            'rsi14': indicators.rsi(close, 14),
+            'macd_main': indicators.macd(close)[0],
+            'bb_upper': upper,
+            'bb_lower': lower,
+            'atr14': indicators.atr(high, low, close, 14),
+            'symbol': f'SYM{i}'
+        }))
+    return pd.concat(frames, ignore_index=True)
+
+
+# ==================== Bisherige Implementierung ====================
+
+def legacy_add_all_features(df):
+    """FeatureEngineer.add_all_features vor dem Umbau (fünf Kopien, ohne Symbol-Gruppierung)"""
+    df = df.copy()
+    df['price_change'] = (df['close'] - df['open']) / df['open']
+    df['high_low_range'] = (df['high'] - df['low']) / df['close']
+    df['body_size'] = abs(df['close'] - df['open']) / df['close']
+    df['upper_shadow'] = (df['high'] - df[['open', 'close']].max(axis=1)) / df['close']
+    df['lower_shadow'] = (df[['open', 'close']].min(axis=1) - df['low']) / df['close']
+    df['close_position'] = (df['close'] - df['low']) / (df['high'] - df['low'] + 1e-10)
+
+    df = df.copy()
+    for period in [1, 2, 3, 5]:
+        df[f'return_{period}'] = df['close'].pct_change(period)
+
+    df = df.copy()
+    if 'rsi14' in df.columns:
+        df['rsi14_norm'] = (df['rsi14'] - 50) / 50
+    if 'macd_main' in df.columns:
+        df['macd_norm'] = df['macd_main'] / (df['close'] + 1e-10)
+        df['macd_signal'] = (df['macd_main'] > 0).astype(int)
+    if all(col in df.columns for col in ['bb_upper', 'bb_lower', 'close']):
+        bb_range = df['bb_upper'] - df['bb_lower'] + 1e-10
+        df['bb_position'] = (df['close'] - df['bb_lower']) / bb_range
+        df['bb_width'] = bb_range / df['close']
+
+    df = df.copy()
+    if 'volume' in df.columns:
+        df['price_volume_ratio'] = df['price_change'] * df['volume']
+
+    df = df.copy()
+    if 'atr14' in df.columns:
+        df['atr_norm'] = df['atr14'] / (df['close'] + 1e-10)
+    df['volatility_5'] = df['close'].pct_change().rolling(5).std()
+    df['volatility_10'] = df['close'].pct_change().rolling(10).std()
+
+    return df
+
+
+def legacy_per_symbol(df):
+    """Bisherige Implementierung pro Symbol (Referenz ohne Grenz-Leak)"""
+    parts = [legacy_add_all_features(part) for _, part in df.groupby('symbol', sort=False)]
+    return pd.concat(parts).loc[df.index]
+
+
+# ==================== Checks ====================
+
+def max_error(actual, expected):
+    """Größte Abweichung (relativ bei |Wert| > 1), inf bei NaN an verschiedenen Stellen"""
+    actual = np.asarray(actual, dtype=np.float64)
+    expected = np.asarray(expected, dtype=np.float64)
+    if (np.isnan(actual) != np.isnan(expected)).any():
+        return float('inf')
+    valid = ~np.isnan(expected)
+    if not valid.any():
+        return 0.0
+    return float((np.abs(actual[valid] - expected[valid]) / np.maximum(1.0, np.abs(expected[valid]))).max())
+
+
+def compare(name, result, reference):
+    """Spalten, Reihenfolge, dtypes und Werte gegen die Referenz"""
+    derived = [col for col in FeatureEngineer('numpy').get_feature_names(include_base=False)
+               if col in reference.columns]
+    same_columns = list(result.columns) == list(reference.columns)
+    same_dtypes = same_columns and (result.dtypes == reference.dtypes).all()
+    worst = max(max_error(result[col], reference[col]) for col in derived)
+    passed = same_columns and same_dtypes and worst <= TOLERANCE
+    print(f"  {name:<34} columns {'OK' if same_columns else 'FAIL'}, dtypes {'OK' if same_dtypes else 'FAIL'}, "
+          f"max error {worst:.2e}  {'OK' if passed else 'FAIL'}")
+    return passed
+
+
+def check(bars):
+    """Parität pro Backend, Symbolgrenzen, verschränkte Symbols, Kernel"""
+    df = synthetic_frame(3, bars)
+    reference = legacy_per_symbol(df)
+    backends = ['numpy'] + (['numba'] if feature_engineering.numba is not None else [])
+
+    print(f"Parity vs legacy per symbol (3 symbols x {bars:,} bars)")
+    ok = True
+    for backend in backends:
+        ok &= compare(f"add_all_features [{backend}]", FeatureEngineer(backend).add_all_features(df), reference)
+
+    steps = FeatureEngineer('numpy')
+    stepped = df
+    for step in (steps.add_price_features, steps.add_returns, steps.add_normalized_indicators,
+                 steps.add_trend_features, steps.add_volatility_features):
+        stepped = step(stepped)
+    ok &= compare("add_* steps [numpy]", stepped, reference)
+
+    # Bisherige Implementierung auf dem kombinierten Frame rechnet über die Symbolgrenzen
+    combined = legacy_add_all_features(df)
+    leaked = 0
+    for col in ('return_1', 'return_5', 'volatility_10'):
+        leaked += int((np.isnan(combined[col]) != np.isnan(reference[col])).sum())
+    print(f"  legacy on the combined frame: {leaked} window values across symbol boundaries")
+
+    # Verschränkte Symbols (z.B. nach Timestamp sortiert)
+    interleaved = df.sort_values(['timestamp', 'symbol'], kind='stable')
+    ok &= compare("interleaved symbols [numpy]", FeatureEngineer('numpy').add_all_features(interleaved),
+                  legacy_per_symbol(interleaved))
+
+    # Kernel-Semantik ohne numba: Python-Ausführung auf einem kleinen Frame
+    small = interleaved.head(3000)
+    engineer = FeatureEngineer('numpy')
+    order, starts = engineer._segments(small)
+    close = small['close'].to_numpy()[order]
+    periods, windows = np.array([1, 2, 3, 5]), np.array([5, 10])
+    returns, volatility = np.empty((4, len(close))), np.empty((2, len(close)))
+    feature_engineering._window_kernel(close, starts, periods, windows, returns, volatility)
+    expected = engineer._window_features(small, periods, windows)
+    worst = 0.0
+    for j, period in enumerate(periods):
+        worst = max(worst, max_error(returns[j], expected[f'return_{period}'][order]))
+    for j, window in enumerate(windows):
+        worst = max(worst, max_error(volatility[j], expected[f'volatility_{window}'][order]))
+    passed = worst <= TOLERANCE
+    ok &= passed
+    print(f"  {'window kernel (python) vs numpy':<34} max error {worst:.2e}  {'OK' if passed else 'FAIL'}")
+    return ok
+
+
+# ==================== Benchmark ====================
+
+def measure(func, df, repeat):
+    """(Bestzeit ms, Speicher-Peak MB über dem Eingangsframe)"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(df)
+        best = min(best, time.perf_counter() - start)
+        del result
+
+    tracemalloc.start()
+    result = func(df)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    del result
+    return best * 1000, peak / 2 ** 20
+
+
+def benchmark(symbols, bars, repeat):
+    """Bisherige Implementierung gegen die Backends über symbols x bars Bars"""
+    df = synthetic_frame(symbols, bars, seed=7)
+    size = df.memory_usage(deep=True).sum() / 2 ** 20
+    print(f"\nBenchmark ({symbols} symbols x {bars:,} bars = {len(df):,} rows, "
+          f"input frame {size:.0f} MB, best of {repeat})")
+    print(f"  {'implementation':<28} {'wall ms':>10} {'peak MB':>10}")
+
+    cases = [('legacy (5 copies)', legacy_add_all_features)]
+    cases.append(('fused [numpy]', FeatureEngineer('numpy').add_all_features))
+    if feature_engineering.numba is not None:
+        engineer = FeatureEngineer('numba')
+        engineer.add_all_features(df.head(100))  # JIT kompilieren
+        cases.append(('fused [numba]', engineer.add_all_features))
+    else:
+        print("  (numba not installed, numba backend skipped)")
+
+    for name, func in cases:
+        wall, peak = measure(func, df, repeat)
+        print(f"  {name:<28} {wall:>10.1f} {peak:>10.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='FeatureEngineer parity check and benchmark')
+    parser.add_argument('--symbols', type=int, default=5, help='Symbols for the benchmark')
+    parser.add_argument('--bars', type=int, default=YEAR_BARS, help='1m bars per symbol')
+    parser.add_argument('--check-bars', type=int, default=20000, help='Bars per symbol for the parity check')
+    parser.add_argument('--repeat', type=int, default=3, help='Repetitions (best time)')
+    args = parser.parse_args()
+
+    ok = check(args.check_bars)
+    benchmark(args.symbols, args.bars, args.repeat)
+
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == '__main__':
+    main()
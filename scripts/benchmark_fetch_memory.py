@@ -0,0 +1,159 @@
+"""
+Fetch Memory Benchmark
+- Vergleicht den Speicherbedarf beim Laden eines Monats 1m-Bars:
+    dict       fetch_all_dict + DataFrame (bisher ModelTrainer.fetch_training_data)
+    tuples     fetch_all + DataFrame      (bisher DataLoader.load_bar_data)
+    dataframe  fetch_dataframe            (serverseitiger Cursor, Chunks -> Spalten)
+    numpy      fetch_numpy                (nur numerische Spalten, 2D-Array)
+- Jeder Modus läuft in einem eigenen Prozess, gemessen wird der Anstieg des
+  Peak-RSS (ru_maxrss) gegenüber dem Stand nach Imports + Verbindungsaufbau
+
+Benötigt eine erreichbare lokale PostgreSQL Datenbank (config.json -> database.local).
+Peak-RSS über das resource Modul (Linux/macOS).
+
+Usage:
+    python scripts/benchmark_fetch_memory.py --days 30 --symbols 5
+"""
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import argparse
+import json
+import random
+import subprocess
+import time
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from src.data.database_manager import get_database
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+TABLE = 'bench_fetch_bars'
+MODES = ('dict', 'tuples', 'dataframe', 'numpy')
+
+COLUMNS = (
+    'symbol', 'timestamp', 'timeframe', 'open', 'high', 'low', 'close',
+    'volume', 'tick_count', 'rsi14', 'macd_main', 'bb_upper', 'bb_lower', 'atr14'
+)
+NUMERIC_COLUMNS = COLUMNS[3:]
+
+
+def peak_rss_mb():
+    """Peak-RSS des Prozesses in MB"""
+    if resource is None:
+        return float('nan')
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux: KB, macOS: Bytes
+    return peak / 1024 / 1024 if sys.platform == 'darwin' else peak / 1024
+
+
+def create_table(db, days, symbols):
+    """Benchmark-Tabelle mit days x 1440 1m-Bars pro Symbol"""
+    db.execute(f"""
+        DROP TABLE IF EXISTS {TABLE};
+        CREATE TABLE {TABLE} (
+            id SERIAL PRIMARY KEY,
+            symbol VARCHAR(20) NOT NULL,
+            timestamp TIMESTAMP WITH TIME ZONE NOT NULL,
+            timeframe VARCHAR(5) NOT NULL,
+            open DOUBLE PRECISION NOT NULL,
+            high DOUBLE PRECISION NOT NULL,
+            low DOUBLE PRECISION NOT NULL,
+            close DOUBLE PRECISION NOT NULL,
+            volume BIGINT,
+            tick_count INTEGER,
+            rsi14 DOUBLE PRECISION,
+            macd_main DOUBLE PRECISION,
+            bb_upper DOUBLE PRECISION,
+            bb_lower DOUBLE PRECISION,
+            atr14 DOUBLE PRECISION
+        )
+    """)
+
+    start = datetime.now().replace(second=0, microsecond=0) - timedelta(days=days)
+    for s in range(symbols):
+        symbol = f"SYM{s}"
+        price = 1.1
+        rows = []
+        for i in range(days * 1440):
+            price += random.gauss(0, 0.0002)
+            high = price + abs(random.gauss(0, 0.0001))
+            low = price - abs(random.gauss(0, 0.0001))
+            rows.append((
+                symbol, start + timedelta(minutes=i), '1m', price, high, low, price,
+                random.randint(1, 500), random.randint(1, 200),
+                random.uniform(0, 100), random.gauss(0, 0.001),
+                high + 0.001, low - 0.001, random.uniform(0.0001, 0.001)
+            ))
+        db.copy_rows(TABLE, COLUMNS, rows)
+
+    return days * 1440 * symbols
+
+
+def run_mode(mode):
+    """Lädt die Tabelle in einem Modus und gibt Messwerte als JSON aus"""
+    db = get_database('local')
+    db.fetch_one("SELECT 1")
+    baseline = peak_rss_mb()
+
+    started = time.perf_counter()
+    if mode == 'dict':
+        df = pd.DataFrame(db.fetch_all_dict(f"SELECT {', '.join(COLUMNS)} FROM {TABLE} ORDER BY timestamp"))
+    elif mode == 'tuples':
+        df = pd.DataFrame(
+            db.fetch_all(f"SELECT {', '.join(COLUMNS)} FROM {TABLE} ORDER BY timestamp"), columns=COLUMNS
+        )
+    elif mode == 'dataframe':
+        df = db.fetch_dataframe(f"SELECT {', '.join(COLUMNS)} FROM {TABLE} ORDER BY timestamp")
+    else:
+        df = db.fetch_numpy(f"SELECT {', '.join(NUMERIC_COLUMNS)} FROM {TABLE} ORDER BY timestamp")
+    elapsed = time.perf_counter() - started
+
+    print(json.dumps({
+        'mode': mode,
+        'rows': len(df),
+        'seconds': elapsed,
+        'baseline_mb': baseline,
+        'peak_delta_mb': peak_rss_mb() - baseline
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark peak RSS of fetch paths')
+    parser.add_argument('--days', type=int, default=30, help='Days of 1m bars per symbol')
+    parser.add_argument('--symbols', type=int, default=5, help='Number of symbols')
+    parser.add_argument('--keep', action='store_true', help='Keep benchmark table')
+    parser.add_argument('--mode', choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        run_mode(args.mode)
+        return
+
+    db = get_database('local')
+    rows = create_table(db, args.days, args.symbols)
+    print(f"Table {TABLE}: {rows} bars ({args.days} days x {args.symbols} symbols)\n")
+
+    try:
+        print(f"{'mode':<10} {'rows':>9} {'seconds':>8} {'peak RSS +MB':>13}")
+        for mode in MODES:
+            output = subprocess.run(
+                [sys.executable, __file__, '--mode', mode],
+                capture_output=True, text=True, check=True
+            ).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            print(f"{mode:<10} {result['rows']:>9} {result['seconds']:>8.2f} {result['peak_delta_mb']:>13.1f}")
+    finally:
+        if not args.keep:
+            db.execute(f"DROP TABLE IF EXISTS {TABLE}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,262 @@
+"""
+Indicator Library Check + Benchmark
+- Goldene Werte: kleine, von Hand nachgerechnete Reihen und die
+  Wilder-RSI-Beispielreihe (StockCharts, exakt gerechnet - deren Tabelle
+  rundet Zwischenwerte und zeigt z.B. 70.53 statt 70.46)
+- Parität: src.indicators Batch-Kernels gegen die Streaming-Klassen über
+  eine Random-Walk-Reihe (Wert i = Streaming-Wert nach Update i)
+- Benchmark: Batch-Kernels über 1M Bars gegen die bisherigen pandas-Formeln
+  der Aufrufer sowie Streaming-Durchsatz pro Update
+
+Usage:
+    python scripts/benchmark_indicators.py
+    python scripts/benchmark_indicators.py --bars 1000000 --parity 20000
+"""
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from src import indicators
+from src.indicators import streaming
+
+# Toleranz (absolut, bei |Wert| > 1 relativ)
+TOLERANCE = 1e-9
+
+NAN = np.nan
+
+# Wilder-Beispielreihe (StockCharts, RSI 14)
+WILDER_CLOSES = [
+    44.34, 44.09, 44.15, 43.61, 44.33, 44.83, 45.10, 45.42, 45.84, 46.08, 45.89,
+    46.03, 45.61, 46.28, 46.28, 46.00, 46.03, 46.41, 46.22, 45.64, 46.21, 46.25,
+    45.71, 46.45, 45.78, 45.35, 44.03, 44.18, 44.22, 44.57, 43.42, 42.66, 43.13
+]
+WILDER_RSI = [
+    70.46, 66.25, 66.48, 69.35, 66.29, 57.92, 62.88, 63.21, 56.01, 62.34,
+    54.67, 50.39, 40.02, 41.49, 41.90, 45.50, 37.32, 33.09, 37.79
+]
+
+SMALL = [1.0, 2.0, 3.0, 10.0, 4.0]
+HIGH = [10.0, 11.0, 12.0, 11.0]
+LOW = [9.0, 10.0, 10.0, 9.0]
+CLOSE = [9.5, 10.5, 11.0, 10.0]
+
+
+def golden_cases():
+    """(Name, berechnet, erwartet, Nachkommastellen)"""
+    std = np.sqrt([2 / 3, 38 / 3, 86 / 9])
+    upper, middle, lower = indicators.bollinger_bands(SMALL, 3, 1.0)
+    line, signal, hist = indicators.macd(np.full(60, 1.1))
+    return [
+        ('sma', indicators.sma(SMALL, 3), [NAN, NAN, 2.0, 5.0, 17 / 3], None),
+        ('ema', indicators.ema(SMALL, 3), [NAN, NAN, 2.0, 6.0, 5.0], None),
+        ('wma', indicators.wma(SMALL, 3), [NAN, NAN, 7 / 3, 19 / 3, 35 / 6], None),
+        ('bollinger upper', upper, [NAN, NAN, *(np.array([2.0, 5.0, 17 / 3]) + std)], None),
+        ('bollinger middle', middle, [NAN, NAN, 2.0, 5.0, 17 / 3], None),
+        ('bollinger lower', lower, [NAN, NAN, *(np.array([2.0, 5.0, 17 / 3]) - std)], None),
+        ('rolling_std', indicators.rolling_std(SMALL, 3), [NAN, NAN, *std], None),
+        ('true_range', indicators.true_range(HIGH, LOW, CLOSE), [1.0, 1.5, 2.0, 2.0], None),
+        ('atr', indicators.atr(HIGH, LOW, CLOSE, 2), [NAN, 1.25, 1.625, 1.8125], None),
+        ('momentum', indicators.momentum(SMALL, 3), [NAN, NAN, 2.0, 8.0, 1.0], None),
+        ('rsi rising', indicators.rsi(np.arange(20.0), 14)[14:], [100.0] * 6, None),
+        ('rsi wilder', indicators.rsi(WILDER_CLOSES, 14)[14:], WILDER_RSI, 2),
+        ('macd constant', line[25:], [0.0] * 35, None),
+        ('macd signal constant', signal[33:], [0.0] * 27, None),
+        ('macd hist constant', hist[33:], [0.0] * 27, None),
+    ]
+
+
+def matches(actual, expected, digits=None):
+    """NaN an gleichen Stellen, Werte innerhalb TOLERANCE bzw. gerundet gleich"""
+    actual = np.asarray(actual, dtype=np.float64)
+    expected = np.asarray(expected, dtype=np.float64)
+    if actual.shape != expected.shape or (np.isnan(actual) != np.isnan(expected)).any():
+        return False
+    valid = ~np.isnan(expected)
+    if digits is not None:
+        return bool((np.round(actual[valid], digits) == np.round(expected[valid], digits)).all())
+    return max_error(actual, expected) <= TOLERANCE
+
+
+def max_error(actual, expected):
+    """Größte Abweichung (relativ bei |Wert| > 1)"""
+    valid = ~np.isnan(expected)
+    if not valid.any():
+        return 0.0
+    diff = np.abs(actual[valid] - expected[valid]) / np.maximum(1.0, np.abs(expected[valid]))
+    return float(diff.max())
+
+
+def check_golden():
+    """Goldene Werte prüfen"""
+    print("Golden values")
+    ok = True
+    for name, actual, expected, digits in golden_cases():
+        passed = matches(actual, expected, digits)
+        ok &= passed
+        print(f"  {name:<22} {'OK' if passed else 'FAIL'}")
+    return ok
+
+
+def streamed(indicator, *series, index=None):
+    """Streaming-Werte pro Update als Array (None -> NaN)"""
+    out = np.full(len(series[0]), np.nan)
+    for i, values in enumerate(zip(*series)):
+        value = indicator.update(*values)
+        if index is not None:
+            value = value[index]
+        if value is not None:
+            out[i] = value
+    return out
+
+
+def random_walk(count, seed=42):
+    """Random Walk um 1.1 mit High/Low-Spanne"""
+    rng = np.random.default_rng(seed)
+    close = 1.1 + np.cumsum(rng.normal(0, 1e-4, count))
+    high = close + np.abs(rng.normal(0, 5e-5, count))
+    low = close - np.abs(rng.normal(0, 5e-5, count))
+    return high, low, close
+
+
+def check_parity(count):
+    """Batch-Kernels gegen Streaming-Klassen"""
+    high, low, close = random_walk(count)
+    macd = indicators.macd(close)
+    bands = indicators.bollinger_bands(close, 20, 2.0)
+    cases = [
+        ('sma', indicators.sma(close, 20), streamed(streaming.SMA(20), close)),
+        ('ema', indicators.ema(close, 20), streamed(streaming.EMA(20), close)),
+        ('wma', indicators.wma(close, 14), streamed(streaming.WMA(14), close)),
+        ('rsi', indicators.rsi(close, 14), streamed(streaming.RSI(14), close)),
+        ('momentum', indicators.momentum(close, 14), streamed(streaming.Momentum(14), close)),
+        ('cci', indicators.cci(close, 14), streamed(streaming.CCI(14), close)),
+        ('atr', indicators.atr(high, low, close, 14), streamed(streaming.ATR(14), high, low, close)),
+    ]
+    for i, name in enumerate(('macd', 'macd signal', 'macd hist')):
+        cases.append((name, macd[i], streamed(streaming.MACD(), close, index=i)))
+    for i, name in enumerate(('bollinger upper', 'bollinger middle', 'bollinger lower')):
+        cases.append((name, bands[i], streamed(streaming.BollingerBands(20, 2.0), close, index=i)))
+
+    print(f"\nParity batch vs streaming ({count:,} values)")
+    ok = True
+    for name, batch, stream in cases:
+        passed = matches(batch, stream)
+        ok &= passed
+        error = max_error(batch, stream) if (np.isnan(batch) == np.isnan(stream)).all() else float('nan')
+        print(f"  {name:<22} max error {error:.2e}  {'OK' if passed else 'FAIL'}")
+    return ok
+
+
+def legacy_kernels(df):
+    """Bisherige pandas-Formeln der Aufrufer (FeatureCalculator, StrategyManager)"""
+    close = df['close']
+
+    def rsi():
+        delta = close.diff()
+        gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
+        loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
+        return 100 - (100 / (1 + gain / loss))
+
+    def macd():
+        line = close.ewm(span=12, adjust=False).mean() - close.ewm(span=26, adjust=False).mean()
+        return line, line.ewm(span=9, adjust=False).mean()
+
+    def bollinger():
+        middle = close.rolling(window=20).mean()
+        std = close.rolling(window=20).std()
+        return middle + 2 * std, middle - 2 * std
+
+    def atr():
+        ranges = pd.concat([
+            df['high'] - df['low'],
+            np.abs(df['high'] - close.shift()),
+            np.abs(df['low'] - close.shift())
+        ], axis=1)
+        return ranges.max(axis=1).rolling(window=14).mean()
+
+    return {
+        'sma 50': lambda: close.rolling(window=50).mean(),
+        'ema 20': lambda: close.ewm(span=20, adjust=False).mean(),
+        'rsi 14': rsi,
+        'macd': macd,
+        'bollinger 20': bollinger,
+        'atr 14': atr,
+    }
+
+
+def batch_kernels(df):
+    """Gleiche Indikatoren über src.indicators"""
+    close = df['close']
+    return {
+        'sma 50': lambda: indicators.sma(close, 50),
+        'ema 20': lambda: indicators.ema(close, 20),
+        'rsi 14': lambda: indicators.rsi(close, 14),
+        'macd': lambda: indicators.macd(close),
+        'bollinger 20': lambda: indicators.bollinger_bands(close, 20, 2.0),
+        'atr 14': lambda: indicators.atr(df['high'], df['low'], close, 14),
+    }
+
+
+def timed(func, repeat):
+    """Bestzeit in ms"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def benchmark(bars, repeat, stream_count):
+    """Batch vs bisherige pandas-Formeln über `bars` Bars, Streaming pro Update"""
+    high, low, close = random_walk(bars, seed=7)
+    df = pd.DataFrame({'high': high, 'low': low, 'close': close})
+    legacy = legacy_kernels(df)
+    batch = batch_kernels(df)
+
+    print(f"\nBenchmark ({bars:,} bars, best of {repeat})")
+    print(f"  {'indicator':<14} {'legacy ms':>10} {'batch ms':>10} {'stream us/update':>18}")
+
+    sample = close[:stream_count]
+    stream = {
+        'sma 50': lambda: streamed(streaming.SMA(50), sample),
+        'ema 20': lambda: streamed(streaming.EMA(20), sample),
+        'rsi 14': lambda: streamed(streaming.RSI(14), sample),
+        'macd': lambda: streamed(streaming.MACD(), sample, index=0),
+        'bollinger 20': lambda: streamed(streaming.BollingerBands(20, 2.0), sample, index=0),
+        'atr 14': lambda: streamed(streaming.ATR(14), high[:stream_count], low[:stream_count], sample),
+    }
+    for name in batch:
+        old = timed(legacy[name], repeat)
+        new = timed(batch[name], repeat)
+        per_update = timed(stream[name], 1) * 1000 / stream_count
+        print(f"  {name:<14} {old:>10.1f} {new:>10.1f} {per_update:>18.2f}")
+
+    total = timed(lambda: [kernel() for kernel in batch.values()], repeat)
+    print(f"  {'all (batch)':<14} {'':>10} {total:>10.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Indicator library golden values, parity check and benchmark')
+    parser.add_argument('--bars', type=int, default=1000000, help='Bars for the benchmark')
+    parser.add_argument('--parity', type=int, default=20000, help='Values for the batch/streaming parity check')
+    parser.add_argument('--stream', type=int, default=100000, help='Updates for the streaming throughput')
+    parser.add_argument('--repeat', type=int, default=3, help='Repetitions (best time)')
+    args = parser.parse_args()
+
+    ok = check_golden()
+    ok &= check_parity(args.parity)
+    benchmark(args.bars, args.repeat, args.stream)
+
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == '__main__':
+    main()
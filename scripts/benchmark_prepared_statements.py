@@ -0,0 +1,160 @@
+"""
+Prepared Statement Benchmark
+- Bar-Pfad: Upsert wie in bars_<timeframe> (ein Row pro Call)
+- Tick-Pfad: INSERT wie start_tick_collector.py (ein Row pro Call und
+  execute_many mit 100 Rows pro Call)
+- Jeder Pfad einmal als SQL-Text und einmal mit PREPARE/EXECUTE
+  (prepare=True); ausgegeben wird die Latenz pro Call (Mittel, p50, p95)
+
+Benötigt eine erreichbare lokale PostgreSQL Datenbank (config.json -> database.local)
+mit database.<type>.prepared_statements = true.
+"""
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import argparse
+import random
+import statistics
+import time
+from datetime import datetime, timedelta
+
+from src.data.database_manager import get_database
+
+BAR_TABLE = 'bench_prepared_bars'
+TICK_TABLE = 'bench_prepared_ticks'
+
+
+def create_tables(db):
+    """Benchmark-Tabellen (Schema wie bars_1m bzw. V1 Tick-Tabelle)"""
+    db.execute(f"""
+        DROP TABLE IF EXISTS {BAR_TABLE};
+        CREATE TABLE {BAR_TABLE} (
+            symbol VARCHAR(20) NOT NULL,
+            timestamp TIMESTAMP NOT NULL,
+            open DOUBLE PRECISION,
+            high DOUBLE PRECISION,
+            low DOUBLE PRECISION,
+            close DOUBLE PRECISION,
+            volume BIGINT,
+            tick_count INTEGER,
+            PRIMARY KEY (symbol, timestamp)
+        );
+
+        DROP TABLE IF EXISTS {TICK_TABLE};
+        CREATE TABLE {TICK_TABLE} (
+            id BIGSERIAL PRIMARY KEY,
+            symbol VARCHAR(20) NOT NULL,
+            timestamp TIMESTAMP NOT NULL,
+            bid DECIMAL(10, 5) NOT NULL,
+            ask DECIMAL(10, 5) NOT NULL,
+            last DECIMAL(10, 5),
+            volume BIGINT,
+            time_msc BIGINT
+        );
+        CREATE INDEX idx_{TICK_TABLE}_symbol ON {TICK_TABLE} (symbol, timestamp DESC);
+    """)
+
+
+BAR_SQL = f"""
+    INSERT INTO {BAR_TABLE}
+        (symbol, timestamp, open, high, low, close, volume, tick_count)
+    VALUES
+        (%s, %s, %s, %s, %s, %s, %s, %s)
+    ON CONFLICT (symbol, timestamp)
+    DO UPDATE SET
+        high = GREATEST({BAR_TABLE}.high, EXCLUDED.high),
+        low = LEAST({BAR_TABLE}.low, EXCLUDED.low),
+        close = EXCLUDED.close,
+        volume = {BAR_TABLE}.volume + EXCLUDED.volume,
+        tick_count = {BAR_TABLE}.tick_count + EXCLUDED.tick_count
+"""
+
+TICK_SQL = f"""
+    INSERT INTO {TICK_TABLE}
+    (symbol, timestamp, bid, ask, last, volume, time_msc)
+    VALUES (%s, %s, %s, %s, %s, %s, %s)
+    ON CONFLICT DO NOTHING
+"""
+
+
+def bar_rows(count):
+    """Bar-Updates: jeweils 60 Updates pro Minute (wie pro Tick)"""
+    start = datetime.now().replace(second=0, microsecond=0)
+    price = 1.1
+    rows = []
+    for i in range(count):
+        price += random.gauss(0, 0.00002)
+        rows.append(('EURUSD', start + timedelta(minutes=i // 60), price, price, price, price, 1, 1))
+    return rows
+
+
+def tick_rows(count):
+    """Synthetische Ticks"""
+    start = datetime.now()
+    price = 1.1
+    rows = []
+    for i in range(count):
+        price += random.gauss(0, 0.00002)
+        ts = start + timedelta(milliseconds=100 * i)
+        rows.append(('EURUSD', ts, round(price, 5), round(price + 0.00012, 5), None, 1, int(ts.timestamp() * 1000)))
+    return rows
+
+
+def bench(label, call, items):
+    """Misst die Latenz pro Call"""
+    latencies = []
+    for item in items:
+        started = time.perf_counter()
+        call(item)
+        latencies.append((time.perf_counter() - started) * 1000)
+
+    latencies.sort()
+    mean = statistics.mean(latencies)
+    p50 = latencies[len(latencies) // 2]
+    p95 = latencies[int(len(latencies) * 0.95)]
+    print(f"  {label:<28} {len(latencies):>7} calls  mean {mean:7.3f}ms  p50 {p50:7.3f}ms  p95 {p95:7.3f}ms")
+    return mean
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark PREPARE/EXECUTE vs plain SQL')
+    parser.add_argument('--db', default='local', help="Database type ('local' or 'remote')")
+    parser.add_argument('--calls', type=int, default=5000, help='Calls per single-row run')
+    args = parser.parse_args()
+
+    db = get_database(args.db)
+    if not db.use_prepared:
+        print(f"Prepared statements are disabled for '{args.db}' (database.{args.db}.prepared_statements)")
+        return
+
+    bars = bar_rows(args.calls)
+    ticks = tick_rows(args.calls)
+    tick_batches = [ticks[i:i + 100] for i in range(0, len(ticks), 100)]
+
+    print("=" * 90)
+    print(f"PREPARED STATEMENT BENCHMARK ({args.db})")
+    print("=" * 90)
+
+    try:
+        results = []
+        for prepare in (False, True):
+            mode = 'prepared' if prepare else 'plain'
+            create_tables(db)
+            results.append((
+                bench(f"bar upsert ({mode})", lambda row: db.execute(BAR_SQL, row, prepare=prepare), bars),
+                bench(f"tick insert ({mode})", lambda row: db.execute(TICK_SQL, row, prepare=prepare), ticks),
+                bench(f"tick batch 100 ({mode})", lambda batch: db.execute_many(TICK_SQL, batch, prepare=prepare),
+                      tick_batches)
+            ))
+
+        print()
+        for label, plain, prepared in zip(('bar upsert', 'tick insert', 'tick batch 100'), *results):
+            print(f"  {label:<16} saving per call: {plain - prepared:7.3f}ms ({(1 - prepared / plain) * 100:5.1f}%)")
+    finally:
+        db.execute(f"DROP TABLE IF EXISTS {BAR_TABLE}; DROP TABLE IF EXISTS {TICK_TABLE}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,144 @@
+"""
+Work Scheduler Benchmark
+- Zykluszeit für symbols x timeframes Units: serielle Schleife (wie bisher)
+  gegen WorkScheduler mit Thread-Pool und mit Thread- + Process-Pool
+- Pro Unit: Lesen (simulierte Query-Latenz), compute_features des Feature
+  Calculators über lookback Bars, Schreiben (simulierte Latenz)
+- Optional eine langsame Unit (--slow): zeigt, dass sie die übrigen Symbols
+  nicht aufhält (Deadline) und im Folgezyklus übersprungen wird
+
+Läuft ohne Datenbank; die Latenz der Queries ist per --latency einstellbar.
+
+Usage:
+    python scripts/benchmark_scheduler.py
+    python scripts/benchmark_scheduler.py --symbols 5 25 --latency 20 --io-workers 8 --cpu-workers 4
+    python scripts/benchmark_scheduler.py --slow 5 --deadline 2
+"""
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.data.feature_calculator import compute_features
+from src.utils.work_scheduler import WorkScheduler, WorkUnit
+
+TIMEFRAMES = ['1m', '5m', '15m', '1h']
+
+
+def synthetic_frame(count, seed):
+    """OHLCV Bars als DataFrame (wie FeatureCalculator.fetch_bars)"""
+    rng = np.random.default_rng(seed)
+    close = 1.1 + np.cumsum(rng.normal(0, 1e-4, count))
+    return pd.DataFrame({
+        'open': close,
+        'high': close + np.abs(rng.normal(0, 5e-5, count)),
+        'low': close - np.abs(rng.normal(0, 5e-5, count)),
+        'close': close,
+        'volume': 1.0
+    }, index=pd.date_range('2025-01-06', periods=count, freq='min'))
+
+
+def make_units(symbols, frames, latency, slow_key=None, slow=0.0):
+    """Key -> WorkUnit mit simulierter Query-Latenz"""
+    def read(key):
+        time.sleep(slow if key == slow_key else latency)
+        return frames[key]
+
+    def write(features):
+        time.sleep(latency / 2)
+        return 0 if features is None else len(features)
+
+    return {
+        (symbol, timeframe): WorkUnit(
+            io=lambda key=(symbol, timeframe): read(key),
+            cpu=compute_features,
+            store=write
+        )
+        for symbol in symbols
+        for timeframe in TIMEFRAMES
+    }
+
+
+def serial_cycle(units):
+    """Bisherige verschachtelte Schleife"""
+    for unit in units.values():
+        data = unit.io()
+        unit.store(unit.cpu(data))
+
+
+def timed_cycles(func, cycles):
+    """Median-Zykluszeit in ms"""
+    durations = []
+    for _ in range(cycles):
+        start = time.perf_counter()
+        func()
+        durations.append(time.perf_counter() - start)
+    return float(np.median(durations)) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Cycle time of the serial loop vs the WorkScheduler')
+    parser.add_argument('--symbols', type=int, nargs='+', default=[5, 25], help='Symbol counts')
+    parser.add_argument('--lookback', type=int, default=200, help='Bars per unit')
+    parser.add_argument('--latency', type=float, default=10.0, help='Simulated query latency in ms')
+    parser.add_argument('--io-workers', type=int, default=8, help='Scheduler threads')
+    parser.add_argument('--cpu-workers', type=int, default=2, help='Scheduler processes')
+    parser.add_argument('--deadline', type=float, default=30.0, help='Cycle deadline in seconds')
+    parser.add_argument('--slow', type=float, default=0.0, help='Latency of one slow unit in seconds')
+    parser.add_argument('--cycles', type=int, default=5, help='Cycles per measurement (median)')
+    args = parser.parse_args()
+
+    latency = args.latency / 1000
+    print(f"{len(TIMEFRAMES)} timeframes, {args.lookback} bars, {args.latency:.0f} ms per query, "
+          f"{args.io_workers} threads, {args.cpu_workers} processes, median of {args.cycles} cycles")
+    print(f"{'symbols':>8} {'units':>6} {'serial ms':>10} {'threads ms':>11} {'+processes ms':>14}")
+
+    for count in args.symbols:
+        symbols = [f"SYM{i}" for i in range(count)]
+        frames = {
+            (symbol, timeframe): synthetic_frame(args.lookback, seed=i * len(TIMEFRAMES) + j)
+            for i, symbol in enumerate(symbols)
+            for j, timeframe in enumerate(TIMEFRAMES)
+        }
+        units = make_units(symbols, frames, latency)
+
+        serial = timed_cycles(lambda: serial_cycle(units), args.cycles)
+        results = []
+        for cpu_workers in (0, args.cpu_workers):
+            scheduler = WorkScheduler('benchmark', io_workers=args.io_workers,
+                                      cpu_workers=cpu_workers, deadline=args.deadline)
+            scheduler.run(units)  # Pools starten
+            results.append(timed_cycles(lambda: scheduler.run(units), args.cycles))
+            scheduler.shutdown()
+
+        print(f"{count:>8} {len(units):>6} {serial:>10.1f} {results[0]:>11.1f} {results[1]:>14.1f}")
+
+    if args.slow:
+        symbols = [f"SYM{i}" for i in range(args.symbols[0])]
+        frames = {(symbol, timeframe): synthetic_frame(args.lookback, seed=0)
+                  for symbol in symbols for timeframe in TIMEFRAMES}
+        slow_key = (symbols[0], TIMEFRAMES[0])
+        units = make_units(symbols, frames, latency, slow_key, args.slow)
+
+        print(f"\nOne slow unit {slow_key} ({args.slow:.1f}s), deadline {args.deadline:.1f}s")
+        start = time.perf_counter()
+        serial_cycle(units)
+        print(f"  serial cycle:    {(time.perf_counter() - start) * 1000:>8.1f} ms")
+
+        scheduler = WorkScheduler('benchmark', io_workers=args.io_workers, cpu_workers=0, deadline=args.deadline)
+        for cycle in range(3):
+            start = time.perf_counter()
+            done = scheduler.run(units)
+            print(f"  scheduler cycle {cycle + 1}: {(time.perf_counter() - start) * 1000:>8.1f} ms, "
+                  f"{len(done)} units done, stats {scheduler.get_stats()}")
+        scheduler.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,216 @@
+"""
+Tick Indicator Parity Check + Benchmark
+- Vergleicht die Streaming-Indikatoren des Tick Collectors V2 mit den
+  bisherigen Batch-Formeln (pro Tick über das 200er Fenster)
+- RSI und MACD-Signal haben bewusst neue Semantik (Wilder RSI, Signal als
+  EMA der MACD-Linie) und werden gegen die entsprechende Batch-Formel über
+  die gesamte Historie geprüft
+- Misst Ticks/Sekunde für Batch- und Streaming-Berechnung
+
+Usage:
+    python scripts/benchmark_tick_indicators.py --ticks-file recorded.csv --symbol EURUSD
+    python scripts/benchmark_tick_indicators.py --synthetic 20000
+"""
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import argparse
+import time
+from collections import deque
+
+import numpy as np
+
+from scripts.start_tick_collector_v2 import IndicatorCalculator
+
+# Toleranzen (absolut, bei |Wert| > 1 relativ)
+TOLERANCE = 1e-9
+# EMA über gleitendes 200er Fenster startet laufend neu -> minimale Abweichung
+EMA_TOLERANCE = 1e-6
+
+
+class BatchIndicatorCalculator:
+    """Bisherige Berechnung: komplette Neuberechnung pro Tick über das Fenster"""
+
+    def __init__(self, window_size=200):
+        self.prices = deque(maxlen=window_size)
+
+    def add_price(self, bid, ask):
+        self.prices.append((bid + ask) / 2)
+
+    def calculate(self):
+        prices = np.array(self.prices)
+        if len(prices) < 50:
+            return {}
+
+        result = {
+            'ma14': np.mean(prices[-14:]),
+            'ema14': self._ema(prices, 14),
+            'wma14': self._wma(prices, 14),
+            'ma50': np.mean(prices[-50:]),
+            'ema50': self._ema(prices, 50),
+            'wma50': self._wma(prices, 50),
+            'atr14': max(prices[-14:]) - min(prices[-14:]),
+            'adx14': np.std(prices[-14:]) / np.mean(prices[-14:]) * 100,
+            'momentum14': prices[-1] - prices[-14],
+            'cci14': self._cci(prices, 14),
+            'stddev14': np.std(prices[-14:]),
+            'macd_main': self._ema(prices, 12) - self._ema(prices, 26),
+        }
+        sma = np.mean(prices[-20:])
+        std = np.std(prices[-20:])
+        result['bb_upper'] = sma + std * 2
+        result['bb_middle'] = sma
+        result['bb_lower'] = sma - std * 2
+        return result
+
+    @staticmethod
+    def _ema(prices, period):
+        multiplier = 2 / (period + 1)
+        ema = np.mean(prices[:period])
+        for price in prices[period:]:
+            ema = (price * multiplier) + (ema * (1 - multiplier))
+        return ema
+
+    @staticmethod
+    def _wma(prices, period):
+        weights = np.arange(1, period + 1)
+        return np.sum(prices[-period:] * weights) / np.sum(weights)
+
+    @staticmethod
+    def _cci(prices, period):
+        tp = prices[-period:]
+        sma = np.mean(tp)
+        mad = np.mean(np.abs(tp - sma))
+        if mad == 0:
+            return 0
+        return (prices[-1] - sma) / (0.015 * mad)
+
+
+def ema_series(values, period):
+    """EMA über die gesamte Historie, Start mit SMA der ersten period Werte"""
+    out = np.full(len(values), np.nan)
+    if len(values) < period:
+        return out
+    alpha = 2 / (period + 1)
+    out[period - 1] = np.mean(values[:period])
+    for i in range(period, len(values)):
+        out[i] = out[i - 1] + alpha * (values[i] - out[i - 1])
+    return out
+
+
+def wilder_rsi_series(values, period):
+    """Wilder RSI über die gesamte Historie"""
+    out = np.full(len(values), np.nan)
+    deltas = np.diff(values)
+    if len(deltas) < period:
+        return out
+    gains = np.where(deltas > 0, deltas, 0.0)
+    losses = np.where(deltas < 0, -deltas, 0.0)
+    avg_gain = gains[:period].mean()
+    avg_loss = losses[:period].mean()
+    for i in range(period, len(values)):
+        if i > period:
+            avg_gain = (avg_gain * (period - 1) + gains[i - 1]) / period
+            avg_loss = (avg_loss * (period - 1) + losses[i - 1]) / period
+        out[i] = 100.0 if avg_loss == 0 else 100 - 100 / (1 + avg_gain / avg_loss)
+    return out
+
+
+def load_ticks(args):
+    """Bid/Ask Arrays aus Tick-Datei oder synthetisch"""
+    if args.ticks_file:
+        from src.data.fake_mt5 import load_tick_file
+        ticks = load_tick_file(args.ticks_file)[args.symbol]
+        return ticks['bid'], ticks['ask']
+
+    rng = np.random.default_rng(42)
+    bid = 1.10000 + np.cumsum(rng.normal(0, 0.00002, args.synthetic))
+    ask = bid + rng.uniform(0.00005, 0.00020, args.synthetic)
+    return bid, ask
+
+
+def check_parity(bid, ask):
+    """Vergleicht Streaming-Ausgabe pro Tick mit den Batch-Formeln"""
+    mid = (bid + ask) / 2
+    rsi14 = wilder_rsi_series(mid, 14)
+    rsi28 = wilder_rsi_series(mid, 28)
+    macd_full = ema_series(mid, 12) - ema_series(mid, 26)
+    signal_full = np.full(len(mid), np.nan)
+    start = np.argmax(~np.isnan(macd_full))
+    signal_full[start:] = ema_series(macd_full[start:], 9)
+
+    streaming_calc = IndicatorCalculator()
+    batch_calc = BatchIndicatorCalculator()
+    max_diff = {}
+
+    for i in range(len(mid)):
+        streaming_calc.add_price('X', bid[i], ask[i])
+        batch_calc.add_price(bid[i], ask[i])
+        stream = streaming_calc.calculate_indicators('X')
+        if not stream:
+            continue
+
+        expected = batch_calc.calculate()
+        expected['rsi14'] = rsi14[i]
+        expected['rsi28'] = rsi28[i]
+        expected['macd_signal'] = signal_full[i]
+        expected['macd_hist'] = macd_full[i] - signal_full[i]
+
+        for name, value in expected.items():
+            if np.isnan(value):
+                continue
+            diff = abs(stream[name] - value) / max(1.0, abs(value))
+            max_diff[name] = max(max_diff.get(name, 0.0), diff)
+
+    failed = []
+    print(f"{'indicator':<12} {'max diff':>14}")
+    for name in sorted(max_diff):
+        tolerance = EMA_TOLERANCE if name in ('ema14', 'ema50', 'macd_main') else TOLERANCE
+        ok = max_diff[name] <= tolerance
+        if not ok:
+            failed.append(name)
+        print(f"{name:<12} {max_diff[name]:>14.3e}  {'OK' if ok else 'FAIL'}")
+
+    return not failed
+
+
+def benchmark(bid, ask):
+    """Ticks/Sekunde für Batch- und Streaming-Berechnung"""
+    batch_calc = BatchIndicatorCalculator()
+    started = time.perf_counter()
+    for b, a in zip(bid.tolist(), ask.tolist()):
+        batch_calc.add_price(b, a)
+        batch_calc.calculate()
+    batch_rate = len(bid) / (time.perf_counter() - started)
+
+    streaming_calc = IndicatorCalculator()
+    started = time.perf_counter()
+    for b, a in zip(bid.tolist(), ask.tolist()):
+        streaming_calc.add_price('X', b, a)
+        streaming_calc.calculate_indicators('X')
+    streaming_rate = len(bid) / (time.perf_counter() - started)
+
+    print(f"\nBatch:     {batch_rate:>10,.0f} ticks/sec")
+    print(f"Streaming: {streaming_rate:>10,.0f} ticks/sec  ({streaming_rate / batch_rate:.1f}x)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Tick indicator parity check and benchmark')
+    parser.add_argument('--ticks-file', help='Recorded tick file (FakeMT5 format)')
+    parser.add_argument('--symbol', default='EURUSD', help='Symbol in tick file')
+    parser.add_argument('--synthetic', type=int, default=20000, help='Synthetic ticks if no file given')
+    args = parser.parse_args()
+
+    bid, ask = load_ticks(args)
+    print(f"Ticks: {len(bid)}\n")
+
+    ok = check_parity(bid, ask)
+    benchmark(bid, ask)
+
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+"""
+Tick Writer Benchmark
+- Vergleicht execute_many (execute_batch) mit COPY FROM STDIN
+- Nutzt eine temporäre Tabelle im V2 Tick-Schema (25 Spalten)
+- Gibt Ticks/Sekunde für beide Pfade aus
+
+Benötigt eine erreichbare lokale PostgreSQL Datenbank (config.json -> database.local)
+"""
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+
+from src.data.database_manager import get_database
+
+TABLE = 'bench_ticks_writer'
+
+INDICATOR_COLUMNS = (
+    'ma14', 'ma50', 'ema14', 'ema50', 'wma14', 'wma50',
+    'rsi14', 'rsi28', 'macd_main', 'macd_signal', 'macd_hist',
+    'adx14', 'atr14', 'cci14', 'momentum14', 'stddev14',
+    'bb_upper', 'bb_middle', 'bb_lower'
+)
+COLUMNS = ('handelszeit', 'systemzeit', 'mt5_ts', 'bid', 'ask', 'volume') + INDICATOR_COLUMNS
+
+
+def create_table(db):
+    """Create benchmark table (V2 tick schema)"""
+    indicator_sql = ',\n'.join(f"{col} DOUBLE PRECISION" for col in INDICATOR_COLUMNS)
+    db.execute(f"""
+        DROP TABLE IF EXISTS {TABLE};
+        CREATE TABLE {TABLE} (
+            id SERIAL PRIMARY KEY,
+            handelszeit TIMESTAMP WITH TIME ZONE,
+            systemzeit TIMESTAMP WITH TIME ZONE,
+            mt5_ts TIMESTAMP WITH TIME ZONE,
+            bid DOUBLE PRECISION,
+            ask DOUBLE PRECISION,
+            volume BIGINT,
+            {indicator_sql}
+        );
+        CREATE INDEX idx_{TABLE}_ts ON {TABLE} (mt5_ts);
+    """)
+
+
+def make_rows(count):
+    """Generate synthetic tick rows"""
+    start = datetime.now()
+    price = 1.10000
+    rows = []
+    for i in range(count):
+        price += random.gauss(0, 0.00002)
+        ts = start + timedelta(milliseconds=100 * i)
+        indicators = tuple(price + random.gauss(0, 0.0001) for _ in INDICATOR_COLUMNS)
+        rows.append((ts, ts, ts, price, price + 0.00012, random.randint(1, 10)) + indicators)
+    return rows
+
+
+def bench(label, write_fn, rows, batch_size):
+    """Write rows in batches and report ticks/sec"""
+    started = time.perf_counter()
+    for i in range(0, len(rows), batch_size):
+        write_fn(rows[i:i + batch_size])
+    elapsed = time.perf_counter() - started
+    rate = len(rows) / elapsed if elapsed > 0 else 0
+    print(f"  {label:<14} {len(rows):>8} ticks in {elapsed:7.2f}s  ->  {rate:>10,.0f} ticks/sec")
+    return rate
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark tick write paths')
+    parser.add_argument('--db', default='local', help="Database type ('local' or 'remote')")
+    parser.add_argument('--ticks', type=int, default=50000, help='Number of ticks per run')
+    parser.add_argument('--batch-size', type=int, default=50, help='Rows per write call')
+    args = parser.parse_args()
+
+    db = get_database(args.db)
+    rows = make_rows(args.ticks)
+
+    placeholders = ', '.join(['%s'] * len(COLUMNS))
+    insert_sql = f"INSERT INTO {TABLE} ({', '.join(COLUMNS)}) VALUES ({placeholders})"
+
+    print("=" * 70)
+    print(f"TICK WRITER BENCHMARK ({args.db}, batch size {args.batch_size})")
+    print("=" * 70)
+
+    try:
+        create_table(db)
+        batch_rate = bench('execute_many', lambda batch: db.execute_many(insert_sql, batch), rows, args.batch_size)
+
+        create_table(db)
+        copy_rate = bench('copy_rows', lambda batch: db.copy_rows(TABLE, COLUMNS, batch), rows, args.batch_size)
+
+        if batch_rate > 0:
+            print(f"\n  Speedup COPY vs execute_many: {copy_rate / batch_rate:.1f}x")
+    finally:
+        db.execute(f"DROP TABLE IF EXISTS {TABLE}")
+
+
+if __name__ == '__main__':
+    main()
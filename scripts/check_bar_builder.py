@@ -0,0 +1,196 @@
+"""
+Bar Builder Check
+- Verspäteter Tick: ein Tick für einen bereits geschriebenen 1m-Bar (und
+  dessen 5m-Parent) ändert high/low/volume/tick_count, aber nicht
+  close/bid_close/ask_close - auch wenn er im selben Flush wie der
+  Abschluss des Bars ankommt
+- Neustart: Stop nach der Hälfte der Ticks, neuer BarBuilder, die Tick
+  Source liefert das Lookback-Fenster erneut; die Bars müssen einem Lauf
+  ohne Unterbrechung entsprechen (kein doppeltes Aufaddieren)
+- Nutzt das Symbol BENCH in bars_1m/bars_5m (push Modus) und räumt danach auf
+
+Benötigt eine erreichbare lokale PostgreSQL Datenbank (config.json -> database.local)
+
+Usage:
+    python scripts/check_bar_builder.py
+    python scripts/check_bar_builder.py --ticks 20000
+"""
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import argparse
+
+import numpy as np
+
+from src.data.bar_builder import BarBuilder
+from src.data.bar_watermarks import BarWatermarks, WATERMARK_TABLE
+from src.data.database_manager import get_database
+from src.data.tick_source import TICK_DTYPE
+
+SYMBOL = 'BENCH'
+TIMEFRAMES = ['1m', '5m']
+COLUMNS = ('timestamp', 'open', 'high', 'low', 'close', 'volume', 'tick_count',
+           'bid_close', 'ask_close', 'close_time_msc')
+
+# Beginn der synthetischen Ticks (Montag 00:00 UTC, auf 5m ausgerichtet)
+START_MSC = 1760313600000
+
+
+def synthetic_ticks(count, seed=42):
+    """Ticks wie von der Tick Source (Random Walk, 50-400ms Abstand)"""
+    rng = np.random.default_rng(seed)
+    ticks = np.zeros(count, dtype=TICK_DTYPE)
+    ticks['time_msc'] = START_MSC + np.cumsum(rng.integers(50, 400, count))
+    ticks['time'] = ticks['time_msc'] // 1000
+    ticks['bid'] = 1.1 + np.cumsum(rng.normal(0, 1e-5, count))
+    ticks['ask'] = ticks['bid'] + 1e-4
+    ticks['volume'] = rng.integers(1, 5, count)
+    return ticks
+
+
+def reset(db):
+    """Bars und Watermark von BENCH löschen (Watermark-Tabelle wird bei Bedarf angelegt)"""
+    watermarks = BarWatermarks(db, 'bar_builder')
+    watermarks.ensure_table()
+    for timeframe in TIMEFRAMES:
+        db.execute(f"DELETE FROM bars_{timeframe} WHERE symbol = %s", (SYMBOL,))
+    db.execute(f"DELETE FROM {WATERMARK_TABLE} WHERE stream = %s AND symbol = %s", (watermarks.stream, SYMBOL))
+
+
+def new_builder(db_type):
+    """BarBuilder im push Modus, Watermark gelesen wie in start()"""
+    builder = BarBuilder(symbols=[SYMBOL], timeframes=TIMEFRAMES, db_type=db_type, mode='push')
+    builder._ensure_columns()
+    builder._restore_watermarks()
+    return builder
+
+
+def stored_bars(db, timeframe):
+    """Bars von BENCH (timestamp -> Dictionary)"""
+    rows = db.fetch_all_dict(f"""
+        SELECT {', '.join(COLUMNS)}
+        FROM bars_{timeframe}
+        WHERE symbol = %s
+        ORDER BY timestamp
+    """, (SYMBOL,))
+    return {row['timestamp']: row for row in rows}
+
+
+def late_tick(ticks, index, price):
+    """Kopie von ticks[index], 1ms später, mit anderem Preis"""
+    tick = ticks[index:index + 1].copy()
+    tick['time_msc'] += 1
+    tick['bid'] = price
+    tick['ask'] = price + 1e-4
+    tick['volume'] = 7
+    return tick
+
+
+def check_late(db, db_type, ticks, same_flush):
+    """Verspäteter Tick mit neuem Hoch im ersten 1m-Bar"""
+    reset(db)
+    builder = new_builder(db_type)
+    first_minute = np.flatnonzero(ticks['time_msc'] < START_MSC + 60000)
+    second_bar = np.flatnonzero(ticks['time_msc'] >= START_MSC + 60000)[0]
+
+    # Erster 1m-Bar abgeschlossen (erster Tick des zweiten Bars)
+    builder.on_ticks(SYMBOL, ticks[:second_bar + 1])
+    if not same_flush:
+        builder._flush()
+    before = {tf: stored_bars(db, tf) for tf in TIMEFRAMES}
+
+    # Verspäteter Tick: zeitlich vor dem letzten Tick des Bars, Preis über allen
+    price = float(ticks['bid'][:second_bar + 1].max()) + 0.01
+    late = late_tick(ticks, first_minute[-2], price)
+    builder.on_ticks(SYMBOL, late)
+    builder._flush(include_open=True)
+    after = {tf: stored_bars(db, tf) for tf in TIMEFRAMES}
+
+    # Erwartung: Bars ohne verspäteten Tick, nur high/volume/tick_count ändern sich
+    reset(db)
+    reference = new_builder(db_type)
+    reference.on_ticks(SYMBOL, ticks[:second_bar + 1])
+    reference._flush(include_open=True)
+    expected = {tf: stored_bars(db, tf) for tf in TIMEFRAMES}
+
+    ok = True
+    for timeframe in TIMEFRAMES:
+        bar = min(after[timeframe])
+        got, want = after[timeframe][bar], expected[timeframe][bar]
+        same_close = all(float(got[col]) == float(want[col]) for col in ('close', 'bid_close', 'ask_close'))
+        corrected = (
+            abs(float(got['high']) - price) < 1e-5
+            and int(got['volume']) == int(want['volume']) + 7
+            and int(got['tick_count']) == int(want['tick_count']) + 1
+        )
+        if not same_flush and timeframe == '1m':
+            corrected &= bar in before[timeframe]
+        passed = same_close and corrected
+        ok &= passed
+        print(f"  late tick ({'same flush' if same_flush else 'after write'}) {timeframe:<3} "
+              f"close kept {'OK' if same_close else 'FAIL'}, high/volume/tick_count "
+              f"{'OK' if corrected else 'FAIL'}")
+    return ok
+
+
+def check_restart(db, db_type, ticks, lookback):
+    """Stop + Neustart gegen einen Lauf ohne Unterbrechung"""
+    reset(db)
+    builder = new_builder(db_type)
+    builder.on_ticks(SYMBOL, ticks)
+    builder._flush(include_open=True)
+    expected = {tf: stored_bars(db, tf) for tf in TIMEFRAMES}
+
+    reset(db)
+    half = len(ticks) // 2
+    first = new_builder(db_type)
+    first.on_ticks(SYMBOL, ticks[:half])
+    first._flush()
+    first._flush(include_open=True)
+
+    # Tick Source nach Neustart: ab lookback Ticks vor dem letzten geschriebenen
+    second = new_builder(db_type)
+    second.on_ticks(SYMBOL, ticks[max(half - lookback, 0):])
+    second._flush(include_open=True)
+    got = {tf: stored_bars(db, tf) for tf in TIMEFRAMES}
+
+    ok = True
+    for timeframe in TIMEFRAMES:
+        columns = ('open', 'high', 'low', 'close', 'volume', 'tick_count')
+        mismatched = [
+            ts for ts in expected[timeframe]
+            if ts not in got[timeframe]
+            or any(float(got[timeframe][ts][col]) != float(expected[timeframe][ts][col]) for col in columns)
+        ]
+        passed = not mismatched and len(got[timeframe]) == len(expected[timeframe])
+        ok &= passed
+        print(f"  restart {timeframe:<3} {len(got[timeframe])} bars, {len(mismatched)} differ  "
+              f"{'OK' if passed else 'FAIL'}")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Check late-tick corrections and restarts of the BarBuilder')
+    parser.add_argument('--db', choices=['local', 'remote'], default='local', help='Database')
+    parser.add_argument('--ticks', type=int, default=5000, help='Synthetic ticks')
+    parser.add_argument('--lookback', type=int, default=300, help='Ticks delivered again after the restart')
+    args = parser.parse_args()
+
+    db = get_database(args.db)
+    ticks = synthetic_ticks(args.ticks)
+
+    print(f"BarBuilder check ({SYMBOL}, {args.ticks:,} ticks, {', '.join(TIMEFRAMES)})")
+    try:
+        ok = check_late(db, args.db, ticks, same_flush=False)
+        ok &= check_late(db, args.db, ticks, same_flush=True)
+        ok &= check_restart(db, args.db, ticks, args.lookback)
+    finally:
+        reset(db)
+
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == '__main__':
+    main()
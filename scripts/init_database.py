@@ -10,6 +10,9 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from src.data.database_manager import get_database
+from src.data.tick_partitions import TickPartitionManager, partitioning_enabled
+from src.data.tick_compact import CompactTickStore, compact_enabled
+from src.data.bar_builder import microstructure_columns_sql
 from src.utils.logger import get_logger, log_exception
 
 logger = get_logger('init_database')
@@ -375,6 +378,23 @@ def init_database(db_type: str = 'local'):
                 log_exception(logger, e, f"Failed to create table {table_name}")
                 raise
 
+        # Mikrostruktur-Spalten der Bar-Tabellen (auch für bestehende Tabellen)
+        for table_name in SCHEMA_DEFINITIONS:
+            if table_name.startswith('bars_'):
+                db.execute(microstructure_columns_sql(table_name))
+        logger.info("✓ Bar microstructure columns verified")
+
+        # Partitionierte Tick-Tabellen (data.tick_partitioning / data.tick_compact)
+        if partitioning_enabled():
+            logger.info("Creating partitioned table: ticks")
+            dropped = TickPartitionManager(db).maintain()
+            logger.info(f"✓ Tick partitions ready ({len(dropped)} expired partitions dropped)")
+
+        if compact_enabled():
+            logger.info("Creating compact tick tables: ticks_compact, tick_indicators")
+            dropped = CompactTickStore(db).maintain()
+            logger.info(f"✓ Compact tick partitions ready ({len(dropped)} expired partitions dropped)")
+
         # List all tables
         logger.info("\n=== Database Tables ===")
         tables = db.list_tables()
@@ -0,0 +1,79 @@
+"""
+Feature Store Materialisierung
+- Schreibt die Features eines Feature Sets pro Symbol/Timeframe offline als
+  Parquet (siehe src/ml/feature_store.py), inkrementell ab der letzten
+  gespeicherten Bar
+- --loop: läuft als Dienst (hält die Offline-Features für Training aktuell)
+
+Usage:
+    python scripts/materialize_features.py                              # indicators, alle Symbols
+    python scripts/materialize_features.py --feature-set bar_engineered --timeframes 1m
+    python scripts/materialize_features.py --start 2025-01-01           # ab Datum neu berechnen
+    python scripts/materialize_features.py --list                       # Feature Sets anzeigen
+"""
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import argparse
+import time
+from datetime import datetime
+
+from src.utils.logger import get_logger, log_exception
+from src.utils.config_loader import get_config
+from src.data.database_manager import get_database
+from src.ml.feature_store import FEATURE_SETS, FeatureStore, get_feature_set
+
+logger = get_logger('materialize_features')
+
+
+def print_feature_sets():
+    """Registrierte Feature Sets ausgeben"""
+    print(f"{'feature set':<22} {'source':<10} {'lookback':>8} {'features':>9}")
+    for key in sorted(FEATURE_SETS):
+        fs = FEATURE_SETS[key]
+        print(f"{key:<22} {fs.source or '-':<10} {fs.lookback:>8} {len(fs.feature_columns):>9}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Materialize feature sets to the offline feature store')
+    parser.add_argument('--db', choices=['local', 'remote'], default='local', help='Database')
+    parser.add_argument('--feature-set', default='indicators', help='Feature set (name or name:v<version>)')
+    parser.add_argument('--symbols', nargs='+', help='Symbols (default: config)')
+    parser.add_argument('--timeframes', nargs='+', default=['1m', '5m', '15m'], help='Timeframes')
+    parser.add_argument('--start', help='Recompute from this date (YYYY-MM-DD)')
+    parser.add_argument('--loop', type=int, metavar='SECONDS', help='Run every SECONDS')
+    parser.add_argument('--list', action='store_true', help='Print feature sets and exit')
+    args = parser.parse_args()
+
+    if args.list:
+        print_feature_sets()
+        return
+
+    feature_set = get_feature_set(args.feature_set)
+    store = FeatureStore(get_database(args.db))
+    symbols = args.symbols or get_config().get_symbols()
+    start = datetime.strptime(args.start, '%Y-%m-%d') if args.start else None
+
+    logger.info(f"Materializing {feature_set.key} to {store.path} "
+                f"({len(symbols)} symbols, {', '.join(args.timeframes)})")
+
+    while True:
+        rows = 0
+        for symbol in symbols:
+            for timeframe in args.timeframes:
+                try:
+                    rows += store.materialize(feature_set, symbol, timeframe, start=start)
+                except Exception as e:
+                    log_exception(logger, e, f"Materializing {feature_set.key} {symbol} {timeframe} failed")
+        logger.info(f"{feature_set.key}: {rows} rows stored")
+
+        if not args.loop:
+            break
+        start = None
+        time.sleep(args.loop)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,287 @@
+"""
+Migration: Tick-Tabellen -> kompaktes Format (ticks_compact)
+- Quellen: V1 Tagestabellen (ticks_YYYYMMDD), V2 Tabellen (ticks_<symbol>_YYYYMMDD)
+  und die partitionierte Tabelle `ticks`
+- Kopiert serverseitig (INSERT ... SELECT), pro Quelle eine Transaktion;
+  vorhandene kompakte Rows mit denselben (symbol_id, time_msc) wie die Quelle
+  werden vorher gelöscht (idempotent, andere Quellen desselben Tages bleiben)
+- Indikatoren optional in tick_indicators (eine Row pro symbol/time_msc,
+  ON CONFLICT: die zuletzt migrierte Quelle gewinnt)
+- --report: Bytes/Row und 1m-Aggregationszeit Quelle vs. kompakt für einen Tag
+
+Quelltabellen werden nicht verändert.
+
+Usage:
+    python scripts/migrate_ticks_compact.py --day 20251014
+    python scripts/migrate_ticks_compact.py --table ticks_eurusd_20251014 --with-indicators
+    python scripts/migrate_ticks_compact.py --day 20251014 --symbol EURUSD --report
+"""
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import argparse
+import time
+from datetime import date, datetime, timedelta
+
+from src.utils.logger import get_logger
+from src.utils.config_loader import get_config
+from src.data.database_manager import get_database
+from src.data.tick_partitions import TICKS_TABLE, INDICATOR_COLUMNS
+from src.data.tick_compact import (
+    CompactTickStore, COMPACT_TABLE, INDICATOR_TABLE, SYMBOLS_TABLE
+)
+
+logger = get_logger('migrate_ticks_compact')
+
+# Wiederholungen pro Aggregations-Query (bester Wert zählt)
+REPORT_RUNS = 3
+
+
+class TickSource:
+    """Beschreibt eine Quelltabelle (Layout wird aus den Spalten erkannt)"""
+
+    def __init__(self, db, table, day=None):
+        self.table = table
+        self.day = day
+        columns = {
+            name for (name,) in db.fetch_all(
+                "SELECT column_name FROM information_schema.columns WHERE table_name = %s", (table,)
+            )
+        }
+        if not columns:
+            raise ValueError(f"Table not found: {table}")
+
+        self.has_indicators = 'rsi14' in columns
+        if 'mt5_ts' in columns:
+            # V2: ein Symbol pro Tabelle (ticks_<symbol>_YYYYMMDD)
+            self.symbol = table.split('_')[1].upper()
+            self.time_column = 't.mt5_ts'
+            self.time_expr = "(EXTRACT(EPOCH FROM t.mt5_ts) * 1000)::bigint"
+        elif 'symbol' in columns:
+            # V1 bzw. `ticks`: Symbol-Spalte, time_msc meist vorhanden
+            self.symbol = None
+            self.time_column = 't.timestamp'
+            self.time_expr = "COALESCE(t.time_msc, (EXTRACT(EPOCH FROM t.timestamp::timestamptz) * 1000)::bigint)"
+        else:
+            raise ValueError(f"Unknown tick layout: {table}")
+
+        # `ticks` enthält alle Tage - auf den Tag filtern (Partition Pruning)
+        self.where = ''
+        self.params = ()
+        if table == TICKS_TABLE:
+            if day is None:
+                raise ValueError("--day required for table ticks")
+            self.where = "WHERE t.timestamp >= %s AND t.timestamp < %s"
+            self.params = (day, day + timedelta(days=1))
+
+    def symbol_join(self):
+        """JOIN auf tick_symbols (+ Parameter)"""
+        if self.symbol:
+            return f"JOIN {SYMBOLS_TABLE} s ON s.symbol = %s", (self.symbol,)
+        return f"JOIN {SYMBOLS_TABLE} s ON s.symbol = t.symbol", ()
+
+
+def discover_sources(db, day):
+    """Alle Quelltabellen eines Tages"""
+    suffix = day.strftime('%Y%m%d')
+    candidates = [f"ticks_{suffix}"]
+    candidates += [f"ticks_{symbol.lower()}_{suffix}" for symbol in get_config().get_symbols()]
+    sources = [table for table in candidates if db.table_exists(table)]
+    if db.table_exists(TICKS_TABLE):
+        sources.append(TICKS_TABLE)
+    return sources
+
+
+def migrate_source(db, store, source, with_indicators):
+    """
+    Kopiert eine Quelltabelle in ticks_compact (+ tick_indicators)
+
+    Returns:
+        Anzahl kopierter Ticks
+    """
+    # Symbols registrieren
+    if source.symbol:
+        symbols = [source.symbol]
+    else:
+        symbols = [row[0] for row in db.fetch_all(
+            f"SELECT DISTINCT t.symbol FROM {source.table} t {source.where}", source.params
+        )]
+    if not symbols:
+        return 0
+    for symbol in symbols:
+        store.register_symbol(symbol)
+
+    # Zeitraum -> Partitionen anlegen
+    first, last = db.fetch_one(
+        f"SELECT MIN({source.time_expr}), MAX({source.time_expr}) FROM {source.table} t {source.where}",
+        source.params
+    )
+    if first is None:
+        return 0
+    day = date.fromtimestamp(first / 1000)
+    while day <= date.fromtimestamp(last / 1000):
+        store.ensure_partition(day)
+        day += timedelta(days=1)
+
+    join_sql, join_params = source.symbol_join()
+    insert_sql = f"""
+        INSERT INTO {COMPACT_TABLE} (time_msc, symbol_id, bid, ask, volume)
+        SELECT
+            {source.time_expr},
+            s.symbol_id,
+            round(t.bid * power(10, s.digits))::integer,
+            round(t.ask * power(10, s.digits))::integer,
+            COALESCE(t.volume, 0)
+        FROM {source.table} t
+        {join_sql}
+        {source.where}
+    """
+
+    # Nur Keys dieser Quelle ersetzen: ein zweiter Lauf ersetzt die eigenen
+    # Rows, Rows anderer Quellen im selben Zeitraum bleiben erhalten
+    delete_sql = f"""
+        DELETE FROM {COMPACT_TABLE} c
+        USING (
+            SELECT DISTINCT s.symbol_id, {source.time_expr} AS time_msc
+            FROM {source.table} t
+            {join_sql}
+            {source.where}
+        ) k
+        WHERE c.symbol_id = k.symbol_id
+          AND c.time_msc = k.time_msc
+          AND c.time_msc BETWEEN %s AND %s
+    """
+
+    with db.get_cursor() as cur:
+        cur.execute(delete_sql, join_params + source.params + (first, last))
+        cur.execute(insert_sql, join_params + source.params)
+        copied = cur.rowcount
+
+        if with_indicators and source.has_indicators:
+            indicator_cols = ', '.join(INDICATOR_COLUMNS)
+            indicator_select = ', '.join(f"t.{col}" for col in INDICATOR_COLUMNS)
+            indicator_update = ', '.join(f"{col} = EXCLUDED.{col}" for col in INDICATOR_COLUMNS)
+            # Eine Row pro (symbol_id, time_msc): zuletzt geschriebener Tick gewinnt
+            cur.execute(f"""
+                INSERT INTO {INDICATOR_TABLE} (time_msc, symbol_id, {indicator_cols})
+                SELECT DISTINCT ON (s.symbol_id, {source.time_expr})
+                    {source.time_expr}, s.symbol_id, {indicator_select}
+                FROM {source.table} t
+                {join_sql}
+                {source.where}
+                ORDER BY s.symbol_id, {source.time_expr}, t.ctid DESC
+                ON CONFLICT (symbol_id, time_msc) DO UPDATE SET {indicator_update}
+            """, join_params + source.params)
+
+    logger.info(f"✓ {source.table}: {copied} ticks ({', '.join(symbols)})")
+    return copied
+
+
+def best_runtime(db, query, params):
+    """Beste Laufzeit (Sekunden) aus REPORT_RUNS Durchläufen"""
+    best = None
+    for _ in range(REPORT_RUNS):
+        started = time.perf_counter()
+        db.fetch_all(query, params)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def relation_stats(db, relation, where='', params=()):
+    """(Rows, Heap-Bytes, Bytes inkl. Indizes)"""
+    rows = db.fetch_one(f"SELECT COUNT(*) FROM {relation} t {where}", params)[0]
+    heap, total = db.fetch_one(
+        "SELECT pg_relation_size(%s), pg_total_relation_size(%s)", (relation, relation)
+    )
+    return rows, heap, total
+
+
+def report(db, store, day, symbol):
+    """Bytes/Row und 1m-Aggregation für einen Tag und ein Symbol"""
+    suffix = day.strftime('%Y%m%d')
+    symbol_id, _ = store.register_symbol(symbol)
+    start_msc, end_msc = store.day_bounds_msc(day)
+
+    # Quelle: V2 Tabelle, sonst V1 Tagestabelle, sonst Partition von `ticks`
+    if db.table_exists(f"ticks_{symbol.lower()}_{suffix}"):
+        relation = f"ticks_{symbol.lower()}_{suffix}"
+        where, params = '', ()
+        source_agg = f"""
+            SELECT date_trunc('minute', t.mt5_ts), MIN(t.bid), MAX(t.bid), SUM(t.volume), COUNT(*)
+            FROM {relation} t GROUP BY 1
+        """
+    else:
+        relation = f"ticks_{suffix}" if db.table_exists(f"ticks_{suffix}") else f"{TICKS_TABLE}_p_{suffix}"
+        where, params = "WHERE t.symbol = %s", (symbol,)
+        source_agg = f"""
+            SELECT date_trunc('minute', t.timestamp), MIN(t.bid), MAX(t.bid), SUM(t.volume), COUNT(*)
+            FROM {relation} t {where} GROUP BY 1
+        """
+
+    compact_relation = f"{COMPACT_TABLE}_p_{suffix}"
+    compact_where = "WHERE t.symbol_id = %s AND t.time_msc >= %s AND t.time_msc < %s"
+    compact_params = (symbol_id, start_msc, end_msc)
+    compact_agg = f"""
+        SELECT t.time_msc / 60000, MIN(t.bid), MAX(t.bid), SUM(t.volume), COUNT(*)
+        FROM {COMPACT_TABLE} t {compact_where} GROUP BY 1
+    """
+
+    source_rows, source_heap, source_total = relation_stats(db, relation, where, params)
+    compact_rows, compact_heap, compact_total = relation_stats(db, compact_relation)
+    source_time = best_runtime(db, source_agg, params)
+    compact_time = best_runtime(db, compact_agg, compact_params)
+
+    # Tabellen mit mehreren Symbols: Bytes anteilig über alle Rows der Tabelle
+    source_all = db.fetch_one(f"SELECT COUNT(*) FROM {relation}")[0] or 1
+    compact_all = compact_rows or 1
+
+    print(f"\n=== {symbol} {suffix} ===")
+    print(f"{'':<10} {'table':<28} {'rows':>10} {'heap B/row':>11} {'total B/row':>12} {'1m agg':>9}")
+    print(f"{'source':<10} {relation:<28} {source_rows:>10} {source_heap / source_all:>11.1f} "
+          f"{source_total / source_all:>12.1f} {source_time * 1000:>7.1f}ms")
+    print(f"{'compact':<10} {compact_relation:<28} {compact_rows:>10} {compact_heap / compact_all:>11.1f} "
+          f"{compact_total / compact_all:>12.1f} {compact_time * 1000:>7.1f}ms")
+    if compact_time:
+        print(f"Aggregation speedup: {source_time / compact_time:.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Migrate tick tables to the compact format')
+    parser.add_argument('--db', choices=['local', 'remote'], default='local', help='Database')
+    parser.add_argument('--day', help='Migrate all tick tables of this day (YYYYMMDD)')
+    parser.add_argument('--table', action='append', default=[], help='Source table (repeatable)')
+    parser.add_argument('--with-indicators', action='store_true', help='Copy indicators into tick_indicators')
+    parser.add_argument('--report', action='store_true', help='Only print bytes/row and aggregation timing')
+    parser.add_argument('--symbol', default='EURUSD', help='Symbol for --report')
+    args = parser.parse_args()
+
+    if not args.day and not args.table:
+        parser.error('--day or --table required')
+
+    day = datetime.strptime(args.day, '%Y%m%d').date() if args.day else None
+    db = get_database(args.db)
+    store = CompactTickStore(db)
+    store.ensure_parent()
+
+    if args.report:
+        if day is None:
+            parser.error('--report requires --day')
+        report(db, store, day, args.symbol)
+        return
+
+    tables = args.table or discover_sources(db, day)
+    total = 0
+    for table in tables:
+        try:
+            total += migrate_source(db, store, TickSource(db, table, day), args.with_indicators)
+        except Exception as e:
+            logger.error(f"Migration of {table} failed: {e}")
+
+    logger.info(f"Migrated {total} ticks from {len(tables)} tables")
+
+
+if __name__ == '__main__':
+    main()
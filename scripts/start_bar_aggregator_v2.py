@@ -1,21 +1,86 @@
 """
 Bar Aggregator V2
-- Reads from per-symbol tick tables (ticks_eurusd_20251014)
-- Creates OHLC bars for multiple timeframes
-- Writes to per-symbol bar tables (bars_eurusd)
+- Reads from per-symbol tick tables (ticks_eurusd_20251014) or, with
+  data.tick_partitioning.enabled, from the partitioned `ticks` table
+  (data.tick_compact.enabled: from the ticks_compact_ind_v view)
+- Ticks are read page by page (data.bar_aggregator.page_size) from the
+  position in tick_watermarks (per-day tables: by id, partitioned layouts:
+  keyset on the time key) until caught up, also across day tables
+- Each page is aggregated to 1m bars, merged with the stored 1m bars, and
+  only the 5m, 15m, 1h, 4h and 1d bars containing a touched minute are
+  recomputed from them (see src/data/bar_resampler.py)
+- Bars, tick position and finalized watermark (bar_watermarks, stream
+  'bar_aggregator_v2') are written in one transaction, so every tick is
+  aggregated exactly once, including after a crash or restart
+- Aggregator lag (seconds since the newest aggregated tick) is logged per
+  symbol and warned above data.bar_aggregator.lag_warning_seconds
+- database.async.enabled: symbols are processed concurrently over the
+  AsyncDatabaseManager; otherwise the WorkScheduler (data.scheduler) runs
+  them on a thread pool with a per-cycle deadline and skips a symbol whose
+  previous run is still going
+- data.bar_aggregator.mode = "database": no OHLC math in Python. Each page
+  only yields the window of touched minutes; bar_summaries are refreshed for
+  that window in SQL (1m from the tick table, parents cascaded, see
+  src/data/bar_summaries.py) and the bar table is written from them, in the
+  same transaction as the watermarks
+- Bars also carry microstructure columns from the same pass over the ticks
+  (bid/ask OHLC, spread mean/max, mid mean and volume weighted, tick
+  interval mean/max; MICROSTRUCTURE_COLUMNS in src/data/bar_resampler.py),
+  so training never has to read tick tables
+- Each bar also stores the time of its first and last tick (open_time_msc,
+  close_time_msc). When a page is merged into stored 1m bars, open and close
+  come from the earliest and latest tick, so a late tick (older mt5_ts,
+  newer id) corrects high/low/volume but keeps open and close
 """
 
 import sys
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-import MetaTrader5 as mt5
+# MT5 is not needed for aggregation (only initialized for consistency)
+try:
+    import MetaTrader5 as mt5
+except ImportError:
+    mt5 = None
+
+import numpy as np
+import pandas as pd
+
 from src.utils.logger import get_logger
 from src.utils.config_loader import get_config
 from src.data.database_manager import get_database
+from src.data.async_database_manager import async_enabled
+from src.data.tick_partitions import TICKS_TABLE, partitioning_enabled
+from src.data.tick_compact import COMPACT_INDICATOR_VIEW, compact_enabled, to_msc
+from src.data.bar_resampler import (
+    TIMEFRAME_SECONDS, MICROSTRUCTURE_COLUMNS, TIME_COLUMNS, resample_ticks, cascade_bars, merge_bars
+)
+from src.data.bar_watermarks import BarWatermarks, TickWatermarks
+from src.data.bar_summaries import BarSummaries, summaries_enabled
+from src.utils.work_scheduler import WorkScheduler, WorkUnit, scheduler_enabled
+import asyncio
+import threading
 import time
-from datetime import datetime, timedelta, date
-import pandas as pd
+from functools import partial
+from datetime import datetime, timedelta, date, timezone
+
+# Tick columns as selected by _tick_query
+TICK_COLUMNS = ('timestamp', 'bid', 'ask', 'volume', 'rsi14', 'macd_main', 'bb_upper', 'bb_lower', 'atr14')
+INDICATOR_COLUMNS = TICK_COLUMNS[4:]
+
+# Bar table columns in write order
+BAR_COLUMNS = (
+    ('timestamp', 'timeframe', 'open', 'high', 'low', 'close', 'volume', 'tick_count')
+    + INDICATOR_COLUMNS + tuple(MICROSTRUCTURE_COLUMNS) + TIME_COLUMNS
+)
+
+# Base timeframe built from ticks, all others are derived from it
+BASE_TIMEFRAME = '1m'
+
+# Bar table upsert: rows replace existing bars
+BAR_CONFLICT_SQL = """
+            ON CONFLICT (timestamp, timeframe) DO UPDATE SET
+                """ + ',\n                '.join(f"{name} = EXCLUDED.{name}" for name in BAR_COLUMNS[2:]) + "\n"
 
 logger = get_logger('BarAggregatorV2')
 
@@ -25,13 +90,36 @@ class BarAggregator:
     def __init__(self):
         self.config = get_config()
         self.db = get_database('local')
+        self.async_db = get_database('local', async_=True) if async_enabled() else None
         self.symbols = self.config.get_symbols()
-        self.timeframes = ['1m', '5m', '15m', '1h', '4h']
-        self.last_processed = {}  # symbol -> last timestamp processed
-
-        # Create bar tables
+        self.timeframes = ['1m', '5m', '15m', '1h', '4h', '1d']
+        self.compact = compact_enabled()
+        self.partitioned = self.compact or partitioning_enabled()
+
+        aggregator_config = self.config.get('data.bar_aggregator', {}) or {}
+        self.page_size = aggregator_config.get('page_size', 10000)
+        self.lag_warning = aggregator_config.get('lag_warning_seconds', 300)
+
+        self.positions = {}  # symbol -> tick watermark (tick_table, last_id, last_ts, last_offset)
+        self.rebuild_from = {}  # symbol -> 1m bucket re-read from ticks after seeding from the last bar
+        self.seeded = set()  # symbols whose position is not at a tick yet (seeded, no page done)
+        self.lag = {}  # symbol -> aggregator lag in seconds
+        self.watermarks = BarWatermarks(self.db, 'bar_aggregator_v2')
+        self.tick_watermarks = TickWatermarks(self.db, 'bar_aggregator_v2')
+        self.stats = {'pages': 0, 'ticks': 0, 'bars_written': 0, 'late_bars': 0}
+        self._stats_lock = threading.Lock()  # symbols run on the scheduler's threads
+
+        # In-database aggregation (bar_summaries)
+        self.summaries = BarSummaries(self.db, self.timeframes, INDICATOR_COLUMNS) if summaries_enabled() else None
+        self.summary_seeded = set()  # symbols whose summaries were rebuilt for the current day
+
+        # Create bar and watermark tables
         for symbol in self.symbols:
             self._ensure_bar_table(symbol)
+        self.watermarks.ensure_table()
+        self.tick_watermarks.ensure_table()
+        if self.summaries is not None:
+            self.summaries.ensure_table()
 
     def _ensure_bar_table(self, symbol):
         """Create bar table for symbol if not exists"""
@@ -61,7 +149,12 @@ class BarAggregator:
 
             CREATE INDEX IF NOT EXISTS idx_{table_name}_ts
             ON {table_name} (timestamp DESC, timeframe);
-        """
+        """ + ''.join(
+            # Microstructure and tick time columns (also added to existing tables)
+            f"\n            ALTER TABLE {table_name} ADD COLUMN IF NOT EXISTS {name} {sql_type};"
+            for name, sql_type in [(name, 'DOUBLE PRECISION') for name in MICROSTRUCTURE_COLUMNS]
+            + [(name, 'BIGINT') for name in TIME_COLUMNS]
+        )
 
         try:
             self.db.execute(sql)
@@ -69,205 +162,643 @@ class BarAggregator:
         except Exception as e:
             logger.error(f"Error creating bar table for {symbol}: {e}")
 
-    def _get_tick_table_name(self, symbol):
-        """Get today's tick table name"""
-        return f"ticks_{symbol.lower()}_{date.today().strftime('%Y%m%d')}"
-
-    def _round_timestamp_to_timeframe(self, ts, timeframe):
-        """Round timestamp to timeframe boundary"""
-        if timeframe == '1m':
-            return ts.replace(second=0, microsecond=0)
-        elif timeframe == '5m':
-            minute = (ts.minute // 5) * 5
-            return ts.replace(minute=minute, second=0, microsecond=0)
-        elif timeframe == '15m':
-            minute = (ts.minute // 15) * 15
-            return ts.replace(minute=minute, second=0, microsecond=0)
-        elif timeframe == '1h':
-            return ts.replace(minute=0, second=0, microsecond=0)
-        elif timeframe == '4h':
-            hour = (ts.hour // 4) * 4
-            return ts.replace(hour=hour, minute=0, second=0, microsecond=0)
-        return ts
-
-    def _get_timeframe_seconds(self, timeframe):
-        """Get seconds for timeframe"""
-        if timeframe == '1m':
-            return 60
-        elif timeframe == '5m':
-            return 300
-        elif timeframe == '15m':
-            return 900
-        elif timeframe == '1h':
-            return 3600
-        elif timeframe == '4h':
-            return 14400
-        return 60
-
-    def aggregate_symbol(self, symbol):
-        """Aggregate ticks to bars for one symbol"""
-        tick_table = self._get_tick_table_name(symbol)
-        bar_table = f"bars_{symbol.lower()}"
-
-        # Check if tick table exists
-        check_sql = f"""
-            SELECT EXISTS (
-                SELECT FROM information_schema.tables
-                WHERE table_name = '{tick_table}'
-            )
+    def _tick_table(self, symbol, day=None):
+        """Tick source of a symbol (per-day table unless partitioned)"""
+        if self.compact:
+            return COMPACT_INDICATOR_VIEW
+        if self.partitioned:
+            return TICKS_TABLE
+        return f"ticks_{symbol.lower()}_{(day or date.today()).strftime('%Y%m%d')}"
+
+    def _tick_tables_sql(self, symbol):
+        """SQL + params listing the symbol's per-day tick tables"""
+        return """
+            SELECT table_name FROM information_schema.tables
+            WHERE table_name LIKE %s
+        """, (f"ticks\\_{symbol.lower()}\\_%",)
+
+    def _last_bar_sql(self, symbol):
+        """SQL for the last 1m bar timestamp of a symbol"""
+        return f"""
+            SELECT MAX(timestamp) FROM bars_{symbol.lower()} WHERE timeframe = '1m'
         """
 
-        exists = self.db.fetch_one(check_sql)
-        if not exists or not exists[0]:
-            logger.debug(f"Tick table {tick_table} does not exist yet")
-            return
+    def _seed_id_sql(self, table):
+        """SQL for the last tick id before a timestamp (first run on a per-day table)"""
+        return f"SELECT COALESCE(MAX(id), 0) FROM {table} WHERE mt5_ts < %s"
+
+    def _tick_query(self, symbol, position):
+        """
+        SQL + params for the next page of ticks after a position
 
-        # Get last processed timestamp for symbol
-        if symbol not in self.last_processed:
-            # Get last bar timestamp from DB
-            last_bar_sql = f"""
-                SELECT MAX(timestamp) FROM {bar_table} WHERE timeframe = '1m'
+        Rows are TICK_COLUMNS plus the key the position advances on (id,
+        timestamp or time_msc). Per-day tables are read by id, so ticks
+        inserted late (older mt5_ts, newer id) are still picked up.
+        """
+        select = f"""
+                    bid,
+                    ask,
+                    volume,
+                    {', '.join(INDICATOR_COLUMNS)}"""
+
+        if self.compact:
+            # Compact format: keyset on time_msc, ticks already read at that key are skipped
+            fetch_sql = f"""
+                SELECT
+                    timestamp,{select},
+                    time_msc
+                FROM {COMPACT_INDICATOR_VIEW}
+                WHERE symbol = %s
+                  AND time_msc >= %s
+                ORDER BY time_msc ASC
+                LIMIT %s OFFSET %s
+            """
+            params = (symbol, position['last_id'], self.page_size, position['last_offset'])
+        elif self.partitioned:
+            # Partition Pruning über symbol + timestamp, keyset on timestamp
+            fetch_sql = f"""
+                SELECT
+                    timestamp,{select},
+                    timestamp
+                FROM {TICKS_TABLE}
+                WHERE symbol = %s
+                  AND timestamp >= %s
+                ORDER BY timestamp ASC
+                LIMIT %s OFFSET %s
+            """
+            params = (symbol, position['last_ts'], self.page_size, position['last_offset'])
+        else:
+            fetch_sql = f"""
+                SELECT
+                    mt5_ts as timestamp,{select},
+                    id
+                FROM {position['tick_table']}
+                WHERE id > %s
+                ORDER BY id ASC
+                LIMIT %s
             """
-            result = self.db.fetch_one(last_bar_sql)
-            if result and result[0]:
-                self.last_processed[symbol] = result[0]
-            else:
-                # Start from 1 hour ago
-                self.last_processed[symbol] = datetime.now() - timedelta(hours=1)
-
-        # Get new ticks since last processed
-        fetch_sql = f"""
-            SELECT
-                mt5_ts as timestamp,
-                bid,
-                ask,
-                volume,
-                rsi14,
-                macd_main,
-                bb_upper,
-                bb_lower,
-                atr14
-            FROM {tick_table}
-            WHERE mt5_ts > %s
-            ORDER BY mt5_ts ASC
-            LIMIT 10000
+            params = (position['last_id'], self.page_size)
+
+        return fetch_sql, params
+
+    def _seed_position(self, symbol, last_bar):
         """
+        Start position for a symbol without tick watermark
 
-        ticks = self.db.fetch_all(fetch_sql, (self.last_processed[symbol],))
+        Resumes at the last 1m bar (rebuilt from its ticks) or 1 hour ago.
 
-        if not ticks or len(ticks) == 0:
-            return
+        Returns:
+            (position, seed timestamp)
+        """
+        seed = last_bar or datetime.now() - timedelta(hours=1)
+        position = {
+            'symbol': symbol,
+            'tick_table': self._tick_table(symbol),
+            'last_id': to_msc(seed) if self.compact else 0,
+            'last_ts': seed,
+            'last_offset': 0
+        }
+        self.seeded.add(symbol)
+        if last_bar:
+            self.rebuild_from[symbol] = self._wall_epoch([last_bar])[0][0]
+        return position, seed
+
+    def _next_position(self, position, ticks, last_timestamp):
+        """Position after a page of ticks (ordered by their key)"""
+        key = ticks[-1][-1]
+        previous_key = position['last_id'] if self.compact else position['last_ts']
+        position = dict(position, last_ts=self._later(position['last_ts'], last_timestamp))
+
+        if not self.partitioned:
+            position['last_id'] = key
+            return position
+
+        # Keyset: count ticks with the last key so the next page skips them
+        same = 0
+        for row in reversed(ticks):
+            if row[-1] != key:
+                break
+            same += 1
+        position['last_offset'] = same + (position['last_offset'] if key == previous_key else 0)
+        if self.compact:
+            position['last_id'] = key
+        else:
+            position['last_ts'] = key
+        return position
+
+    def _next_tick_table(self, position, tables):
+        """
+        Next per-day tick table after a drained one (catch-up across midnight)
 
-        logger.info(f"[{symbol}] Processing {len(ticks)} new ticks")
+        Args:
+            position: Drained position
+            tables: Existing per-day tick tables of the symbol
 
-        # Convert to DataFrame
-        df = pd.DataFrame(ticks, columns=[
-            'timestamp', 'bid', 'ask', 'volume',
-            'rsi14', 'macd_main', 'bb_upper', 'bb_lower', 'atr14'
-        ])
+        Returns:
+            New position or None (stay on the current table)
+        """
+        if self.partitioned:
+            return None
+        symbol = position['symbol']
+        today = date.today()
+        day = datetime.strptime(position['tick_table'].rsplit('_', 1)[1], '%Y%m%d').date()
+        while day < today:
+            day += timedelta(days=1)
+            table = self._tick_table(symbol, day)
+            if day == today or table in tables:
+                return dict(position, tick_table=table, last_id=0, last_offset=0)
+        return None
+
+    @staticmethod
+    def _wall_epoch(values):
+        """
+        Timestamps -> wall-clock epoch seconds
 
-        # Use mid price for OHLC
-        df['price'] = (df['bid'] + df['ask']) / 2
+        Buckets are floored in wall-clock time of the returned timestamps
+        (like the previous datetime.replace rounding), so 1h/4h/1d
+        boundaries follow the session time zone.
 
-        # Aggregate for each timeframe
-        for timeframe in self.timeframes:
-            bars = self._aggregate_timeframe(df, timeframe)
+        Returns:
+            (epoch array, time zone or None, DatetimeIndex)
+        """
+        first = values[0]
+        if getattr(first, 'tzinfo', None) is not None:
+            times = pd.DatetimeIndex(pd.to_datetime(list(values), utc=True)).tz_convert(first.tzinfo)
+        else:
+            times = pd.DatetimeIndex(list(values))
+        tz = times.tz
+        wall = times.tz_localize(None) if tz is not None else times
+        return wall.values.astype('datetime64[s]').astype(np.int64), tz, times
+
+    def _base_bars(self, ticks, previous=None):
+        """
+        Tick rows -> 1m bar arrays incl. microstructure columns (vectorized)
 
-            if len(bars) > 0:
-                self._write_bars(symbol, timeframe, bars)
+        Args:
+            ticks: Tick rows (TICK_COLUMNS first)
+            previous: Timestamp of the last tick before this page (tick interval
+                of the first tick), None if unknown
 
-        # Update last processed timestamp
-        self.last_processed[symbol] = df['timestamp'].max()
+        Returns:
+            (1m bar arrays, time zone, last tick timestamp)
+        """
+        columns = list(zip(*ticks))[:len(TICK_COLUMNS)]
+        epoch, tz, times = self._wall_epoch(columns[0])
 
-    def _aggregate_timeframe(self, df, timeframe):
-        """Aggregate ticks to bars for specific timeframe"""
-        df = df.copy()
+        bid = np.asarray(columns[1], dtype=np.float64)
+        ask = np.asarray(columns[2], dtype=np.float64)
+        volume = np.asarray([v or 0 for v in columns[3]], dtype=np.int64)
+        extras = {
+            name: np.asarray([np.nan if v is None else v for v in values], dtype=np.float64)
+            for name, values in zip(INDICATOR_COLUMNS, columns[4:])
+        }
 
-        # Round timestamps to timeframe boundaries
-        df['bar_time'] = df['timestamp'].apply(
-            lambda x: self._round_timestamp_to_timeframe(x, timeframe)
+        # Use mid price for OHLC
+        bars = resample_ticks(
+            epoch, (bid + ask) / 2, volume, [BASE_TIMEFRAME], extras,
+            bid=bid, ask=ask, time=times.values.astype('datetime64[us]').astype(np.int64) / 1e6,
+            previous_time=None if previous is None else pd.Timestamp(previous).value / 1e9
         )
+        return bars[BASE_TIMEFRAME], tz, times.max().to_pydatetime()
 
-        # Group by bar_time and aggregate
-        bars = df.groupby('bar_time').agg({
-            'price': ['first', 'max', 'min', 'last'],  # OHLC
-            'volume': 'sum',
-            'timestamp': 'count',  # tick_count
-            'rsi14': 'last',  # Last tick's indicators
-            'macd_main': 'last',
-            'bb_upper': 'last',
-            'bb_lower': 'last',
-            'atr14': 'last'
-        })
-
-        # Flatten column names
-        bars.columns = [
-            'open', 'high', 'low', 'close',
-            'volume', 'tick_count',
-            'rsi14', 'macd_main', 'bb_upper', 'bb_lower', 'atr14'
-        ]
+    def _resample(self, ticks):
+        """
+        Tick rows -> bar rows for all timeframes (1m from ticks, rest cascaded)
 
-        bars = bars.reset_index()
-        bars.rename(columns={'bar_time': 'timestamp'}, inplace=True)
+        Returns:
+            (bar rows, last tick timestamp)
+        """
+        base, tz, last_timestamp = self._base_bars(ticks)
+        bars = cascade_bars(base, BASE_TIMEFRAME, self.timeframes, INDICATOR_COLUMNS)
 
+        rows = []
+        for timeframe, arrays in bars.items():
+            rows.extend(self._bar_rows(timeframe, arrays, tz))
+        return rows, last_timestamp
+
+    def _parent_range(self, minutes, tz):
+        """
+        1m bar range needed to recompute the parents of the given 1m buckets
+
+        Args:
+            minutes: Touched 1m buckets (wall-clock epoch seconds)
+            tz: Time zone of the bar timestamps
+
+        Returns:
+            (start, end) timestamps, end exclusive
+        """
+        largest = max(TIMEFRAME_SECONDS[tf] for tf in self.timeframes)
+        start = int(minutes.min()) - int(minutes.min()) % largest
+        end = int(minutes.max()) - int(minutes.max()) % largest + largest
+
+        start, end = pd.to_datetime([start, end], unit='s')
+        if tz is not None:
+            start, end = start.tz_localize(tz), end.tz_localize(tz)
+        return start.to_pydatetime(), end.to_pydatetime()
+
+    def _parent_bars_sql(self, symbol):
+        """SQL for stored 1m bars in [start, end)"""
+        return f"""
+            SELECT {', '.join(BAR_COLUMNS[:1] + BAR_COLUMNS[2:])}
+            FROM bars_{symbol.lower()}
+            WHERE timeframe = '{BASE_TIMEFRAME}'
+              AND timestamp >= %s
+              AND timestamp < %s
+            ORDER BY timestamp ASC
+        """
+
+    def _stored_bars(self, base_rows):
+        """Stored 1m bar rows from _parent_bars_sql -> bar arrays"""
+        columns = list(zip(*base_rows))
+        epoch, _, _ = self._wall_epoch(columns[0])
+
+        def numeric(values):
+            return np.asarray([np.nan if v is None else v for v in values], dtype=np.float64)
+
+        bars = {
+            'bucket': epoch,
+            'open': numeric(columns[1]),
+            'high': numeric(columns[2]),
+            'low': numeric(columns[3]),
+            'close': numeric(columns[4]),
+            'volume': np.asarray([v or 0 for v in columns[5]], dtype=np.int64),
+            'tick_count': np.asarray([v or 0 for v in columns[6]], dtype=np.int64)
+        }
+        for name, values in zip(INDICATOR_COLUMNS + tuple(MICROSTRUCTURE_COLUMNS) + TIME_COLUMNS, columns[7:]):
+            bars[name] = numeric(values)
         return bars
 
-    def _write_bars(self, symbol, timeframe, bars_df):
-        """Write bars to database"""
-        bar_table = f"bars_{symbol.lower()}"
+    def _page_rows(self, symbol, base, base_rows, tz):
+        """
+        Bar rows to write for one page of ticks
 
-        sql = f"""
-            INSERT INTO {bar_table}
-            (timestamp, timeframe, open, high, low, close, volume, tick_count,
-             rsi14, macd_main, bb_upper, bb_lower, atr14)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-            ON CONFLICT (timestamp, timeframe) DO UPDATE SET
-                open = EXCLUDED.open,
-                high = EXCLUDED.high,
-                low = EXCLUDED.low,
-                close = EXCLUDED.close,
-                volume = EXCLUDED.volume,
-                tick_count = EXCLUDED.tick_count,
-                rsi14 = EXCLUDED.rsi14,
-                macd_main = EXCLUDED.macd_main,
-                bb_upper = EXCLUDED.bb_upper,
-                bb_lower = EXCLUDED.bb_lower,
-                atr14 = EXCLUDED.atr14
+        The page's 1m bars are merged into the stored 1m bars (open and
+        close by tick time, see merge_bars), then the parent bars (5m ... 1d)
+        containing a touched minute are recomputed.
+
+        Args:
+            symbol: Trading symbol
+            base: 1m bar arrays of the page (_base_bars)
+            base_rows: Stored 1m bars from _parent_bars_sql
+            tz: Time zone of the bar timestamps
+
+        Returns:
+            Bar rows (BAR_COLUMNS order): touched 1m bars + affected parents
+        """
+        minutes = base['bucket']
+        parts = [base]
+        if base_rows:
+            stored = self._stored_bars(base_rows)
+            rebuild_from = self.rebuild_from.get(symbol)
+            if rebuild_from is not None:
+                # First page after seeding from the last bar: its ticks are read again
+                keep = stored['bucket'] < rebuild_from
+                stored = {name: values[keep] for name, values in stored.items()}
+            parts.insert(0, stored)
+
+        merged = merge_bars(parts, INDICATOR_COLUMNS)
+        bars = cascade_bars(merged, BASE_TIMEFRAME, self.timeframes, INDICATOR_COLUMNS)
+
+        rows = []
+        for timeframe, arrays in bars.items():
+            seconds = TIMEFRAME_SECONDS[timeframe]
+            affected = np.isin(arrays['bucket'], np.unique(minutes - minutes % seconds))
+            rows.extend(self._bar_rows(timeframe, {k: v[affected] for k, v in arrays.items()}, tz))
+        return rows
+
+    def _previous_tick(self, symbol, position):
+        """Newest tick aggregated before the position (None right after seeding)"""
+        if symbol in self.seeded:
+            return None
+        return position['last_ts']
+
+    def _count_late(self, symbol, base):
+        """Count 1m bars touched behind the finalized watermark (late ticks)"""
+        finalized = self.positions[symbol]['last_ts']
+        if symbol in self.rebuild_from or finalized is None:
+            return 0
+        epoch, _, _ = self._wall_epoch([finalized])
+        late = int(np.count_nonzero(base['bucket'] < epoch[0] - epoch[0] % TIMEFRAME_SECONDS[BASE_TIMEFRAME]))
+        with self._stats_lock:
+            self.stats['late_bars'] += late
+        return late
+
+    @staticmethod
+    def _later(previous, current):
+        """Later of two timestamps (current if they cannot be compared)"""
+        if previous is None or (previous.tzinfo is None) != (current.tzinfo is None):
+            return current
+        return max(previous, current)
+
+    def _lag_seconds(self, symbol):
+        """Aggregator lag: seconds since the newest tick folded into the bars"""
+        last_ts = self.positions.get(symbol, {}).get('last_ts')
+        if last_ts is None:
+            return None
+        now = datetime.now(timezone.utc) if last_ts.tzinfo is not None else datetime.now()
+        return max((now - last_ts).total_seconds(), 0.0)
+
+    @staticmethod
+    def _bar_rows(timeframe, arrays, tz):
+        """Bar arrays of one timeframe -> parameter tuples in BAR_COLUMNS order"""
+        count = len(arrays['bucket'])
+        if count == 0:
+            return []
+
+        timestamps = pd.to_datetime(arrays['bucket'], unit='s')
+        if tz is not None:
+            timestamps = timestamps.tz_localize(tz)
+
+        def nullable(values):
+            return np.where(np.isnan(values), None, values).tolist()
+
+        def msc(values):
+            return [None if np.isnan(value) else int(round(value)) for value in values]
+
+        return list(zip(
+            timestamps.to_pydatetime().tolist(),
+            [timeframe] * count,
+            arrays['open'].tolist(),
+            arrays['high'].tolist(),
+            arrays['low'].tolist(),
+            arrays['close'].tolist(),
+            arrays['volume'].tolist(),
+            arrays['tick_count'].tolist(),
+            *(nullable(arrays[name]) for name in INDICATOR_COLUMNS),
+            *(nullable(arrays[name]) for name in MICROSTRUCTURE_COLUMNS),
+            *(msc(arrays[name]) for name in TIME_COLUMNS)
+        ))
+
+    def _start_position(self, symbol, watermark, last_bar):
+        """Position from the tick watermark, or seeded (see _seed_position)"""
+        if watermark is not None:
+            return dict(watermark, symbol=symbol), None
+        return self._seed_position(symbol, last_bar)
+
+    def _page_batches(self, symbol, bar_batches, position, values=None):
         """
+        Write batches for one page: bars, tick watermark, finalized watermark
 
-        values = []
-        for _, row in bars_df.iterrows():
-            values.append((
-                row['timestamp'],
-                timeframe,
-                float(row['open']),
-                float(row['high']),
-                float(row['low']),
-                float(row['close']),
-                int(row['volume']) if pd.notna(row['volume']) else 0,
-                int(row['tick_count']),
-                float(row['rsi14']) if pd.notna(row['rsi14']) else None,
-                float(row['macd_main']) if pd.notna(row['macd_main']) else None,
-                float(row['bb_upper']) if pd.notna(row['bb_upper']) else None,
-                float(row['bb_lower']) if pd.notna(row['bb_lower']) else None,
-                float(row['atr14']) if pd.notna(row['atr14']) else None
-            ))
+        Args:
+            bar_batches: Bar write batches (_python_page or _summary_page)
+            values: None for execute_values, else placeholder VALUES clauses
+                (bars, tick watermark, bar watermark, summary window) for execute_many
+        """
+        values = values or ('VALUES %s',) * 4
+        return bar_batches + [
+            self.tick_watermarks.save_batch([position], values[1]),
+            self.watermarks.advance_batch({symbol: position['last_ts']}, values[2])
+        ]
 
-        try:
-            self.db.execute_many(sql, values)
-            logger.info(f"[{symbol}] Wrote {len(values)} {timeframe} bars")
-        except Exception as e:
-            logger.error(f"[{symbol}] Error writing {timeframe} bars: {e}")
+    def _python_page(self, symbol, base, base_rows, tz, values=None):
+        """
+        Bar batches for one page aggregated in Python (merge + cascade)
+
+        Returns:
+            (bar batches, bars written)
+        """
+        values = values or ('VALUES %s',) * 4
+        rows = self._page_rows(symbol, base, base_rows, tz)
+        return [(self._bar_write_sql(symbol, values[0]), rows)], len(rows)
+
+    def _summary_window(self, symbol, minutes, tz):
+        """
+        Summary refresh window [start, end) for the touched 1m buckets
+
+        The first page of a symbol rebuilds the summaries from the start of
+        its largest bucket (e.g. the day), so parent bars never come from
+        partial summaries.
+
+        Returns:
+            (start, end) as time zone aware timestamps
+        """
+        start = int(minutes.min())
+        if symbol not in self.summary_seeded:
+            largest = max(TIMEFRAME_SECONDS[tf] for tf in self.timeframes)
+            start -= start % largest
+        end = int(minutes.max()) + TIMEFRAME_SECONDS[BASE_TIMEFRAME]
+
+        start, end = pd.to_datetime([start, end], unit='s')
+        if tz is not None:
+            start, end = start.tz_localize(tz), end.tz_localize(tz)
+        start, end = start.to_pydatetime(), end.to_pydatetime()
+        if start.tzinfo is None:
+            # Naive tick timestamps are local wall-clock time
+            start, end = start.astimezone(), end.astimezone()
+        return start, end
+
+    def _summary_source(self, position):
+        """Tick source arguments for BarSummaries.refresh_batches"""
+        if self.compact:
+            return dict(source=COMPACT_INDICATOR_VIEW, time_column='timestamp', order_column='time_msc',
+                        by_symbol=True, msc_column='time_msc')
+        if self.partitioned:
+            return dict(source=TICKS_TABLE, time_column='timestamp', order_column='time_msc', by_symbol=True)
+        return dict(source=position['tick_table'], time_column='mt5_ts', order_column='id')
+
+    def _summary_page(self, symbol, ticks, position, values=None):
+        """
+        Bar batches for one page aggregated in the database (bar_summaries)
+
+        Python only determines the window of touched minutes; the summaries
+        of that window are refreshed from the tick table and copied into the
+        bar table.
+
+        Returns:
+            (bar batches, 1m bars refreshed, late 1m bars, last tick timestamp)
+        """
+        values = values or ('VALUES %s',) * 4
+        epoch, tz, times = self._wall_epoch([row[0] for row in ticks])
+        minutes = np.unique(epoch - epoch % TIMEFRAME_SECONDS[BASE_TIMEFRAME])
+        late = self._count_late(symbol, {'bucket': minutes})
+        start, end = self._summary_window(symbol, minutes, tz)
+
+        batches = self.summaries.refresh_batches(
+            symbol, start, end, values=values[3], **self._summary_source(position)
+        )
+        batches.append(self.summaries.copy_batch(
+            symbol, start, end, f"bars_{symbol.lower()}", BAR_COLUMNS, BAR_CONFLICT_SQL, values[3]
+        ))
+        return batches, len(minutes), late, times.max().to_pydatetime()
+
+    def _page_done(self, symbol, ticks, written, position, late):
+        """Book-keeping after a page was committed"""
+        self.positions[symbol] = position
+        self.rebuild_from.pop(symbol, None)
+        self.seeded.discard(symbol)
+        self.summary_seeded.add(symbol)
+        with self._stats_lock:
+            self.stats['pages'] += 1
+            self.stats['ticks'] += len(ticks)
+            self.stats['bars_written'] += written
+        if late:
+            logger.info(f"[{symbol}] Corrected {late} late 1m bars and their parents")
+
+    def _report(self, symbol, pages, ticks):
+        """Log progress and aggregator lag after a cycle"""
+        lag = self._lag_seconds(symbol)
+        self.lag[symbol] = lag
+        if not pages:
+            return
+        logger.info(f"[{symbol}] Processed {ticks} ticks in {pages} pages, lag {lag:.1f}s")
+        if lag > self.lag_warning:
+            logger.warning(f"[{symbol}] Aggregator lag {lag:.0f}s exceeds {self.lag_warning}s")
+
+    def aggregate_symbol(self, symbol):
+        """Aggregate ticks to bars for one symbol, page by page until caught up"""
+        tables = set() if self.partitioned else {row[0] for row in self.db.fetch_all(*self._tick_tables_sql(symbol))}
+
+        if symbol not in self.positions:
+            result = self.db.fetch_one(self._last_bar_sql(symbol))
+            position, seed = self._start_position(
+                symbol, self.tick_watermarks.latest(symbol), result[0] if result else None
+            )
+            if seed is not None and not self.partitioned:
+                if position['tick_table'] not in tables:
+                    logger.debug(f"Tick table {position['tick_table']} does not exist yet")
+                    return
+                position['last_id'] = self.db.fetch_one(self._seed_id_sql(position['tick_table']), (seed,))[0]
+            self.positions[symbol] = position
+
+        pages = processed = 0
+        while True:
+            position = self.positions[symbol]
+            if not self.partitioned and position['tick_table'] not in tables:
+                logger.debug(f"Tick table {position['tick_table']} does not exist yet")
+                break
+
+            try:
+                ticks = self.db.fetch_all(*self._tick_query(symbol, position))
+                if ticks:
+                    if self.summaries is not None:
+                        bar_batches, written, late, last_timestamp = self._summary_page(symbol, ticks, position)
+                    else:
+                        base, tz, last_timestamp = self._base_bars(ticks, self._previous_tick(symbol, position))
+                        late = self._count_late(symbol, base)
+                        base_rows = self.db.fetch_all(
+                            self._parent_bars_sql(symbol), self._parent_range(base['bucket'], tz)
+                        )
+                        bar_batches, written = self._python_page(symbol, base, base_rows, tz)
+                    next_position = self._next_position(position, ticks, last_timestamp)
+
+                    # Bars and both watermarks in one transaction: every tick exactly once
+                    self.db.insert_values_many(self._page_batches(symbol, bar_batches, next_position))
+                    self._page_done(symbol, ticks, written, next_position, late)
+                    pages += 1
+                    processed += len(ticks)
+            except Exception as e:
+                logger.error(f"[{symbol}] Error aggregating ticks from {position['tick_table']}: {e}")
+                break
+
+            if len(ticks) < self.page_size:
+                next_table = self._next_tick_table(self.positions[symbol], tables)
+                if next_table is None:
+                    break
+                self.positions[symbol] = next_table
+
+        self._report(symbol, pages, processed)
+
+    async def aggregate_symbol_async(self, symbol):
+        """Aggregate ticks to bars for one symbol, page by page until caught up (async)"""
+        tables = set()
+        if not self.partitioned:
+            tables = {row[0] for row in await self.async_db.fetch_all(*self._tick_tables_sql(symbol))}
+
+        if symbol not in self.positions:
+            result = await self.async_db.fetch_one(self._last_bar_sql(symbol))
+            watermark = await asyncio.to_thread(self.tick_watermarks.latest, symbol)
+            position, seed = self._start_position(symbol, watermark, result[0] if result else None)
+            if seed is not None and not self.partitioned:
+                if position['tick_table'] not in tables:
+                    logger.debug(f"Tick table {position['tick_table']} does not exist yet")
+                    return
+                position['last_id'] = (
+                    await self.async_db.fetch_one(self._seed_id_sql(position['tick_table']), (seed,))
+                )[0]
+            self.positions[symbol] = position
+
+        placeholders = tuple(
+            f"VALUES ({', '.join(['%s'] * count)})" for count in (len(BAR_COLUMNS), 6, 3)
+        ) + ("VALUES (%s::varchar, %s::timestamptz, %s::timestamptz)",)
+        pages = processed = 0
+        while True:
+            position = self.positions[symbol]
+            if not self.partitioned and position['tick_table'] not in tables:
+                logger.debug(f"Tick table {position['tick_table']} does not exist yet")
+                break
+
+            try:
+                ticks = await self.async_db.fetch_all(*self._tick_query(symbol, position))
+                if ticks:
+                    if self.summaries is not None:
+                        bar_batches, written, late, last_timestamp = self._summary_page(
+                            symbol, ticks, position, placeholders
+                        )
+                    else:
+                        base, tz, last_timestamp = self._base_bars(ticks, self._previous_tick(symbol, position))
+                        late = self._count_late(symbol, base)
+                        base_rows = await self.async_db.fetch_all(
+                            self._parent_bars_sql(symbol), self._parent_range(base['bucket'], tz)
+                        )
+                        bar_batches, written = self._python_page(symbol, base, base_rows, tz, placeholders)
+                    next_position = self._next_position(position, ticks, last_timestamp)
+
+                    await self.async_db.execute_many_batches(
+                        self._page_batches(symbol, bar_batches, next_position, placeholders)
+                    )
+                    self._page_done(symbol, ticks, written, next_position, late)
+                    pages += 1
+                    processed += len(ticks)
+            except Exception as e:
+                logger.error(f"[{symbol}] Error aggregating ticks from {position['tick_table']}: {e}")
+                break
+
+            if len(ticks) < self.page_size:
+                next_table = self._next_tick_table(self.positions[symbol], tables)
+                if next_table is None:
+                    break
+                self.positions[symbol] = next_table
+
+        self._report(symbol, pages, processed)
+
+    def _bar_write_sql(self, symbol, values='VALUES %s'):
+        """
+        Upsert SQL for the symbol's bar table (rows replace existing bars)
+
+        Args:
+            symbol: Trading symbol
+            values: VALUES clause ('VALUES %s' for execute_values, a
+                placeholder tuple for execute_many)
+        """
+        return f"""
+            INSERT INTO bars_{symbol.lower()}
+            ({', '.join(BAR_COLUMNS)})
+            {values}
+{BAR_CONFLICT_SQL}"""
+
+    def get_stats(self):
+        """Aggregation statistics incl. lag in seconds per symbol"""
+        return dict(self.stats, lag_seconds=dict(self.lag))
 
     def run(self):
         """Main loop"""
         logger.info(f"Starting bar aggregation for {len(self.symbols)} symbols")
         logger.info(f"Timeframes: {', '.join(self.timeframes)}")
+        logger.info(f"Aggregation: {'database (bar_summaries)' if self.summaries is not None else 'python'}")
+
+        if self.async_db is not None:
+            asyncio.run(self.run_async())
+            return
+
+        scheduler = WorkScheduler('bar_aggregator') if scheduler_enabled('bar_aggregator') else None
 
         while True:
             try:
-                for symbol in self.symbols:
-                    self.aggregate_symbol(symbol)
+                if scheduler is not None:
+                    scheduler.run({symbol: WorkUnit(partial(self.aggregate_symbol, symbol)) for symbol in self.symbols})
+                else:
+                    for symbol in self.symbols:
+                        self.aggregate_symbol(symbol)
 
                 # Sleep 30 seconds between iterations
                 time.sleep(30)
@@ -278,6 +809,23 @@ class BarAggregator:
                 traceback.print_exc()
                 time.sleep(60)
 
+    async def run_async(self):
+        """Main loop (async): all symbols concurrently"""
+        try:
+            while True:
+                results = await asyncio.gather(
+                    *(self.aggregate_symbol_async(symbol) for symbol in self.symbols),
+                    return_exceptions=True
+                )
+                for symbol, result in zip(self.symbols, results):
+                    if isinstance(result, Exception):
+                        logger.error(f"[{symbol}] Error in aggregation: {result}")
+
+                # Sleep 30 seconds between iterations
+                await asyncio.sleep(30)
+        finally:
+            await self.async_db.close()
+
 
 def main():
     """Main function"""
@@ -287,7 +835,7 @@ def main():
 
     try:
         # MT5 not strictly needed but initialize for consistency
-        if not mt5.initialize():
+        if mt5 is None or not mt5.initialize():
             logger.warning("MT5 not available, continuing anyway...")
 
         aggregator = BarAggregator()
@@ -0,0 +1,68 @@
+"""
+Data Pipeline (ein Prozess)
+- TickCollector + BarBuilder im push Modus: der Collector reicht neue Ticks
+  direkt an den Bar Builder weiter, ohne Umweg über die Datenbank
+- Wird von start_system.py statt tick_collector + bar_builder gestartet,
+  wenn data.bar_builder.mode = "push"
+
+Usage:
+    python scripts/start_data_pipeline.py
+    python scripts/start_data_pipeline.py --replay data/ticks.csv  # FakeMT5
+"""
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import argparse
+import time
+
+from src.utils.logger import get_logger
+from src.data.tick_collector import TickCollector
+from src.data.bar_builder import BarBuilder
+
+logger = get_logger('DataPipeline')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Tick collector with in-process bar builder')
+    parser.add_argument('--db', choices=['local', 'remote'], default='local', help='Database')
+    parser.add_argument('--replay', help='Replay recorded tick file via FakeMT5 instead of MetaTrader5')
+    parser.add_argument('--speed', type=float, default=1.0, help='Replay speed factor')
+    args = parser.parse_args()
+
+    mt5_module = None
+    if args.replay:
+        from src.data.fake_mt5 import FakeMT5
+        mt5_module = FakeMT5(args.replay, speed=args.speed)
+
+    collector = TickCollector(db_type=args.db, mt5_module=mt5_module)
+    builder = BarBuilder(db_type=args.db, mode='push')
+    builder.attach(collector)
+
+    builder.start()
+    collector.start()
+    if not collector.is_running:
+        builder.stop()
+        return
+
+    try:
+        while True:
+            time.sleep(30)
+            collector_stats = collector.get_stats()
+            builder_stats = builder.get_stats()
+            logger.info(
+                f"Ticks: collected={collector_stats['ticks_collected']}, written={collector_stats['ticks_written']}, "
+                f"bars={sum(builder_stats['bars_built'].values())}, pending={builder_stats['bars_pending']}, "
+                f"flush={builder_stats['flush_latency_ms_last']:.1f}ms"
+            )
+    except KeyboardInterrupt:
+        logger.info("Stopping...")
+    finally:
+        # Collector zuerst, damit der Bar Builder alle Ticks bekommt
+        collector.stop()
+        builder.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -141,13 +141,18 @@ def start_all_components():
     config = get_config()
     root_dir = Path(__file__).parent.parent
 
+    # push: Tick Collector + Bar Builder in einem Prozess
+    bar_push = config.get('data.bar_builder.mode', 'poll') == 'push'
+
     # Component Definitions
     # Format: (name, command, enabled)
     components = [
         # Data Pipeline
-        ('tick_collector', ['src/data/tick_collector.py'], True),
-        ('bar_builder', ['src/data/bar_builder.py'], True),
+        ('data_pipeline', ['scripts/start_data_pipeline.py'], bar_push),
+        ('tick_collector', ['src/data/tick_collector.py'], not bar_push),
+        ('bar_builder', ['src/data/bar_builder.py'], not bar_push),
         ('feature_calculator', ['src/data/feature_calculator.py'], True),
+        ('tick_archiver', ['scripts/archive_ticks.py', '--loop'], config.get('data.tick_archive.enabled', False)),
 
         # ML System
         ('ml_inference', ['scripts/run_inference.py'], True),
@@ -122,7 +122,7 @@ class SimpleTickCollector:
                                t['last'], t['volume'], t['time_msc']) for t in batch]
 
                     try:
-                        self.db.execute_many(sql, values)
+                        self.db.execute_many(sql, values, prepare=True)
                         self.stats['written'] += len(batch)
                         logger.info(f"Wrote {len(batch)} ticks to {self.current_table}")
                     except Exception as e:
@@ -147,7 +147,7 @@ class SimpleTickCollector:
                 """
                 values = [(t['symbol'], t['timestamp'], t['bid'], t['ask'],
                            t['last'], t['volume'], t['time_msc']) for t in batch]
-                self.db.execute_many(sql, values)
+                self.db.execute_many(sql, values, prepare=True)
                 self.stats['written'] += len(batch)
                 logger.info(f"Wrote final {len(batch)} ticks")
             except Exception as e:
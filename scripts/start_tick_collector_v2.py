@@ -10,234 +10,151 @@ import sys
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-import MetaTrader5 as mt5
 from src.utils.logger import get_logger
 from src.utils.config_loader import get_config
 from src.data.database_manager import get_database
+from src.data.tick_source import create_tick_source
+from src.data.tick_writer import TickWriterPool
+from src.data.spill_journal import SpillJournal
+from src.data.tick_partitions import (
+    TickPartitionManager, TICKS_TABLE, INDICATOR_COLUMNS, partitioning_enabled
+)
+from src.data.tick_compact import (
+    CompactTickStore, COMPACT_COLUMNS, COMPACT_INDICATOR_COLUMNS, INDICATOR_TABLE, INDICATOR_CONFLICT,
+    compact_enabled
+)
+import argparse
 import time
 from datetime import datetime, date
-from queue import Queue
 import threading
-from collections import deque
-import numpy as np
+from src.indicators import streaming
 
 logger = get_logger('TickCollectorV2')
 
-class IndicatorCalculator:
-    """Berechnet Technical Indicators aus Price-Daten"""
+# Spaltenreihenfolge für COPY (entspricht Tabellen-Schema ohne id)
+TICK_COLUMNS = ('handelszeit', 'systemzeit', 'mt5_ts', 'bid', 'ask', 'volume') + INDICATOR_COLUMNS
+# Partitionierte Tabelle `ticks` (data.tick_partitioning.enabled)
+PARTITIONED_TICK_COLUMNS = ('symbol', 'timestamp', 'systemzeit', 'bid', 'ask', 'volume', 'time_msc') + INDICATOR_COLUMNS
 
-    def __init__(self, window_size=200):
-        self.window_size = window_size
-        self.price_buffers = {}  # symbol -> deque of prices
+class SymbolIndicatorState:
+    """Streaming-Zustand aller Tick-Indikatoren eines Symbols (O(1) pro Tick)"""
 
-    def add_price(self, symbol, bid, ask):
-        """Füge neuen Preis zu Buffer hinzu"""
-        if symbol not in self.price_buffers:
-            self.price_buffers[symbol] = {
-                'bid': deque(maxlen=self.window_size),
-                'ask': deque(maxlen=self.window_size),
-                'mid': deque(maxlen=self.window_size)
-            }
-
-        mid = (bid + ask) / 2
-        self.price_buffers[symbol]['bid'].append(bid)
-        self.price_buffers[symbol]['ask'].append(ask)
-        self.price_buffers[symbol]['mid'].append(mid)
+    def __init__(self):
+        self.count = 0
+        self.last = None
+
+        self.sma14 = streaming.SMA(14)
+        self.sma50 = streaming.SMA(50)
+        self.ema14 = streaming.EMA(14)
+        self.ema50 = streaming.EMA(50)
+        self.wma14 = streaming.WMA(14)
+        self.wma50 = streaming.WMA(50)
+        self.rsi14 = streaming.RSI(14)
+        self.rsi28 = streaming.RSI(28)
+        self.macd = streaming.MACD(12, 26, 9)
+        self.minmax14 = streaming.RollingMinMax(14)
+        self.window14 = streaming.RollingWindow(14)
+        self.bollinger = streaming.BollingerBands(20, 2.0)
+        self.momentum14 = streaming.Momentum(14)
+        self.cci14 = streaming.CCI(14)
+
+    def update(self, mid):
+        """Aktualisiert alle Indikatoren mit neuem Mid-Preis"""
+        self.count += 1
+        self.last = {
+            'ma14': self.sma14.update(mid),
+            'ma50': self.sma50.update(mid),
+            'ema14': self.ema14.update(mid),
+            'ema50': self.ema50.update(mid),
+            'wma14': self.wma14.update(mid),
+            'wma50': self.wma50.update(mid),
+            'rsi14': self.rsi14.update(mid),
+            'rsi28': self.rsi28.update(mid),
+            'momentum14': self.momentum14.update(mid),
+            'cci14': self.cci14.update(mid),
+        }
+
+        macd, signal, hist = self.macd.update(mid)
+        self.last['macd_main'] = macd
+        self.last['macd_signal'] = signal
+        self.last['macd_hist'] = hist
+
+        # ATR (simplified: Range der letzten 14 Preise)
+        low, high = self.minmax14.update(mid)
+        self.last['atr14'] = high - low if high is not None else None
+
+        # StdDev + ADX (simplified: Volatilität als Proxy)
+        self.window14.update(mid)
+        if self.window14.full:
+            std = self.window14.std
+            self.last['stddev14'] = std
+            self.last['adx14'] = std / self.window14.mean * 100
+
+        # Bollinger Bands
+        upper, middle, lower = self.bollinger.update(mid)
+        if middle is not None:
+            self.last['bb_upper'] = upper
+            self.last['bb_middle'] = middle
+            self.last['bb_lower'] = lower
 
-    def calculate_indicators(self, symbol):
-        """Berechne alle Indikatoren für Symbol"""
-        if symbol not in self.price_buffers:
-            return {}
 
-        buffer = self.price_buffers[symbol]
-        prices = np.array(buffer['mid'])
+class IndicatorCalculator:
+    """Berechnet Technical Indicators inkrementell pro Tick"""
 
-        if len(prices) < 50:
-            return {}  # Nicht genug Daten
+    # Wie bisher: erst ab 50 Ticks Indikatoren ausgeben
+    MIN_TICKS = 50
+
+    def __init__(self):
+        self.states = {}  # symbol -> SymbolIndicatorState
 
-        indicators = {}
+    def add_price(self, symbol, bid, ask):
+        """Füge neuen Preis hinzu und aktualisiere alle Indikatoren"""
+        state = self.states.get(symbol)
+        if state is None:
+            state = self.states[symbol] = SymbolIndicatorState()
 
         try:
-            # Moving Averages
-            if len(prices) >= 14:
-                indicators['ma14'] = float(np.mean(prices[-14:]))
-                ema14 = self._ema(prices, 14)
-                if ema14 is not None:
-                    indicators['ema14'] = float(ema14)
-                wma14 = self._wma(prices, 14)
-                if wma14 is not None:
-                    indicators['wma14'] = float(wma14)
-
-            if len(prices) >= 50:
-                indicators['ma50'] = float(np.mean(prices[-50:]))
-                ema50 = self._ema(prices, 50)
-                if ema50 is not None:
-                    indicators['ema50'] = float(ema50)
-                wma50 = self._wma(prices, 50)
-                if wma50 is not None:
-                    indicators['wma50'] = float(wma50)
-
-            # RSI
-            if len(prices) >= 14:
-                rsi14 = self._rsi(prices, 14)
-                if rsi14 is not None:
-                    indicators['rsi14'] = float(rsi14)
-            if len(prices) >= 28:
-                rsi28 = self._rsi(prices, 28)
-                if rsi28 is not None:
-                    indicators['rsi28'] = float(rsi28)
-
-            # MACD
-            if len(prices) >= 26:
-                macd, signal, hist = self._macd(prices)
-                if macd is not None:
-                    indicators['macd_main'] = float(macd)
-                    indicators['macd_signal'] = float(signal)
-                    indicators['macd_hist'] = float(hist)
-
-            # ATR
-            if len(prices) >= 14:
-                high = float(max(prices[-14:]))
-                low = float(min(prices[-14:]))
-                indicators['atr14'] = high - low  # Simplified
-
-            # Bollinger Bands
-            if len(prices) >= 20:
-                bb_upper, bb_mid, bb_lower = self._bollinger_bands(prices, 20, 2)
-                if bb_upper is not None:
-                    indicators['bb_upper'] = float(bb_upper)
-                    indicators['bb_middle'] = float(bb_mid)
-                    indicators['bb_lower'] = float(bb_lower)
-
-            # ADX (simplified)
-            if len(prices) >= 14:
-                adx = self._adx_simplified(prices, 14)
-                if adx is not None:
-                    indicators['adx14'] = float(adx)
-
-            # Momentum
-            if len(prices) >= 14:
-                indicators['momentum14'] = float(prices[-1] - prices[-14])
-
-            # CCI (simplified)
-            if len(prices) >= 14:
-                cci = self._cci(prices, 14)
-                if cci is not None:
-                    indicators['cci14'] = float(cci)
-
-            # Standard Deviation
-            if len(prices) >= 14:
-                indicators['stddev14'] = float(np.std(prices[-14:]))
-
+            state.update((bid + ask) / 2)
         except Exception as e:
             logger.error(f"Indicator calculation error for {symbol}: {e}")
 
-        return indicators
-
-    def _ema(self, prices, period):
-        """Exponential Moving Average"""
-        if len(prices) < period:
-            return None
-        multiplier = 2 / (period + 1)
-        ema = np.mean(prices[:period])
-        for price in prices[period:]:
-            ema = (price * multiplier) + (ema * (1 - multiplier))
-        return ema
-
-    def _wma(self, prices, period):
-        """Weighted Moving Average"""
-        if len(prices) < period:
-            return None
-        weights = np.arange(1, period + 1)
-        return np.sum(prices[-period:] * weights) / np.sum(weights)
-
-    def _rsi(self, prices, period=14):
-        """Relative Strength Index"""
-        if len(prices) < period + 1:
-            return None
-
-        deltas = np.diff(prices[-period-1:])
-        gains = np.where(deltas > 0, deltas, 0)
-        losses = np.where(deltas < 0, -deltas, 0)
-
-        avg_gain = np.mean(gains)
-        avg_loss = np.mean(losses)
-
-        if avg_loss == 0:
-            return 100
-
-        rs = avg_gain / avg_loss
-        rsi = 100 - (100 / (1 + rs))
-        return rsi
-
-    def _macd(self, prices, fast=12, slow=26, signal=9):
-        """MACD Indicator"""
-        if len(prices) < slow:
-            return None, None, None
-
-        ema_fast = self._ema(prices, fast)
-        ema_slow = self._ema(prices, slow)
-
-        if ema_fast is None or ema_slow is None:
-            return None, None, None
-
-        macd_line = ema_fast - ema_slow
-
-        # Signal line (simplified - should be EMA of MACD)
-        signal_line = macd_line * 0.9  # Simplified
-        histogram = macd_line - signal_line
-
-        return macd_line, signal_line, histogram
-
-    def _bollinger_bands(self, prices, period=20, std_dev=2):
-        """Bollinger Bands"""
-        if len(prices) < period:
-            return None, None, None
-
-        sma = np.mean(prices[-period:])
-        std = np.std(prices[-period:])
-
-        upper = sma + (std * std_dev)
-        lower = sma - (std * std_dev)
-
-        return upper, sma, lower
-
-    def _adx_simplified(self, prices, period=14):
-        """Simplified ADX"""
-        if len(prices) < period:
-            return None
-
-        # Sehr vereinfacht: Volatilität als Proxy
-        return np.std(prices[-period:]) / np.mean(prices[-period:]) * 100
-
-    def _cci(self, prices, period=14):
-        """Commodity Channel Index (simplified)"""
-        if len(prices) < period:
-            return None
-
-        tp = prices[-period:]  # Typical Price (simplified)
-        sma = np.mean(tp)
-        mad = np.mean(np.abs(tp - sma))
-
-        if mad == 0:
-            return 0
+    def calculate_indicators(self, symbol):
+        """Aktuelle Indikatoren für Symbol (nur Werte != None)"""
+        state = self.states.get(symbol)
+        if state is None or state.count < self.MIN_TICKS:
+            return {}  # Nicht genug Daten
 
-        cci = (prices[-1] - sma) / (0.015 * mad)
-        return cci
+        return {name: float(value) for name, value in state.last.items() if value is not None}
 
 
 class AdvancedTickCollector:
     """Advanced Tick Collector mit Indicators"""
 
-    def __init__(self):
+    def __init__(self, mt5_module, fetch_mode=None, writer_workers=None):
         self.config = get_config()
         self.db = get_database('local')
+        self.mt5 = mt5_module
+        self.tick_source = create_tick_source(mt5_module, fetch_mode)
         self.symbols = self.config.get_symbols()
-        self.tick_queues = {symbol: Queue(maxsize=500) for symbol in self.symbols}
+        self.writer = TickWriterPool(
+            self.db,
+            workers=writer_workers,
+            journal=SpillJournal('tick_collector_v2'),
+            on_conflict={INDICATOR_TABLE: INDICATOR_CONFLICT}
+        )
         self.is_running = False
+        self.collector_thread = None
         self.indicator_calc = IndicatorCalculator()
-        self.stats = {symbol: {'collected': 0, 'written': 0} for symbol in self.symbols}
+        self.stats = {symbol: {'collected': 0, 'dropped': 0} for symbol in self.symbols}
         self.current_tables = {}
+        self.compact = compact_enabled()
+        if self.compact:
+            self.partitions = CompactTickStore(self.db)
+        elif partitioning_enabled():
+            self.partitions = TickPartitionManager(self.db, symbols=self.symbols)
+        else:
+            self.partitions = None
+        self.partition_day = None
 
     def _get_today_table(self, symbol):
         """Get today's table name for symbol"""
@@ -245,8 +162,12 @@ class AdvancedTickCollector:
 
     def _ensure_table(self, symbol):
         """Ensure today's table exists for symbol"""
+        if self.partitions is not None:
+            self._ensure_partitions()
+            return
+
         table = self._get_today_table(symbol)
-        if table not in self.current_tables:
+        if self.current_tables.get(symbol) != table:
             self.current_tables[symbol] = table
 
             # Schema matching remote server
@@ -291,115 +212,136 @@ class AdvancedTickCollector:
             except Exception as e:
                 logger.error(f"Table creation error for {symbol}: {e}")
 
-    def _collect_loop(self, symbol):
-        """Collect ticks for one symbol"""
-        logger.info(f"Starting collection for {symbol}...")
-
-        while self.is_running:
-            try:
-                tick = mt5.symbol_info_tick(symbol)
-                if tick:
-                    # Add to indicator calculator
-                    self.indicator_calc.add_price(symbol, tick.bid, tick.ask)
-
-                    # Calculate indicators
-                    indicators = self.indicator_calc.calculate_indicators(symbol)
-
-                    tick_data = {
-                        'handelszeit': datetime.fromtimestamp(tick.time),
-                        'systemzeit': datetime.now(),
-                        'mt5_ts': datetime.fromtimestamp(tick.time),
-                        'bid': float(tick.bid),
-                        'ask': float(tick.ask),
-                        'volume': int(tick.volume),
-                        **indicators  # Add all calculated indicators
-                    }
-
-                    try:
-                        self.tick_queues[symbol].put(tick_data, block=False)
-                        self.stats[symbol]['collected'] += 1
-                    except:
-                        pass  # Queue full
-
-                time.sleep(0.1)  # 10 ticks/second max per symbol
+    def _ensure_partitions(self):
+        """Pre-create partitions and apply retention once per day"""
+        today = date.today()
+        if self.partition_day == today:
+            return
 
-            except Exception as e:
-                logger.error(f"Collection error for {symbol}: {e}")
-                time.sleep(1)
+        self.partition_day = today
+        try:
+            self.partitions.maintain(today)
+            if self.compact:
+                self.partitions.register_symbols(self.symbols, self.mt5)
+        except Exception as e:
+            logger.error(f"Tick partition maintenance error: {e}")
 
-    def _write_loop(self, symbol):
-        """Write ticks for one symbol"""
-        logger.info(f"Starting write loop for {symbol}...")
-        batch = []
-        last_write = time.time()
+    def _collect_loop(self):
+        """Collect ticks for all symbols and hand them to the writer pool"""
+        logger.info(f"Starting collection for {', '.join(self.symbols)}...")
 
-        while self.is_running or not self.tick_queues[symbol].empty():
-            try:
-                # Get tick from queue
+        while self.is_running:
+            for symbol in self.symbols:
                 try:
-                    tick = self.tick_queues[symbol].get(timeout=1)
-                    batch.append(tick)
-                except:
-                    pass
-
-                # Write batch
-                now = time.time()
-                should_write = len(batch) >= 50 or (len(batch) > 0 and now - last_write > 10)
-
-                if should_write:
-                    self._ensure_table(symbol)
-                    table = self.current_tables[symbol]
-
-                    # Build dynamic SQL based on available fields
-                    if batch:
-                        columns = list(batch[0].keys())
-                        placeholders = ', '.join(['%s'] * len(columns))
-                        column_str = ', '.join(columns)
-
-                        sql = f"""
-                            INSERT INTO {table} ({column_str})
-                            VALUES ({placeholders})
-                        """
-
-                        values = [tuple(tick[col] for col in columns) for tick in batch]
-
-                        try:
-                            self.db.execute_many(sql, values)
-                            self.stats[symbol]['written'] += len(batch)
-                            logger.info(f"[{symbol}] Wrote {len(batch)} ticks to {table}")
-                        except Exception as e:
-                            logger.error(f"[{symbol}] Write error: {e}")
-
-                        batch = []
-                        last_write = now
+                    self._collect_symbol(symbol)
+                except Exception as e:
+                    logger.error(f"Collection error for {symbol}: {e}")
+                    time.sleep(1)
 
-            except Exception as e:
-                logger.error(f"[{symbol}] Write loop error: {e}")
-                time.sleep(1)
+            time.sleep(0.1)  # Incremental Modus: Ticks zwischen zwei Abrufen gehen nicht verloren
+
+    def _collect_symbol(self, symbol):
+        """Fetch new ticks for one symbol, add indicators, submit rows"""
+        ticks = self.tick_source.fetch(symbol)
+        if len(ticks) == 0:
+            return
+
+        self._ensure_table(symbol)
+        if self.compact:
+            submitted = self._submit_compact(symbol, ticks)
+        else:
+            submitted = self._submit_rows(symbol, ticks)
+
+        if submitted:
+            self.stats[symbol]['collected'] += len(ticks)
+        else:
+            self.stats[symbol]['dropped'] += len(ticks)
+
+    def _submit_rows(self, symbol, ticks):
+        """Rows with indicators for `ticks` or the per-symbol daily table"""
+        systemzeit = datetime.now()
+        rows = []
+        for bid, ask, volume, time_msc in ticks[['bid', 'ask', 'volume', 'time_msc']].tolist():
+            # Add to indicator calculator
+            self.indicator_calc.add_price(symbol, bid, ask)
+
+            # Calculate indicators
+            indicators = self.indicator_calc.calculate_indicators(symbol)
+
+            mt5_ts = datetime.fromtimestamp(time_msc / 1000)
+            values = tuple(indicators.get(col) for col in INDICATOR_COLUMNS)
+            if self.partitions is not None:
+                rows.append((symbol, mt5_ts, systemzeit, bid, ask, volume, time_msc) + values)
+            else:
+                rows.append((mt5_ts, systemzeit, mt5_ts, bid, ask, volume) + values)
+
+        if self.partitions is not None:
+            return self.writer.submit(TICKS_TABLE, PARTITIONED_TICK_COLUMNS, rows)
+        return self.writer.submit(self.current_tables[symbol], TICK_COLUMNS, rows)
+
+    def _submit_compact(self, symbol, ticks):
+        """Compact tick rows plus indicator side-table rows"""
+        indicator_rows = {}
+        for bid, ask, time_msc in ticks[['bid', 'ask', 'time_msc']].tolist():
+            self.indicator_calc.add_price(symbol, bid, ask)
+            indicators = self.indicator_calc.calculate_indicators(symbol)
+            if indicators and self.partitions.store_indicators:
+                # One row per time_msc: last tick of this fetch wins, a millisecond
+                # repeated by the next fetch keeps the stored row (INDICATOR_CONFLICT)
+                indicator_rows[time_msc] = self.partitions.encode_indicators(symbol, time_msc, indicators)
+
+        rows = self.partitions.encode_ticks(symbol, ticks)
+        submitted = self.writer.submit(self.partitions.table, COMPACT_COLUMNS, rows)
+        if indicator_rows:
+            self.writer.submit(INDICATOR_TABLE, COMPACT_INDICATOR_COLUMNS, list(indicator_rows.values()))
+        return submitted
 
     def start(self):
         """Start collecting for all symbols"""
         self.is_running = True
 
-        # Start collection thread for each symbol
-        for symbol in self.symbols:
-            threading.Thread(target=self._collect_loop, args=(symbol,), daemon=True).start()
-            threading.Thread(target=self._write_loop, args=(symbol,), daemon=True).start()
+        self.writer.start()
+        self.collector_thread = threading.Thread(target=self._collect_loop, daemon=True)
+        self.collector_thread.start()
 
         logger.info(f"Started collecting {len(self.symbols)} symbols with indicators")
 
     def stop(self):
-        """Stop collecting"""
+        """Stop collecting, flush remaining rows"""
         self.is_running = False
+        if self.collector_thread:
+            self.collector_thread.join(timeout=10)
+        self.writer.stop()
         logger.info(f"Stats: {self.stats}")
 
+    def get_stats(self):
+        """Collector stats per symbol plus writer backpressure metrics"""
+        return {
+            'symbols': {symbol: dict(stats) for symbol, stats in self.stats.items()},
+            'writer': self.writer.get_stats(),
+            'db_pool': self.db.get_pool_stats()
+        }
+
 
 def main():
     """Main function"""
+    parser = argparse.ArgumentParser(description='Advanced Tick Collector V2')
+    parser.add_argument('--replay', help='Replay recorded tick file via FakeMT5 instead of MetaTrader5')
+    parser.add_argument('--speed', type=float, default=1.0, help='Replay speed factor')
+    parser.add_argument('--fetch-mode', choices=['incremental', 'poll'], help='Override data.tick_fetch_mode')
+    parser.add_argument('--writers', type=int, help='Override data.tick_writer.workers')
+    args = parser.parse_args()
+
     logger.info("=" * 70)
     logger.info("ADVANCED TICK COLLECTOR V2 - With Indicators")
     logger.info("=" * 70)
 
+    if args.replay:
+        from src.data.fake_mt5 import FakeMT5
+        mt5 = FakeMT5(args.replay, speed=args.speed)
+    else:
+        import MetaTrader5 as mt5
+
     try:
         if not mt5.initialize():
             logger.error("MT5 not available!")
@@ -413,7 +355,7 @@ def main():
 
         logger.info(f"Connected to MT5: {account_info.login}")
 
-        collector = AdvancedTickCollector()
+        collector = AdvancedTickCollector(mt5, args.fetch_mode, args.writers)
         collector.start()
 
         logger.info("Collecting ticks with indicators... Press Ctrl+C to stop")
@@ -421,9 +363,20 @@ def main():
         while True:
             time.sleep(30)
             # Print stats
-            total_collected = sum(s['collected'] for s in collector.stats.values())
-            total_written = sum(s['written'] for s in collector.stats.values())
-            logger.info(f"Total: Collected={total_collected}, Written={total_written}")
+            stats = collector.get_stats()
+            writer = stats['writer']
+            total_collected = sum(s['collected'] for s in stats['symbols'].values())
+            logger.info(
+                f"Total: Collected={total_collected}, Written={writer['rows_written']}, "
+                f"Dropped={writer['rows_dropped']}, Queue={writer['queue_depth']}/{writer['queue_capacity']}, "
+                f"Flush={writer['flush_latency_ms_avg']:.1f}ms avg / {writer['flush_latency_ms_max']:.1f}ms max"
+            )
+            db_pool = stats['db_pool']
+            logger.info(
+                f"DB pool: in use={db_pool['in_use']}, idle={db_pool['idle']}, waiting={db_pool['waiting']}, "
+                f"wait={db_pool['wait_ms_avg']:.1f}ms avg / {db_pool['wait_ms_max']:.1f}ms max, "
+                f"timeouts={db_pool['timeouts']}"
+            )
 
     except KeyboardInterrupt:
         logger.info("Stopping...")
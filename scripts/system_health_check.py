@@ -42,6 +42,13 @@ try:
         info = db.get_connection_info()
         print(f"  INFO: {info['host']}:{info['port']}/{info['database']}")
 
+        # Pool Metriken
+        pool_stats = db.get_pool_stats()
+        print(f"  INFO: Pool {pool_stats['in_use']} in use / {pool_stats['idle']} idle "
+              f"(size {pool_stats['size']} + overflow {pool_stats['max_overflow']}), "
+              f"wait avg {pool_stats['wait_ms_avg']:.1f}ms max {pool_stats['wait_ms_max']:.1f}ms, "
+              f"timeouts {pool_stats['timeouts']}")
+
         # Table Count
         tables = db.list_tables()
         print(f"  INFO: {len(tables)} tables found")
@@ -75,6 +82,19 @@ try:
                 count = db.get_table_row_count(table)
                 print(f"  INFO: {table}: {count} bars")
 
+        # Bar Aggregator V2 Lag (tick_watermarks)
+        if 'tick_watermarks' in tables:
+            from src.data.bar_watermarks import TickWatermarks
+            lag_warning = config.get('data.bar_aggregator.lag_warning_seconds', 300)
+            for position in TickWatermarks(db, 'bar_aggregator_v2').get_all():
+                lag = position['lag_seconds']
+                print(f"  INFO: Aggregator {position['symbol']} @ {position['tick_table']}: "
+                      f"lag {lag:.0f}s" if lag is not None else
+                      f"  INFO: Aggregator {position['symbol']} @ {position['tick_table']}: no ticks yet")
+                if lag is not None and lag > lag_warning:
+                    health_status["warnings"].append(f"Bar aggregator lag {position['symbol']}: {lag:.0f}s")
+                    print(f"  [WARNING] Bar aggregator lag {lag:.0f}s > {lag_warning}s")
+
     else:
         health_status["critical"].append("Database Connection")
         print("  [CRITICAL] Database connection failed")
@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 """
 Simple Model Training Script
-Uses new ML pipeline: DataLoader → FeatureEngineer → Model Training
+Uses new ML pipeline: DataLoader → Feature Store (feature set) → Model Training
 """
 
 import sys
@@ -12,7 +12,7 @@ import numpy as np
 from datetime import datetime
 from src.utils.config_loader import get_config
 from src.ml.data_loader import DataLoader
-from src.ml.feature_engineering import FeatureEngineer
+from src.ml.feature_store import get_feature_set
 from src.ml.models.xgboost_model import XGBoostModel
 from src.ml.models.lightgbm_model import LightGBMModel
 from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score, roc_auc_score
@@ -23,7 +23,8 @@ def train_model(
     timeframe='1m',
     horizon_label='label_h5',  # 3 minutes ahead
     algorithm='xgboost',
-    lookback=5
+    lookback=5,
+    feature_set='bar_engineered'
 ):
     """
     Train a simple model
@@ -34,6 +35,7 @@ def train_model(
         horizon_label: Label column to predict
         algorithm: 'xgboost' or 'lightgbm'
         lookback: Lookback window for features
+        feature_set: Feature set (name = latest version, or name:v<version>)
     """
     print("="*70)
     print("SIMPLE MODEL TRAINING")
@@ -42,6 +44,8 @@ def train_model(
     print(f"Timeframe: {timeframe}")
     print(f"Horizon: {horizon_label}")
     print(f"Lookback: {lookback}")
+    feature_set = get_feature_set(feature_set)
+    print(f"Feature set: {feature_set.key}")
     print()
 
     # Get config
@@ -66,14 +70,14 @@ def train_model(
 
     # Feature engineering
     print("Engineering features...")
-    engineer = FeatureEngineer()
-    df = engineer.add_all_features(df)
+    df = feature_set.build(df)
 
-    # Get feature columns
-    feature_cols = engineer.get_feature_names(include_base=True)
-
-    # Remove features that don't exist in data
-    feature_cols = [col for col in feature_cols if col in df.columns]
+    # Get feature columns (same columns the signal generator reads online)
+    feature_cols = feature_set.feature_columns
+    missing_cols = [col for col in feature_cols if col not in df.columns]
+    if missing_cols:
+        print(f"ERROR: Missing feature columns: {missing_cols}")
+        return None
 
     print(f"Features: {len(feature_cols)}")
     print(f"Features: {feature_cols[:10]}... (showing first 10)")
@@ -117,6 +121,7 @@ def train_model(
         model = LightGBMModel()
 
     model.train(X_train, y_train, X_val, y_val, verbose=False)
+    model.feature_set = feature_set.key
 
     duration = (datetime.now() - start_time).total_seconds()
     print(f"Training completed in {duration:.1f}s")
@@ -184,6 +189,7 @@ def train_model(
         'metrics': metrics,
         'model_path': model_path,
         'feature_cols': feature_cols,
+        'feature_set': feature_set.key,
         'lookback': lookback
     }
 
@@ -196,6 +202,7 @@ if __name__ == '__main__':
     parser.add_argument('--timeframe', type=str, default='1m')
     parser.add_argument('--horizon', type=str, default='label_h5', help='Label column (label_h1, label_h3, label_h5, label_h10)')
     parser.add_argument('--lookback', type=int, default=5, help='Lookback window')
+    parser.add_argument('--feature-set', type=str, default='bar_engineered', help='Feature set (name or name:v<version>)')
 
     args = parser.parse_args()
 
@@ -203,7 +210,8 @@ if __name__ == '__main__':
         algorithm=args.algorithm,
         timeframe=args.timeframe,
         horizon_label=args.horizon,
-        lookback=args.lookback
+        lookback=args.lookback,
+        feature_set=args.feature_set
     )
 
     if result:
@@ -15,7 +15,15 @@ from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import StandardScaler
 from sklearn.metrics import accuracy_score, classification_report
 import joblib
+import json
 import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from src.ml.feature_store import get_feature_set
+
+# Feature-Set der Tick-Modelle (LiveMLPredictor rechnet mit derselben Version)
+FEATURE_SET = get_feature_set('tick_mid')
 
 class EURUSDMLTrainer:
     def __init__(self):
@@ -100,30 +108,11 @@ class EURUSDMLTrainer:
             print("Not enough data for feature preparation")
             return None, None
         
-        # Convert to DataFrame
-        df = pd.DataFrame(data, columns=['bid', 'ask', 'time'])
-        df['bid'] = pd.to_numeric(df['bid'])
-        df['ask'] = pd.to_numeric(df['ask'])
-        df['mid'] = (df['bid'] + df['ask']) / 2
-        df['spread'] = df['ask'] - df['bid']
-        
-        # Create features
-        df['price_change'] = df['mid'].diff()
-        df['price_change_5'] = df['mid'].diff(5)
-        df['price_change_10'] = df['mid'].diff(10)
-        
-        # Moving averages
-        df['ma_5'] = df['mid'].rolling(5).mean()
-        df['ma_10'] = df['mid'].rolling(10).mean()
-        df['ma_20'] = df['mid'].rolling(20).mean()
+        # Convert to DataFrame (Tagestabellen kommen neueste zuerst)
+        df = pd.DataFrame(data, columns=FEATURE_SET.columns).sort_values('time', kind='stable')
         
-        # Volatility features
-        df['volatility_5'] = df['mid'].rolling(5).std()
-        df['volatility_10'] = df['mid'].rolling(10).std()
-        
-        # Trend indicators
-        df['trend_5'] = (df['mid'] > df['ma_5']).astype(int)
-        df['trend_10'] = (df['mid'] > df['ma_10']).astype(int)
+        # Create features (Feature Store, wie LiveMLPredictor)
+        df = FEATURE_SET.build(df)
         
         # Create target (next price direction)
         df['target'] = (df['mid'].shift(-1) > df['mid']).astype(int)
@@ -135,12 +124,7 @@ class EURUSDMLTrainer:
             print("Not enough data after feature engineering")
             return None, None
         
-        # Feature columns
-        feature_columns = ['bid', 'ask', 'spread', 'price_change', 'price_change_5', 
-                          'price_change_10', 'ma_5', 'ma_10', 'ma_20', 
-                          'volatility_5', 'volatility_10', 'trend_5', 'trend_10']
-        
-        X = df[feature_columns].values
+        X = FEATURE_SET.matrix(df)
         y = df['target'].values[:-1]  # Remove last target (no future data)
         X = X[:-1]  # Align X with y
         
@@ -217,6 +201,10 @@ class EURUSDMLTrainer:
             for name, model in self.trained_models.items():
                 joblib.dump(model, f"{models_dir}/{name}.joblib")
             
+            # Feature-Set der Modelle
+            with open(f"{models_dir}/feature_set.json", 'w') as f:
+                json.dump({'feature_set': FEATURE_SET.key, 'feature_columns': FEATURE_SET.feature_columns}, f, indent=2)
+            
             print(f"\n✅ Models saved to {models_dir}/ directory")
             
         except Exception as e:
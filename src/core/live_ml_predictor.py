@@ -11,12 +11,20 @@ import pandas as pd
 import numpy as np
 from datetime import datetime
 import json
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from src.ml.feature_store import get_feature_set
+
+# Modelle ohne feature_set.json wurden mit diesen Features trainiert
+LEGACY_FEATURE_SET = 'tick_mid:v1'
 
 class LiveMLPredictor:
     def __init__(self, models_dir="models"):
         self.models_dir = models_dir
         self.models = {}
         self.scaler = None
+        self.feature_set = get_feature_set(LEGACY_FEATURE_SET)
         self.load_models()
     
     def load_models(self):
@@ -32,6 +40,13 @@ class LiveMLPredictor:
                 self.scaler = joblib.load(scaler_path)
                 print("✅ Scaler loaded")
             
+            # Feature-Set der Modelle (EURUSDMLTrainer.save_models)
+            feature_set_path = os.path.join(self.models_dir, "feature_set.json")
+            if os.path.exists(feature_set_path):
+                with open(feature_set_path) as f:
+                    self.feature_set = get_feature_set(json.load(f)['feature_set'])
+                print(f"✅ Feature set {self.feature_set.key}")
+            
             # Load models
             model_files = ['random_forest.joblib', 'gradient_boost.joblib', 
                           'neural_network.joblib', 'svm.joblib']
@@ -97,42 +112,18 @@ class LiveMLPredictor:
             return None
         
         # Convert to DataFrame (reverse for chronological order)
-        df = pd.DataFrame(data[::-1], columns=['bid', 'ask', 'time'])
-        df['bid'] = pd.to_numeric(df['bid'])
-        df['ask'] = pd.to_numeric(df['ask'])
-        df['mid'] = (df['bid'] + df['ask']) / 2
-        df['spread'] = df['ask'] - df['bid']
-        
-        # Create same features as in training
-        df['price_change'] = df['mid'].diff()
-        df['price_change_5'] = df['mid'].diff(5)
-        df['price_change_10'] = df['mid'].diff(10)
+        df = pd.DataFrame(data[::-1], columns=self.feature_set.columns)
         
-        # Moving averages
-        df['ma_5'] = df['mid'].rolling(5).mean()
-        df['ma_10'] = df['mid'].rolling(10).mean()
-        df['ma_20'] = df['mid'].rolling(20).mean()
-        
-        # Volatility features
-        df['volatility_5'] = df['mid'].rolling(5).std()
-        df['volatility_10'] = df['mid'].rolling(10).std()
-        
-        # Trend indicators
-        df['trend_5'] = (df['mid'] > df['ma_5']).astype(int)
-        df['trend_10'] = (df['mid'] > df['ma_10']).astype(int)
+        # Create same features as in training (Feature Store)
+        df = self.feature_set.build(df)
         
         # Remove NaN values
-        df = df.dropna()
+        df = df.dropna(subset=self.feature_set.feature_columns)
         
         if len(df) == 0:
             return None
         
-        # Feature columns (same as training)
-        feature_columns = ['bid', 'ask', 'spread', 'price_change', 'price_change_5', 
-                          'price_change_10', 'ma_5', 'ma_10', 'ma_20', 
-                          'volatility_5', 'volatility_10', 'trend_5', 'trend_10']
-        
-        return df[feature_columns].values[-1:]  # Return latest features only
+        return self.feature_set.matrix(df)[-1:]  # Return latest features only
     
     def get_predictions(self):
         """Macht Live Predictions mit allen Modellen"""
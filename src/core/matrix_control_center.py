@@ -8,6 +8,7 @@ Single-Port Web-Application mit Routing
 
 import sys
 import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 # Fix encoding für Windows
 if sys.platform == "win32":
     import io
@@ -20,6 +21,7 @@ import pandas as pd
 import json
 from datetime import datetime, timedelta
 import numpy as np
+import indicators
 from sklearn.ensemble import RandomForestClassifier, GradientBoostingClassifier
 from sklearn.svm import SVC
 from sklearn.neural_network import MLPClassifier
@@ -536,10 +538,24 @@ def get_local_postgres_connection():
 class ServerTickDataManager:
     def __init__(self):
         self.available_tables = []
+        self.partitioned = False  # partitionierte Tabelle `ticks` vorhanden
+        self.summaries = False  # bar_summaries vorhanden (Bar Aggregator V2, mode "database")
         self.connection_status = False
         self.last_update = None
         self._refresh_tables()
     
+    @staticmethod
+    def _has_partitioned_ticks(cursor):
+        """Prüft ob die partitionierte Tick-Tabelle `ticks` existiert"""
+        cursor.execute("SELECT to_regclass('ticks') IS NOT NULL")
+        return cursor.fetchone()[0]
+    
+    @staticmethod
+    def _has_bar_summaries(cursor):
+        """Prüft ob die materialisierten Bar-Summaries existieren"""
+        cursor.execute("SELECT to_regclass('bar_summaries') IS NOT NULL")
+        return cursor.fetchone()[0]
+    
     def _refresh_tables(self):
         """Aktualisiere verfügbare Tabellen vom Server"""
         try:
@@ -550,11 +566,15 @@ class ServerTickDataManager:
                 SELECT table_name 
                 FROM information_schema.tables 
                 WHERE table_name LIKE 'ticks_%' 
+                  AND table_name NOT LIKE 'ticks\\_p\\_%'
+                  AND table_name NOT LIKE '%\\_default'
                 ORDER BY table_name DESC
             """)
             
             tables = cursor.fetchall()
             self.available_tables = [table[0] for table in tables]
+            self.partitioned = self._has_partitioned_ticks(cursor)
+            self.summaries = self._has_bar_summaries(cursor)
             self.connection_status = True
             self.last_update = datetime.now()
             
@@ -572,10 +592,14 @@ class ServerTickDataManager:
                     SELECT table_name 
                     FROM information_schema.tables 
                     WHERE table_name LIKE 'ticks_%' 
+                      AND table_name NOT LIKE 'ticks\\_p\\_%'
+                      AND table_name NOT LIKE '%\\_default'
                     ORDER BY table_name DESC
                 """)
                 tables = cursor.fetchall()
                 self.available_tables = [table[0] for table in tables]
+                self.partitioned = self._has_partitioned_ticks(cursor)
+                self.summaries = self._has_bar_summaries(cursor)
                 conn.close()
                 print(f"[FALLBACK] Local: {len(self.available_tables)} tables")
             except Exception as local_e:
@@ -603,6 +627,21 @@ class ServerTickDataManager:
             cursor = conn.cursor()
             
             symbol_data = {}
+            if self.partitioned:
+                # Ein Query über `ticks` statt Zählen pro Tagestabelle
+                cursor.execute("""
+                    SELECT symbol, COUNT(*), COUNT(DISTINCT timestamp::date), MAX(timestamp)::date
+                    FROM ticks
+                    WHERE timestamp >= CURRENT_DATE - 10
+                    GROUP BY symbol
+                """)
+                for symbol, count, days, latest in cursor.fetchall():
+                    symbol_data[symbol] = {
+                        'total_ticks': count,
+                        'tables': days,
+                        'latest_date': latest.strftime('%Y%m%d')
+                    }
+
             for table in self.available_tables[:10]:  # Letzte 10 Tabellen
                 try:
                     cursor.execute(f"SELECT COUNT(*) FROM {table}")
@@ -705,33 +744,23 @@ class RealTimeMLAnalyzer:
             df['spread_pct'] = (df['spread'] / df['price_avg']) * 100
             
             # Moving averages
-            df['ma_5'] = df['price_avg'].rolling(window=5, min_periods=1).mean()
-            df['ma_10'] = df['price_avg'].rolling(window=10, min_periods=1).mean()
-            df['ma_20'] = df['price_avg'].rolling(window=20, min_periods=1).mean()
+            price = df['price_avg']
+            df['ma_5'] = indicators.sma(price, 5)
+            df['ma_10'] = indicators.sma(price, 10)
+            df['ma_20'] = indicators.sma(price, 20)
             
-            # RSI (Simplified version)
-            delta = df['price_avg'].diff()
-            gain = (delta.where(delta > 0, 0)).rolling(window=14, min_periods=1).mean()
-            loss = (-delta.where(delta < 0, 0)).rolling(window=14, min_periods=1).mean()
-            rs = gain / loss.replace(0, 0.0001)
-            df['rsi'] = 100 - (100 / (1 + rs))
+            # RSI (Wilder)
+            df['rsi'] = indicators.rsi(price, 14)
             
             # Bollinger Bands
-            rolling_mean = df['price_avg'].rolling(window=20, min_periods=1).mean()
-            rolling_std = df['price_avg'].rolling(window=20, min_periods=1).std()
-            df['bb_upper'] = rolling_mean + (rolling_std * 2)
-            df['bb_lower'] = rolling_mean - (rolling_std * 2)
-            df['bb_position'] = (df['price_avg'] - df['bb_lower']) / (df['bb_upper'] - df['bb_lower'])
+            df['bb_upper'], _, df['bb_lower'] = indicators.bollinger_bands(price, 20, 2)
+            df['bb_position'] = (price - df['bb_lower']) / (df['bb_upper'] - df['bb_lower'])
             
-            # MACD (Simplified)
-            ema_12 = df['price_avg'].ewm(span=12).mean()
-            ema_26 = df['price_avg'].ewm(span=26).mean()
-            df['macd'] = ema_12 - ema_26
-            df['macd_signal'] = df['macd'].ewm(span=9).mean()
-            df['macd_histogram'] = df['macd'] - df['macd_signal']
+            # MACD
+            df['macd'], df['macd_signal'], df['macd_histogram'] = indicators.macd(price)
             
             # Volatility
-            df['volatility'] = df['price_avg'].rolling(window=20, min_periods=1).std()
+            df['volatility'] = indicators.rolling_std(price, 20)
             
             # Price momentum
             df['momentum_5'] = df['price_avg'].pct_change(5)
@@ -2932,17 +2961,35 @@ def dashboard_stats():
             conn = tick_manager.get_connection()
             cursor = conn.cursor()
             
-            cursor.execute(f"""
-                SELECT COUNT(*) as total_ticks,
-                       MIN(bid) as min_bid, MAX(bid) as max_bid,
-                       MIN(ask) as min_ask, MAX(ask) as max_ask,
-                       AVG((bid + ask) / 2) as avg_price,
-                       AVG(ask - bid) as avg_spread
-                FROM {latest_table}
-                WHERE bid IS NOT NULL AND ask IS NOT NULL
-            """)
+            eurusd_stats = None
+            if tick_manager.summaries:
+                # Tag der Tick-Tabelle aus den 1h Summaries (24 Rows statt Scan der Tick-Tabelle)
+                day = datetime.strptime(latest_table.rsplit('_', 1)[1], '%Y%m%d').date()
+                cursor.execute("""
+                    SELECT SUM(tick_count) as total_ticks,
+                           MIN(bid_low) as min_bid, MAX(bid_high) as max_bid,
+                           MIN(ask_low) as min_ask, MAX(ask_high) as max_ask,
+                           SUM(mid_sum) / NULLIF(SUM(tick_count), 0) as avg_price,
+                           SUM(spread_sum) / NULLIF(SUM(tick_count), 0) as avg_spread
+                    FROM bar_summaries
+                    WHERE symbol = 'EURUSD' AND timeframe = '1h'
+                      AND bucket >= %s AND bucket < %s
+                """, (day, day + timedelta(days=1)))
+                eurusd_stats = cursor.fetchone()
+                if eurusd_stats and eurusd_stats[0] is None:
+                    eurusd_stats = None
             
-            eurusd_stats = cursor.fetchone()
+            if eurusd_stats is None:
+                cursor.execute(f"""
+                    SELECT COUNT(*) as total_ticks,
+                           MIN(bid) as min_bid, MAX(bid) as max_bid,
+                           MIN(ask) as min_ask, MAX(ask) as max_ask,
+                           AVG((bid + ask) / 2) as avg_price,
+                           AVG(ask - bid) as avg_spread
+                    FROM {latest_table}
+                    WHERE bid IS NOT NULL AND ask IS NOT NULL
+                """)
+                eurusd_stats = cursor.fetchone()
             conn.close()
             
             total_ticks = eurusd_stats[0] if eurusd_stats else 0
@@ -15,6 +15,7 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 import pandas as pd
+import indicators
 from datetime import datetime, timedelta
 import json
 from typing import Dict, List, Any, Optional
@@ -257,8 +258,8 @@ class OrderDecisionTrackerPostgreSQL:
             df['time'] = pd.to_datetime(df['time'], unit='s')
             
             # Calculate indicators
-            df['sma_20'] = df['close'].rolling(window=20).mean()
-            df['sma_50'] = df['close'].rolling(window=50).mean()
+            df['sma_20'] = indicators.sma(df['close'], 20)
+            df['sma_50'] = indicators.sma(df['close'], 50)
             df['rsi'] = self.calculate_rsi(df['close'])
             
             current_price = df['close'].iloc[-1]
@@ -301,13 +302,8 @@ class OrderDecisionTrackerPostgreSQL:
             return 'UNKNOWN'
     
     def calculate_rsi(self, prices, period=14):
-        """Calculate RSI indicator"""
-        delta = prices.diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-        rs = gain / loss
-        rsi = 100 - (100 / (1 + rs))
-        return rsi
+        """Calculate RSI indicator (Wilder)"""
+        return indicators.rsi(prices, period)
     
     def make_trading_decision(self, symbol: str):
         """
@@ -0,0 +1,354 @@
+"""
+Async Database Manager für PostgreSQL
+asyncio-Variante des DatabaseManager (asyncpg) für I/O-gebundene Dienste
+
+- Gleiche API wie DatabaseManager, alle Methoden als Coroutines:
+  execute, execute_many, execute_many_batches, fetch_one, fetch_all, fetch_dict, fetch_all_dict,
+  copy_rows, copy_rows_many, stream, fetch_dataframe, table_exists
+- Queries behalten die psycopg2 Platzhalter (%s), sie werden einmal pro SQL
+  in $1, $2, ... umgewandelt; benannte Platzhalter %(name)s gehen nicht
+- asyncpg cached Prepared Statements pro Connection selbst
+  (database.<type>.prepared_statements = false schaltet das ab)
+- Der Pool wird beim ersten Query im laufenden Event Loop angelegt und ist an
+  diesen Loop gebunden (ein Loop pro Prozess bzw. Dienst)
+
+Unterschied zu psycopg2: asyncpg prüft Parameter-Typen streng (z.B. datetime
+für TIMESTAMP, keine numpy Scalars, kein str für Zahlen).
+
+Benötigt asyncpg (optional).
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+# asyncpg ist optional (nur für Dienste mit database.async.enabled)
+try:
+    import asyncpg
+except ImportError:
+    asyncpg = None
+
+from ..utils.logger import get_logger, log_exception
+from ..utils.config_loader import get_config
+from .database_manager import DEFAULT_CHUNK_ROWS, to_positional_sql
+
+
+def async_enabled() -> bool:
+    """True wenn Dienste die Async-Variante nutzen sollen (und asyncpg installiert ist)"""
+    if not get_config().get('database.async.enabled', False):
+        return False
+    if asyncpg is None:
+        get_logger('AsyncDatabaseManager').warning(
+            "database.async.enabled is set but asyncpg is not installed - using psycopg2"
+        )
+        return False
+    return True
+
+
+@lru_cache(maxsize=1024)
+def _convert(query: str) -> str:
+    """psycopg2 SQL (%s) -> asyncpg SQL ($n)"""
+    sql, _ = to_positional_sql(query)
+    if sql is None:
+        raise ValueError("Named placeholders (%(name)s) are not supported by AsyncDatabaseManager")
+    return sql
+
+
+def _args(params: Optional[Sequence[Any]]) -> tuple:
+    return tuple(params) if params else ()
+
+
+class AsyncDatabaseManager:
+    """PostgreSQL Database Manager für asyncio (asyncpg Pool)"""
+
+    def __init__(self, db_type: str = 'local'):
+        """
+        Initialisiert den Async Database Manager (Pool wird lazy angelegt)
+
+        Args:
+            db_type: 'local' oder 'remote'
+        """
+        if asyncpg is None:
+            raise RuntimeError("asyncpg is required for AsyncDatabaseManager (pip install asyncpg)")
+
+        self.logger = get_logger(self.__class__.__name__)
+        self.config = get_config()
+        self.db_type = db_type
+
+        self.db_config = self.config.get_database_config(db_type)
+        self.use_prepared = self.db_config.get('prepared_statements', True)
+
+        self.pool = None
+        self._pool_lock: Optional[asyncio.Lock] = None
+
+    async def _get_pool(self):
+        """Pool im laufenden Event Loop anlegen (einmalig)"""
+        if self.pool is not None:
+            return self.pool
+
+        if self._pool_lock is None:
+            self._pool_lock = asyncio.Lock()
+
+        async with self._pool_lock:
+            if self.pool is None:
+                try:
+                    self.pool = await asyncpg.create_pool(
+                        host=self.db_config['host'],
+                        port=self.db_config['port'],
+                        database=self.db_config['database'],
+                        user=self.db_config['user'],
+                        password=self.db_config['password'],
+                        min_size=self.config.get('database.async.min_size', 1),
+                        max_size=self.db_config.get('pool_size', 5),
+                        statement_cache_size=100 if self.use_prepared else 0
+                    )
+                    self.logger.info(
+                        f"Async database pool initialized ({self.db_type}): "
+                        f"{self.db_config['host']}:{self.db_config['port']}/{self.db_config['database']}"
+                    )
+                except Exception as e:
+                    log_exception(self.logger, e, "Failed to initialize async database pool")
+                    raise
+
+        return self.pool
+
+    @asynccontextmanager
+    async def get_connection(self):
+        """
+        Context Manager für eine Connection mit Transaktion
+
+        Yields:
+            asyncpg.Connection (Commit am Ende, Rollback bei Exception)
+        """
+        pool = await self._get_pool()
+        async with pool.acquire() as conn:
+            try:
+                async with conn.transaction():
+                    yield conn
+            except Exception as e:
+                log_exception(self.logger, e, "Database connection error")
+                raise
+
+    async def execute(self, query: str, params: tuple = None) -> None:
+        """
+        Führt Query aus (INSERT, UPDATE, DELETE)
+
+        Args:
+            query: SQL Query
+            params: Query Parameter
+        """
+        async with self.get_connection() as conn:
+            await conn.execute(_convert(query), *_args(params))
+
+    async def execute_many(self, query: str, params_list: List[tuple]) -> None:
+        """
+        Führt Query mehrfach aus (Batch, eine Transaktion)
+
+        Args:
+            query: SQL Query
+            params_list: Liste von Query Parametern
+        """
+        if not params_list:
+            return
+        async with self.get_connection() as conn:
+            await conn.executemany(_convert(query), [_args(params) for params in params_list])
+
+    async def execute_many_batches(self, batches: List[Tuple[str, List[tuple]]]) -> int:
+        """
+        Führt mehrere Batches in einer einzigen Transaktion aus
+
+        Args:
+            batches: Liste von (query, params_list)
+
+        Returns:
+            Anzahl ausgeführter Parameter-Sets insgesamt
+        """
+        executed = 0
+        async with self.get_connection() as conn:
+            for query, params_list in batches:
+                if params_list:
+                    await conn.executemany(_convert(query), [_args(params) for params in params_list])
+                    executed += len(params_list)
+        return executed
+
+    async def copy_rows(self, table: str, columns: Sequence[str], rows: List[Sequence[Any]]) -> int:
+        """
+        Schreibt Rows per COPY (binär) in eine Tabelle
+
+        Args:
+            table: Tabellenname
+            columns: Spaltennamen in Reihenfolge der Row-Werte
+            rows: Liste von Rows, None wird zu NULL
+
+        Returns:
+            Anzahl geschriebener Rows
+        """
+        return await self.copy_rows_many([(table, columns, rows)])
+
+    async def copy_rows_many(self, batches: List[Tuple[str, Sequence[str], List[Sequence[Any]]]]) -> int:
+        """
+        Schreibt mehrere Tabellen per COPY in einer einzigen Transaktion
+
+        Args:
+            batches: Liste von (table, columns, rows)
+
+        Returns:
+            Anzahl geschriebener Rows insgesamt
+        """
+        written = 0
+        async with self.get_connection() as conn:
+            for table, columns, rows in batches:
+                if rows:
+                    await conn.copy_records_to_table(table, records=rows, columns=list(columns))
+                    written += len(rows)
+        return written
+
+    async def fetch_one(self, query: str, params: tuple = None) -> Optional[Tuple]:
+        """
+        Holt einen einzelnen Row
+
+        Returns:
+            Row als Tuple oder None
+        """
+        async with self.get_connection() as conn:
+            row = await conn.fetchrow(_convert(query), *_args(params))
+            return tuple(row) if row is not None else None
+
+    async def fetch_all(self, query: str, params: tuple = None) -> List[Tuple]:
+        """
+        Holt alle Rows
+
+        Returns:
+            Liste von Rows als Tuples
+        """
+        async with self.get_connection() as conn:
+            rows = await conn.fetch(_convert(query), *_args(params))
+            return [tuple(row) for row in rows]
+
+    async def fetch_dict(self, query: str, params: tuple = None) -> Optional[Dict[str, Any]]:
+        """
+        Holt einen einzelnen Row als Dictionary
+
+        Returns:
+            Row als Dictionary oder None
+        """
+        async with self.get_connection() as conn:
+            row = await conn.fetchrow(_convert(query), *_args(params))
+            return dict(row) if row is not None else None
+
+    async def fetch_all_dict(self, query: str, params: tuple = None) -> List[Dict[str, Any]]:
+        """
+        Holt alle Rows als Dictionaries
+
+        Returns:
+            Liste von Rows als Dictionaries
+        """
+        async with self.get_connection() as conn:
+            rows = await conn.fetch(_convert(query), *_args(params))
+            return [dict(row) for row in rows]
+
+    async def stream(
+        self,
+        query: str,
+        params: tuple = None,
+        chunk_rows: Optional[int] = None
+    ) -> AsyncIterator[List[Tuple]]:
+        """
+        Liefert die Rows eines SELECT in Chunks (serverseitiger Cursor)
+
+        Args:
+            query: SQL Query (nur SELECT)
+            params: Query Parameter
+            chunk_rows: Rows pro Chunk
+
+        Yields:
+            Liste von Rows als Tuples
+        """
+        chunk_rows = chunk_rows or DEFAULT_CHUNK_ROWS
+        async with self.get_connection() as conn:
+            cursor = await conn.cursor(_convert(query), *_args(params))
+            while True:
+                rows = await cursor.fetch(chunk_rows)
+                if not rows:
+                    break
+                yield [tuple(row) for row in rows]
+
+    async def fetch_dataframe(
+        self,
+        query: str,
+        params: tuple = None,
+        chunk_rows: Optional[int] = None
+    ) -> pd.DataFrame:
+        """
+        Holt ein Ergebnis direkt als DataFrame (chunkweise, siehe stream)
+
+        Returns:
+            DataFrame (ohne Rows: leer, Spalten aus dem Statement)
+        """
+        chunk_rows = chunk_rows or DEFAULT_CHUNK_ROWS
+        frames = []
+        async with self.get_connection() as conn:
+            statement = await conn.prepare(_convert(query))
+            columns = [attr.name for attr in statement.get_attributes()]
+            cursor = await statement.cursor(*_args(params))
+            while True:
+                rows = await cursor.fetch(chunk_rows)
+                if not rows:
+                    break
+                frames.append(pd.DataFrame.from_records(
+                    [tuple(row) for row in rows], columns=columns, coerce_float=True
+                ))
+
+        if not frames:
+            return pd.DataFrame(columns=columns)
+        return frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True)
+
+    async def table_exists(self, table_name: str) -> bool:
+        """
+        Prüft ob Tabelle existiert
+
+        Args:
+            table_name: Tabellenname
+
+        Returns:
+            True wenn Tabelle existiert
+        """
+        query = """
+            SELECT EXISTS (
+                SELECT FROM information_schema.tables
+                WHERE table_schema = 'public'
+                AND table_name = %s
+            )
+        """
+        result = await self.fetch_one(query, (table_name,))
+        return result[0] if result else False
+
+    async def test_connection(self) -> bool:
+        """
+        Testet Database Verbindung
+
+        Returns:
+            True wenn Verbindung erfolgreich
+        """
+        try:
+            result = await self.fetch_one("SELECT 1")
+            return result[0] == 1
+        except Exception as e:
+            log_exception(self.logger, e, "Connection test failed")
+            return False
+
+    async def close(self):
+        """Schließt den Pool"""
+        if self.pool is not None:
+            await self.pool.close()
+            self.pool = None
+            # Lock gehört zum alten Event Loop
+            self._pool_lock = None
+            self.logger.info(f"Async database pool closed ({self.db_type})")
+
+    def __repr__(self) -> str:
+        """String Representation"""
+        return f"AsyncDatabaseManager(type={self.db_type}, host={self.db_config['host']})"
@@ -0,0 +1,552 @@
+"""
+Backfill
+Füllt Bars, Ticks und Features aus der MT5 Historie nach (nach einem Ausfall
+oder für ein neues Symbol)
+
+- Zeitraum in Chunks von data.backfill.chunk_days ganzen UTC-Tagen
+  (Chunk-Grenzen an der Epoch ausgerichtet, damit sie über Läufe stabil sind)
+- bars: M1 Rates per copy_rates_range, 5m ... 1d kaskadierend daraus
+  (cascade_bars), Upsert in bars_<timeframe> per insert_values_many - zusammen
+  mit dem Fortschritt in einer Transaktion
+- ticks: nur Tage innerhalb data.tick_storage_days, pro Tag per replace_rows
+  (DELETE + COPY) in das aktive Tick-Layout (ticks_YYYYMMDD, partitioniert
+  oder kompakt), dazu 5s Bars aus den Ticks
+- features: FeatureCalculator über den Chunk plus Warm-up Bars davor
+- Fortschritt pro (symbol, stage, chunk_start) in backfill_progress; erledigte
+  Chunks werden beim nächsten Lauf übersprungen. Der Chunk mit dem Ende des
+  Zeitraums ist unvollständig und wird nie als erledigt markiert.
+- Symbols parallel in einem Thread Pool (MT5 Aufrufe serialisiert, numpy und
+  psycopg2 geben den GIL frei)
+
+Rates von MT5 sind Bid-basiert; der Live-Pfad (BarBuilder) nutzt Last bzw. Bid.
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timezone
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+try:
+    import MetaTrader5 as mt5
+except ImportError:
+    mt5 = None
+
+from ..utils.logger import get_logger, log_exception
+from ..utils.config_loader import get_config
+from .database_manager import get_database
+from .bar_resampler import TIMEFRAME_SECONDS, cascade_bars, resample_ticks
+from .feature_calculator import FeatureCalculator
+from .tick_collector import TickCollector, daily_table_sql
+from .tick_partitions import TickPartitionManager, partitioning_enabled
+from .tick_compact import CompactTickStore, COMPACT_TABLE, COMPACT_COLUMNS, compact_enabled
+
+PROGRESS_TABLE = 'backfill_progress'
+
+DAY_SECONDS = 86400
+TIMEFRAME_M1 = 1
+
+BAR_COLUMNS = ('symbol', 'timestamp', 'open', 'high', 'low', 'close', 'volume', 'tick_count')
+
+
+def _utc(epoch: int) -> datetime:
+    """Epoch-Sekunden als timezone-aware UTC datetime (für MT5 und Progress)"""
+    return datetime.fromtimestamp(epoch, tz=timezone.utc)
+
+
+class Backfiller:
+    """Lädt MT5 Historie in Chunks und schreibt Bars, Ticks und Features"""
+
+    STAGES = ('bars', 'ticks', 'features')
+
+    def __init__(
+        self,
+        symbols: List[str] = None,
+        db_type: str = 'local',
+        mt5_module: Any = None,
+        chunk_days: Optional[int] = None,
+        workers: Optional[int] = None,
+        stages: Sequence[str] = STAGES
+    ):
+        """
+        Initialisiert den Backfiller
+
+        Args:
+            symbols: Liste der Symbols (None = aus Config)
+            db_type: Database Type ('local' oder 'remote')
+            mt5_module: MT5 API (None = MetaTrader5, z.B. FakeMT5)
+            chunk_days: Tage pro Chunk (None = data.backfill.chunk_days)
+            workers: Parallel verarbeitete Symbols (None = data.backfill.workers)
+            stages: Auszuführende Stages (bars, ticks, features)
+        """
+        self.logger = get_logger(self.__class__.__name__)
+        self.config = get_config()
+        self.db = get_database(db_type)
+
+        self.mt5 = mt5_module or mt5
+        if self.mt5 is None:
+            raise ImportError("MetaTrader5 not available - pass mt5_module (e.g. FakeMT5)")
+        self._mt5_lock = threading.Lock()
+        self.mt5_connected = False
+
+        backfill_config = self.config.get('data.backfill', {}) or {}
+        self.symbols = symbols or self.config.get_symbols()
+        self.chunk_days = chunk_days or backfill_config.get('chunk_days', 7)
+        self.workers = workers or backfill_config.get('workers', 4)
+        self.stages = [stage for stage in self.STAGES if stage in stages]
+        self.tick_storage_days = self.config.get('data.tick_storage_days', 7)
+
+        # Bar Timeframes (5s aus Ticks, Rest aus M1 Rates)
+        bar_types = self.config.get('data.bar_types', ['1m', '5m', '15m', '1h', '4h'])
+        self.timeframes = sorted(
+            (tf for tf in bar_types if TIMEFRAME_SECONDS[tf] >= 60),
+            key=lambda tf: TIMEFRAME_SECONDS[tf]
+        )
+        self.tick_timeframes = [tf for tf in bar_types if TIMEFRAME_SECONDS[tf] < 60]
+
+        # Tick-Layout wie TickCollector
+        self.compact = compact_enabled()
+        if self.compact:
+            self.partitions = CompactTickStore(self.db)
+        else:
+            self.partitions = TickPartitionManager(self.db) if partitioning_enabled() else None
+
+        self.features = FeatureCalculator(symbols=self.symbols, db_type=db_type) if 'features' in self.stages else None
+
+        self._table_ready = False
+
+        # Statistics
+        self._stats_lock = threading.Lock()
+        self.stats = {
+            'chunks_done': 0,
+            'chunks_skipped': 0,
+            'bars_written': 0,
+            'ticks_written': 0,
+            'features_written': 0,
+            'errors': 0,
+            'start_time': None
+        }
+
+    # === MT5 ===
+
+    def connect(self) -> bool:
+        """
+        Verbindet mit MT5
+
+        Returns:
+            True wenn Verbindung erfolgreich
+        """
+        try:
+            mt5_config = self.config.get_mt5_config()
+
+            if not self.mt5.initialize(path=mt5_config.get('path')):
+                self.logger.error(f"MT5 initialization failed: {self.mt5.last_error()}")
+                return False
+
+            if not self.mt5.login(
+                login=mt5_config['login'],
+                password=mt5_config['password'],
+                server=mt5_config['server']
+            ):
+                self.logger.error(f"MT5 login failed: {self.mt5.last_error()}")
+                self.mt5.shutdown()
+                return False
+
+            for symbol in self.symbols:
+                if not self.mt5.symbol_select(symbol, True):
+                    self.logger.warning(f"Could not enable symbol: {symbol}")
+
+            self.mt5_connected = True
+            self.logger.info("✓ MT5 connected")
+            return True
+
+        except Exception as e:
+            log_exception(self.logger, e, "MT5 connection failed")
+            return False
+
+    def disconnect(self):
+        """Trennt MT5 Verbindung"""
+        if self.mt5_connected:
+            self.mt5.shutdown()
+            self.mt5_connected = False
+            self.logger.info("MT5 disconnected")
+
+    def _fetch_rates(self, symbol: str, start: int, end: int) -> Optional[np.ndarray]:
+        """M1 Rates mit Beginn in [start, end)"""
+        with self._mt5_lock:
+            rates = self.mt5.copy_rates_range(symbol, TIMEFRAME_M1, _utc(start), _utc(end - 1))
+        if rates is None:
+            self.logger.error(f"[{symbol}] copy_rates_range failed: {self.mt5.last_error()}")
+            return None
+        return rates[(rates['time'] >= start) & (rates['time'] < end)]
+
+    def _fetch_ticks(self, symbol: str, start: int, end: int) -> Optional[np.ndarray]:
+        """Ticks in [start, end)"""
+        with self._mt5_lock:
+            ticks = self.mt5.copy_ticks_range(symbol, _utc(start), _utc(end), self.mt5.COPY_TICKS_ALL)
+        if ticks is None:
+            self.logger.error(f"[{symbol}] copy_ticks_range failed: {self.mt5.last_error()}")
+            return None
+        return ticks[(ticks['time_msc'] >= start * 1000) & (ticks['time_msc'] < end * 1000)]
+
+    # === Fortschritt ===
+
+    def ensure_table(self):
+        """Legt die Fortschritts-Tabelle an (einmalig)"""
+        if self._table_ready:
+            return
+        self.db.execute(f"""
+            CREATE TABLE IF NOT EXISTS {PROGRESS_TABLE} (
+                symbol VARCHAR(20) NOT NULL,
+                stage VARCHAR(20) NOT NULL,
+                chunk_start TIMESTAMP WITH TIME ZONE NOT NULL,
+                chunk_end TIMESTAMP WITH TIME ZONE NOT NULL,
+                rows INTEGER NOT NULL DEFAULT 0,
+                completed_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+                PRIMARY KEY (symbol, stage, chunk_start)
+            )
+        """)
+        self._table_ready = True
+
+    def completed_chunks(self, symbol: str) -> Set[Tuple[str, int, int]]:
+        """
+        Holt die erledigten Chunks eines Symbols
+
+        Returns:
+            Set von (stage, chunk_start, chunk_end) in Epoch-Sekunden
+        """
+        self.ensure_table()
+        rows = self.db.fetch_all(
+            f"SELECT stage, chunk_start, chunk_end FROM {PROGRESS_TABLE} WHERE symbol = %s",
+            (symbol,)
+        )
+        return {(stage, int(start.timestamp()), int(end.timestamp())) for stage, start, end in rows}
+
+    def _progress_batch(self, symbol: str, stage: str, chunk: Tuple[int, int], rows: int) -> Tuple[str, List[tuple]]:
+        """Upsert eines erledigten Chunks für insert_values_many"""
+        return f"""
+            INSERT INTO {PROGRESS_TABLE} (symbol, stage, chunk_start, chunk_end, rows)
+            VALUES %s
+            ON CONFLICT (symbol, stage, chunk_start) DO UPDATE SET
+                chunk_end = EXCLUDED.chunk_end,
+                rows = EXCLUDED.rows,
+                completed_at = NOW()
+        """, [(symbol, stage, _utc(chunk[0]), _utc(chunk[1]), rows)]
+
+    def _count(self, key: str, value: int = 1):
+        with self._stats_lock:
+            self.stats[key] += value
+
+    # === Chunks ===
+
+    def chunks(self, start: int, end: int) -> List[Tuple[int, int, bool]]:
+        """
+        Teilt [start, end) in Chunks ganzer UTC-Tage
+
+        Args:
+            start: Beginn in Epoch-Sekunden (wird auf die Chunk-Grenze gefloort)
+            end: Ende in Epoch-Sekunden (exklusiv)
+
+        Returns:
+            Liste von (chunk_start, chunk_end, complete)
+        """
+        size = self.chunk_days * DAY_SECONDS
+        chunks = []
+        chunk_start = start - start % size
+        while chunk_start < end:
+            chunk_end = chunk_start + size
+            chunks.append((chunk_start, min(chunk_end, end), chunk_end <= end))
+            chunk_start = chunk_end
+        return chunks
+
+    # === Stages ===
+
+    def _bar_sql(self, timeframe: str) -> str:
+        """Upsert für bars_<timeframe> (Backfill ersetzt vorhandene Bars)"""
+        return f"""
+            INSERT INTO bars_{timeframe}
+                ({', '.join(BAR_COLUMNS)})
+            VALUES %s
+            ON CONFLICT (symbol, timestamp)
+            DO UPDATE SET
+                open = EXCLUDED.open,
+                high = EXCLUDED.high,
+                low = EXCLUDED.low,
+                close = EXCLUDED.close,
+                volume = EXCLUDED.volume,
+                tick_count = EXCLUDED.tick_count
+        """
+
+    @staticmethod
+    def _bar_rows(symbol: str, bars: Dict[str, np.ndarray]) -> List[tuple]:
+        """Bar-Arrays als Rows (Reihenfolge wie BAR_COLUMNS, Zeit wie BarBuilder)"""
+        n = len(bars['bucket'])
+        return list(zip(
+            [symbol] * n,
+            [datetime.fromtimestamp(bucket) for bucket in bars['bucket'].tolist()],
+            bars['open'].tolist(),
+            bars['high'].tolist(),
+            bars['low'].tolist(),
+            bars['close'].tolist(),
+            bars['volume'].tolist(),
+            bars['tick_count'].tolist()
+        ))
+
+    def backfill_bars(self, symbol: str, chunk: Tuple[int, int], complete: bool) -> bool:
+        """
+        Holt M1 Rates eines Chunks und schreibt alle Bar-Timeframes
+
+        Args:
+            symbol: Trading Symbol
+            chunk: (start, end) in Epoch-Sekunden
+            complete: Chunk als erledigt markieren
+
+        Returns:
+            True wenn erfolgreich
+        """
+        rates = self._fetch_rates(symbol, *chunk)
+        if rates is None:
+            return False
+
+        base = {
+            'bucket': rates['time'].astype(np.int64),
+            'open': rates['open'].astype(np.float64),
+            'high': rates['high'].astype(np.float64),
+            'low': rates['low'].astype(np.float64),
+            'close': rates['close'].astype(np.float64),
+            'volume': rates['real_volume'].astype(np.int64),
+            'tick_count': rates['tick_volume'].astype(np.int64)
+        }
+        bars = cascade_bars(base, '1m', self.timeframes)
+
+        batches = [
+            (self._bar_sql(timeframe), self._bar_rows(symbol, bars[timeframe]))
+            for timeframe in self.timeframes
+        ]
+        written = sum(len(rows) for _, rows in batches)
+        if complete:
+            batches.append(self._progress_batch(symbol, 'bars', chunk, written))
+
+        self.db.insert_values_many(batches)
+        self._count('bars_written', written)
+        return True
+
+    def _tick_days(self, chunk: Tuple[int, int]) -> List[Tuple[int, int]]:
+        """UTC-Tage des Chunks innerhalb der Tick-Retention"""
+        today = datetime.now(timezone.utc).timestamp()
+        first = int(today - today % DAY_SECONDS) - self.tick_storage_days * DAY_SECONDS
+        return [
+            (day, min(day + DAY_SECONDS, chunk[1]))
+            for day in range(max(chunk[0], first), chunk[1], DAY_SECONDS)
+        ]
+
+    def _write_ticks(self, symbol: str, ticks: np.ndarray, day: Tuple[int, int]) -> int:
+        """Ersetzt die Ticks eines Symbols für einen Tag (idempotent)"""
+        local_days = sorted({date.fromtimestamp(day[0]), date.fromtimestamp(day[1] - 1)})
+        msc_range = (day[0] * 1000, day[1] * 1000)
+
+        if self.compact:
+            for local_day in local_days:
+                self.partitions.ensure_partition(local_day)
+            symbol_id = self.partitions.register_symbol(symbol)[0]
+            return self.db.replace_rows(
+                f"DELETE FROM {COMPACT_TABLE} WHERE symbol_id = %s AND time_msc >= %s AND time_msc < %s",
+                (symbol_id, *msc_range),
+                COMPACT_TABLE, COMPACT_COLUMNS, self.partitions.encode_ticks(symbol, ticks)
+            )
+
+        rows = [
+            (symbol, datetime.fromtimestamp(time_msc / 1000), bid, ask, last, volume, time_msc)
+            for bid, ask, last, volume, time_msc in ticks[['bid', 'ask', 'last', 'volume', 'time_msc']].tolist()
+        ]
+
+        # Tabelle(n) des Tages: partitioniert eine, sonst ticks_YYYYMMDD (lokales Datum)
+        if self.partitions is not None:
+            for local_day in local_days:
+                self.partitions.ensure_partition(local_day)
+            by_table = {self.partitions.table: (rows, day)}
+        else:
+            by_table = {}
+            for local_day in local_days:
+                table = f"ticks_{local_day.strftime('%Y%m%d')}"
+                self.db.execute(daily_table_sql(table))
+                midnight = datetime.combine(local_day, datetime.min.time()).timestamp()
+                bounds = (max(day[0], int(midnight)), min(day[1], int(midnight) + DAY_SECONDS))
+                by_table[table] = ([row for row in rows if bounds[0] * 1000 <= row[6] < bounds[1] * 1000], bounds)
+
+        written = 0
+        for table, (table_rows, bounds) in by_table.items():
+            written += self.db.replace_rows(
+                f"""DELETE FROM {table}
+                    WHERE symbol = %s AND timestamp >= %s AND timestamp < %s
+                      AND time_msc >= %s AND time_msc < %s""",
+                (symbol, datetime.fromtimestamp(bounds[0]), datetime.fromtimestamp(bounds[1]),
+                 bounds[0] * 1000, bounds[1] * 1000),
+                table, TickCollector.TICK_COLUMNS, table_rows
+            )
+        return written
+
+    def backfill_ticks(self, symbol: str, chunk: Tuple[int, int], complete: bool) -> bool:
+        """
+        Holt Ticks eines Chunks (nur innerhalb der Retention) Tag für Tag
+
+        Args:
+            symbol: Trading Symbol
+            chunk: (start, end) in Epoch-Sekunden
+            complete: Chunk als erledigt markieren
+
+        Returns:
+            True wenn erfolgreich
+        """
+        written = 0
+        for day in self._tick_days(chunk):
+            ticks = self._fetch_ticks(symbol, *day)
+            if ticks is None:
+                return False
+
+            written += self._write_ticks(symbol, ticks, day)
+
+            if self.tick_timeframes and len(ticks):
+                price = np.where(ticks['last'] > 0, ticks['last'], ticks['bid'])
+                bars = resample_ticks(
+                    ticks['time_msc'] // 1000, price, ticks['volume'].astype(np.int64), self.tick_timeframes
+                )
+                self.db.insert_values_many([
+                    (self._bar_sql(timeframe), self._bar_rows(symbol, bars[timeframe]))
+                    for timeframe in self.tick_timeframes
+                ])
+
+        if complete:
+            self.db.insert_values_many([self._progress_batch(symbol, 'ticks', chunk, written)])
+        self._count('ticks_written', written)
+        return True
+
+    def backfill_features(self, symbol: str, chunk: Tuple[int, int], complete: bool) -> bool:
+        """
+        Berechnet Features eines Chunks (mit Warm-up Bars davor)
+
+        Args:
+            symbol: Trading Symbol
+            chunk: (start, end) in Epoch-Sekunden
+            complete: Chunk als erledigt markieren
+
+        Returns:
+            True wenn erfolgreich
+        """
+        start = datetime.fromtimestamp(chunk[0])
+        end = datetime.fromtimestamp(chunk[1])
+
+        written = 0
+        for timeframe in self.features.timeframes:
+            df = self.features.fetch_bars_range(symbol, timeframe, start, end, warmup=200)
+            features = self.features.calculate_features(df)
+            if features is None:
+                continue
+
+            features = features[features.index >= start]
+            if not self.features.save_features(symbol, timeframe, features, tail=None):
+                return False
+            written += len(features)
+
+        if complete:
+            self.db.insert_values_many([self._progress_batch(symbol, 'features', chunk, written)])
+        self._count('features_written', written)
+        return True
+
+    # === Ablauf ===
+
+    def backfill_symbol(self, symbol: str, start: int, end: int) -> bool:
+        """
+        Backfill eines Symbols, Chunk für Chunk (Stages in Reihenfolge)
+
+        Args:
+            symbol: Trading Symbol
+            start: Beginn in Epoch-Sekunden
+            end: Ende in Epoch-Sekunden (exklusiv)
+
+        Returns:
+            True wenn alle Chunks erfolgreich waren
+        """
+        done = self.completed_chunks(symbol)
+
+        for chunk_start, chunk_end, complete in self.chunks(start, end):
+            chunk = (chunk_start, chunk_end)
+            label = f"[{symbol}] {_utc(chunk_start):%Y-%m-%d} - {_utc(chunk_end):%Y-%m-%d}"
+
+            for stage in self.stages:
+                if (stage, chunk_start, chunk_end) in done:
+                    self._count('chunks_skipped')
+                    continue
+
+                try:
+                    ok = getattr(self, f'backfill_{stage}')(symbol, chunk, complete)
+                except Exception as e:
+                    log_exception(self.logger, e, f"{label}: {stage} failed")
+                    ok = False
+
+                if not ok:
+                    # Nachfolgende Chunks bauen auf diesem auf (Warm-up) - Abbruch, Resume beim nächsten Lauf
+                    self._count('errors')
+                    return False
+                self._count('chunks_done')
+
+            self.logger.info(f"{label} done")
+
+        return True
+
+    def run(self, start: datetime, end: Optional[datetime] = None) -> Dict[str, bool]:
+        """
+        Backfill aller Symbols (parallel)
+
+        Args:
+            start: Beginn
+            end: Ende (None = jetzt)
+
+        Returns:
+            Dictionary symbol -> erfolgreich
+        """
+        self.ensure_table()
+        self.stats['start_time'] = datetime.now()
+
+        start_epoch = int(start.timestamp())
+        end_epoch = int((end or datetime.now(timezone.utc)).timestamp())
+        workers = max(1, min(self.workers, len(self.symbols)))
+
+        self.logger.info(
+            f"Backfill {len(self.symbols)} symbols {_utc(start_epoch):%Y-%m-%d %H:%M} - "
+            f"{_utc(end_epoch):%Y-%m-%d %H:%M} UTC, stages={self.stages}, "
+            f"chunk={self.chunk_days}d, workers={workers}"
+        )
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='backfill') as executor:
+            results = dict(zip(
+                self.symbols,
+                executor.map(lambda symbol: self.backfill_symbol(symbol, start_epoch, end_epoch), self.symbols)
+            ))
+
+        self.logger.info(
+            f"Backfill finished: {self.stats['chunks_done']} stages done, {self.stats['chunks_skipped']} skipped, "
+            f"bars={self.stats['bars_written']}, ticks={self.stats['ticks_written']}, "
+            f"features={self.stats['features_written']}, errors={self.stats['errors']}"
+        )
+        return results
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Holt Statistiken
+
+        Returns:
+            Dictionary mit Stats
+        """
+        with self._stats_lock:
+            return dict(self.stats)
+
+    def __enter__(self):
+        """Context Manager Entry"""
+        self.connect()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context Manager Exit"""
+        self.disconnect()
@@ -1,24 +1,84 @@
 """
 Bar Builder
 Aggregiert Tick-Daten zu OHLC Bars für verschiedene Timeframes
+
+Modi (data.bar_builder.mode):
+- push: Der TickCollector im selben Prozess liefert Ticks direkt an
+  on_ticks (attach)
+- poll: Ticks werden alle data.bar_aggregation_interval Sekunden aus der
+  Datenbank gelesen (Fallback für getrennte Prozesse)
+
+Ticks aktualisieren nur den feinsten Timeframe. Gröbere Timeframes werden
+kaskadierend aus abgeschlossenen Bars des nächstfeineren Timeframes gebildet
+(5s -> 1m -> 5m -> 15m -> 1h -> 4h -> 1d); sobald ein Kind-Bar in einem neuen
+Parent-Bucket beginnt, wird der Parent abgeschlossen.
+
+Neben OHLCV führt jeder Bar im selben Durchlauf Mikrostruktur-Werte
+(Bid/Ask OHLC, Spread Mittel/Max, Mid Mittel und volumengewichtet,
+Tick-Abstand Mittel/Max; MICROSTRUCTURE_COLUMNS). Offene Bars halten dafür
+Summen, geschrieben werden Mittelwerte; der Upsert gewichtet sie mit
+tick_count bzw. volume.
+
+Abgeschlossene Bars werden gesammelt und pro Zyklus in einer Transaktion
+geschrieben (ein multi-row Upsert pro Bar-Tabelle). Danach wird der
+finalized Watermark pro Symbol fortgeschrieben (bar_watermarks, Stream
+'bar_builder'): alle Ticks davor stecken in geschriebenen Bars. Beim Stoppen
+werden auch die offenen Bars geschrieben, der Watermark steht dann hinter
+dem letzten Tick. Nach einem Neustart setzt der Builder dort wieder auf
+(kein erneutes Aufaddieren bereits geschriebener Ticks). Verspätete Ticks
+werden als Teil-Bars für den betroffenen Bar und alle Parents geschrieben
+und per Upsert zusammengeführt. close/bid_close/ask_close ersetzt dabei nur
+ein neuerer Tick (close_time_msc = Zeit des letzten Ticks im Bar).
 """
 
 import time
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
-from decimal import Decimal
+from typing import List, Dict, Any, Optional, Tuple
 import threading
 from collections import defaultdict
 
+import numpy as np
+
 from ..utils.logger import get_logger, log_exception
 from ..utils.config_loader import get_config
 from .database_manager import get_database
+from .bar_resampler import MICROSTRUCTURE_COLUMNS
+from .bar_watermarks import BarWatermarks
+from .tick_partitions import TICKS_TABLE, partitioning_enabled
+from .tick_compact import COMPACT_VIEW, compact_enabled, to_msc
+
+
+# Zeit des letzten Ticks eines Bars (ms): nur ein neuerer Tick ersetzt die close-Werte
+CLOSE_TIME_COLUMN = 'close_time_msc'
+
+
+def microstructure_columns_sql(table: str) -> str:
+    """ALTER TABLE Statements für die Mikrostruktur-Spalten (+ close_time_msc) einer Bar-Tabelle"""
+    return '\n'.join(
+        [f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS {name} DOUBLE PRECISION;"
+         for name in MICROSTRUCTURE_COLUMNS]
+        + [f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS {CLOSE_TIME_COLUMN} BIGINT;"]
+    )
 
 
 class BarBuilder:
     """Baut OHLC Bars aus Tick-Daten"""
 
-    def __init__(self, symbols: List[str] = None, timeframes: List[str] = None, db_type: str = 'local'):
+    # Index der Felder eines offenen Bars [bucket, open, high, low, close, volume, tick_count,
+    # bid OHLC, ask OHLC, Spread Summe/Max, Mid Summe, Mid*Volumen Summe, Tick-Abstand Summe/Anzahl/Max,
+    # Zeit des letzten Ticks in ms]
+    BUCKET, OPEN, HIGH, LOW, CLOSE, VOLUME, TICK_COUNT = range(7)
+    BID_OPEN, BID_HIGH, BID_LOW, BID_CLOSE, ASK_OPEN, ASK_HIGH, ASK_LOW, ASK_CLOSE = range(7, 15)
+    SPREAD_SUM, SPREAD_MAX, MID_SUM, MID_VOLUME_SUM, INTERVAL_SUM, INTERVAL_COUNT, INTERVAL_MAX = range(15, 22)
+    CLOSE_MSC = 22
+
+    def __init__(
+        self,
+        symbols: List[str] = None,
+        timeframes: List[str] = None,
+        db_type: str = 'local',
+        mode: str = None
+    ):
         """
         Initialisiert den Bar Builder
 
@@ -26,6 +86,7 @@ class BarBuilder:
             symbols: Liste der Symbols (None = aus Config)
             timeframes: Liste der Timeframes (None = aus Config)
             db_type: Database Type
+            mode: 'push' oder 'poll' (None = data.bar_builder.mode)
         """
         self.logger = get_logger(self.__class__.__name__)
         self.config = get_config()
@@ -46,8 +107,45 @@ class BarBuilder:
             '1d': 86400
         }
 
-        # Current Bars (per Symbol + Timeframe)
-        self.current_bars = defaultdict(lambda: defaultdict(lambda: None))
+        # Kaskade: Timeframes ohne feineren Teiler werden aus Ticks gebaut,
+        # alle anderen aus dem nächstfeineren Timeframe, der sie teilt
+        ordered = sorted(self.timeframes, key=lambda tf: self.timeframe_seconds.get(tf, 60))
+        self._tick_timeframes: List[Tuple[str, int]] = []
+        self._parents: Dict[str, List[Tuple[str, int]]] = defaultdict(list)
+        for index, timeframe in enumerate(ordered):
+            seconds = self.timeframe_seconds.get(timeframe, 60)
+            source = next(
+                (finer for finer in reversed(ordered[:index])
+                 if seconds % self.timeframe_seconds.get(finer, 60) == 0),
+                None
+            )
+            if source is None:
+                self._tick_timeframes.append((timeframe, seconds))
+            else:
+                self._parents[source].append((timeframe, seconds))
+
+        # finalized Watermark pro Symbol (bar_watermarks)
+        self.watermarks = BarWatermarks(self.db, 'bar_builder')
+        self._written_watermarks: Dict[str, datetime] = {}
+        # Ende des zuletzt abgeschlossenen Bars: symbol -> timeframe -> epoch
+        self._closed_until: Dict[str, Dict[str, int]] = defaultdict(dict)
+        # Gespeicherter Watermark beim Start: Ticks davor sind bereits geschrieben
+        self._resume_from: Dict[str, datetime] = {}
+
+        # Modus + Intervalle
+        builder_config = self.config.get('data.bar_builder', {}) or {}
+        self.mode = mode or builder_config.get('mode', 'poll')
+        self.flush_interval = builder_config.get('flush_interval', 1.0)
+        self.poll_interval = self.config.get('data.bar_aggregation_interval', 5)
+
+        # Offene Bars: symbol -> timeframe -> [bucket, open, high, low, close, volume, tick_count, ...]
+        self.current_bars: Dict[str, Dict[str, list]] = defaultdict(dict)
+        # Zeit des letzten Ticks pro Symbol (Tick-Abstand)
+        self._last_tick_time: Dict[str, float] = {}
+
+        # Abgeschlossene, noch nicht geschriebene Bars: timeframe -> Liste von Rows
+        self._closed: Dict[str, List[tuple]] = defaultdict(list)
+        self._lock = threading.Lock()
 
         # State
         self.is_running = False
@@ -57,6 +155,12 @@ class BarBuilder:
         self.stats = {
             'bars_built': defaultdict(int),
             'ticks_processed': 0,
+            'late_ticks': 0,
+            'late_corrections': 0,
+            'flushes': 0,
+            'flush_errors': 0,
+            'flush_latency_ms_last': 0.0,
+            'flush_latency_ms_max': 0.0,
             'start_time': None
         }
 
@@ -107,6 +211,36 @@ class BarBuilder:
         if since is None:
             since = datetime.now() - timedelta(minutes=1)
 
+        if compact_enabled():
+            # Kompaktes Format: Pruning über time_msc (View rechnet Preise zurück)
+            query = f"""
+                SELECT symbol, timestamp, bid, ask, last, volume
+                FROM {COMPACT_VIEW}
+                WHERE symbol = %s
+                  AND time_msc >= %s
+                ORDER BY time_msc ASC
+            """
+            params = (symbol, to_msc(since))
+        elif partitioning_enabled():
+            # Partition Pruning über timestamp - auch über Tagesgrenzen hinweg
+            query = f"""
+                SELECT symbol, timestamp, bid, ask, last, volume
+                FROM {TICKS_TABLE}
+                WHERE symbol = %s
+                  AND timestamp >= %s
+                ORDER BY timestamp ASC
+            """
+            params = (symbol, since)
+        else:
+            query = None
+
+        if query is not None:
+            try:
+                return self.db.fetch_all_dict(query, params)
+            except Exception as e:
+                log_exception(self.logger, e, f"Failed to fetch ticks for {symbol}")
+                return []
+
         # Get today's table
         from datetime import date
         today = date.today()
@@ -132,128 +266,468 @@ class BarBuilder:
             log_exception(self.logger, e, f"Failed to fetch ticks for {symbol}")
             return []
 
-    def _process_tick(self, tick: Dict[str, Any], timeframe: str):
+    def _add_tick(
+        self,
+        symbol: str,
+        epoch: int,
+        price: float,
+        volume: int,
+        bid: float,
+        ask: float,
+        tick_time: float
+    ):
         """
-        Verarbeitet einen Tick für ein Timeframe
+        Aktualisiert den offenen Bar des feinsten Timeframes mit einem Tick
+
+        Aufrufer hält self._lock.
 
         Args:
-            tick: Tick Data
-            timeframe: Timeframe
+            symbol: Trading Symbol
+            epoch: Tick-Zeit in Sekunden seit Epoch
+            price: Preis (Last oder Bid)
+            volume: Volumen
+            bid: Bid
+            ask: Ask
+            tick_time: Genaue Tick-Zeit in Sekunden (Tick-Abstand)
         """
-        symbol = tick['symbol']
-        timestamp = tick['timestamp']
-        price = float(tick['last'] or tick['bid'])  # Last oder Bid
-
-        # Round timestamp to timeframe
-        bar_timestamp = self._round_timestamp_to_timeframe(timestamp, timeframe)
-
-        # Get current bar
-        current_bar = self.current_bars[symbol][timeframe]
-
-        # Check if new bar needed
-        if current_bar is None or current_bar['timestamp'] != bar_timestamp:
-            # Save previous bar
-            if current_bar is not None:
-                self._save_bar(current_bar, timeframe)
-
-            # Create new bar
-            current_bar = {
-                'symbol': symbol,
-                'timestamp': bar_timestamp,
-                'open': price,
-                'high': price,
-                'low': price,
-                'close': price,
-                'volume': tick.get('volume', 0),
-                'tick_count': 1
-            }
-            self.current_bars[symbol][timeframe] = current_bar
-        else:
-            # Update existing bar
-            current_bar['high'] = max(current_bar['high'], price)
-            current_bar['low'] = min(current_bar['low'], price)
-            current_bar['close'] = price
-            current_bar['volume'] += tick.get('volume', 0)
-            current_bar['tick_count'] += 1
+        bars = self.current_bars[symbol]
+        tick_msc = int(round(tick_time * 1000))
+        mid = (bid + ask) / 2
+        spread = ask - bid
+        previous = self._last_tick_time.get(symbol)
+        interval = tick_time - previous if previous is not None and tick_time >= previous else None
+        if previous is None or tick_time > previous:
+            self._last_tick_time[symbol] = tick_time
+
+        for timeframe, seconds in self._tick_timeframes:
+            bucket = epoch - epoch % seconds
+            bar = bars.get(timeframe)
+
+            if bar is not None and bar[self.BUCKET] == bucket:
+                if price > bar[self.HIGH]:
+                    bar[self.HIGH] = price
+                elif price < bar[self.LOW]:
+                    bar[self.LOW] = price
+                if tick_msc >= bar[self.CLOSE_MSC]:
+                    bar[self.CLOSE] = price
+                    bar[self.BID_CLOSE] = bid
+                    bar[self.ASK_CLOSE] = ask
+                    bar[self.CLOSE_MSC] = tick_msc
+                bar[self.VOLUME] += volume
+                bar[self.TICK_COUNT] += 1
+                bar[self.BID_HIGH] = max(bar[self.BID_HIGH], bid)
+                bar[self.BID_LOW] = min(bar[self.BID_LOW], bid)
+                bar[self.ASK_HIGH] = max(bar[self.ASK_HIGH], ask)
+                bar[self.ASK_LOW] = min(bar[self.ASK_LOW], ask)
+                bar[self.SPREAD_SUM] += spread
+                bar[self.SPREAD_MAX] = max(bar[self.SPREAD_MAX], spread)
+                bar[self.MID_SUM] += mid
+                bar[self.MID_VOLUME_SUM] += mid * volume
+                if interval is not None:
+                    bar[self.INTERVAL_SUM] += interval
+                    bar[self.INTERVAL_COUNT] += 1
+                    bar[self.INTERVAL_MAX] = self._max(bar[self.INTERVAL_MAX], interval)
+            else:
+                self.stats['late_ticks'] += bucket < self._closed_until[symbol].get(timeframe, 0)
+                self._fold(symbol, bars, timeframe, seconds, [
+                    bucket, price, price, price, price, volume, 1,
+                    bid, bid, bid, bid, ask, ask, ask, ask,
+                    spread, spread, mid, mid * volume,
+                    interval or 0.0, 0 if interval is None else 1, interval, tick_msc
+                ])
+
+    @staticmethod
+    def _max(a: Optional[float], b: Optional[float]) -> Optional[float]:
+        """Maximum, None wird ignoriert"""
+        if a is None:
+            return b
+        return a if b is None else max(a, b)
+
+    @classmethod
+    def _combine(cls, bar: list, row: list):
+        """
+        Führt einen Bar (bzw. Tick) desselben Buckets in bar zusammen
+
+        close-Werte übernimmt bar nur, wenn der letzte Tick von row neuer ist
+        (verspätete Teil-Bars ändern high/low/volume, nicht close).
+
+        Args:
+            bar: Offener Bar (wird verändert)
+            row: Bar eines feineren Timeframes oder Teil-Bar
+        """
+        bar[cls.HIGH] = max(bar[cls.HIGH], row[cls.HIGH])
+        bar[cls.LOW] = min(bar[cls.LOW], row[cls.LOW])
+        bar[cls.BID_HIGH] = max(bar[cls.BID_HIGH], row[cls.BID_HIGH])
+        bar[cls.BID_LOW] = min(bar[cls.BID_LOW], row[cls.BID_LOW])
+        bar[cls.ASK_HIGH] = max(bar[cls.ASK_HIGH], row[cls.ASK_HIGH])
+        bar[cls.ASK_LOW] = min(bar[cls.ASK_LOW], row[cls.ASK_LOW])
+        if row[cls.CLOSE_MSC] >= bar[cls.CLOSE_MSC]:
+            bar[cls.CLOSE] = row[cls.CLOSE]
+            bar[cls.BID_CLOSE] = row[cls.BID_CLOSE]
+            bar[cls.ASK_CLOSE] = row[cls.ASK_CLOSE]
+            bar[cls.CLOSE_MSC] = row[cls.CLOSE_MSC]
+        for index in (cls.VOLUME, cls.TICK_COUNT, cls.SPREAD_SUM, cls.MID_SUM,
+                      cls.MID_VOLUME_SUM, cls.INTERVAL_SUM, cls.INTERVAL_COUNT):
+            bar[index] += row[index]
+        bar[cls.SPREAD_MAX] = max(bar[cls.SPREAD_MAX], row[cls.SPREAD_MAX])
+        bar[cls.INTERVAL_MAX] = cls._max(bar[cls.INTERVAL_MAX], row[cls.INTERVAL_MAX])
+
+    def _fold(self, symbol: str, bars: Dict[str, list], timeframe: str, seconds: int, row: list):
+        """
+        Übernimmt einen Bar (bzw. Tick) eines feineren Timeframes in den offenen Bar
+
+        - gleicher Bucket: zusammenführen
+        - späterer Bucket: offenen Bar abschließen, neuen beginnen
+        - früherer Bucket (verspätet): als Teil-Bar schreiben und an die
+          Parents weiterreichen (Korrektur per Upsert)
+        """
+        bucket = row[self.BUCKET] - row[self.BUCKET] % seconds
+        bar = bars.get(timeframe)
+        closed_until = self._closed_until[symbol].get(timeframe, 0)
+
+        if bar is not None and bar[self.BUCKET] == bucket:
+            self._combine(bar, row)
+            return
+
+        if bucket < closed_until or (bar is not None and bucket < bar[self.BUCKET]):
+            partial = [bucket, *row[1:]]
+            self._closed[timeframe].append((symbol, *partial))
+            self.stats['late_corrections'] += 1
+            for parent, parent_seconds in self._parents[timeframe]:
+                self._fold(symbol, bars, parent, parent_seconds, partial)
+            return
+
+        if bar is not None:
+            self._close(symbol, bars, timeframe)
+        bars[timeframe] = [bucket, *row[1:]]
+        self._advance(symbol, bars, timeframe, bucket)
+
+    def _close(self, symbol: str, bars: Dict[str, list], timeframe: str):
+        """Schließt den offenen Bar ab und übernimmt ihn in die Parents"""
+        bar = bars.pop(timeframe)
+        self._closed[timeframe].append((symbol, *bar))
+        self._closed_until[symbol][timeframe] = bar[self.BUCKET] + self.timeframe_seconds.get(timeframe, 60)
+        for parent, parent_seconds in self._parents[timeframe]:
+            self._fold(symbol, bars, parent, parent_seconds, bar)
+
+    def _advance(self, symbol: str, bars: Dict[str, list], timeframe: str, bucket: int):
+        """Schließt Parents ab, deren Bucket vor dem neuen Bucket eines Kind-Bars liegt"""
+        for parent, parent_seconds in self._parents[timeframe]:
+            parent_bucket = bucket - bucket % parent_seconds
+            parent_bar = bars.get(parent)
+            if parent_bar is not None and parent_bar[self.BUCKET] < parent_bucket:
+                self._close(symbol, bars, parent)
+                self._advance(symbol, bars, parent, parent_bucket)
+
+    def _finalized_until(self) -> Dict[str, datetime]:
+        """
+        Watermarks: Beginn des offenen Bars im feinsten Timeframe pro Symbol
+
+        Alle Bars, die bis dahin enden, sind abgeschlossen. Aufrufer hält self._lock.
+        """
+        finest = self._tick_timeframes[0][0]
+        return {
+            symbol: datetime.fromtimestamp(bars[finest][self.BUCKET])
+            for symbol, bars in self.current_bars.items() if finest in bars
+        }
+
+    def _written_until(self) -> Dict[str, datetime]:
+        """
+        Watermarks beim Stoppen: direkt hinter dem letzten Tick pro Symbol
+
+        Die offenen Bars werden mitgeschrieben, damit ist jeder bisherige Tick
+        geschrieben. Aufrufer hält self._lock.
+        """
+        return {
+            symbol: datetime.fromtimestamp(tick_time) + timedelta(microseconds=1)
+            for symbol, tick_time in self._last_tick_time.items()
+        }
+
+    def _restore_watermarks(self):
+        """
+        Setzt nach einem Neustart am gespeicherten Watermark auf
+
+        Ticks vor finalized_until stecken bereits in geschriebenen Bars: poll
+        liest erst ab dort, push verwirft ältere Ticks (Lookback der Tick
+        Source), bis der erste neuere kommt. Bars, die bis zum Watermark
+        enden, gelten als abgeschlossen.
+        """
+        watermarks = self.watermarks.get_all()
+        with self._lock:
+            for symbol, finalized in watermarks.items():
+                if symbol not in self.symbols:
+                    continue
+                self._resume_from[symbol] = finalized
+                self._written_watermarks[symbol] = finalized
+                epoch = int(finalized.timestamp())
+                for timeframe in self.timeframes:
+                    seconds = self.timeframe_seconds.get(timeframe, 60)
+                    self._closed_until[symbol][timeframe] = epoch - epoch % seconds
+
+        if self._resume_from:
+            self.logger.info(f"Resuming {len(self._resume_from)} symbols from bar watermarks")
+
+    def on_ticks(self, symbol: str, ticks: np.ndarray):
+        """
+        Nimmt neue Ticks vom TickCollector entgegen (push Modus)
+
+        Args:
+            symbol: Trading Symbol
+            ticks: Structured Array (bid, ask, last, volume, time_msc) wie von der Tick Source
+        """
+        if len(ticks) == 0:
+            return
+
+        with self._lock:
+            resume = self._resume_from.get(symbol)
+            if resume is not None:
+                ticks = ticks[ticks['time_msc'] >= resume.timestamp() * 1000]
+                if len(ticks) == 0:
+                    return
+                del self._resume_from[symbol]
+
+            rows = ticks[['bid', 'ask', 'last', 'volume', 'time_msc']].tolist()
+            for bid, ask, last, volume, time_msc in rows:
+                self._add_tick(
+                    symbol, int(time_msc) // 1000, float(last or bid), int(volume),
+                    float(bid), float(ask), time_msc / 1000
+                )
+            self.stats['ticks_processed'] += len(rows)
+
+    def attach(self, collector):
+        """
+        Registriert den Bar Builder als Listener eines TickCollector (push Modus)
 
-    def _save_bar(self, bar: Dict[str, Any], timeframe: str):
+        Args:
+            collector: TickCollector im selben Prozess
         """
-        Speichert Bar in Database
+        collector.add_tick_listener(self.on_ticks)
+
+    def _ensure_columns(self):
+        """Ergänzt die Mikrostruktur-Spalten und close_time_msc in bestehenden Bar-Tabellen"""
+        for timeframe in self.timeframes:
+            try:
+                self.db.execute(microstructure_columns_sql(self._get_bar_table(timeframe)))
+            except Exception as e:
+                log_exception(self.logger, e, f"Failed to add microstructure columns to {timeframe} bars")
+
+    def _upsert_sql(self, timeframe: str) -> str:
+        """
+        Multi-row Upsert für eine Bar-Tabelle (execute_values)
 
         Args:
-            bar: Bar Data
             timeframe: Timeframe
+
+        Returns:
+            SQL mit VALUES %s
         """
         table_name = self._get_bar_table(timeframe)
 
-        insert_sql = f"""
+        def weighted(name, weight):
+            # Mittelwert beider Teile, gewichtet (NULL-Teil wird ignoriert)
+            return (
+                f"{name} = COALESCE(({table_name}.{name} * {table_name}.{weight} + EXCLUDED.{name} * EXCLUDED.{weight})"
+                f" / NULLIF({table_name}.{weight} + EXCLUDED.{weight}, 0), EXCLUDED.{name}, {table_name}.{name})"
+            )
+
+        def last(name):
+            # Nur ein neuerer letzter Tick ersetzt close (verspätete Teil-Bars nicht)
+            return (
+                f"{name} = CASE WHEN EXCLUDED.{CLOSE_TIME_COLUMN} >= COALESCE({table_name}.{CLOSE_TIME_COLUMN}, 0)"
+                f" THEN EXCLUDED.{name} ELSE {table_name}.{name} END"
+            )
+
+        micro = {
+            'first': lambda name: f"{name} = COALESCE({table_name}.{name}, EXCLUDED.{name})",
+            'last': last,
+            'max': lambda name: f"{name} = GREATEST({table_name}.{name}, EXCLUDED.{name})",
+            'min': lambda name: f"{name} = LEAST({table_name}.{name}, EXCLUDED.{name})",
+            'tick_count': lambda name: weighted(name, 'tick_count'),
+            'volume': lambda name: weighted(name, 'volume')
+        }
+        updates = ',\n                '.join(micro[how](name) for name, how in MICROSTRUCTURE_COLUMNS.items())
+
+        return f"""
             INSERT INTO {table_name}
-                (symbol, timestamp, open, high, low, close, volume, tick_count)
-            VALUES
-                (%s, %s, %s, %s, %s, %s, %s, %s)
+                (symbol, timestamp, open, high, low, close, volume, tick_count,
+                 {', '.join(MICROSTRUCTURE_COLUMNS)}, {CLOSE_TIME_COLUMN})
+            VALUES %s
             ON CONFLICT (symbol, timestamp)
             DO UPDATE SET
                 high = GREATEST({table_name}.high, EXCLUDED.high),
                 low = LEAST({table_name}.low, EXCLUDED.low),
-                close = EXCLUDED.close,
+                {last('close')},
                 volume = {table_name}.volume + EXCLUDED.volume,
-                tick_count = {table_name}.tick_count + EXCLUDED.tick_count
+                tick_count = {table_name}.tick_count + EXCLUDED.tick_count,
+                {updates},
+                {CLOSE_TIME_COLUMN} = GREATEST({table_name}.{CLOSE_TIME_COLUMN}, EXCLUDED.{CLOSE_TIME_COLUMN})
         """
 
-        values = (
-            bar['symbol'],
-            bar['timestamp'],
-            bar['open'],
-            bar['high'],
-            bar['low'],
-            bar['close'],
-            bar['volume'],
-            bar['tick_count']
-        )
+    @classmethod
+    def _merge_rows(cls, rows: List[tuple]) -> List[tuple]:
+        """
+        Fasst Rows mit gleichem (symbol, bucket) zusammen
+
+        Ein multi-row Upsert darf denselben Key nur einmal enthalten.
 
+        Args:
+            rows: (symbol, *offener Bar)
+
+        Returns:
+            Rows mit eindeutigem Key, Timestamp als datetime, Mikrostruktur
+            als Mittelwerte (Reihenfolge wie _upsert_sql)
+        """
+        merged: Dict[Tuple[str, int], list] = {}
+        for symbol, *row in rows:
+            key = (symbol, row[cls.BUCKET])
+            bar = merged.get(key)
+            if bar is None:
+                merged[key] = list(row)
+            else:
+                cls._combine(bar, row)
+
+        def mean(total, count):
+            return total / count if count else None
+
+        return [
+            (
+                symbol, datetime.fromtimestamp(bar[cls.BUCKET]), *bar[cls.OPEN:cls.SPREAD_SUM],
+                mean(bar[cls.SPREAD_SUM], bar[cls.TICK_COUNT]), bar[cls.SPREAD_MAX],
+                mean(bar[cls.MID_SUM], bar[cls.TICK_COUNT]), mean(bar[cls.MID_VOLUME_SUM], bar[cls.VOLUME]),
+                mean(bar[cls.INTERVAL_SUM], bar[cls.INTERVAL_COUNT]), bar[cls.INTERVAL_MAX],
+                bar[cls.CLOSE_MSC]
+            )
+            for (symbol, _), bar in merged.items()
+        ]
+
+    def _flush(self, include_open: bool = False):
+        """
+        Schreibt alle abgeschlossenen Bars in einer Transaktion
+
+        Bei Fehler bleiben die Bars gepuffert und werden im nächsten Zyklus
+        erneut geschrieben.
+
+        Args:
+            include_open: Auch offene Bars schreiben (beim Stoppen)
+        """
+        with self._lock:
+            finalized = self._written_until() if include_open else self._finalized_until()
+            if include_open:
+                # Von fein nach grob abschließen, damit Parents alle Kinder enthalten
+                ordered = sorted(self.timeframes, key=lambda tf: self.timeframe_seconds.get(tf, 60))
+                for symbol, bars in self.current_bars.items():
+                    for timeframe in ordered:
+                        if timeframe in bars:
+                            self._close(symbol, bars, timeframe)
+                self.current_bars.clear()
+
+            closed = self._closed
+            self._closed = defaultdict(list)
+
+        batches = [(timeframe, self._merge_rows(rows)) for timeframe, rows in closed.items() if rows]
+        if not batches:
+            self._advance_watermarks(finalized)
+            return
+
+        started = time.perf_counter()
         try:
-            self.db.execute(insert_sql, values)
-            self.stats['bars_built'][timeframe] += 1
+            self.db.insert_values_many([(self._upsert_sql(timeframe), rows) for timeframe, rows in batches])
         except Exception as e:
-            log_exception(self.logger, e, f"Failed to save bar for {timeframe}")
+            log_exception(self.logger, e, "Failed to save bars")
+            self.stats['flush_errors'] += 1
+            with self._lock:
+                for timeframe, rows in closed.items():
+                    self._closed[timeframe][:0] = rows
+            return
+
+        latency = (time.perf_counter() - started) * 1000
+        self.stats['flushes'] += 1
+        self.stats['flush_latency_ms_last'] = latency
+        self.stats['flush_latency_ms_max'] = max(self.stats['flush_latency_ms_max'], latency)
+        for timeframe, rows in batches:
+            self.stats['bars_built'][timeframe] += len(rows)
+
+        self._advance_watermarks(finalized)
+
+    def _advance_watermarks(self, finalized: Dict[str, datetime]):
+        """Schreibt finalized Watermarks (Fehler blockieren den Bar-Flush nicht)"""
+        changed = {
+            symbol: ts for symbol, ts in finalized.items()
+            if self._written_watermarks.get(symbol) != ts
+        }
+        if not changed:
+            return
+        try:
+            self.watermarks.advance(changed)
+            self._written_watermarks.update(changed)
+        except Exception as e:
+            log_exception(self.logger, e, "Failed to advance bar watermarks")
 
     def _build_bars(self):
-        """Baut Bars (läuft in eigenem Thread)"""
-        self.logger.info("Bar builder started")
+        """Baut Bars aus der Datenbank (poll Modus, läuft in eigenem Thread)"""
+        self.logger.info("Bar builder started (poll)")
 
-        last_fetch = {}
-        fetch_interval = 5  # Sekunden
+        # symbol -> (letzter Tick-Zeitstempel, Anzahl bereits verarbeiteter Ticks mit genau diesem)
+        last_fetch = {
+            symbol: (self._resume_from.pop(symbol), 0)
+            for symbol in list(self._resume_from)
+        }
 
         while self.is_running:
             try:
                 for symbol in self.symbols:
                     # Get latest ticks
-                    since = last_fetch.get(symbol, datetime.now() - timedelta(minutes=5))
+                    since, seen = last_fetch.get(symbol, (datetime.now() - timedelta(minutes=5), 0))
                     ticks = self._fetch_latest_ticks(symbol, since)
 
-                    # Process ticks for all timeframes
-                    for tick in ticks:
-                        for timeframe in self.timeframes:
-                            self._process_tick(tick, timeframe)
-                        self.stats['ticks_processed'] += 1
+                    # timestamp >= since liefert die Ticks am letzten Zeitstempel erneut
+                    boundary = 0
+                    while boundary < min(seen, len(ticks)) and ticks[boundary]['timestamp'] == since:
+                        boundary += 1
+                    new_ticks = ticks[boundary:]
+
+                    with self._lock:
+                        for tick in new_ticks:
+                            price = float(tick['last'] or tick['bid'])  # Last oder Bid
+                            tick_time = tick['timestamp'].timestamp()
+                            self._add_tick(
+                                symbol, int(tick_time), price, tick.get('volume') or 0,
+                                float(tick['bid']), float(tick['ask']), tick_time
+                            )
+                        self.stats['ticks_processed'] += len(new_ticks)
 
                     # Update last fetch time
                     if ticks:
-                        last_fetch[symbol] = ticks[-1]['timestamp']
+                        last = ticks[-1]['timestamp']
+                        last_fetch[symbol] = (last, sum(1 for tick in ticks if tick['timestamp'] == last))
+
+                self._flush()
 
                 # Sleep
-                time.sleep(fetch_interval)
+                time.sleep(self.poll_interval)
 
             except Exception as e:
                 log_exception(self.logger, e, "Error in bar builder")
                 time.sleep(1)
 
         # Save remaining bars
-        for symbol in self.symbols:
-            for timeframe in self.timeframes:
-                current_bar = self.current_bars[symbol][timeframe]
-                if current_bar is not None:
-                    self._save_bar(current_bar, timeframe)
+        self._flush(include_open=True)
+
+        self.logger.info("Bar builder stopped")
+
+    def _flush_loop(self):
+        """Schreibt abgeschlossene Bars periodisch (push Modus, läuft in eigenem Thread)"""
+        self.logger.info("Bar builder started (push)")
+
+        while self.is_running:
+            time.sleep(self.flush_interval)
+            try:
+                self._flush()
+            except Exception as e:
+                log_exception(self.logger, e, "Error in bar builder")
+
+        # Save remaining bars
+        self._flush(include_open=True)
 
         self.logger.info("Bar builder stopped")
 
@@ -265,14 +739,18 @@ class BarBuilder:
 
         self.logger.info("Starting bar builder...")
 
+        self._ensure_columns()
+        self._restore_watermarks()
+
         self.is_running = True
         self.stats['start_time'] = datetime.now()
 
-        # Start thread
-        self.builder_thread = threading.Thread(target=self._build_bars, daemon=True)
+        # Start thread (push: Ticks kommen über on_ticks, Thread schreibt nur)
+        target = self._flush_loop if self.mode == 'push' else self._build_bars
+        self.builder_thread = threading.Thread(target=target, daemon=True)
         self.builder_thread.start()
 
-        self.logger.info(f"✓ Bar builder started for timeframes: {', '.join(self.timeframes)}")
+        self.logger.info(f"✓ Bar builder started ({self.mode}) for timeframes: {', '.join(self.timeframes)}")
 
     def stop(self):
         """Stoppt den Bar Builder"""
@@ -300,10 +778,29 @@ class BarBuilder:
             self.logger.info("=== Bar Builder Statistics ===")
             self.logger.info(f"Runtime: {runtime:.0f}s")
             self.logger.info(f"Ticks Processed: {self.stats['ticks_processed']}")
+            self.logger.info(f"Late Ticks: {self.stats['late_ticks']} "
+                             f"(bar corrections: {self.stats['late_corrections']})")
+            self.logger.info(f"Flushes: {self.stats['flushes']} (errors: {self.stats['flush_errors']}, "
+                             f"max {self.stats['flush_latency_ms_max']:.1f}ms)")
             self.logger.info("Bars Built:")
             for timeframe, count in self.stats['bars_built'].items():
                 self.logger.info(f"  {timeframe}: {count}")
 
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Holt aktuelle Statistiken
+
+        Returns:
+            Statistics Dictionary
+        """
+        with self._lock:
+            stats = dict(self.stats)
+            stats['bars_built'] = dict(self.stats['bars_built'])
+            stats['bars_pending'] = sum(len(rows) for rows in self._closed.values())
+            stats['finalized_until'] = self._finalized_until()
+        stats['mode'] = self.mode
+        return stats
+
     def get_latest_bar(self, symbol: str, timeframe: str) -> Optional[Dict[str, Any]]:
         """
         Holt neuesten Bar
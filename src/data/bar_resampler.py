@@ -0,0 +1,338 @@
+"""
+Bar Resampler
+Vektorisierte OHLCV-Aggregation von Ticks für mehrere Timeframes
+
+- Tick-Zeiten werden einmal als Integer-Sekunden übergeben und pro Timeframe
+  nur noch per Modulo auf den Bucket gefloort
+- Nur der feinste Timeframe wird aus Ticks berechnet, alle gröberen
+  kaskadierend aus dem nächstfeineren Timeframe, der sie teilt
+  (1m -> 5m -> 15m -> 1h -> 4h -> 1d); cascade_bars macht dasselbe
+  ausgehend von gespeicherten Bars, merge_bars führt gespeicherte und neue
+  Bars desselben Timeframes zusammen
+- Gruppen werden über Bucket-Wechsel in sortierten Arrays gefunden und mit
+  ufunc.reduceat aggregiert (kein groupby, keine Kopien des Frames)
+- Zusatzspalten (z.B. Indikatoren) übernehmen den letzten Nicht-NaN Wert
+  des Bars (wie pandas groupby 'last')
+- Mit Bid/Ask entstehen im selben Durchlauf Mikrostruktur-Spalten
+  (MICROSTRUCTURE_COLUMNS): Bid/Ask OHLC, Spread Mittel/Max, Mid Mittel und
+  volumengewichtet, Tick-Abstand Mittel/Max. Mittelwerte werden beim
+  Kaskadieren und Zusammenführen gewichtet (tick_count bzw. volume), daher
+  brauchen gröbere Timeframes keine Ticks
+- Jeder Bar trägt die Zeit seines ersten und letzten Ticks (TIME_COLUMNS).
+  merge_bars wählt open und close danach, nicht nach der Reihenfolge der
+  Teile; ein verspäteter Tick (älter als der close eines gespeicherten Bars)
+  ändert daher high/low/volume, aber nicht open/close
+
+Ergebnis pro Timeframe: Dictionary von numpy Arrays
+(bucket, open, high, low, close, volume, tick_count, <Mikrostruktur>, <Zeiten>, <Zusatzspalten>).
+"""
+
+from typing import Dict, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Timeframe -> Sekunden
+TIMEFRAME_SECONDS = {
+    '5s': 5,
+    '1m': 60,
+    '5m': 300,
+    '15m': 900,
+    '1h': 3600,
+    '4h': 14400,
+    '1d': 86400
+}
+
+# Mikrostruktur-Spalte -> Aggregation: 'first', 'last', 'max', 'min' oder
+# Gewichtsspalte des Mittelwerts ('tick_count', 'volume'); NaN wird ignoriert
+MICROSTRUCTURE_COLUMNS = {
+    'bid_open': 'first',
+    'bid_high': 'max',
+    'bid_low': 'min',
+    'bid_close': 'last',
+    'ask_open': 'first',
+    'ask_high': 'max',
+    'ask_low': 'min',
+    'ask_close': 'last',
+    'spread_mean': 'tick_count',
+    'spread_max': 'max',
+    'mid_mean': 'tick_count',
+    'mid_vwap': 'volume',
+    'interval_mean': 'tick_count',
+    'interval_max': 'max'
+}
+
+# Zeit des ersten / letzten Ticks eines Bars in Epoch-ms (NaN = unbekannt)
+TIME_COLUMNS = ('open_time_msc', 'close_time_msc')
+
+
+def tick_microstructure(
+    bid: np.ndarray,
+    ask: np.ndarray,
+    time: np.ndarray,
+    previous_time: Optional[float] = None
+) -> Dict[str, np.ndarray]:
+    """
+    Mikrostruktur-Werte pro Tick (Eingabe für die Bar-Aggregation)
+
+    Args:
+        bid: Bid pro Tick
+        ask: Ask pro Tick
+        time: Tick-Zeiten in Sekunden (float, zeitlich sortiert)
+        previous_time: Zeit des Ticks vor dem ersten (None = unbekannt)
+
+    Returns:
+        Dictionary MICROSTRUCTURE_COLUMNS -> Array; Tick-Abstand NaN für den
+        ersten Tick ohne Vorgänger und für verspätete Ticks
+    """
+    bid = np.asarray(bid, dtype=np.float64)
+    ask = np.asarray(ask, dtype=np.float64)
+    time = np.asarray(time, dtype=np.float64)
+    mid = (bid + ask) / 2
+    spread = ask - bid
+
+    interval = np.diff(time, prepend=np.nan if previous_time is None else previous_time)
+    interval[interval < 0] = np.nan
+
+    values = {'bid': bid, 'ask': ask, 'spread': spread, 'mid': mid, 'interval': interval}
+    return {name: values[name.split('_')[0]] for name in MICROSTRUCTURE_COLUMNS}
+
+
+def _weighted_mean(values: np.ndarray, weights: np.ndarray, starts: np.ndarray) -> np.ndarray:
+    """Gewichteter Mittelwert pro Gruppe ohne NaN (NaN wenn Gewichtssumme 0)"""
+    valid = ~np.isnan(values)
+    weights = np.where(valid, weights, 0).astype(np.float64)
+    total = np.add.reduceat(np.where(valid, values, 0) * weights, starts)
+    weight = np.add.reduceat(weights, starts)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(weight > 0, total / np.where(weight > 0, weight, 1), np.nan)
+
+
+def _group_starts(buckets: np.ndarray) -> np.ndarray:
+    """Startindizes der Gruppen in einem sortierten Bucket-Array"""
+    if len(buckets) == 0:
+        return np.empty(0, dtype=np.intp)
+    return np.flatnonzero(np.concatenate(([True], buckets[1:] != buckets[:-1])))
+
+
+def _last_valid(values: np.ndarray, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    """Letzter Nicht-NaN Wert pro Gruppe (NaN wenn die Gruppe keinen hat)"""
+    values = np.asarray(values, dtype=np.float64)
+    index = np.where(np.isnan(values), -1, np.arange(len(values)))
+    last = np.maximum.accumulate(index)[ends - 1]
+    result = values[np.maximum(last, 0)]
+    result[last < starts] = np.nan
+    return result
+
+
+def _time_order(buckets: np.ndarray, times: np.ndarray) -> np.ndarray:
+    """Sortierung nach bucket, darin nach Zeit (stabil, unbekannte Zeiten zuerst)"""
+    return np.lexsort((np.where(np.isnan(times), -np.inf, times), buckets))
+
+
+def _aggregate(
+    buckets: np.ndarray,
+    open_: np.ndarray,
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    volume: np.ndarray,
+    tick_count: np.ndarray,
+    extras: Mapping[str, np.ndarray],
+    micro: Optional[Mapping[str, np.ndarray]] = None,
+    times: Optional[Tuple[np.ndarray, np.ndarray]] = None
+) -> Dict[str, np.ndarray]:
+    """
+    Aggregiert sortierte Rows (Ticks oder Bars) gleicher Buckets
+
+    Ohne times kommt open von der ersten und close von der letzten Row eines
+    Buckets. Mit times (Zeit des ersten / letzten Ticks pro Row) kommen open
+    von der Row mit der frühesten und close von der mit der spätesten Zeit;
+    bei gleicher Zeit gilt die Reihenfolge der Rows.
+    """
+    starts = _group_starts(buckets)
+    ends = np.append(starts[1:], len(buckets)) if len(starts) else starts
+    first, last = starts, ends - 1
+    if times is not None and len(starts):
+        first = _time_order(buckets, times[0])[starts]
+        last = _time_order(buckets, times[1])[ends - 1]
+
+    bars = {
+        'bucket': buckets[starts],
+        'open': open_[first],
+        'high': np.maximum.reduceat(high, starts) if len(starts) else high[:0],
+        'low': np.minimum.reduceat(low, starts) if len(starts) else low[:0],
+        'close': close[last],
+        'volume': np.add.reduceat(volume, starts) if len(starts) else volume[:0],
+        'tick_count': np.add.reduceat(tick_count, starts) if len(starts) else tick_count[:0]
+    }
+    for name, values in (micro or {}).items():
+        how = MICROSTRUCTURE_COLUMNS[name]
+        if not len(starts):
+            bars[name] = values[:0]
+        elif how == 'first':
+            bars[name] = values[first]
+        elif how == 'last':
+            bars[name] = values[last]
+        elif how == 'max':
+            bars[name] = np.fmax.reduceat(values, starts)
+        elif how == 'min':
+            bars[name] = np.fmin.reduceat(values, starts)
+        else:
+            bars[name] = _weighted_mean(values, volume if how == 'volume' else tick_count, starts)
+    if times is not None:
+        for name, reduce, values in zip(TIME_COLUMNS, (np.fmin, np.fmax), times):
+            bars[name] = reduce.reduceat(values, starts) if len(starts) else values[:0]
+    for name, values in extras.items():
+        bars[name] = _last_valid(values, starts, ends)
+    return bars
+
+
+def resample_ticks(
+    epoch: np.ndarray,
+    price: np.ndarray,
+    volume: Optional[np.ndarray] = None,
+    timeframes: Sequence[str] = ('1m', '5m', '15m', '1h', '4h'),
+    extras: Optional[Mapping[str, np.ndarray]] = None,
+    bid: Optional[np.ndarray] = None,
+    ask: Optional[np.ndarray] = None,
+    time: Optional[np.ndarray] = None,
+    previous_time: Optional[float] = None
+) -> Dict[str, Dict[str, np.ndarray]]:
+    """
+    Berechnet OHLCV-Bars für mehrere Timeframes (kaskadierend)
+
+    Args:
+        epoch: Tick-Zeiten in Sekunden (int64), wird bei Bedarf sortiert
+        price: Preis pro Tick
+        volume: Volumen pro Tick (None = 0)
+        timeframes: Timeframes aus TIMEFRAME_SECONDS
+        extras: Zusatzspalten pro Tick (letzter Nicht-NaN Wert pro Bar)
+        bid: Bid pro Tick (mit ask: Mikrostruktur-Spalten)
+        ask: Ask pro Tick
+        time: Genaue Tick-Zeiten in Sekunden für Tick-Abstände,
+            Sortierung und TIME_COLUMNS (None = epoch)
+        previous_time: Zeit des letzten Ticks vor diesen (siehe tick_microstructure)
+
+    Returns:
+        Dictionary timeframe -> Dictionary von Arrays
+        (bucket, open, high, low, close, volume, tick_count, Mikrostruktur, extras...)
+    """
+    epoch = np.asarray(epoch, dtype=np.int64)
+    price = np.asarray(price, dtype=np.float64)
+    volume = np.zeros(len(epoch), dtype=np.int64) if volume is None else np.asarray(volume, dtype=np.int64)
+    extras = {name: np.asarray(values, dtype=np.float64) for name, values in (extras or {}).items()}
+    quotes = bid is not None and ask is not None
+    time = epoch.astype(np.float64) if time is None else np.asarray(time, dtype=np.float64)
+    if quotes:
+        bid, ask = np.asarray(bid, dtype=np.float64), np.asarray(ask, dtype=np.float64)
+
+    if len(epoch) > 1 and np.any(time[1:] < time[:-1]):
+        order = np.argsort(time, kind='stable')
+        epoch, price, volume, time = epoch[order], price[order], volume[order], time[order]
+        extras = {name: values[order] for name, values in extras.items()}
+        if quotes:
+            bid, ask = bid[order], ask[order]
+
+    ordered = sorted(timeframes, key=lambda tf: TIMEFRAME_SECONDS[tf])
+    base_timeframe = ordered[0]
+    seconds = TIMEFRAME_SECONDS[base_timeframe]
+    base = _aggregate(
+        epoch - epoch % seconds, price, price, price, price,
+        volume, np.ones(len(epoch), dtype=np.int64), extras,
+        tick_microstructure(bid, ask, time, previous_time) if quotes else None,
+        (time * 1000, time * 1000)
+    )
+    return cascade_bars(base, base_timeframe, timeframes, list(extras))
+
+
+def cascade_bars(
+    base: Mapping[str, np.ndarray],
+    base_timeframe: str,
+    timeframes: Sequence[str],
+    extras: Sequence[str] = ()
+) -> Dict[str, Dict[str, np.ndarray]]:
+    """
+    Leitet gröbere Timeframes aus Bars eines feineren Timeframes ab
+
+    Jeder Timeframe wird aus dem nächstfeineren (bereits berechneten)
+    Timeframe aggregiert, dessen Länge ihn teilt. Mikrostruktur-Spalten der
+    Basis-Bars werden mit übernommen.
+
+    Args:
+        base: Bars des Basis-Timeframes (bucket, open, high, low, close,
+            volume, tick_count, extras...), nach bucket sortiert
+        base_timeframe: Timeframe der Basis-Bars
+        timeframes: Gewünschte Timeframes (Basis-Timeframe optional)
+        extras: Namen der Zusatzspalten (letzter Nicht-NaN Wert)
+
+    Returns:
+        Dictionary timeframe -> Dictionary von Arrays
+    """
+    results: Dict[str, Mapping[str, np.ndarray]] = {base_timeframe: base}
+    ordered = sorted(timeframes, key=lambda tf: TIMEFRAME_SECONDS[tf])
+
+    for timeframe in ordered:
+        if timeframe in results:
+            continue
+        seconds = TIMEFRAME_SECONDS[timeframe]
+
+        # Nächstfeineren Timeframe suchen, der diesen teilt
+        source = None
+        for finer in sorted(results, key=lambda tf: TIMEFRAME_SECONDS[tf], reverse=True):
+            if TIMEFRAME_SECONDS[finer] < seconds and seconds % TIMEFRAME_SECONDS[finer] == 0:
+                source = results[finer]
+                break
+        if source is None:
+            raise ValueError(f"Timeframe {timeframe} cannot be derived from {base_timeframe}")
+
+        results[timeframe] = _aggregate(
+            source['bucket'] - source['bucket'] % seconds,
+            source['open'], source['high'], source['low'], source['close'],
+            source['volume'], source['tick_count'],
+            {name: source[name] for name in extras},
+            {name: source[name] for name in MICROSTRUCTURE_COLUMNS if name in source},
+            tuple(source[name] for name in TIME_COLUMNS) if all(name in source for name in TIME_COLUMNS) else None
+        )
+
+    return {timeframe: results[timeframe] for timeframe in timeframes}
+
+
+def merge_bars(
+    parts: Sequence[Mapping[str, np.ndarray]],
+    extras: Sequence[str] = ()
+) -> Dict[str, np.ndarray]:
+    """
+    Führt Bars desselben Timeframes zusammen (z.B. gespeicherte + neue)
+
+    Bars mit gleichem Bucket werden wie Ticks aggregiert: open vom Bar mit
+    dem frühesten, close (und Zusatzspalten, letzter Nicht-NaN Wert) vom Bar
+    mit dem spätesten Tick (TIME_COLUMNS), high/low/volume/tick_count
+    kombiniert. Ohne TIME_COLUMNS in allen Teilen, bei unbekannter (NaN) oder
+    gleicher Zeit entscheidet die Reihenfolge von parts. Mikrostruktur-Spalten
+    werden zusammengeführt, wenn alle Teile sie haben.
+
+    Args:
+        parts: Bar-Arrays in zeitlicher Reihenfolge
+        extras: Namen der Zusatzspalten
+
+    Returns:
+        Dictionary von Arrays, nach bucket sortiert
+    """
+    micro = tuple(name for name in MICROSTRUCTURE_COLUMNS if all(name in part for part in parts))
+    timed = all(name in part for part in parts for name in TIME_COLUMNS)
+    columns = (('bucket', 'open', 'high', 'low', 'close', 'volume', 'tick_count') + micro
+               + (TIME_COLUMNS if timed else ()) + tuple(extras))
+    bars = {name: np.concatenate([part[name] for part in parts]) for name in columns}
+    # Innerhalb eines Buckets nach Zeit des letzten Ticks (Zusatzspalten: letzter Wert)
+    if timed:
+        order = _time_order(bars['bucket'], bars['close_time_msc'])
+    else:
+        order = np.argsort(bars['bucket'], kind='stable')
+    bars = {name: values[order] for name, values in bars.items()}
+
+    return _aggregate(
+        bars['bucket'], bars['open'], bars['high'], bars['low'], bars['close'],
+        bars['volume'], bars['tick_count'], {name: bars[name] for name in extras},
+        {name: bars[name] for name in micro},
+        tuple(bars[name] for name in TIME_COLUMNS) if timed else None
+    )
@@ -0,0 +1,436 @@
+"""
+Bar Summaries
+Materialisierte Bar-Zusammenfassungen pro Timeframe, inkrementell in der
+Datenbank aktualisiert (Continuous-Aggregate-Stil, ohne TimescaleDB)
+
+- Tabelle bar_summaries (symbol, timeframe, bucket): OHLC auf dem Mid-Preis,
+  Volumen, Tick- und 1m-Bar-Anzahl, Bid/Ask OHLC, Summen von Mid, Mid *
+  Volumen, Spread und Tick-Abständen (Durchschnitte = Summe / Anzahl, siehe
+  BAR_EXPRESSIONS), Spread- und Abstand-Maxima und Zusatzspalten (letzter
+  Nicht-NaN Wert, z.B. Indikatoren)
+- Refresh nur für ein Zeitfenster geänderter Buckets: 1m per INSERT ... SELECT
+  aus den Ticks, 5m ... 1d kaskadierend aus dem nächstfeineren Timeframe
+  (wie bar_resampler.cascade_bars); Buckets in Wall-Clock Zeit der Session
+- Alle Statements sind Upserts mit dem Fenster als VALUES-Row und laufen über
+  insert_values_many / execute_many_batches in derselben Transaktion wie die
+  Tick-Position des Bar Aggregators V2 (data.bar_aggregator.mode = "database")
+- Dashboards lesen Zählungen und Durchschnitte aus wenigen vorberechneten
+  Rows statt COUNT(*)/AVG über ganze Tick-Tabellen
+"""
+
+from typing import List, Optional, Sequence, Tuple
+
+from ..utils.logger import get_logger
+from ..utils.config_loader import get_config
+from .bar_resampler import TIMEFRAME_SECONDS
+
+SUMMARY_TABLE = 'bar_summaries'
+
+SUMMARY_TIMEFRAMES = ('1m', '5m', '15m', '1h', '4h', '1d')
+
+# Bucket eines Zeitstempels (Wall-Clock der Session wie der Python-Pfad)
+BUCKET_SQL = {
+    '1m': "date_trunc('minute', {x})",
+    '5m': "(date_trunc('hour', {x}) + floor(date_part('minute', {x}) / 5) * interval '5 minutes')",
+    '15m': "(date_trunc('hour', {x}) + floor(date_part('minute', {x}) / 15) * interval '15 minutes')",
+    '1h': "date_trunc('hour', {x})",
+    '4h': "(date_trunc('day', {x}) + floor(date_part('hour', {x}) / 4) * interval '4 hours')",
+    '1d': "date_trunc('day', {x})"
+}
+
+# Spalten ohne symbol, timeframe, bucket und Zusatzspalten
+VALUE_COLUMNS = (
+    'open', 'high', 'low', 'close', 'volume', 'tick_count', 'bar_count',
+    'bid_open', 'bid_high', 'bid_low', 'bid_close', 'ask_open', 'ask_high', 'ask_low', 'ask_close',
+    'mid_sum', 'mid_volume_sum', 'spread_sum', 'spread_max', 'interval_sum', 'interval_count', 'interval_max'
+)
+
+# Nachträglich hinzugekommene Spalten (ALTER TABLE für bestehende Tabellen)
+ADDED_COLUMNS = {
+    'bid_open': 'DOUBLE PRECISION',
+    'bid_close': 'DOUBLE PRECISION',
+    'ask_open': 'DOUBLE PRECISION',
+    'ask_close': 'DOUBLE PRECISION',
+    'mid_volume_sum': 'DOUBLE PRECISION',
+    'spread_max': 'DOUBLE PRECISION',
+    'interval_sum': 'DOUBLE PRECISION',
+    'interval_count': 'BIGINT',
+    'interval_max': 'DOUBLE PRECISION'
+}
+
+# Bar-Spalten, die aus Summen abgeleitet werden (copy_batch); Mikrostruktur-
+# Spalten wie bar_resampler.MICROSTRUCTURE_COLUMNS, alle anderen gleichnamig
+BAR_EXPRESSIONS = {
+    'timestamp': 's.bucket',
+    'timeframe': 's.timeframe',
+    'spread_mean': 's.spread_sum / NULLIF(s.tick_count, 0)',
+    'mid_mean': 's.mid_sum / NULLIF(s.tick_count, 0)',
+    'mid_vwap': 's.mid_volume_sum / NULLIF(s.volume, 0)',
+    'interval_mean': 's.interval_sum / NULLIF(s.interval_count, 0)',
+    # Tick-Zeiten für die Zusammenführung im Python-Pfad (dort NULL = unbekannt)
+    'open_time_msc': 'NULL::bigint',
+    'close_time_msc': 'NULL::bigint'
+}
+
+
+def summaries_enabled() -> bool:
+    """True wenn der Bar Aggregator V2 in der Datenbank aggregiert"""
+    return get_config().get('data.bar_aggregator.mode', 'python') == 'database'
+
+
+# Länge eines Buckets (Kalender-Intervalle, damit 1d über Zeitumstellungen stimmt)
+INTERVAL_SQL = {
+    '1m': "interval '1 minute'",
+    '5m': "interval '5 minutes'",
+    '15m': "interval '15 minutes'",
+    '1h': "interval '1 hour'",
+    '4h': "interval '4 hours'",
+    '1d': "interval '1 day'"
+}
+
+
+def window_sql(timeframe: str, column: str = 'bucket') -> str:
+    """
+    Bedingung: Buckets eines Timeframes, die das Fenster w (start_ts, end_ts) berühren
+
+    Args:
+        timeframe: Timeframe
+        column: Bucket-Spalte
+
+    Returns:
+        SQL Bedingung (erwartet die CTE w)
+    """
+    first = BUCKET_SQL[timeframe].format(x='w.start_ts')
+    last = BUCKET_SQL[timeframe].format(x="(w.end_ts - interval '1 microsecond')")
+    return f"{column} >= {first} AND {column} < {last} + {INTERVAL_SQL[timeframe]}"
+
+
+class BarSummaries:
+    """Legt bar_summaries an und baut die Refresh-Statements"""
+
+    def __init__(self, db, timeframes: Sequence[str] = SUMMARY_TIMEFRAMES, extras: Sequence[str] = ()):
+        """
+        Args:
+            db: DatabaseManager
+            timeframes: Timeframes (der feinste wird aus Ticks berechnet)
+            extras: Zusatzspalten der Tick-Quelle (letzter Nicht-NULL Wert)
+        """
+        self.logger = get_logger(self.__class__.__name__)
+        self.db = db
+        self.timeframes = sorted(timeframes, key=lambda tf: TIMEFRAME_SECONDS[tf])
+        self.extras = tuple(extras)
+        self._table_ready = False
+
+    @property
+    def columns(self) -> Tuple[str, ...]:
+        return ('symbol', 'timeframe', 'bucket') + VALUE_COLUMNS + self.extras
+
+    def ensure_table(self):
+        """Legt die Tabelle bar_summaries an (einmalig)"""
+        if self._table_ready:
+            return
+        extra_sql = ''.join(f"                {name} DOUBLE PRECISION,\n" for name in self.extras)
+        self.db.execute(f"""
+            CREATE TABLE IF NOT EXISTS {SUMMARY_TABLE} (
+                symbol VARCHAR(20) NOT NULL,
+                timeframe VARCHAR(5) NOT NULL,
+                bucket TIMESTAMP WITH TIME ZONE NOT NULL,
+                open DOUBLE PRECISION NOT NULL,
+                high DOUBLE PRECISION NOT NULL,
+                low DOUBLE PRECISION NOT NULL,
+                close DOUBLE PRECISION NOT NULL,
+                volume BIGINT NOT NULL DEFAULT 0,
+                tick_count BIGINT NOT NULL DEFAULT 0,
+                bar_count INTEGER NOT NULL DEFAULT 1,
+                bid_open DOUBLE PRECISION,
+                bid_high DOUBLE PRECISION,
+                bid_low DOUBLE PRECISION,
+                bid_close DOUBLE PRECISION,
+                ask_open DOUBLE PRECISION,
+                ask_high DOUBLE PRECISION,
+                ask_low DOUBLE PRECISION,
+                ask_close DOUBLE PRECISION,
+                mid_sum DOUBLE PRECISION,
+                mid_volume_sum DOUBLE PRECISION,
+                spread_sum DOUBLE PRECISION,
+                spread_max DOUBLE PRECISION,
+                interval_sum DOUBLE PRECISION,
+                interval_count BIGINT,
+                interval_max DOUBLE PRECISION,
+{extra_sql}                updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+                PRIMARY KEY (symbol, timeframe, bucket)
+            )
+        """)
+        added = dict(ADDED_COLUMNS, **{name: 'DOUBLE PRECISION' for name in self.extras})
+        for name, column_type in added.items():
+            self.db.execute(f"ALTER TABLE {SUMMARY_TABLE} ADD COLUMN IF NOT EXISTS {name} {column_type}")
+        self._table_ready = True
+
+    def _upsert(self, select_sql: str, values: str) -> str:
+        """INSERT ... SELECT mit Fenster-CTE w und Upsert aller Wertspalten"""
+        updates = ',\n                '.join(
+            f"{name} = EXCLUDED.{name}" for name in VALUE_COLUMNS + self.extras
+        )
+        return f"""
+            WITH w (symbol, start_ts, end_ts) AS ({values})
+            INSERT INTO {SUMMARY_TABLE} ({', '.join(self.columns)})
+            {select_sql}
+            ON CONFLICT (symbol, timeframe, bucket) DO UPDATE SET
+                {updates},
+                updated_at = NOW()
+        """
+
+    def _tick_select(
+        self,
+        source: str,
+        time_column: str,
+        order_column: Optional[str],
+        by_symbol: bool,
+        msc_column: Optional[str]
+    ) -> str:
+        """
+        SELECT der feinsten Buckets aus einer Tick-Quelle
+
+        Der Tick-Abstand des ersten Ticks im Fenster bezieht sich auf den
+        letzten Tick davor (höchstens einen Tag zurück), wie im Python-Pfad.
+        """
+        timeframe = self.timeframes[0]
+        ts = f"t.{time_column}"
+        order = [ts] + ([f"t.{order_column}"] if order_column else [])
+        first = "ORDER BY t.ts" + (", t.ord" if order_column else '')
+        last = "ORDER BY t.ts DESC" + (", t.ord DESC" if order_column else '')
+
+        conditions = [f"{ts} >= w.start_ts", f"{ts} < w.end_ts", "t.bid IS NOT NULL", "t.ask IS NOT NULL"]
+        previous = [f"{ts} < w.start_ts", f"{ts} >= w.start_ts - interval '1 day'"]
+        if by_symbol:
+            conditions.insert(0, "t.symbol = w.symbol")
+            previous.insert(0, "t.symbol = w.symbol")
+        if msc_column:
+            # Partition Pruning auf dem Zeit-Key (kompaktes Format)
+            conditions += [
+                f"t.{msc_column} >= extract(epoch FROM w.start_ts::timestamptz) * 1000",
+                f"t.{msc_column} < extract(epoch FROM w.end_ts::timestamptz) * 1000"
+            ]
+            previous += [
+                f"t.{msc_column} >= extract(epoch FROM w.start_ts::timestamptz - interval '1 day') * 1000",
+                f"t.{msc_column} < extract(epoch FROM w.start_ts::timestamptz) * 1000"
+            ]
+
+        ord_column = f"\n                    t.{order_column} AS ord," if order_column else ''
+        columns = ''.join(f",\n                    t.{name}" for name in self.extras)
+        extras = ''.join(
+            f",\n                (array_agg(t.{name} {last}) FILTER (WHERE t.{name} IS NOT NULL))[1]"
+            for name in self.extras
+        )
+        where = '\n                  AND '.join(conditions)
+        previous_where = '\n                      AND '.join(previous)
+        return f"""
+            SELECT
+                t.symbol,
+                '{timeframe}',
+                {BUCKET_SQL[timeframe].format(x='t.ts')},
+                (array_agg(t.mid {first}))[1],
+                MAX(t.mid),
+                MIN(t.mid),
+                (array_agg(t.mid {last}))[1],
+                COALESCE(SUM(t.volume), 0),
+                COUNT(*),
+                1,
+                (array_agg(t.bid {first}))[1],
+                MAX(t.bid),
+                MIN(t.bid),
+                (array_agg(t.bid {last}))[1],
+                (array_agg(t.ask {first}))[1],
+                MAX(t.ask),
+                MIN(t.ask),
+                (array_agg(t.ask {last}))[1],
+                SUM(t.mid),
+                SUM(t.mid * t.volume),
+                SUM(t.ask - t.bid),
+                MAX(t.ask - t.bid),
+                SUM(t.gap),
+                COUNT(t.gap),
+                MAX(t.gap){extras}
+            FROM (
+                SELECT
+                    w.symbol,
+                    {ts} AS ts,{ord_column}
+                    t.bid,
+                    t.ask,
+                    (t.bid + t.ask) / 2 AS mid,
+                    t.volume,
+                    extract(epoch FROM {ts} - COALESCE(
+                        LAG({ts}) OVER (PARTITION BY w.symbol ORDER BY {', '.join(order)}),
+                        p.previous_ts
+                    )) AS gap{columns}
+                FROM w JOIN {source} t
+                  ON {where}
+                LEFT JOIN LATERAL (
+                    SELECT MAX({ts}) AS previous_ts
+                    FROM {source} t
+                    WHERE {previous_where}
+                ) p ON TRUE
+            ) t
+            GROUP BY t.symbol, 3
+        """
+
+    def _rollup_select(self, timeframe: str, source_timeframe: str) -> str:
+        """SELECT eines Timeframes aus den Summaries des nächstfeineren"""
+        extras = ''.join(
+            f",\n                (array_agg(s.{name} ORDER BY s.bucket DESC) FILTER (WHERE s.{name} IS NOT NULL))[1]"
+            for name in self.extras
+        )
+        return f"""
+            SELECT
+                s.symbol,
+                '{timeframe}',
+                {BUCKET_SQL[timeframe].format(x='s.bucket')},
+                (array_agg(s.open ORDER BY s.bucket))[1],
+                MAX(s.high),
+                MIN(s.low),
+                (array_agg(s.close ORDER BY s.bucket DESC))[1],
+                SUM(s.volume),
+                SUM(s.tick_count),
+                SUM(s.bar_count),
+                (array_agg(s.bid_open ORDER BY s.bucket))[1],
+                MAX(s.bid_high),
+                MIN(s.bid_low),
+                (array_agg(s.bid_close ORDER BY s.bucket DESC))[1],
+                (array_agg(s.ask_open ORDER BY s.bucket))[1],
+                MAX(s.ask_high),
+                MIN(s.ask_low),
+                (array_agg(s.ask_close ORDER BY s.bucket DESC))[1],
+                SUM(s.mid_sum),
+                SUM(s.mid_volume_sum),
+                SUM(s.spread_sum),
+                MAX(s.spread_max),
+                SUM(s.interval_sum),
+                SUM(s.interval_count),
+                MAX(s.interval_max){extras}
+            FROM w JOIN {SUMMARY_TABLE} s
+              ON s.symbol = w.symbol
+             AND s.timeframe = '{source_timeframe}'
+             AND {window_sql(timeframe, 's.bucket')}
+            GROUP BY s.symbol, 3
+        """
+
+    def refresh_batches(
+        self,
+        symbol: str,
+        start,
+        end,
+        source: str,
+        time_column: str = 'timestamp',
+        order_column: Optional[str] = None,
+        by_symbol: bool = False,
+        msc_column: Optional[str] = None,
+        values: str = 'VALUES %s'
+    ) -> List[Tuple[str, List[tuple]]]:
+        """
+        Refresh-Statements für das Fenster [start, end) (für insert_values_many)
+
+        Der feinste Timeframe wird für alle Buckets im Fenster aus den Ticks
+        neu berechnet, gröbere Timeframes für alle Buckets, die das Fenster
+        berühren, aus dem nächstfeineren.
+
+        Args:
+            symbol: Trading Symbol
+            start: Beginn des Fensters (Bucket-Grenze des feinsten Timeframes)
+            end: Ende des Fensters (exklusiv, Bucket-Grenze)
+            source: Tick-Tabelle oder View
+            time_column: Zeitspalte der Ticks
+            order_column: Tie-Breaker bei gleichem Zeitstempel (z.B. id)
+            by_symbol: Quelle enthält mehrere Symbols (Spalte symbol)
+            msc_column: Epoch-ms Spalte für Partition Pruning (kompakt)
+            values: VALUES Klausel (siehe BarWatermarks.advance_batch)
+
+        Returns:
+            Liste von (SQL, Rows) in Ausführungsreihenfolge
+        """
+        self.ensure_table()
+        window = [(symbol, start, end)]
+        batches = [(
+            self._upsert(self._tick_select(source, time_column, order_column, by_symbol, msc_column), values),
+            window
+        )]
+
+        for index, timeframe in enumerate(self.timeframes[1:], start=1):
+            source_timeframe = self._source_timeframe(timeframe, self.timeframes[:index])
+            batches.append((self._upsert(self._rollup_select(timeframe, source_timeframe), values), window))
+        return batches
+
+    @staticmethod
+    def _source_timeframe(timeframe: str, finer: Sequence[str]) -> str:
+        """Nächstfeinerer Timeframe, der den Timeframe teilt"""
+        seconds = TIMEFRAME_SECONDS[timeframe]
+        for candidate in reversed(finer):
+            if seconds % TIMEFRAME_SECONDS[candidate] == 0:
+                return candidate
+        raise ValueError(f"Timeframe {timeframe} cannot be derived from {finer[0]}")
+
+    def copy_batch(
+        self,
+        symbol: str,
+        start,
+        end,
+        table: str,
+        columns: Sequence[str],
+        conflict_sql: str,
+        values: str = 'VALUES %s'
+    ) -> Tuple[str, List[tuple]]:
+        """
+        Schreibt die Summaries eines Fensters in eine Bar-Tabelle (z.B. bars_<symbol>)
+
+        Args:
+            symbol: Trading Symbol
+            start: Beginn des Fensters
+            end: Ende des Fensters (exklusiv)
+            table: Ziel-Tabelle
+            columns: Ziel-Spalten; abgeleitet nach BAR_EXPRESSIONS, alle
+                anderen gleichnamig aus bar_summaries
+            conflict_sql: ON CONFLICT Klausel der Ziel-Tabelle
+            values: VALUES Klausel
+
+        Returns:
+            (SQL, Rows)
+        """
+        select = ', '.join(BAR_EXPRESSIONS.get(name, f"s.{name}") for name in columns)
+        windows = '\n                 OR '.join(
+            f"(s.timeframe = '{timeframe}' AND {window_sql(timeframe, 's.bucket')})"
+            for timeframe in self.timeframes
+        )
+        return f"""
+            WITH w (symbol, start_ts, end_ts) AS ({values})
+            INSERT INTO {table} ({', '.join(columns)})
+            SELECT {select}
+            FROM w JOIN {SUMMARY_TABLE} s
+              ON s.symbol = w.symbol
+             AND ({windows})
+            {conflict_sql}
+        """, [(symbol, start, end)]
+
+
+# Bar-Statistiken für Dashboards (1m Bars: Anzahl gesamt, letzte, letzte Stunde/24h)
+BAR_STATS_SQL = f"""
+    SELECT
+        (SELECT COALESCE(SUM(bar_count), 0) FROM {SUMMARY_TABLE}
+         WHERE symbol = %s AND timeframe = '1d') AS total_bars,
+        (SELECT MAX(bucket) FROM {SUMMARY_TABLE}
+         WHERE symbol = %s AND timeframe = '1m') AS latest_bar,
+        (SELECT COUNT(*) FROM {SUMMARY_TABLE}
+         WHERE symbol = %s AND timeframe = '1m' AND bucket >= NOW() - INTERVAL '1 hour') AS bars_1h,
+        (SELECT COUNT(*) FROM {SUMMARY_TABLE}
+         WHERE symbol = %s AND timeframe = '1m' AND bucket >= NOW() - INTERVAL '24 hours') AS bars_24h
+"""
+
+# Tick-Statistiken eines Tages aus den 1h Summaries (statt COUNT/AVG über die Tick-Tabelle)
+TICK_STATS_SQL = f"""
+    SELECT COALESCE(SUM(tick_count), 0) AS total_ticks,
+           MIN(bid_low) AS min_bid, MAX(bid_high) AS max_bid,
+           MIN(ask_low) AS min_ask, MAX(ask_high) AS max_ask,
+           SUM(mid_sum) / NULLIF(SUM(tick_count), 0) AS avg_price,
+           SUM(spread_sum) / NULLIF(SUM(tick_count), 0) AS avg_spread
+    FROM {SUMMARY_TABLE}
+    WHERE symbol = %s AND timeframe = '1h'
+      AND bucket >= %s::date AND bucket < %s::date + 1
+"""
@@ -0,0 +1,226 @@
+"""
+Bar Watermarks
+Persistenter "finalized" Watermark pro Bar-Stream und Symbol
+
+Alle Bars eines Streams, deren Ende <= finalized_until liegt, sind
+abgeschlossen und geschrieben. Verspätete Ticks vor dem Watermark lösen eine
+Korrektur aus (betroffener Basis-Bar + dessen Parent-Bars), der Watermark
+selbst läuft nie zurück.
+
+Streams:
+- bar_builder: Tabellen bars_<timeframe> (BarBuilder)
+- bar_aggregator_v2: Tabellen bars_<symbol> (Bar Aggregator V2)
+
+Dazu die Lese-Position eines Konsumenten in den Tick-Tabellen
+(tick_watermarks, Key: consumer, symbol, tick_table). Sie wird in derselben
+Transaktion geschrieben wie die daraus gebauten Bars, so dass jeder Tick
+genau einmal aggregiert wird - auch nach Absturz oder Neustart.
+"""
+
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..utils.logger import get_logger
+
+WATERMARK_TABLE = 'bar_watermarks'
+TICK_WATERMARK_TABLE = 'tick_watermarks'
+
+
+class BarWatermarks:
+    """Liest und schreibt finalized Watermarks (Tabelle bar_watermarks)"""
+
+    def __init__(self, db, stream: str):
+        """
+        Args:
+            db: DatabaseManager
+            stream: Name des Bar-Streams (z.B. 'bar_builder')
+        """
+        self.logger = get_logger(self.__class__.__name__)
+        self.db = db
+        self.stream = stream
+        self._table_ready = False
+
+    def ensure_table(self):
+        """Legt die Watermark-Tabelle an (einmalig)"""
+        if self._table_ready:
+            return
+        self.db.execute(f"""
+            CREATE TABLE IF NOT EXISTS {WATERMARK_TABLE} (
+                stream VARCHAR(50) NOT NULL,
+                symbol VARCHAR(20) NOT NULL,
+                finalized_until TIMESTAMP WITH TIME ZONE NOT NULL,
+                updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+                PRIMARY KEY (stream, symbol)
+            )
+        """)
+        self._table_ready = True
+
+    def get(self, symbol: str) -> Optional[datetime]:
+        """
+        Holt den Watermark eines Symbols
+
+        Returns:
+            finalized_until oder None
+        """
+        self.ensure_table()
+        row = self.db.fetch_one(
+            f"SELECT finalized_until FROM {WATERMARK_TABLE} WHERE stream = %s AND symbol = %s",
+            (self.stream, symbol)
+        )
+        return row[0] if row else None
+
+    def get_all(self) -> Dict[str, datetime]:
+        """
+        Holt die Watermarks aller Symbols des Streams
+
+        Returns:
+            Dictionary symbol -> finalized_until
+        """
+        self.ensure_table()
+        rows = self.db.fetch_all(
+            f"SELECT symbol, finalized_until FROM {WATERMARK_TABLE} WHERE stream = %s",
+            (self.stream,)
+        )
+        return dict(rows)
+
+    def advance_batch(
+        self,
+        watermarks: Dict[str, datetime],
+        values: str = 'VALUES %s'
+    ) -> Tuple[str, List[tuple]]:
+        """
+        Upsert für insert_values_many (Watermark in derselben Transaktion wie die Bars)
+
+        Args:
+            watermarks: Dictionary symbol -> finalized_until
+            values: VALUES Klausel ('VALUES %s' für execute_values,
+                '(%s, %s, %s)' Platzhalter für execute_many)
+
+        Returns:
+            (SQL, Rows)
+        """
+        self.ensure_table()
+        return f"""
+            INSERT INTO {WATERMARK_TABLE} (stream, symbol, finalized_until)
+            {values}
+            ON CONFLICT (stream, symbol) DO UPDATE SET
+                finalized_until = GREATEST({WATERMARK_TABLE}.finalized_until, EXCLUDED.finalized_until),
+                updated_at = NOW()
+        """, [(self.stream, symbol, ts) for symbol, ts in watermarks.items()]
+
+    def advance(self, watermarks: Dict[str, datetime]):
+        """
+        Setzt Watermarks (nur vorwärts)
+
+        Args:
+            watermarks: Dictionary symbol -> finalized_until
+        """
+        if not watermarks:
+            return
+        self.db.insert_values(*self.advance_batch(watermarks))
+
+
+class TickWatermarks:
+    """
+    Lese-Position eines Konsumenten pro Symbol und Tick-Tabelle
+
+    - Tabellen mit id (ticks_<symbol>_YYYYMMDD): last_id = letzte gelesene id;
+      auch später eingefügte Ticks mit älterem Zeitstempel werden gelesen
+    - Tabellen ohne id (ticks, ticks_compact_ind_v): Keyset auf dem Zeit-Key
+      (last_id = time_msc bzw. 0, last_ts = Zeitstempel) plus last_offset =
+      Anzahl bereits gelesener Ticks mit genau diesem Key
+    """
+
+    def __init__(self, db, consumer: str):
+        """
+        Args:
+            db: DatabaseManager
+            consumer: Name des Konsumenten (z.B. 'bar_aggregator_v2')
+        """
+        self.logger = get_logger(self.__class__.__name__)
+        self.db = db
+        self.consumer = consumer
+        self._table_ready = False
+
+    def ensure_table(self):
+        """Legt die Tabelle tick_watermarks an (einmalig)"""
+        if self._table_ready:
+            return
+        self.db.execute(f"""
+            CREATE TABLE IF NOT EXISTS {TICK_WATERMARK_TABLE} (
+                consumer VARCHAR(50) NOT NULL,
+                symbol VARCHAR(20) NOT NULL,
+                tick_table VARCHAR(63) NOT NULL,
+                last_id BIGINT NOT NULL DEFAULT 0,
+                last_ts TIMESTAMP WITH TIME ZONE,
+                last_offset INTEGER NOT NULL DEFAULT 0,
+                updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+                PRIMARY KEY (consumer, symbol, tick_table)
+            )
+        """)
+        self._table_ready = True
+
+    def latest(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """
+        Holt die aktuelle Position eines Symbols (jüngste Tick-Tabelle)
+
+        Returns:
+            Dictionary (tick_table, last_id, last_ts, last_offset) oder None
+        """
+        self.ensure_table()
+        row = self.db.fetch_one(f"""
+            SELECT tick_table, last_id, last_ts, last_offset
+            FROM {TICK_WATERMARK_TABLE}
+            WHERE consumer = %s AND symbol = %s
+            ORDER BY tick_table DESC
+            LIMIT 1
+        """, (self.consumer, symbol))
+        if not row:
+            return None
+        return dict(zip(('tick_table', 'last_id', 'last_ts', 'last_offset'), row))
+
+    def get_all(self) -> List[Dict[str, Any]]:
+        """
+        Holt alle Positionen des Konsumenten inkl. Lag (NOW() - last_ts)
+
+        Returns:
+            Liste von Dictionaries
+        """
+        self.ensure_table()
+        return self.db.fetch_all_dict(f"""
+            SELECT symbol, tick_table, last_id, last_ts, last_offset, updated_at,
+                   EXTRACT(EPOCH FROM NOW() - last_ts) AS lag_seconds
+            FROM {TICK_WATERMARK_TABLE}
+            WHERE consumer = %s
+            ORDER BY symbol, tick_table
+        """, (self.consumer,))
+
+    def save_batch(
+        self,
+        positions: List[Dict[str, Any]],
+        values: str = 'VALUES %s'
+    ) -> Tuple[str, List[tuple]]:
+        """
+        Upsert für insert_values_many (Position in derselben Transaktion wie die Bars)
+
+        Args:
+            positions: Dictionaries (symbol, tick_table, last_id, last_ts, last_offset)
+            values: VALUES Klausel (siehe BarWatermarks.advance_batch)
+
+        Returns:
+            (SQL, Rows)
+        """
+        self.ensure_table()
+        return f"""
+            INSERT INTO {TICK_WATERMARK_TABLE}
+                (consumer, symbol, tick_table, last_id, last_ts, last_offset)
+            {values}
+            ON CONFLICT (consumer, symbol, tick_table) DO UPDATE SET
+                last_id = EXCLUDED.last_id,
+                last_ts = EXCLUDED.last_ts,
+                last_offset = EXCLUDED.last_offset,
+                updated_at = NOW()
+        """, [
+            (self.consumer, p['symbol'], p['tick_table'], p['last_id'], p['last_ts'], p['last_offset'])
+            for p in positions
+        ]
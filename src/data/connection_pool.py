@@ -0,0 +1,287 @@
+"""
+Connection Pool für PostgreSQL
+Ersatz für psycopg2.pool.ThreadedConnectionPool mit Health Checks und Metriken
+
+- Wartet bei erschöpftem Pool bis zu `timeout` Sekunden auf eine freie
+  Connection, statt sofort PoolError zu werfen
+- Overflow: bis zu `max_overflow` zusätzliche Connections über `size` hinaus,
+  die bei Rückgabe geschlossen werden
+- Recycling: Connections älter als `recycle` Sekunden werden ersetzt
+- Pre-Ping: Connections, die länger als PRE_PING_IDLE_SECONDS idle waren,
+  werden vor der Ausgabe mit SELECT 1 geprüft und bei Fehler ersetzt
+- Metriken: Checkouts, Wartezeit-Histogramm, Timeouts, in-use/idle
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, Optional
+
+import psycopg2
+from psycopg2 import pool
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE, TRANSACTION_STATUS_UNKNOWN
+
+from ..utils.logger import get_logger
+
+# Nur Connections pingen, die mindestens so lange idle waren
+PRE_PING_IDLE_SECONDS = 5.0
+
+# Obergrenzen der Wartezeit-Buckets in ms (letzter Bucket: darüber)
+WAIT_BUCKETS_MS = (1, 5, 10, 50, 100, 500, 1000, 5000)
+
+
+class PoolTimeout(pool.PoolError):
+    """Keine Connection innerhalb des Timeouts frei"""
+
+
+class ConnectionPool:
+    """Thread-sicherer Connection Pool mit Wartequeue, Overflow und Health Checks"""
+
+    def __init__(
+        self,
+        size: int,
+        max_overflow: int = 0,
+        timeout: float = 30.0,
+        recycle: Optional[float] = None,
+        pre_ping: bool = True,
+        minconn: int = 1,
+        **connect_kwargs
+    ):
+        """
+        Initialisiert den Pool und öffnet `minconn` Connections
+
+        Args:
+            size: Connections, die dauerhaft gehalten werden
+            max_overflow: Zusätzliche Connections bei Last (werden wieder geschlossen)
+            timeout: Max. Wartezeit in Sekunden auf eine freie Connection
+            recycle: Max. Alter einer Connection in Sekunden (None = unbegrenzt)
+            pre_ping: Länger idle Connections vor der Ausgabe prüfen
+            minconn: Connections, die beim Start geöffnet werden
+            **connect_kwargs: Argumente für psycopg2.connect
+        """
+        self.logger = get_logger(self.__class__.__name__)
+        self.size = size
+        self.max_overflow = max_overflow
+        self.timeout = timeout
+        self.recycle = recycle
+        self.pre_ping = pre_ping
+        self.connect_kwargs = connect_kwargs
+
+        self.closed = False
+        self._cond = threading.Condition()
+        self._idle: deque = deque()          # (conn, idle_since)
+        self._in_use: Dict[int, Any] = {}    # id(conn) -> conn
+        self._created: Dict[int, float] = {} # id(conn) -> Zeitpunkt Connect
+        self._total = 0                      # offene + gerade öffnende Connections
+        self._waiting = 0
+
+        self.stats = {
+            'checkouts': 0,
+            'timeouts': 0,
+            'connects': 0,
+            'overflow_connects': 0,
+            'recycled': 0,
+            'ping_failures': 0,
+            'discarded': 0,
+            'wait_ms_total': 0.0,
+            'wait_ms_max': 0.0,
+            'wait_histogram': {self._bucket_label(i): 0 for i in range(len(WAIT_BUCKETS_MS) + 1)}
+        }
+
+        for _ in range(min(minconn, size)):
+            self._total += 1
+            self._idle.append((self._connect(), time.monotonic()))
+
+    @staticmethod
+    def _bucket_label(index: int) -> str:
+        if index < len(WAIT_BUCKETS_MS):
+            return f"<={WAIT_BUCKETS_MS[index]}ms"
+        return f">{WAIT_BUCKETS_MS[-1]}ms"
+
+    def _connect(self):
+        """Neue Connection öffnen (außerhalb des Locks aufrufen)"""
+        try:
+            conn = psycopg2.connect(**self.connect_kwargs)
+        except Exception:
+            with self._cond:
+                self._total -= 1
+                self._cond.notify()
+            raise
+        with self._cond:
+            self._created[id(conn)] = time.monotonic()
+            self.stats['connects'] += 1
+        return conn
+
+    def _discard(self, conn):
+        """Connection schließen und aus der Zählung nehmen (Lock nicht halten)"""
+        try:
+            conn.close()
+        except Exception:
+            pass
+        with self._cond:
+            self._created.pop(id(conn), None)
+            self._total -= 1
+            self._cond.notify()
+
+    def _healthy(self, conn, idle_since: float) -> bool:
+        """Prüft eine idle Connection vor der Ausgabe"""
+        if conn.closed:
+            return False
+
+        if self.recycle is not None and time.monotonic() - self._created.get(id(conn), 0) > self.recycle:
+            self._count('recycled')
+            return False
+
+        if self.pre_ping and time.monotonic() - idle_since >= PRE_PING_IDLE_SECONDS:
+            try:
+                with conn.cursor() as cur:
+                    cur.execute("SELECT 1")
+                conn.rollback()
+            except Exception:
+                self._count('ping_failures')
+                self.logger.warning("Stale pooled connection replaced (pre-ping failed)")
+                return False
+
+        return True
+
+    def _count(self, key: str):
+        with self._cond:
+            self.stats[key] += 1
+
+    def getconn(self):
+        """
+        Holt eine Connection (wartet bis zu `timeout` Sekunden)
+
+        Returns:
+            psycopg2.connection
+
+        Raises:
+            PoolTimeout: Keine Connection innerhalb des Timeouts frei
+            pool.PoolError: Pool ist geschlossen
+        """
+        started = time.monotonic()
+        deadline = started + self.timeout
+
+        while True:
+            with self._cond:
+                if self.closed:
+                    raise pool.PoolError("connection pool is closed")
+
+                idle = None
+                if self._idle:
+                    idle = self._idle.popleft()
+                elif self._total < self.size + self.max_overflow:
+                    self._total += 1
+                    if self._total > self.size:
+                        self.stats['overflow_connects'] += 1
+                else:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self.stats['timeouts'] += 1
+                        raise PoolTimeout(
+                            f"no connection available within {self.timeout}s "
+                            f"({len(self._in_use)} in use, max {self.size + self.max_overflow})"
+                        )
+                    self._waiting += 1
+                    try:
+                        self._cond.wait(remaining)
+                    finally:
+                        self._waiting -= 1
+                    continue
+
+            if idle is None:
+                conn = self._connect()
+            else:
+                conn, idle_since = idle
+                if not self._healthy(conn, idle_since):
+                    self._discard(conn)
+                    continue
+
+            self._checked_out(conn, (time.monotonic() - started) * 1000)
+            return conn
+
+    def _checked_out(self, conn, wait_ms: float):
+        """Checkout verbuchen"""
+        with self._cond:
+            self._in_use[id(conn)] = conn
+            self.stats['checkouts'] += 1
+            self.stats['wait_ms_total'] += wait_ms
+            self.stats['wait_ms_max'] = max(self.stats['wait_ms_max'], wait_ms)
+
+            index = len(WAIT_BUCKETS_MS)
+            for i, bound in enumerate(WAIT_BUCKETS_MS):
+                if wait_ms <= bound:
+                    index = i
+                    break
+            self.stats['wait_histogram'][self._bucket_label(index)] += 1
+
+    def putconn(self, conn, close: bool = False):
+        """
+        Gibt eine Connection zurück
+
+        Args:
+            conn: Connection aus getconn
+            close: Connection schließen statt zurücklegen
+        """
+        with self._cond:
+            if self._in_use.pop(id(conn), None) is None:
+                raise pool.PoolError("trying to put unkeyed connection")
+            # Overflow nur abbauen, wenn niemand wartet
+            overflow = self._total > self.size and not self._waiting
+
+        if not close and not conn.closed and not self.closed:
+            status = conn.get_transaction_status()
+            if status == TRANSACTION_STATUS_UNKNOWN:
+                close = True
+            elif status != TRANSACTION_STATUS_IDLE:
+                try:
+                    conn.rollback()
+                except Exception:
+                    close = True
+
+        if close or conn.closed or self.closed or overflow:
+            if not overflow:
+                self._count('discarded')
+            self._discard(conn)
+            return
+
+        with self._cond:
+            self._idle.append((conn, time.monotonic()))
+            self._cond.notify()
+
+    def closeall(self):
+        """Schließt alle Connections (auch ausgegebene)"""
+        with self._cond:
+            self.closed = True
+            conns = [conn for conn, _ in self._idle] + list(self._in_use.values())
+            self._idle.clear()
+            self._in_use.clear()
+            self._created.clear()
+            self._total = 0
+            self._cond.notify_all()
+
+        for conn in conns:
+            try:
+                conn.close()
+            except Exception:
+                pass
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Holt Pool Metriken
+
+        Returns:
+            Statistics Dictionary (Zähler, Wartezeiten, in-use/idle)
+        """
+        with self._cond:
+            stats = dict(self.stats)
+            stats['wait_histogram'] = dict(self.stats['wait_histogram'])
+            stats['in_use'] = len(self._in_use)
+            stats['idle'] = len(self._idle)
+            stats['waiting'] = self._waiting
+            stats['open'] = self._total
+
+        stats['size'] = self.size
+        stats['max_overflow'] = self.max_overflow
+        stats['wait_ms_avg'] = stats['wait_ms_total'] / stats['checkouts'] if stats['checkouts'] else 0.0
+        return stats
@@ -4,14 +4,122 @@ Verwaltet Verbindungen, Connection Pooling und Queries
 """
 
 import psycopg2
-from psycopg2 import pool, extras
+from psycopg2 import extras
 from psycopg2.extensions import connection, cursor
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional, Tuple, Sequence, Iterator
 from contextlib import contextmanager
+from collections import OrderedDict
+import csv
+import io
+import itertools
+import re
 import time
 
+import numpy as np
+import pandas as pd
+
 from ..utils.logger import get_logger, log_exception
 from ..utils.config_loader import get_config
+from .connection_pool import ConnectionPool
+
+# Rows pro FETCH bei serverseitigen Cursorn (stream, fetch_dataframe, fetch_numpy)
+DEFAULT_CHUNK_ROWS = 10000
+
+# Eindeutige Namen für serverseitige Cursor
+_cursor_ids = itertools.count(1)
+
+# Max. Prepared Statements pro Connection (älteste werden per DEALLOCATE entfernt)
+PREPARED_CACHE_SIZE = 256
+
+# psycopg2 Platzhalter: %s, %% (Literal) und %(name)s (nicht unterstützt)
+_PLACEHOLDER_RE = re.compile(r'%(s|%|\()')
+
+
+def to_positional_sql(query: str) -> Tuple[Optional[str], int]:
+    """
+    Wandelt psycopg2 Platzhalter (%s) in PREPARE Parameter ($1, $2, ...)
+
+    Args:
+        query: SQL mit %s Platzhaltern
+
+    Returns:
+        (SQL für PREPARE, Anzahl Parameter); SQL ist None bei benannten
+        Platzhaltern %(name)s
+    """
+    count = 0
+    named = False
+
+    def replace(match):
+        nonlocal count, named
+        token = match.group(1)
+        if token == '%':
+            return '%'
+        if token == '(':
+            named = True
+            return match.group(0)
+        count += 1
+        return f"${count}"
+
+    sql = _PLACEHOLDER_RE.sub(replace, query)
+    return (None, 0) if named else (sql, count)
+
+
+class PreparingConnection(connection):
+    """
+    Connection mit Cache für serverseitige Prepared Statements
+
+    Der Cache hängt an der Connection und bleibt damit über Pool-Checkouts
+    erhalten. Key ist das whitespace-normalisierte SQL.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # normalisiertes SQL -> (Statement-Name, Anzahl Parameter)
+        self.prepared: 'OrderedDict[str, Tuple[str, int]]' = OrderedDict()
+        self._statement_ids = itertools.count(1)
+
+    def prepare(self, cur: cursor, query: str) -> Optional[Tuple[str, int]]:
+        """
+        Holt (oder legt an) das Prepared Statement für ein Query
+
+        Args:
+            cur: Cursor dieser Connection
+            query: SQL mit %s Platzhaltern
+
+        Returns:
+            (Statement-Name, Anzahl Parameter) oder None wenn nicht preparable
+        """
+        key = ' '.join(query.split())
+        entry = self.prepared.get(key)
+        if entry is not None:
+            self.prepared.move_to_end(key)
+            return entry
+
+        sql, param_count = to_positional_sql(query)
+        if sql is None:
+            return None
+
+        if len(self.prepared) >= PREPARED_CACHE_SIZE:
+            _, (old_name, _) = self.prepared.popitem(last=False)
+            cur.execute(f"DEALLOCATE {old_name}")
+
+        name = f"ps_{next(self._statement_ids)}"
+        cur.execute(f"PREPARE {name} AS {sql}")
+        entry = self.prepared[key] = (name, param_count)
+        return entry
+
+    def reset_prepared(self):
+        """Verwirft alle Prepared Statements (nach Fehlern, Stand unklar)"""
+        self.prepared.clear()
+        try:
+            if not self.closed:
+                self.rollback()
+                with self.cursor() as cur:
+                    cur.execute("DEALLOCATE ALL")
+                self.commit()
+        except Exception:
+            pass
+
 
 class DatabaseManager:
     """PostgreSQL Database Manager mit Connection Pooling"""
@@ -30,21 +138,32 @@ class DatabaseManager:
         # Database Config laden
         self.db_config = self.config.get_database_config(db_type)
 
+        # Prepared Statements (Opt-out: database.<type>.prepared_statements = false)
+        self.use_prepared = self.db_config.get('prepared_statements', True)
+
         # Connection Pool
         self.pool = None
         self._init_pool()
 
     def _init_pool(self):
         """Initialisiert den Connection Pool"""
+        # Optionales Schema (z.B. Replica als Schema in derselben Datenbank)
+        schema = self.db_config.get('schema')
+
         try:
-            self.pool = psycopg2.pool.ThreadedConnectionPool(
-                minconn=1,
-                maxconn=self.db_config.get('pool_size', 5),
+            self.pool = ConnectionPool(
+                size=self.db_config.get('pool_size', 5),
+                max_overflow=self.db_config.get('max_overflow', 0),
+                timeout=self.db_config.get('pool_timeout', 30),
+                recycle=self.db_config.get('pool_recycle'),
+                pre_ping=self.db_config.get('pool_pre_ping', True),
                 host=self.db_config['host'],
                 port=self.db_config['port'],
                 database=self.db_config['database'],
                 user=self.db_config['user'],
-                password=self.db_config['password']
+                password=self.db_config['password'],
+                options=f"-c search_path={schema},public" if schema else None,
+                connection_factory=PreparingConnection if self.use_prepared else None
             )
             self.logger.info(f"Database pool initialized ({self.db_type}): {self.db_config['host']}:{self.db_config['port']}/{self.db_config['database']}")
         except Exception as e:
@@ -65,8 +184,12 @@ class DatabaseManager:
             yield conn
             conn.commit()
         except Exception as e:
-            if conn:
-                conn.rollback()
+            if conn and not conn.closed:
+                try:
+                    conn.rollback()
+                except psycopg2.Error:
+                    # Connection kaputt -> putconn verwirft sie
+                    pass
             log_exception(self.logger, e, "Database connection error")
             raise
         finally:
@@ -95,56 +218,287 @@ class DatabaseManager:
             finally:
                 cur.close()
 
-    def execute(self, query: str, params: tuple = None) -> None:
+    def _prepared_statement(self, cur: cursor, query: str) -> Optional[str]:
+        """
+        EXECUTE-Statement für ein Query (legt das Prepared Statement bei Bedarf an)
+
+        Returns:
+            "EXECUTE name (%s, ...)" oder None wenn Prepared Statements aus sind
+        """
+        conn = cur.connection
+        if not self.use_prepared or not isinstance(conn, PreparingConnection):
+            return None
+
+        entry = conn.prepare(cur, query)
+        if entry is None:
+            return None
+
+        name, param_count = entry
+        if param_count == 0:
+            return f"EXECUTE {name}"
+        return f"EXECUTE {name} ({', '.join(['%s'] * param_count)})"
+
+    def _run(self, cur: cursor, query: str, params: tuple = None, prepare: bool = False, batch: bool = False):
+        """
+        Führt ein Query auf einem Cursor aus, optional als Prepared Statement
+
+        Args:
+            cur: psycopg2 Cursor
+            query: SQL Query
+            params: Query Parameter (bei batch: Liste von Parametern)
+            prepare: Serverseitiges PREPARE/EXECUTE verwenden
+            batch: execute_batch statt execute
+        """
+        statement = None
+        try:
+            if prepare:
+                statement = self._prepared_statement(cur, query)
+            if batch:
+                extras.execute_batch(cur, statement or query, params)
+            else:
+                cur.execute(statement or query, params)
+        except Exception:
+            # Stand der Prepared Statements nach Fehler unklar -> verwerfen
+            if prepare and isinstance(cur.connection, PreparingConnection):
+                cur.connection.reset_prepared()
+            raise
+
+    def execute(self, query: str, params: tuple = None, prepare: bool = False) -> None:
         """
         Führt Query aus (INSERT, UPDATE, DELETE)
 
         Args:
             query: SQL Query
             params: Query Parameter
+            prepare: Als Prepared Statement ausführen (für häufige Queries)
         """
         with self.get_cursor() as cur:
-            cur.execute(query, params)
+            self._run(cur, query, params, prepare)
 
-    def execute_many(self, query: str, params_list: List[tuple]) -> None:
+    def execute_many(self, query: str, params_list: List[tuple], prepare: bool = False) -> None:
         """
         Führt Query mehrfach aus (Batch)
 
         Args:
             query: SQL Query
             params_list: Liste von Query Parametern
+            prepare: Als Prepared Statement ausführen (execute_batch von EXECUTE)
+        """
+        with self.get_cursor() as cur:
+            self._run(cur, query, params_list, prepare, batch=True)
+
+    def copy_rows(self, table: str, columns: Sequence[str], rows: List[Sequence[Any]]) -> int:
+        """
+        Schreibt Rows per COPY FROM STDIN (CSV) in eine Tabelle
+
+        Deutlich schneller als execute_many, unterstützt aber kein
+        ON CONFLICT. Für Tabellen mit Konfliktbehandlung bulk_insert
+        mit on_conflict verwenden.
+
+        Args:
+            table: Tabellenname
+            columns: Spaltennamen in Reihenfolge der Row-Werte
+            rows: Liste von Rows (Tuples/Listen), None wird zu NULL
+
+        Returns:
+            Anzahl geschriebener Rows
+        """
+        if not rows:
+            return 0
+
+        with self.get_cursor() as cur:
+            self._copy_rows(cur, table, columns, rows)
+
+        return len(rows)
+
+    def copy_rows_many(
+        self,
+        batches: List[Tuple[str, Sequence[str], List[Sequence[Any]]]],
+        on_conflict: Optional[Dict[str, str]] = None
+    ) -> int:
+        """
+        Schreibt mehrere Tabellen per COPY in einer einzigen Transaktion
+
+        Args:
+            batches: Liste von (table, columns, rows)
+            on_conflict: Tabelle -> ON CONFLICT Klausel ohne Schlüsselwort;
+                diese Tabellen werden per execute_values statt COPY geschrieben
+                (wie bulk_insert)
+
+        Returns:
+            Anzahl geschriebener Rows insgesamt
+        """
+        on_conflict = on_conflict or {}
+        written = 0
+        with self.get_cursor() as cur:
+            for table, columns, rows in batches:
+                if not rows:
+                    continue
+                if table in on_conflict:
+                    extras.execute_values(cur, f"""
+                        INSERT INTO {table} ({', '.join(columns)})
+                        VALUES %s
+                        ON CONFLICT {on_conflict[table]}
+                    """, rows, page_size=1000)
+                else:
+                    self._copy_rows(cur, table, columns, rows)
+                written += len(rows)
+
+        return written
+
+    def replace_rows(
+        self,
+        delete_query: str,
+        params: tuple,
+        table: str,
+        columns: Sequence[str],
+        rows: List[Sequence[Any]]
+    ) -> int:
+        """
+        Löscht einen Bereich und schreibt ihn per COPY neu (eine Transaktion)
+
+        Macht COPY-Loads ohne Unique Key wiederholbar (z.B. Backfill eines Tages).
+
+        Args:
+            delete_query: DELETE für den zu ersetzenden Bereich
+            params: Parameter des DELETE
+            table: Tabellenname
+            columns: Spaltennamen
+            rows: Liste von Rows
+
+        Returns:
+            Anzahl geschriebener Rows
+        """
+        with self.get_cursor() as cur:
+            cur.execute(delete_query, params)
+            if rows:
+                self._copy_rows(cur, table, columns, rows)
+
+        return len(rows)
+
+    def insert_values(self, query: str, rows: List[Sequence[Any]], page_size: int = 1000) -> int:
+        """
+        Führt multi-row INSERT per execute_values aus
+
+        Args:
+            query: SQL Query mit einem einzelnen VALUES %s Platzhalter
+            rows: Liste von Rows
+            page_size: Rows pro Statement
+
+        Returns:
+            Anzahl geschriebener Rows
+        """
+        if not rows:
+            return 0
+
+        with self.get_cursor() as cur:
+            extras.execute_values(cur, query, rows, page_size=page_size)
+
+        return len(rows)
+
+    def insert_values_many(self, batches: List[Tuple[str, List[Sequence[Any]]]], page_size: int = 1000) -> int:
+        """
+        Führt mehrere multi-row INSERTs in einer einzigen Transaktion aus
+
+        Args:
+            batches: Liste von (query mit VALUES %s, rows)
+            page_size: Rows pro Statement
+
+        Returns:
+            Anzahl geschriebener Rows insgesamt
         """
+        written = 0
         with self.get_cursor() as cur:
-            extras.execute_batch(cur, query, params_list)
+            for query, rows in batches:
+                if rows:
+                    extras.execute_values(cur, query, rows, page_size=page_size)
+                    written += len(rows)
+
+        return written
+
+    def bulk_insert(
+        self,
+        table: str,
+        columns: Sequence[str],
+        rows: List[Sequence[Any]],
+        on_conflict: Optional[str] = None
+    ) -> int:
+        """
+        Schreibt Rows im schnellsten passenden Verfahren
+
+        Ohne Konfliktbehandlung wird COPY verwendet, sonst execute_values.
+
+        Args:
+            table: Tabellenname
+            columns: Spaltennamen
+            rows: Liste von Rows
+            on_conflict: ON CONFLICT Klausel ohne Schlüsselwort
+                (z.B. "(symbol, timestamp) DO NOTHING"), None = COPY
+
+        Returns:
+            Anzahl geschriebener Rows
+        """
+        if on_conflict is None:
+            return self.copy_rows(table, columns, rows)
+
+        query = f"""
+            INSERT INTO {table} ({', '.join(columns)})
+            VALUES %s
+            ON CONFLICT {on_conflict}
+        """
+        return self.insert_values(query, rows)
+
+    @staticmethod
+    def _copy_rows(cur: cursor, table: str, columns: Sequence[str], rows: List[Sequence[Any]]) -> None:
+        """
+        Schreibt Rows über einen bestehenden Cursor per COPY
 
-    def fetch_one(self, query: str, params: tuple = None) -> Optional[Tuple]:
+        Args:
+            cur: psycopg2 Cursor (Transaktion bleibt beim Aufrufer)
+            table: Tabellenname
+            columns: Spaltennamen
+            rows: Liste von Rows
+        """
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator='\n')
+        writer.writerows(rows)
+        buffer.seek(0)
+
+        cur.copy_expert(
+            f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)",
+            buffer
+        )
+
+    def fetch_one(self, query: str, params: tuple = None, prepare: bool = False) -> Optional[Tuple]:
         """
         Holt einen einzelnen Row
 
         Args:
             query: SQL Query
             params: Query Parameter
+            prepare: Als Prepared Statement ausführen
 
         Returns:
             Row als Tuple oder None
         """
         with self.get_cursor() as cur:
-            cur.execute(query, params)
+            self._run(cur, query, params, prepare)
             return cur.fetchone()
 
-    def fetch_all(self, query: str, params: tuple = None) -> List[Tuple]:
+    def fetch_all(self, query: str, params: tuple = None, prepare: bool = False) -> List[Tuple]:
         """
         Holt alle Rows
 
         Args:
             query: SQL Query
             params: Query Parameter
+            prepare: Als Prepared Statement ausführen
 
         Returns:
             Liste von Rows als Tuples
         """
         with self.get_cursor() as cur:
-            cur.execute(query, params)
+            self._run(cur, query, params, prepare)
             return cur.fetchall()
 
     def fetch_dict(self, query: str, params: tuple = None) -> Optional[Dict[str, Any]]:
@@ -163,22 +517,155 @@ class DatabaseManager:
             result = cur.fetchone()
             return dict(result) if result else None
 
-    def fetch_all_dict(self, query: str, params: tuple = None) -> List[Dict[str, Any]]:
+    def fetch_all_dict(self, query: str, params: tuple = None, prepare: bool = False) -> List[Dict[str, Any]]:
         """
         Holt alle Rows als Dictionaries
 
         Args:
             query: SQL Query
             params: Query Parameter
+            prepare: Als Prepared Statement ausführen
 
         Returns:
             Liste von Rows als Dictionaries
         """
         with self.get_cursor(dict_cursor=True) as cur:
-            cur.execute(query, params)
+            self._run(cur, query, params, prepare)
             results = cur.fetchall()
             return [dict(row) for row in results] if results else []
 
+    def _iter_chunks(
+        self,
+        query: str,
+        params: tuple = None,
+        chunk_rows: Optional[int] = None
+    ) -> Iterator[Tuple[List[str], List[Tuple]]]:
+        """
+        Liest ein Query über einen serverseitigen (named) Cursor in Chunks
+
+        Die Connection ist bis zum Ende der Iteration belegt. Wird die
+        Iteration vorzeitig abgebrochen, wird der Cursor geschlossen und die
+        Transaktion zurückgerollt, bevor die Connection zurück in den Pool geht.
+
+        Yields:
+            (Spaltennamen, Rows des Chunks)
+        """
+        chunk_rows = chunk_rows or DEFAULT_CHUNK_ROWS
+        conn = self.pool.getconn()
+        cur = None
+        try:
+            cur = conn.cursor(name=f"stream_{next(_cursor_ids)}")
+            cur.itersize = chunk_rows
+            cur.execute(query, params)
+
+            columns = None
+            while True:
+                rows = cur.fetchmany(chunk_rows)
+                if columns is None:
+                    # Bei named Cursorn erst nach dem ersten FETCH gesetzt
+                    columns = [desc[0] for desc in cur.description or ()]
+                    if not rows:
+                        # Leeres Ergebnis: Spaltennamen trotzdem liefern
+                        yield columns, rows
+                if not rows:
+                    break
+                yield columns, rows
+        except Exception as e:
+            log_exception(self.logger, e, "Database stream error")
+            raise
+        finally:
+            try:
+                if cur is not None:
+                    cur.close()
+                conn.rollback()
+            except Exception:
+                pass
+            self.pool.putconn(conn)
+
+    def stream(self, query: str, params: tuple = None, chunk_rows: Optional[int] = None) -> Iterator[List[Tuple]]:
+        """
+        Liefert die Rows eines SELECT in Chunks (serverseitiger Cursor)
+
+        Anders als fetch_all liegt nie das ganze Ergebnis im Speicher,
+        sondern nur chunk_rows Rows.
+
+        Args:
+            query: SQL Query (nur SELECT)
+            params: Query Parameter
+            chunk_rows: Rows pro Chunk (Default: DEFAULT_CHUNK_ROWS)
+
+        Yields:
+            Liste von Rows als Tuples
+        """
+        for _, rows in self._iter_chunks(query, params, chunk_rows):
+            if rows:
+                yield rows
+
+    def fetch_dataframe(
+        self,
+        query: str,
+        params: tuple = None,
+        chunk_rows: Optional[int] = None,
+        dtypes: Optional[Dict[str, Any]] = None
+    ) -> pd.DataFrame:
+        """
+        Holt ein Ergebnis direkt als DataFrame
+
+        Jeder Chunk wird sofort in Spalten-Arrays umgewandelt (keine Dicts pro
+        Row, keine Liste aller Tuples). NUMERIC wird zu float.
+
+        Args:
+            query: SQL Query
+            params: Query Parameter
+            chunk_rows: Rows pro Chunk
+            dtypes: Optionale dtypes pro Spalte (z.B. {'volume': 'int64'})
+
+        Returns:
+            DataFrame (leer, mit Spalten, wenn das Query keine Rows liefert)
+        """
+        frames = []
+        columns = []
+        for columns, rows in self._iter_chunks(query, params, chunk_rows):
+            frame = pd.DataFrame.from_records(rows, columns=columns, coerce_float=True)
+            if dtypes:
+                frame = frame.astype(dtypes)
+            frames.append(frame)
+
+        if not frames:
+            return pd.DataFrame(columns=columns)
+        if len(frames) == 1:
+            return frames[0]
+        return pd.concat(frames, ignore_index=True)
+
+    def fetch_numpy(
+        self,
+        query: str,
+        params: tuple = None,
+        dtype: Any = np.float64,
+        chunk_rows: Optional[int] = None
+    ) -> np.ndarray:
+        """
+        Holt ein rein numerisches Ergebnis als 2D-Array
+
+        Args:
+            query: SQL Query (alle Spalten numerisch, NULL wird zu NaN)
+            params: Query Parameter
+            dtype: dtype des Arrays
+            chunk_rows: Rows pro Chunk
+
+        Returns:
+            Array (Rows x Spalten)
+        """
+        chunks = []
+        columns = []
+        for columns, rows in self._iter_chunks(query, params, chunk_rows):
+            if rows:
+                chunks.append(np.asarray(rows, dtype=dtype))
+
+        if not chunks:
+            return np.empty((0, len(columns)), dtype=dtype)
+        return np.concatenate(chunks)
+
     def table_exists(self, table_name: str) -> bool:
         """
         Prüft ob Tabelle existiert
@@ -294,9 +781,23 @@ class DatabaseManager:
             'port': self.db_config['port'],
             'database': self.db_config['database'],
             'user': self.db_config['user'],
-            'pool_size': self.db_config.get('pool_size', 5)
+            'pool_size': self.db_config.get('pool_size', 5),
+            'max_overflow': self.db_config.get('max_overflow', 0),
+            'prepared_statements': self.use_prepared
         }
 
+    def get_pool_stats(self) -> Dict[str, Any]:
+        """
+        Holt Connection Pool Metriken
+
+        Returns:
+            Dictionary mit Checkouts, Wartezeiten (Histogramm), Timeouts,
+            in-use/idle Connections
+        """
+        stats = self.pool.get_stats() if self.pool else {}
+        stats['type'] = self.db_type
+        return stats
+
     def close(self):
         """Schließt alle Verbindungen"""
         if self.pool:
@@ -319,19 +820,31 @@ class DatabaseManager:
 # Singleton Instances
 _db_local = None
 _db_remote = None
+_db_others = {}
+_async_dbs = {}
 
-def get_database(db_type: str = 'local') -> DatabaseManager:
+def get_database(db_type: str = 'local', async_: bool = False):
     """
     Holt Database Manager Instance
 
     Args:
-        db_type: 'local' oder 'remote'
+        db_type: 'local', 'remote' oder ein weiterer Eintrag unter database.*
+            (z.B. eine Replica für den DatabaseRouter)
+        async_: AsyncDatabaseManager (asyncpg) statt DatabaseManager
 
     Returns:
-        DatabaseManager Instance
+        DatabaseManager bzw. AsyncDatabaseManager Instance
     """
     global _db_local, _db_remote
 
+    if async_:
+        if db_type not in ('local', 'remote'):
+            raise ValueError(f"Invalid db_type: {db_type}")
+        if db_type not in _async_dbs:
+            from .async_database_manager import AsyncDatabaseManager
+            _async_dbs[db_type] = AsyncDatabaseManager(db_type)
+        return _async_dbs[db_type]
+
     if db_type == 'local':
         if _db_local is None:
             _db_local = DatabaseManager('local')
@@ -340,10 +853,27 @@ def get_database(db_type: str = 'local') -> DatabaseManager:
         if _db_remote is None:
             _db_remote = DatabaseManager('remote')
         return _db_remote
+    elif get_config().get_database_config(db_type).get('host'):
+        if db_type not in _db_others:
+            _db_others[db_type] = DatabaseManager(db_type)
+        return _db_others[db_type]
     else:
         raise ValueError(f"Invalid db_type: {db_type}")
 
 
+def get_pool_stats() -> Dict[str, Dict[str, Any]]:
+    """
+    Holt Pool Metriken aller DatabaseManager Instanzen dieses Prozesses
+
+    Returns:
+        Dictionary db_type -> Pool Metriken
+    """
+    return {
+        db.db_type: db.get_pool_stats()
+        for db in [_db_local, _db_remote, *_db_others.values()] if db is not None
+    }
+
+
 if __name__ == "__main__":
     # Test
     print("=== Database Manager Test ===\n")
@@ -0,0 +1,247 @@
+"""
+Database Router
+Verteilt Queries auf Primary und Read-Replicas (bzw. lokalen Mirror)
+
+Routes:
+- write: execute, execute_many, copy_rows, ... -> immer Primary
+- read:  fetch_one, fetch_all, fetch_dict, fetch_all_dict -> Primary,
+         bei Ausfall Replica
+- bulk:  stream, fetch_dataframe, fetch_numpy (historische Massendaten)
+         -> Replica, bei Ausfall Primary
+
+Fällt ein Knoten mit einem Verbindungsfehler aus (OperationalError,
+InterfaceError), wird er für database.routing.retry_interval Sekunden
+übersprungen und das Query auf dem nächsten Knoten der Route wiederholt.
+SQL-Fehler werden nicht umgeleitet. Ein erschöpfter lokaler Pool (PoolError,
+PoolTimeout) sagt nichts über den Server aus: er geht an den Aufrufer, ohne
+den Knoten als ausgefallen zu markieren.
+
+Config (database.routing):
+    enabled: Replicas verwenden (false = alles auf Primary)
+    primary: DB Type des Primary ('remote')
+    replicas: DB Types der Replicas (['local']), jeweils database.<type>
+    failover: Reads bei Ausfall auf andere Knoten umleiten
+    retry_interval: Sekunden bis ein ausgefallener Knoten erneut probiert wird
+
+Lokal testen lässt sich das mit zwei PostgreSQL Instanzen oder mit einem
+zweiten Schema in derselben Datenbank, z.B. database.replica = Kopie von
+database.local mit "schema": "replica" und routing.replicas = ["replica"].
+"""
+
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Dict, Iterator, List, Optional
+
+import psycopg2
+
+from ..utils.logger import get_logger
+from ..utils.config_loader import get_config
+from .database_manager import DatabaseManager, get_database
+
+# Fehler, nach denen ein Knoten als ausgefallen gilt (nicht PoolError: Last im Client)
+CONNECTION_ERRORS = (psycopg2.OperationalError, psycopg2.InterfaceError)
+
+WRITE_METHODS = (
+    'execute', 'execute_many', 'copy_rows', 'copy_rows_many', 'replace_rows',
+    'insert_values', 'insert_values_many', 'bulk_insert'
+)
+READ_METHODS = ('fetch_one', 'fetch_all', 'fetch_dict', 'fetch_all_dict')
+BULK_METHODS = ('fetch_dataframe', 'fetch_numpy')
+
+
+class DatabaseRouter:
+    """Leitet Queries je nach Route an Primary oder Replica weiter"""
+
+    def __init__(
+        self,
+        primary: Optional[str] = None,
+        replicas: Optional[List[str]] = None,
+        failover: Optional[bool] = None,
+        retry_interval: Optional[float] = None
+    ):
+        """
+        Initialisiert den Router (Database Manager werden lazy angelegt)
+
+        Args:
+            primary: DB Type des Primary (None = database.routing.primary)
+            replicas: DB Types der Replicas (None = database.routing.replicas)
+            failover: Reads bei Ausfall umleiten
+            retry_interval: Sekunden bis zum nächsten Versuch auf einem ausgefallenen Knoten
+        """
+        self.logger = get_logger(self.__class__.__name__)
+        routing = get_config().get('database.routing', {}) or {}
+
+        self.primary = primary or routing.get('primary', 'remote')
+        if replicas is None:
+            replicas = routing.get('replicas', []) if routing.get('enabled', False) else []
+        self.replicas = [r for r in replicas if r != self.primary]
+        self.failover = routing.get('failover', True) if failover is None else failover
+        self.retry_interval = retry_interval or routing.get('retry_interval', 30)
+
+        self._lock = threading.Lock()
+        self._down_until: Dict[str, float] = {}
+
+        # Statistics pro Route
+        self.stats = defaultdict(lambda: {
+            'queries': 0,
+            'errors': 0,
+            'failovers': 0,
+            'latency_ms_total': 0.0,
+            'latency_ms_max': 0.0,
+            'by_node': defaultdict(int)
+        })
+
+    def _candidates(self, route: str) -> List[str]:
+        """Knoten einer Route in Reihenfolge der Präferenz"""
+        if route == 'write':
+            return [self.primary]
+        if route == 'bulk':
+            nodes = self.replicas + [self.primary]
+        else:
+            nodes = [self.primary] + self.replicas
+        return nodes if self.failover else nodes[:1]
+
+    def _is_down(self, node: str) -> bool:
+        with self._lock:
+            return self._down_until.get(node, 0) > time.monotonic()
+
+    def _mark_down(self, node: str, error: Exception):
+        with self._lock:
+            self._down_until[node] = time.monotonic() + self.retry_interval
+        self.logger.warning(f"Database '{node}' unavailable, skipping for {self.retry_interval}s: {error}")
+
+    def _record(self, route: str, node: str, started: float, error: bool = False, failover: bool = False):
+        elapsed = (time.perf_counter() - started) * 1000
+        with self._lock:
+            stats = self.stats[route]
+            stats['queries'] += 1
+            stats['latency_ms_total'] += elapsed
+            stats['latency_ms_max'] = max(stats['latency_ms_max'], elapsed)
+            stats['by_node'][node] += 1
+            if error:
+                stats['errors'] += 1
+            if failover:
+                stats['failovers'] += 1
+
+    def get_manager(self, route: str = 'read') -> DatabaseManager:
+        """
+        Holt den Database Manager, der eine Route aktuell bedient
+
+        Args:
+            route: 'write', 'read' oder 'bulk'
+
+        Returns:
+            DatabaseManager des ersten verfügbaren Knotens
+        """
+        candidates = self._candidates(route)
+        last_error = None
+        for node in candidates:
+            if self._is_down(node) and node != candidates[-1]:
+                continue
+            try:
+                return get_database(node)
+            except CONNECTION_ERRORS as e:
+                self._mark_down(node, e)
+                last_error = e
+        raise last_error
+
+    def _call(self, route: str, method: str, *args, **kwargs):
+        """Ruft eine DatabaseManager Methode auf dem ersten verfügbaren Knoten auf"""
+        candidates = self._candidates(route)
+        available = [n for n in candidates if not self._is_down(n)] or candidates[-1:]
+        failover = False
+
+        for index, node in enumerate(available):
+            started = time.perf_counter()
+            try:
+                result = getattr(get_database(node), method)(*args, **kwargs)
+            except CONNECTION_ERRORS as e:
+                self._record(route, node, started, error=True)
+                self._mark_down(node, e)
+                if index == len(available) - 1:
+                    raise
+                failover = True
+                continue
+            except Exception:
+                self._record(route, node, started, error=True)
+                raise
+
+            self._record(route, node, started, failover=failover)
+            return result
+
+    def stream(self, query: str, params: tuple = None, chunk_rows: Optional[int] = None) -> Iterator[List[tuple]]:
+        """
+        Liefert die Rows eines SELECT in Chunks (Route bulk)
+
+        Umgeleitet wird nur beim Verbindungsaufbau, nicht mitten im Stream.
+        """
+        started = time.perf_counter()
+        db = self.get_manager('bulk')
+        try:
+            yield from db.stream(query, params, chunk_rows)
+        except Exception as e:
+            self._record('bulk', db.db_type, started, error=True)
+            if isinstance(e, CONNECTION_ERRORS):
+                self._mark_down(db.db_type, e)
+            raise
+        self._record('bulk', db.db_type, started)
+
+    def __getattr__(self, name: str):
+        """Query-Methoden nach Route, alles andere (table_exists, ...) auf Primary"""
+        if name in WRITE_METHODS:
+            route = 'write'
+        elif name in READ_METHODS:
+            route = 'read'
+        elif name in BULK_METHODS:
+            route = 'bulk'
+        elif name.startswith('_'):
+            raise AttributeError(name)
+        else:
+            return getattr(self.get_manager('write'), name)
+        return lambda *args, **kwargs: self._call(route, name, *args, **kwargs)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Holt Latenz-Statistiken pro Route und den Zustand der Knoten
+
+        Returns:
+            Statistics Dictionary
+        """
+        now = time.monotonic()
+        with self._lock:
+            routes = {}
+            for route, stats in self.stats.items():
+                route_stats = dict(stats)
+                route_stats['by_node'] = dict(stats['by_node'])
+                route_stats['latency_ms_avg'] = (
+                    stats['latency_ms_total'] / stats['queries'] if stats['queries'] else 0.0
+                )
+                routes[route] = route_stats
+            nodes = {
+                node: 'down' if self._down_until.get(node, 0) > now else 'up'
+                for node in [self.primary] + self.replicas
+            }
+
+        return {'routes': routes, 'nodes': nodes}
+
+    def __repr__(self) -> str:
+        """String Representation"""
+        return f"DatabaseRouter(primary={self.primary}, replicas={self.replicas})"
+
+
+# Singleton Instance
+_router = None
+
+
+def get_router() -> DatabaseRouter:
+    """
+    Holt den Database Router (Config: database.routing)
+
+    Returns:
+        DatabaseRouter Instance
+    """
+    global _router
+    if _router is None:
+        _router = DatabaseRouter()
+    return _router
@@ -0,0 +1,284 @@
+"""
+Fake MetaTrader5 Modul
+Spielt aufgezeichnete Ticks ab - für Tests und Entwicklung unter Linux
+
+Tick-Datei (CSV mit Header):
+    symbol,time_msc,bid,ask,last,volume,flags
+
+Rates (copy_rates_range, copy_rates_from_pos) werden wie bei MT5 aus den
+Bid-Preisen der Ticks gebildet. generate_ticks erzeugt synthetische Ticks
+(Random Walk), z.B. für Backfill-Tests ohne Aufzeichnung.
+"""
+
+import csv
+import time
+from collections import namedtuple
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+import numpy as np
+
+from .tick_source import TICK_DTYPE, EMPTY_TICKS
+from .bar_resampler import TIMEFRAME_SECONDS, resample_ticks
+
+# Layout wie von MT5 copy_rates_* geliefert
+RATE_DTYPE = np.dtype([
+    ('time', '<i8'),
+    ('open', '<f8'),
+    ('high', '<f8'),
+    ('low', '<f8'),
+    ('close', '<f8'),
+    ('tick_volume', '<u8'),
+    ('spread', '<i4'),
+    ('real_volume', '<u8')
+])
+
+# MT5 Timeframe-Konstanten -> Timeframe
+MT5_TIMEFRAMES = {1: '1m', 5: '5m', 15: '15m', 16385: '1h', 16388: '4h', 16408: '1d'}
+
+Tick = namedtuple('Tick', ['time', 'bid', 'ask', 'last', 'volume', 'time_msc', 'flags', 'volume_real'])
+AccountInfo = namedtuple('AccountInfo', ['login', 'server', 'balance', 'currency'])
+
+TICK_FILE_COLUMNS = ('symbol', 'time_msc', 'bid', 'ask', 'last', 'volume', 'flags')
+
+
+def load_tick_file(path: Union[str, Path]) -> Dict[str, np.ndarray]:
+    """
+    Lädt aufgezeichnete Ticks
+
+    Args:
+        path: Pfad zur CSV Tick-Datei
+
+    Returns:
+        Dictionary symbol -> Structured Array (TICK_DTYPE), nach time_msc sortiert
+    """
+    rows: Dict[str, list] = {}
+
+    with open(path, 'r', newline='', encoding='utf-8') as f:
+        for record in csv.DictReader(f):
+            time_msc = int(record['time_msc'])
+            rows.setdefault(record['symbol'], []).append((
+                time_msc // 1000,
+                float(record['bid']),
+                float(record['ask']),
+                float(record.get('last') or 0.0),
+                int(record.get('volume') or 0),
+                time_msc,
+                int(record.get('flags') or 0),
+                float(record.get('volume') or 0)
+            ))
+
+    ticks = {}
+    for symbol, symbol_rows in rows.items():
+        array = np.array(symbol_rows, dtype=TICK_DTYPE)
+        ticks[symbol] = array[np.argsort(array['time_msc'], kind='stable')]
+
+    return ticks
+
+
+def generate_ticks(
+    symbols: Dict[str, float],
+    start_msc: int,
+    end_msc: int,
+    mean_interval_ms: int = 1000,
+    spread: float = 0.00012,
+    seed: int = 42
+) -> Dict[str, np.ndarray]:
+    """
+    Erzeugt synthetische Ticks (Random Walk auf dem Bid)
+
+    Args:
+        symbols: Dictionary symbol -> Startpreis
+        start_msc: Beginn in Epoch-ms
+        end_msc: Ende in Epoch-ms (exklusiv)
+        mean_interval_ms: Mittlerer Abstand zwischen Ticks
+        spread: Ask - Bid
+        seed: Zufalls-Seed
+
+    Returns:
+        Dictionary symbol -> Structured Array (TICK_DTYPE)
+    """
+    rng = np.random.default_rng(seed)
+    ticks = {}
+    for symbol, price in symbols.items():
+        count = max(int((end_msc - start_msc) / mean_interval_ms), 1)
+        time_msc = start_msc + np.cumsum(rng.integers(1, 2 * mean_interval_ms, count))
+        time_msc = time_msc[time_msc < end_msc]
+
+        array = np.zeros(len(time_msc), dtype=TICK_DTYPE)
+        array['time_msc'] = time_msc
+        array['time'] = time_msc // 1000
+        array['bid'] = price * np.exp(np.cumsum(rng.normal(0, 2e-5, len(time_msc))))
+        array['ask'] = array['bid'] + spread
+        array['volume'] = rng.integers(1, 10, len(time_msc))
+        array['volume_real'] = array['volume']
+        ticks[symbol] = array
+    return ticks
+
+
+def write_tick_file(path: Union[str, Path], ticks: Dict[str, np.ndarray]) -> int:
+    """
+    Schreibt Ticks im Format von load_tick_file (zum Aufzeichnen echter Daten)
+
+    Args:
+        path: Ziel-Pfad
+        ticks: Dictionary symbol -> Structured Array
+
+    Returns:
+        Anzahl geschriebener Ticks
+    """
+    written = 0
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(TICK_FILE_COLUMNS)
+        for symbol, array in ticks.items():
+            for tick in array:
+                writer.writerow((
+                    symbol, int(tick['time_msc']), repr(float(tick['bid'])), repr(float(tick['ask'])),
+                    repr(float(tick['last'])), int(tick['volume']), int(tick['flags'])
+                ))
+                written += 1
+    return written
+
+
+class FakeMT5:
+    """Stellt die vom Tick Collector genutzte MT5 API über aufgezeichnete Ticks bereit"""
+
+    COPY_TICKS_ALL = 1
+    COPY_TICKS_INFO = 2
+    COPY_TICKS_TRADE = 4
+
+    TIMEFRAME_M1 = 1
+    TIMEFRAME_M5 = 5
+    TIMEFRAME_M15 = 15
+    TIMEFRAME_H1 = 16385
+    TIMEFRAME_H4 = 16388
+    TIMEFRAME_D1 = 16408
+
+    def __init__(self, tick_file: Union[str, Path] = None, ticks: Dict[str, np.ndarray] = None, speed: Optional[float] = 1.0):
+        """
+        Initialisiert das Fake Modul
+
+        Args:
+            tick_file: Pfad zur Tick-Datei
+            ticks: Alternativ direkt symbol -> Structured Array
+            speed: Wiedergabe-Geschwindigkeit relativ zur Echtzeit
+                (None = alle Ticks sofort verfügbar)
+        """
+        if ticks is None:
+            ticks = load_tick_file(tick_file) if tick_file else {}
+        self.ticks = ticks
+        self.speed = speed
+
+        starts = [int(array['time_msc'][0]) for array in ticks.values() if len(array)]
+        self.replay_start_msc = min(starts) if starts else 0
+        self.wall_start = None
+
+        self.initialized = False
+        self._last_error = (0, 'Success')
+
+    # === Verbindung ===
+
+    def initialize(self, path: str = None, **kwargs) -> bool:
+        self.initialized = True
+        self.wall_start = time.time()
+        return True
+
+    def login(self, login: int = None, password: str = None, server: str = None, **kwargs) -> bool:
+        return self.initialized
+
+    def shutdown(self):
+        self.initialized = False
+
+    def last_error(self):
+        return self._last_error
+
+    def account_info(self):
+        if not self.initialized:
+            return None
+        return AccountInfo(login=0, server='replay', balance=0.0, currency='USD')
+
+    def symbol_select(self, symbol: str, enable: bool = True) -> bool:
+        return symbol in self.ticks
+
+    # === Replay Uhr ===
+
+    def now_msc(self) -> int:
+        """Aktueller Zeitpunkt der Wiedergabe in Millisekunden"""
+        if self.speed is None:
+            return np.iinfo(np.int64).max
+        if self.wall_start is None:
+            return self.replay_start_msc
+        elapsed = (time.time() - self.wall_start) * self.speed
+        return self.replay_start_msc + int(elapsed * 1000)
+
+    def _available(self, symbol: str) -> np.ndarray:
+        """Bis zur Replay-Uhr verfügbare Ticks"""
+        array = self.ticks.get(symbol)
+        if array is None:
+            self._last_error = (-1, f'Unknown symbol {symbol}')
+            return EMPTY_TICKS
+        end = np.searchsorted(array['time_msc'], self.now_msc(), side='right')
+        return array[:end]
+
+    # === Daten ===
+
+    def symbol_info_tick(self, symbol: str):
+        available = self._available(symbol)
+        if len(available) == 0:
+            return None
+        return Tick(*available[-1].tolist())
+
+    def copy_ticks_from(self, symbol: str, date_from, count: int, flags: int = COPY_TICKS_ALL) -> Optional[np.ndarray]:
+        available = self._available(symbol)
+        if hasattr(date_from, 'timestamp'):
+            date_from = date_from.timestamp()
+        start = np.searchsorted(available['time_msc'], int(date_from) * 1000, side='left')
+        return available[start:start + count].copy()
+
+    def copy_ticks_range(self, symbol: str, date_from, date_to, flags: int = COPY_TICKS_ALL) -> Optional[np.ndarray]:
+        available = self._available(symbol)
+        if hasattr(date_from, 'timestamp'):
+            date_from = date_from.timestamp()
+        if hasattr(date_to, 'timestamp'):
+            date_to = date_to.timestamp()
+        start = np.searchsorted(available['time_msc'], int(date_from) * 1000, side='left')
+        end = np.searchsorted(available['time_msc'], int(date_to) * 1000, side='right')
+        return available[start:end].copy()
+
+    def _rates(self, ticks: np.ndarray, timeframe: int) -> np.ndarray:
+        """Bid-Rates eines Timeframes aus Ticks"""
+        tf = MT5_TIMEFRAMES.get(timeframe)
+        if tf is None:
+            self._last_error = (-2, f'Unsupported timeframe {timeframe}')
+            return np.empty(0, dtype=RATE_DTYPE)
+
+        bars = resample_ticks(
+            ticks['time_msc'] // 1000, ticks['bid'], ticks['volume'].astype(np.int64), [tf]
+        )[tf]
+        rates = np.zeros(len(bars['bucket']), dtype=RATE_DTYPE)
+        rates['time'] = bars['bucket']
+        for name in ('open', 'high', 'low', 'close'):
+            rates[name] = bars[name]
+        rates['tick_volume'] = bars['tick_count']
+        rates['real_volume'] = bars['volume']
+        return rates
+
+    def copy_rates_range(self, symbol: str, timeframe: int, date_from, date_to) -> Optional[np.ndarray]:
+        available = self._available(symbol)
+        if hasattr(date_from, 'timestamp'):
+            date_from = date_from.timestamp()
+        if hasattr(date_to, 'timestamp'):
+            date_to = date_to.timestamp()
+        # Bars, die im Intervall beginnen (Ticks bis zum Ende des letzten Bars)
+        seconds = TIMEFRAME_SECONDS.get(MT5_TIMEFRAMES.get(timeframe), 60)
+        start_epoch = int(date_from) - int(date_from) % seconds
+        start = np.searchsorted(available['time_msc'], start_epoch * 1000, side='left')
+        end = np.searchsorted(available['time_msc'], (int(date_to) // seconds + 1) * seconds * 1000, side='left')
+        rates = self._rates(available[start:end], timeframe)
+        return rates[(rates['time'] >= int(date_from)) & (rates['time'] <= int(date_to))]
+
+    def copy_rates_from_pos(self, symbol: str, timeframe: int, start_pos: int, count: int) -> Optional[np.ndarray]:
+        rates = self._rates(self._available(symbol), timeframe)
+        end = len(rates) - start_pos
+        return rates[max(end - count, 0):max(end, 0)]
@@ -1,18 +1,141 @@
 """
 Feature Calculator
 Berechnet Technical Indicators aus Bar-Daten
+
+Modi (data.feature_calculator.mode):
+- incremental: Streaming-Zustand pro Symbol/Timeframe, pro Zyklus nur Bars
+  nach dem Watermark, ein Bulk-Write; nach Restart Warm-up aus der Datenbank
+- window (Default): pro Zyklus die letzten lookback_bars Bars neu berechnen,
+  letzte 10 speichern
 """
 
 import pandas as pd
-import numpy as np
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
+import copy
 import threading
 import time
+from functools import partial
 
 from ..utils.logger import get_logger, log_exception
 from ..utils.config_loader import get_config
 from .database_manager import get_database
+from .. import indicators
+from ..indicators import streaming
+from ..utils.work_scheduler import WorkScheduler, WorkUnit, scheduler_enabled
+
+# Feature-Spalten in Tabellen-Reihenfolge
+FEATURE_COLUMNS = ['sma_10', 'sma_20', 'sma_50', 'ema_10', 'ema_20', 'rsi_14', 'macd', 'macd_signal',
+                   'macd_hist', 'bb_upper', 'bb_middle', 'bb_lower', 'atr_14']
+
+FEATURE_UPSERT_SQL = """
+    INSERT INTO features
+        (symbol, timestamp, timeframe, sma_10, sma_20, sma_50,
+         ema_10, ema_20, rsi_14, macd, macd_signal, macd_hist,
+         bb_upper, bb_middle, bb_lower, atr_14)
+    VALUES %s
+    ON CONFLICT (symbol, timestamp, timeframe)
+    DO UPDATE SET
+        sma_10 = EXCLUDED.sma_10,
+        sma_20 = EXCLUDED.sma_20,
+        sma_50 = EXCLUDED.sma_50,
+        ema_10 = EXCLUDED.ema_10,
+        ema_20 = EXCLUDED.ema_20,
+        rsi_14 = EXCLUDED.rsi_14,
+        macd = EXCLUDED.macd,
+        macd_signal = EXCLUDED.macd_signal,
+        macd_hist = EXCLUDED.macd_hist,
+        bb_upper = EXCLUDED.bb_upper,
+        bb_middle = EXCLUDED.bb_middle,
+        bb_lower = EXCLUDED.bb_lower,
+        atr_14 = EXCLUDED.atr_14,
+        created_at = CURRENT_TIMESTAMP
+"""
+
+
+def compute_features(df: pd.DataFrame) -> Optional[pd.DataFrame]:
+    """
+    Berechnet alle Features für DataFrame (Top-Level-Funktion, damit der
+    Process-Pool des WorkSchedulers sie ausführen kann)
+
+    Args:
+        df: DataFrame mit OHLCV Daten
+
+    Returns:
+        DataFrame mit Features oder None bei weniger als 50 Bars
+    """
+    if df is None or len(df) < 50:
+        return None
+
+    features = df.copy()
+    close = df['close']
+
+    # Moving Averages
+    features['sma_10'] = indicators.sma(close, 10)
+    features['sma_20'] = indicators.sma(close, 20)
+    features['sma_50'] = indicators.sma(close, 50)
+
+    features['ema_10'] = indicators.ema(close, 10)
+    features['ema_20'] = indicators.ema(close, 20)
+
+    # RSI
+    features['rsi_14'] = indicators.rsi(close, 14)
+
+    # MACD
+    features['macd'], features['macd_signal'], features['macd_hist'] = indicators.macd(close)
+
+    # Bollinger Bands
+    features['bb_upper'], features['bb_middle'], features['bb_lower'] = indicators.bollinger_bands(close)
+
+    # ATR
+    features['atr_14'] = indicators.atr(df['high'], df['low'], close)
+
+    # Drop NaN
+    return features.dropna()
+
+
+class FeatureState:
+    """
+    Streaming-Zustand der Features eines Symbols/Timeframes (inkrementeller Modus)
+
+    Gleiche Semantik wie calculate_features (Batch- und Streaming-Kernels aus
+    src.indicators sind identisch), aber über die gesamte seit dem Warm-up
+    gesehene Historie statt über ein festes Fenster.
+    """
+
+    def __init__(self):
+        self.sma_10 = streaming.SMA(10)
+        self.sma_20 = streaming.SMA(20)
+        self.sma_50 = streaming.SMA(50)
+        self.ema_10 = streaming.EMA(10)
+        self.ema_20 = streaming.EMA(20)
+        self.rsi_14 = streaming.RSI(14)
+        self.macd = streaming.MACD(12, 26, 9)
+        self.bollinger = streaming.BollingerBands(20, 2.0)
+        self.atr_14 = streaming.ATR(14)
+
+        # Timestamp der letzten abgeschlossenen (in den Zustand übernommenen) Bar
+        self.watermark = None
+
+    def update(self, high: float, low: float, close: float) -> Optional[Tuple[float, ...]]:
+        """
+        Übernimmt eine Bar
+
+        Returns:
+            Feature-Werte in FEATURE_COLUMNS-Reihenfolge oder None während Warm-up
+        """
+        values = (
+            self.sma_10.update(close),
+            self.sma_20.update(close),
+            self.sma_50.update(close),
+            self.ema_10.update(close),
+            self.ema_20.update(close),
+            self.rsi_14.update(close),
+            *self.macd.update(close),
+            *self.bollinger.update(close),
+            self.atr_14.update(high, low, close)
+        )
+        return None if None in values else values
 
 
 class FeatureCalculator:
@@ -34,44 +157,45 @@ class FeatureCalculator:
         # Configuration
         self.symbols = symbols or self.config.get_symbols()
         self.timeframes = timeframes or ['1m', '5m', '15m', '1h']
+        self.mode = self.config.get('data.feature_calculator.mode', 'window')
+        self.interval = self.config.get('data.feature_calculator.interval', 60)
+        self.lookback_bars = self.config.get('data.feature_calculator.lookback_bars', 200)
 
         # State
         self.is_running = False
         self.calculator_thread = None
+        self.states: Dict[Tuple[str, str], FeatureState] = {}  # inkrementeller Modus
+        self.scheduler = None  # WorkScheduler (data.scheduler), ab start()
 
         # Statistics
         self.stats = {
             'features_calculated': 0,
+            'bars_processed': 0,
+            'warmups': 0,
             'errors': 0,
             'start_time': None
         }
+        self._stats_lock = threading.Lock()
+
+    def _count(self, key: str, value: int = 1):
+        with self._stats_lock:
+            self.stats[key] += value
 
     def calculate_sma(self, data: pd.Series, period: int) -> pd.Series:
         """Simple Moving Average"""
-        return data.rolling(window=period, min_periods=period).mean()
+        return indicators.sma(data, period)
 
     def calculate_ema(self, data: pd.Series, period: int) -> pd.Series:
-        """Exponential Moving Average"""
-        return data.ewm(span=period, adjust=False).mean()
+        """Exponential Moving Average (Start mit SMA)"""
+        return indicators.ema(data, period)
 
     def calculate_rsi(self, data: pd.Series, period: int = 14) -> pd.Series:
-        """Relative Strength Index"""
-        delta = data.diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-
-        rs = gain / loss
-        rsi = 100 - (100 / (1 + rs))
-        return rsi
+        """Relative Strength Index (Wilder)"""
+        return indicators.rsi(data, period)
 
     def calculate_macd(self, data: pd.Series, fast: int = 12, slow: int = 26, signal: int = 9) -> Dict[str, pd.Series]:
         """Moving Average Convergence Divergence"""
-        ema_fast = self.calculate_ema(data, fast)
-        ema_slow = self.calculate_ema(data, slow)
-
-        macd_line = ema_fast - ema_slow
-        signal_line = self.calculate_ema(macd_line, signal)
-        histogram = macd_line - signal_line
+        macd_line, signal_line, histogram = indicators.macd(data, fast, slow, signal)
 
         return {
             'macd': macd_line,
@@ -81,29 +205,17 @@ class FeatureCalculator:
 
     def calculate_bollinger_bands(self, data: pd.Series, period: int = 20, std_dev: float = 2.0) -> Dict[str, pd.Series]:
         """Bollinger Bands"""
-        sma = self.calculate_sma(data, period)
-        std = data.rolling(window=period).std()
-
-        upper = sma + (std * std_dev)
-        lower = sma - (std * std_dev)
+        upper, middle, lower = indicators.bollinger_bands(data, period, std_dev)
 
         return {
             'upper': upper,
-            'middle': sma,
+            'middle': middle,
             'lower': lower
         }
 
     def calculate_atr(self, high: pd.Series, low: pd.Series, close: pd.Series, period: int = 14) -> pd.Series:
-        """Average True Range"""
-        high_low = high - low
-        high_close = np.abs(high - close.shift())
-        low_close = np.abs(low - close.shift())
-
-        ranges = pd.concat([high_low, high_close, low_close], axis=1)
-        true_range = ranges.max(axis=1)
-
-        atr = true_range.rolling(window=period).mean()
-        return atr
+        """Average True Range (Wilder)"""
+        return indicators.atr(high, low, close, period)
 
     def fetch_bars(self, symbol: str, timeframe: str, limit: int = 200) -> Optional[pd.DataFrame]:
         """
@@ -158,48 +270,68 @@ class FeatureCalculator:
         Returns:
             DataFrame mit Features
         """
-        if df is None or len(df) < 50:
+        try:
+            return compute_features(df)
+
+        except Exception as e:
+            log_exception(self.logger, e, "Failed to calculate features")
             return None
 
-        try:
-            features = df.copy()
+    def fetch_bars_range(
+        self,
+        symbol: str,
+        timeframe: str,
+        start: datetime,
+        end: datetime,
+        warmup: int = 200
+    ) -> Optional[pd.DataFrame]:
+        """
+        Holt Bars eines Zeitraums plus Warm-up Bars davor (Backfill)
 
-            # Moving Averages
-            features['sma_10'] = self.calculate_sma(df['close'], 10)
-            features['sma_20'] = self.calculate_sma(df['close'], 20)
-            features['sma_50'] = self.calculate_sma(df['close'], 50)
+        Args:
+            symbol: Trading Symbol
+            timeframe: Timeframe
+            start: Beginn (inklusiv)
+            end: Ende (exklusiv)
+            warmup: Anzahl Bars vor start (wie fetch_bars im Live-Betrieb)
 
-            features['ema_10'] = self.calculate_ema(df['close'], 10)
-            features['ema_20'] = self.calculate_ema(df['close'], 20)
+        Returns:
+            DataFrame mit Bar-Daten oder None
+        """
+        table_name = f"bars_{timeframe}"
 
-            # RSI
-            features['rsi_14'] = self.calculate_rsi(df['close'], 14)
+        query = f"""
+            (SELECT timestamp, open, high, low, close, volume
+             FROM {table_name}
+             WHERE symbol = %s AND timestamp < %s
+             ORDER BY timestamp DESC
+             LIMIT %s)
+            UNION ALL
+            (SELECT timestamp, open, high, low, close, volume
+             FROM {table_name}
+             WHERE symbol = %s AND timestamp >= %s AND timestamp < %s)
+        """
 
-            # MACD
-            macd = self.calculate_macd(df['close'])
-            features['macd'] = macd['macd']
-            features['macd_signal'] = macd['signal']
-            features['macd_hist'] = macd['histogram']
+        try:
+            results = self.db.fetch_all_dict(query, (symbol, start, warmup, symbol, start, end))
 
-            # Bollinger Bands
-            bb = self.calculate_bollinger_bands(df['close'])
-            features['bb_upper'] = bb['upper']
-            features['bb_middle'] = bb['middle']
-            features['bb_lower'] = bb['lower']
+            if not results:
+                return None
 
-            # ATR
-            features['atr_14'] = self.calculate_atr(df['high'], df['low'], df['close'])
+            df = pd.DataFrame(results)
+            df = df.sort_values('timestamp')
+            df.set_index('timestamp', inplace=True)
 
-            # Drop NaN
-            features = features.dropna()
+            for col in ['open', 'high', 'low', 'close', 'volume']:
+                df[col] = df[col].astype(float)
 
-            return features
+            return df
 
         except Exception as e:
-            log_exception(self.logger, e, "Failed to calculate features")
+            log_exception(self.logger, e, f"Failed to fetch bars for {symbol} {timeframe}")
             return None
 
-    def save_features(self, symbol: str, timeframe: str, features: pd.DataFrame):
+    def save_features(self, symbol: str, timeframe: str, features: pd.DataFrame, tail: Optional[int] = 10) -> bool:
         """
         Speichert Features in Database
 
@@ -207,65 +339,37 @@ class FeatureCalculator:
             symbol: Trading Symbol
             timeframe: Timeframe
             features: DataFrame mit Features
+            tail: Nur die letzten N Bars speichern (None = alle, Backfill)
+
+        Returns:
+            True wenn gespeichert (oder nichts zu speichern)
         """
         if features is None or len(features) == 0:
-            return
+            return True
 
-        insert_sql = """
-            INSERT INTO features
-                (symbol, timestamp, timeframe, sma_10, sma_20, sma_50,
-                 ema_10, ema_20, rsi_14, macd, macd_signal, macd_hist,
-                 bb_upper, bb_middle, bb_lower, atr_14)
-            VALUES
-                (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-            ON CONFLICT (symbol, timestamp, timeframe)
-            DO UPDATE SET
-                sma_10 = EXCLUDED.sma_10,
-                sma_20 = EXCLUDED.sma_20,
-                sma_50 = EXCLUDED.sma_50,
-                ema_10 = EXCLUDED.ema_10,
-                ema_20 = EXCLUDED.ema_20,
-                rsi_14 = EXCLUDED.rsi_14,
-                macd = EXCLUDED.macd,
-                macd_signal = EXCLUDED.macd_signal,
-                macd_hist = EXCLUDED.macd_hist,
-                bb_upper = EXCLUDED.bb_upper,
-                bb_middle = EXCLUDED.bb_middle,
-                bb_lower = EXCLUDED.bb_lower,
-                atr_14 = EXCLUDED.atr_14,
-                created_at = CURRENT_TIMESTAMP
-        """
+        # Prepare values (im Live-Betrieb nur neueste Werte, nicht alle)
+        latest_features = features.tail(tail) if tail else features
+
+        columns = FEATURE_COLUMNS
+        data = latest_features[columns].astype(float)
+        data = data.astype(object).where(data.notna(), None)
 
-        # Prepare values (nur neueste Werte, nicht alle)
-        latest_features = features.tail(10)  # Letzte 10 Bars
-
-        values = []
-        for timestamp, row in latest_features.iterrows():
-            values.append((
-                symbol,
-                timestamp,
-                timeframe,
-                float(row['sma_10']) if not pd.isna(row['sma_10']) else None,
-                float(row['sma_20']) if not pd.isna(row['sma_20']) else None,
-                float(row['sma_50']) if not pd.isna(row['sma_50']) else None,
-                float(row['ema_10']) if not pd.isna(row['ema_10']) else None,
-                float(row['ema_20']) if not pd.isna(row['ema_20']) else None,
-                float(row['rsi_14']) if not pd.isna(row['rsi_14']) else None,
-                float(row['macd']) if not pd.isna(row['macd']) else None,
-                float(row['macd_signal']) if not pd.isna(row['macd_signal']) else None,
-                float(row['macd_hist']) if not pd.isna(row['macd_hist']) else None,
-                float(row['bb_upper']) if not pd.isna(row['bb_upper']) else None,
-                float(row['bb_middle']) if not pd.isna(row['bb_middle']) else None,
-                float(row['bb_lower']) if not pd.isna(row['bb_lower']) else None,
-                float(row['atr_14']) if not pd.isna(row['atr_14']) else None
-            ))
+        n = len(latest_features)
+        values = list(zip(
+            [symbol] * n,
+            latest_features.index.tolist(),
+            [timeframe] * n,
+            *(data[col].tolist() for col in columns)
+        ))
 
         try:
-            self.db.execute_many(insert_sql, values)
-            self.stats['features_calculated'] += len(values)
+            self.db.insert_values(FEATURE_UPSERT_SQL, values)
+            self._count('features_calculated', len(values))
+            return True
         except Exception as e:
             log_exception(self.logger, e, f"Failed to save features for {symbol} {timeframe}")
-            self.stats['errors'] += 1
+            self._count('errors')
+            return False
 
     def process_symbol_timeframe(self, symbol: str, timeframe: str):
         """
@@ -277,7 +381,7 @@ class FeatureCalculator:
         """
         try:
             # Fetch bars
-            df = self.fetch_bars(symbol, timeframe, limit=200)
+            df = self.fetch_bars(symbol, timeframe, limit=self.lookback_bars)
 
             if df is None or len(df) < 50:
                 return
@@ -293,26 +397,178 @@ class FeatureCalculator:
 
         except Exception as e:
             log_exception(self.logger, e, f"Error processing {symbol} {timeframe}")
-            self.stats['errors'] += 1
+            self._count('errors')
+
+    def fetch_new_bars(self, symbol: str, timeframe: str, after: datetime) -> List[Tuple]:
+        """
+        Holt Bars nach dem Watermark (inkrementeller Modus)
+
+        Args:
+            symbol: Trading Symbol
+            timeframe: Timeframe
+            after: Timestamp der letzten abgeschlossenen Bar (exklusiv)
+
+        Returns:
+            Liste von (timestamp, high, low, close), aufsteigend
+        """
+        query = f"""
+            SELECT timestamp, high, low, close
+            FROM bars_{timeframe}
+            WHERE symbol = %s AND timestamp > %s
+            ORDER BY timestamp
+        """
+        rows = self.db.fetch_all(query, (symbol, after), prepare=True)
+        return [(timestamp, float(high), float(low), float(close)) for timestamp, high, low, close in rows]
+
+    def _stored_until(self, symbol: str, timeframe: str) -> Optional[datetime]:
+        """Timestamp des neuesten gespeicherten Features (Lückenfüllung nach Restart)"""
+        row = self.db.fetch_one(
+            "SELECT MAX(timestamp) FROM features WHERE symbol = %s AND timeframe = %s",
+            (symbol, timeframe)
+        )
+        return row[0] if row else None
+
+    def _advance(self, symbol: str, timeframe: str, state: FeatureState, bars: List[Tuple],
+                 since: Optional[datetime] = None) -> List[Tuple]:
+        """
+        Schiebt den Zustand über neue Bars und erzeugt die Feature-Rows
+
+        Die neueste Bar gilt als offen (der BarBuilder schreibt sie laufend fort):
+        sie wird auf einer Kopie des Zustands berechnet und im nächsten Zyklus
+        erneut gelesen. Der Watermark steht auf der letzten abgeschlossenen Bar.
+
+        Args:
+            symbol: Trading Symbol
+            timeframe: Timeframe
+            state: Zustand des Symbols/Timeframes
+            bars: (timestamp, high, low, close), aufsteigend
+            since: Rows nur für Bars ab diesem Timestamp (Warm-up), None = alle
+
+        Returns:
+            Rows für FEATURE_UPSERT_SQL
+        """
+        rows = []
+        last = len(bars) - 1
+        for i, (timestamp, high, low, close) in enumerate(bars):
+            target = copy.deepcopy(state) if i == last else state
+            values = target.update(high, low, close)
+            if i < last:
+                state.watermark = timestamp
+            if values is not None and (since is None or timestamp >= since):
+                rows.append((symbol, timestamp, timeframe) + values)
+
+        self._count('bars_processed', len(bars))
+        return rows
+
+    def _incremental_rows(self, symbol: str, timeframe: str) -> List[Tuple]:
+        """
+        Feature-Rows für neue Bars eines Symbols/Timeframes
+
+        Ohne Zustand (Start, Restart, nach Fehlern) wird er neu aufgebaut
+        (Warm-up): aus lookback_bars Bars vor dem neuesten gespeicherten
+        Feature plus allen Bars danach, geschrieben werden nur Bars ab dem
+        gespeicherten Feature. Eine Lücke wird so auch dann ganz gefüllt, wenn
+        sie länger als lookback_bars ist. Ohne gespeicherte Features reichen
+        die letzten lookback_bars Bars.
+        """
+        key = (symbol, timeframe)
+        state = self.states.get(key)
+
+        if state is None or state.watermark is None:
+            state = self.states[key] = FeatureState()
+            self._count('warmups')
+            stored_until = self._stored_until(symbol, timeframe)
+            if stored_until is None:
+                df = self.fetch_bars(symbol, timeframe, limit=self.lookback_bars)
+            else:
+                df = self.fetch_bars_range(symbol, timeframe, stored_until, datetime.max,
+                                           warmup=self.lookback_bars)
+            if df is None:
+                return []
+            bars = list(zip(df.index.to_pydatetime(), df['high'], df['low'], df['close']))
+            return self._advance(symbol, timeframe, state, bars, since=stored_until)
+
+        return self._advance(symbol, timeframe, state, self.fetch_new_bars(symbol, timeframe, state.watermark))
+
+    def _collect_rows(self, symbol: str, timeframe: str) -> List[Tuple]:
+        """_incremental_rows mit Fehlerbehandlung (Zustand wird bei Fehlern neu aufgebaut)"""
+        try:
+            return self._incremental_rows(symbol, timeframe)
+        except Exception as e:
+            log_exception(self.logger, e, f"Error processing {symbol} {timeframe}")
+            self._count('errors')
+            self.states.pop((symbol, timeframe), None)
+            return []
+
+    def process_incremental(self) -> int:
+        """
+        Ein Zyklus im inkrementellen Modus: neue Bars aller Symbols/Timeframes
+        (mit Scheduler parallel), ein Bulk-Write für alle Feature-Rows
+
+        Returns:
+            Anzahl geschriebener Rows
+        """
+        pairs = [(symbol, timeframe) for symbol in self.symbols for timeframe in self.timeframes]
+        if self.scheduler is None:
+            batches = [self._collect_rows(*pair) for pair in pairs]
+        else:
+            batches = [rows for _, rows in self.scheduler.run(
+                {pair: WorkUnit(partial(self._collect_rows, *pair)) for pair in pairs}
+            )]
+
+        rows = [row for batch in batches for row in batch]
+        if not rows:
+            return 0
+
+        try:
+            written = self.db.insert_values(FEATURE_UPSERT_SQL, rows)
+            self._count('features_calculated', written)
+            return written
+        except Exception as e:
+            # Zustände sind schon fortgeschrieben -> neu aufbauen, Warm-up füllt die Lücke
+            log_exception(self.logger, e, "Failed to save features")
+            self._count('errors')
+            self.states.clear()
+            return 0
+
+    def process_window(self):
+        """
+        Ein Zyklus im window-Modus über alle Symbols/Timeframes; mit Scheduler
+        laufen Lesen/Schreiben im Thread-Pool und die Berechnung im Process-Pool
+        """
+        if self.scheduler is None:
+            for symbol in self.symbols:
+                for timeframe in self.timeframes:
+                    self.process_symbol_timeframe(symbol, timeframe)
+            return
+
+        self.scheduler.run({
+            (symbol, timeframe): WorkUnit(
+                io=partial(self.fetch_bars, symbol, timeframe, self.lookback_bars),
+                cpu=compute_features,
+                store=partial(self.save_features, symbol, timeframe)
+            )
+            for symbol in self.symbols
+            for timeframe in self.timeframes
+        })
 
     def _calculate_loop(self):
         """Feature Calculation Loop (läuft in eigenem Thread)"""
         self.logger.info("Feature calculator started")
 
-        calculation_interval = 60  # Sekunden (alle 60s neu berechnen)
-
         while self.is_running:
             try:
                 # Process all symbols and timeframes
-                for symbol in self.symbols:
-                    for timeframe in self.timeframes:
-                        self.process_symbol_timeframe(symbol, timeframe)
+                if self.mode == 'incremental':
+                    self.process_incremental()
+                else:
+                    self.process_window()
 
                 # Log progress
                 self.logger.info(f"Features calculated: {self.stats['features_calculated']}, Errors: {self.stats['errors']}")
 
                 # Sleep
-                time.sleep(calculation_interval)
+                time.sleep(self.interval)
 
             except Exception as e:
                 log_exception(self.logger, e, "Error in feature calculation loop")
@@ -330,12 +586,14 @@ class FeatureCalculator:
 
         self.is_running = True
         self.stats['start_time'] = datetime.now()
+        if scheduler_enabled('feature_calculator'):
+            self.scheduler = WorkScheduler('feature_calculator')
 
         # Start thread
         self.calculator_thread = threading.Thread(target=self._calculate_loop, daemon=True)
         self.calculator_thread.start()
 
-        self.logger.info(f"✓ Feature calculator started for {len(self.symbols)} symbols x {len(self.timeframes)} timeframes")
+        self.logger.info(f"✓ Feature calculator started for {len(self.symbols)} symbols x {len(self.timeframes)} timeframes ({self.mode} mode)")
 
     def stop(self):
         """Stoppt den Feature Calculator"""
@@ -350,6 +608,10 @@ class FeatureCalculator:
         if self.calculator_thread:
             self.calculator_thread.join(timeout=10)
 
+        if self.scheduler is not None:
+            self.scheduler.shutdown()
+            self.scheduler = None
+
         # Log statistics
         self._log_statistics()
 
@@ -363,6 +625,7 @@ class FeatureCalculator:
             self.logger.info("=== Feature Calculator Statistics ===")
             self.logger.info(f"Runtime: {runtime:.0f}s")
             self.logger.info(f"Features Calculated: {self.stats['features_calculated']}")
+            self.logger.info(f"Bars Processed: {self.stats['bars_processed']} (warm-ups: {self.stats['warmups']})")
             self.logger.info(f"Errors: {self.stats['errors']}")
 
     def get_latest_features(self, symbol: str, timeframe: str) -> Optional[Dict[str, Any]]:
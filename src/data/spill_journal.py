@@ -0,0 +1,335 @@
+"""
+Spill Journal
+Append-only Journal auf lokaler Platte für Tick-Rows, die nicht in die
+Datenbank geschrieben werden konnten (Queue voll oder DB nicht erreichbar)
+
+- Segmentierte Binärdateien (spill_000000000001.seg, ...)
+- Record: Header (Payload-Länge, Anzahl Rows) + Pickle von (table, columns, rows)
+- Begrenzter Platzbedarf: neue Records werden abgelehnt wenn max_bytes erreicht
+- Replay beim Start: vorhandene Segmente werden eingelesen und abgearbeitet
+- Drain segmentweise: ein Segment = eine DB-Transaktion, danach wird die
+  Datei gelöscht (Crash zwischen Commit und Löschen -> Segment doppelt)
+- Quarantäne: ein Segment, das max_drain_failures mal nicht geschrieben werden
+  kann (Datenfehler, nicht lesbar), wird nach quarantine/ verschoben und der
+  Drain läuft mit den übrigen Segmenten weiter. Verbindungsfehler zählen nicht.
+"""
+
+import os
+import pickle
+import struct
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from ..utils.logger import get_logger, log_exception
+from ..utils.config_loader import get_config
+
+try:
+    import psycopg2
+    CONNECTION_ERRORS: Tuple[type, ...] = (
+        ConnectionError, TimeoutError, psycopg2.OperationalError, psycopg2.InterfaceError
+    )
+except ImportError:
+    CONNECTION_ERRORS = (ConnectionError, TimeoutError)
+
+HEADER = struct.Struct('<II')  # payload bytes, row count
+SEGMENT_PREFIX = 'spill_'
+SEGMENT_SUFFIX = '.seg'
+QUARANTINE_DIR = 'quarantine'
+
+Batch = Tuple[str, Sequence[str], List[Sequence[Any]]]
+
+
+class SpillJournal:
+    """Segmentiertes Append-only Journal für nicht geschriebene Rows"""
+
+    def __init__(
+        self,
+        name: str,
+        directory: Optional[str] = None,
+        segment_bytes: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        fsync: Optional[bool] = None,
+        max_drain_failures: Optional[int] = None
+    ):
+        """
+        Initialisiert das Journal und liest vorhandene Segmente ein
+
+        Args:
+            name: Unterverzeichnis pro Komponente (ein Journal pro Prozess)
+            directory: Basis-Verzeichnis (relativ = zum Projekt-Root)
+            segment_bytes: Segmentgröße, danach wird rotiert
+            max_bytes: Maximaler Platzbedarf aller Segmente
+            fsync: Nach jedem Append fsync ausführen
+            max_drain_failures: Fehlversuche pro Segment bis zur Quarantäne
+        """
+        self.logger = get_logger(self.__class__.__name__)
+        config = get_config()
+        journal_config = config.get('data.spill_journal', {}) or {}
+
+        directory = Path(directory or journal_config.get('directory', 'data/spill'))
+        if not directory.is_absolute():
+            directory = config.root_dir / directory
+        self.directory = directory / name
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        self.segment_bytes = segment_bytes or journal_config.get('segment_mb', 16) * 1024 * 1024
+        self.max_bytes = max_bytes or journal_config.get('max_mb', 1024) * 1024 * 1024
+        self.fsync = journal_config.get('fsync', False) if fsync is None else fsync
+        self.max_drain_failures = max_drain_failures or journal_config.get('max_drain_failures', 5)
+        self.quarantine_dir = self.directory / QUARANTINE_DIR
+
+        self._lock = threading.Lock()
+        self._drain_lock = threading.Lock()
+        self._active = None  # offenes File-Objekt des aktiven Segments
+        self._active_path = None
+
+        # path -> [bytes, rows]
+        self.segments: Dict[Path, List[int]] = {}
+        self._failures: Dict[Path, int] = {}
+        self._next_seq = 1
+
+        self.stats = {
+            'rows_spilled': 0,
+            'rows_drained': 0,
+            'rows_rejected': 0,
+            'drain_errors': 0,
+            'rows_quarantined': 0,
+            'segments_quarantined': 0,
+            'last_drain_rows': 0,
+            'last_drain_seconds': 0.0
+        }
+
+        self._load_existing()
+
+    def _load_existing(self):
+        """Vorhandene Segmente einlesen (Replay-on-Startup)"""
+        for path in sorted(self.directory.glob(f"{SEGMENT_PREFIX}*{SEGMENT_SUFFIX}")):
+            size, rows = self._scan_segment(path)
+            if size == 0:
+                path.unlink()
+                continue
+            self.segments[path] = [size, rows]
+            self._next_seq = max(self._next_seq, self._segment_seq(path) + 1)
+
+        if self.segments:
+            self.logger.warning(
+                f"Spill journal contains {self.get_stats()['rows_pending']} rows "
+                f"in {len(self.segments)} segments - will replay"
+            )
+
+    @staticmethod
+    def _segment_seq(path: Path) -> int:
+        return int(path.name[len(SEGMENT_PREFIX):-len(SEGMENT_SUFFIX)])
+
+    @staticmethod
+    def _scan_segment(path: Path) -> Tuple[int, int]:
+        """
+        Zählt Rows eines Segments, schneidet unvollständige Records ab
+
+        Returns:
+            (gültige Bytes, Rows)
+        """
+        valid_bytes = 0
+        rows = 0
+        with open(path, 'r+b') as f:
+            while True:
+                header = f.read(HEADER.size)
+                if len(header) < HEADER.size:
+                    break
+                payload_len, row_count = HEADER.unpack(header)
+                f.seek(payload_len, os.SEEK_CUR)
+                if f.tell() > os.fstat(f.fileno()).st_size:
+                    break  # abgebrochener Schreibvorgang
+                valid_bytes = f.tell()
+                rows += row_count
+            f.truncate(valid_bytes)
+        return valid_bytes, rows
+
+    @staticmethod
+    def _read_segment(path: Path) -> List[Batch]:
+        """Liest alle Records eines Segments"""
+        batches = []
+        with open(path, 'rb') as f:
+            while True:
+                header = f.read(HEADER.size)
+                if len(header) < HEADER.size:
+                    break
+                payload_len, _ = HEADER.unpack(header)
+                batches.append(pickle.loads(f.read(payload_len)))
+        return batches
+
+    def _open_new_segment(self):
+        """Schließt aktives Segment und öffnet ein neues"""
+        self._close_active()
+        self._active_path = self.directory / f"{SEGMENT_PREFIX}{self._next_seq:012d}{SEGMENT_SUFFIX}"
+        self._next_seq += 1
+        self._active = open(self._active_path, 'ab')
+        self.segments[self._active_path] = [0, 0]
+
+    def _close_active(self):
+        if self._active is not None:
+            self._active.close()
+            self._active = None
+            self._active_path = None
+
+    def append(self, table: str, columns: Sequence[str], rows: List[Sequence[Any]]) -> bool:
+        """
+        Hängt Rows an das Journal an
+
+        Args:
+            table: Ziel-Tabelle
+            columns: Spaltennamen
+            rows: Liste von Rows
+
+        Returns:
+            True wenn gespeichert, False wenn max_bytes erreicht (Rows verloren)
+        """
+        if not rows:
+            return True
+
+        payload = pickle.dumps((table, tuple(columns), list(rows)), protocol=pickle.HIGHEST_PROTOCOL)
+        record = HEADER.pack(len(payload), len(rows)) + payload
+
+        with self._lock:
+            if self._size_bytes() + len(record) > self.max_bytes:
+                self.stats['rows_rejected'] += len(rows)
+                self.logger.error(f"Spill journal full ({self.max_bytes} bytes), dropping {len(rows)} rows")
+                return False
+
+            if self._active is None or self.segments[self._active_path][0] >= self.segment_bytes:
+                self._open_new_segment()
+
+            self._active.write(record)
+            self._active.flush()
+            if self.fsync:
+                os.fsync(self._active.fileno())
+
+            self.segments[self._active_path][0] += len(record)
+            self.segments[self._active_path][1] += len(rows)
+            self.stats['rows_spilled'] += len(rows)
+
+        return True
+
+    def has_pending(self) -> bool:
+        """True wenn Rows auf Replay warten"""
+        with self._lock:
+            return any(rows for _, rows in self.segments.values())
+
+    def drain(self, write_fn: Callable[[List[Batch]], Any], max_segments: int = 1) -> int:
+        """
+        Schreibt Segmente (älteste zuerst) zurück in die Datenbank
+
+        Args:
+            write_fn: Schreibt eine Liste von (table, columns, rows) in einer
+                Transaktion, z.B. DatabaseManager.copy_rows_many
+            max_segments: Max. geschriebene Segmente pro Aufruf
+
+        Returns:
+            Anzahl zurückgeschriebener Rows
+        """
+        # Nur ein Drain gleichzeitig (mehrere Writer Worker)
+        if not self._drain_lock.acquire(blocking=False):
+            return 0
+
+        try:
+            drained = 0
+            written = 0
+            started = time.perf_counter()
+
+            # Quarantänierte Segmente zählen nicht gegen max_segments
+            while written < max_segments:
+                with self._lock:
+                    pending = [path for path, (_, rows) in sorted(self.segments.items()) if rows]
+                    if not pending:
+                        break
+                    path = pending[0]
+                    if path == self._active_path:
+                        # Aktives Segment abschließen, neue Records gehen in ein neues
+                        self._close_active()
+
+                try:
+                    write_fn(self._read_segment(path))
+                except Exception as e:
+                    log_exception(self.logger, e, f"Failed to drain spill segment {path.name}")
+                    with self._lock:
+                        self.stats['drain_errors'] += 1
+                    if isinstance(e, CONNECTION_ERRORS):
+                        break  # DB nicht erreichbar - Segment ist nicht schuld
+                    self._failures[path] = self._failures.get(path, 0) + 1
+                    if self._failures[path] < self.max_drain_failures:
+                        break
+                    self._quarantine(path)
+                    continue
+
+                with self._lock:
+                    rows = self.segments.pop(path)[1]
+                    self.stats['rows_drained'] += rows
+                self._failures.pop(path, None)
+                path.unlink()
+                drained += rows
+                written += 1
+
+            if drained:
+                elapsed = time.perf_counter() - started
+                with self._lock:
+                    self.stats['last_drain_rows'] = drained
+                    self.stats['last_drain_seconds'] = elapsed
+                self.logger.info(f"Drained {drained} rows from spill journal in {elapsed:.2f}s")
+
+            return drained
+
+        finally:
+            self._drain_lock.release()
+
+    def _quarantine(self, path: Path):
+        """
+        Verschiebt ein nicht schreibbares Segment nach quarantine/
+
+        Es wird beim Start nicht mehr eingelesen; nach Behebung der Ursache
+        kann es zurück ins Journal-Verzeichnis verschoben werden.
+
+        Args:
+            path: Segment-Datei
+        """
+        self.quarantine_dir.mkdir(exist_ok=True)
+        target = self.quarantine_dir / path.name
+        path.rename(target)
+
+        with self._lock:
+            rows = self.segments.pop(path)[1]
+            self.stats['rows_quarantined'] += rows
+            self.stats['segments_quarantined'] += 1
+        failures = self._failures.pop(path, 0)
+
+        self.logger.error(
+            f"SPILL SEGMENT QUARANTINED: {path.name} ({rows} rows) failed {failures} times, "
+            f"moved to {target} - rows are NOT in the database until replayed manually"
+        )
+
+    def _size_bytes(self) -> int:
+        return sum(size for size, _ in self.segments.values())
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Holt Journal Statistiken
+
+        Returns:
+            Statistics Dictionary (Größe, offene Rows, Drain-Rate)
+        """
+        with self._lock:
+            stats = dict(self.stats)
+            stats['size_bytes'] = self._size_bytes()
+            stats['segments'] = len(self.segments)
+            stats['rows_pending'] = sum(rows for _, rows in self.segments.values())
+
+        stats['drain_rate_rows_per_sec'] = (
+            stats['last_drain_rows'] / stats['last_drain_seconds'] if stats['last_drain_seconds'] else 0.0
+        )
+        return stats
+
+    def close(self):
+        """Schließt das aktive Segment"""
+        with self._lock:
+            self._close_active()
@@ -0,0 +1,509 @@
+"""
+Tick Archive
+Retention für Tick-Daten: abgelaufene Tage werden als Spaltendateien
+archiviert und erst nach Prüfung der Row-Counts aus der Datenbank entfernt
+
+- Quellen eines Tages: V1 Tagestabelle (ticks_YYYYMMDD), V2 Tabellen
+  (ticks_<symbol>_YYYYMMDD), Partition von `ticks` und von ticks_compact
+- Eine Datei pro Symbol und Tag (Parquet oder Feather, zstd) mit einheitlichem
+  Schema (ARCHIVE_COLUMNS + source), unabhängig vom Layout der Quelle
+- Manifest (manifest.json) mit Rows, Zeitbereich und Rows pro Quelltabelle
+- Gedroppt wird erst, wenn alle Rows jeder Quelle exportiert wurden und jede
+  Datei beim Zurücklesen die erwartete Anzahl Rows hat
+- read_ticks() liefert archivierte Tage aus den Dateien, alle anderen aus der
+  Datenbank (DataLoader, Training)
+
+Aktivierung über data.tick_archive.enabled: dann übernimmt der Archiver die
+Retention (data.tick_storage_days) auch für die partitionierten Tabellen.
+Benötigt pyarrow.
+"""
+
+import json
+import os
+import re
+import threading
+from datetime import date, datetime, time, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+# pyarrow ist Engine für Parquet/Feather (nur für Archivdateien nötig)
+try:
+    import pyarrow.feather as feather
+    import pyarrow.parquet as parquet
+except ImportError:
+    feather = None
+    parquet = None
+
+from ..utils.logger import get_logger, log_exception
+from ..utils.config_loader import get_config
+from .tick_partitions import TICKS_TABLE, INDICATOR_COLUMNS
+from .tick_compact import COMPACT_TABLE, INDICATOR_TABLE, COMPACT_INDICATOR_VIEW, SYMBOLS_TABLE
+
+# Spalten der Archivdateien (aus SQL), dazu 'source' (Layout der Quelltabelle)
+ARCHIVE_COLUMNS = ('timestamp', 'time_msc', 'bid', 'ask', 'last', 'volume') + INDICATOR_COLUMNS
+
+FORMATS = {'parquet': '.parquet', 'feather': '.feather'}
+MANIFEST_FILE = 'manifest.json'
+
+# ticks_YYYYMMDD, ticks_<symbol>_YYYYMMDD, ticks_p_YYYYMMDD, ticks_compact_p_YYYYMMDD
+_DAY_TABLE_RE = re.compile(r'^ticks(?:_compact_p|_p|_[a-z0-9]+)?_(\d{8})$')
+
+
+def archive_enabled() -> bool:
+    """True wenn abgelaufene Tick-Tage archiviert statt nur gedroppt werden"""
+    return bool(get_config().get('data.tick_archive.enabled', False))
+
+
+class DaySource:
+    """Eine Tabelle mit Ticks eines Tages (Queries je nach Layout)"""
+
+    def __init__(self, kind: str, relation: str, day: date, columns=(), symbol: Optional[str] = None):
+        """
+        Args:
+            kind: 'v1', 'v2', 'partition' oder 'compact'
+            relation: Tabelle bzw. Partition
+            day: Kalendertag
+            columns: Spalten der Tabelle (für Indikatoren)
+            symbol: Symbol bei V2 (ein Symbol pro Tabelle)
+        """
+        self.kind = kind
+        self.relation = relation
+        self.day = day
+        self.columns = set(columns)
+        self.symbol = symbol
+
+    @property
+    def drop_sql(self) -> str:
+        """DDL zum Entfernen der Quelle"""
+        if self.kind == 'compact':
+            suffix = self.day.strftime('%Y%m%d')
+            return f"DROP TABLE IF EXISTS {COMPACT_TABLE}_p_{suffix}, {INDICATOR_TABLE}_p_{suffix}"
+        return f"DROP TABLE IF EXISTS {self.relation}"
+
+    def _select(self, symbol: str) -> Tuple[str, tuple]:
+        """SELECT der ARCHIVE_COLUMNS für ein Symbol (+ Parameter)"""
+        if self.kind == 'compact':
+            start = int(datetime.combine(self.day, time()).timestamp() * 1000)
+            end = int(datetime.combine(self.day + timedelta(days=1), time()).timestamp() * 1000)
+            select = ', '.join(ARCHIVE_COLUMNS)
+            return (
+                f"SELECT {select} FROM {COMPACT_INDICATOR_VIEW} "
+                f"WHERE symbol = %s AND time_msc >= %s AND time_msc < %s",
+                (symbol, start, end)
+            )
+
+        indicators = [
+            f"t.{col}" if col in self.columns else f"NULL::double precision AS {col}"
+            for col in INDICATOR_COLUMNS
+        ]
+        if self.kind == 'v2':
+            prices = [
+                "t.mt5_ts::timestamp AS timestamp",
+                "(EXTRACT(EPOCH FROM t.mt5_ts) * 1000)::bigint AS time_msc",
+                "t.bid", "t.ask", "NULL::double precision AS last", "t.volume::bigint"
+            ]
+            where, params = '', ()
+        else:
+            prices = [
+                "t.timestamp",
+                "COALESCE(t.time_msc, (EXTRACT(EPOCH FROM t.timestamp::timestamptz) * 1000)::bigint)",
+                "t.bid::double precision", "t.ask::double precision",
+                "t.last::double precision", "t.volume::bigint"
+            ]
+            where, params = "WHERE t.symbol = %s", (symbol,)
+
+        return f"SELECT {', '.join(prices + indicators)} FROM {self.relation} t {where}", params
+
+    def symbols(self, db) -> List[str]:
+        """Symbols mit Ticks in dieser Quelle"""
+        if self.kind == 'v2':
+            return [self.symbol] if db.fetch_one(f"SELECT 1 FROM {self.relation} LIMIT 1") else []
+        if self.kind == 'compact':
+            query = f"SELECT DISTINCT s.symbol FROM {self.relation} t JOIN {SYMBOLS_TABLE} s USING (symbol_id)"
+        else:
+            query = f"SELECT DISTINCT symbol FROM {self.relation}"
+        return sorted(symbol for (symbol,) in db.fetch_all(query))
+
+    def count(self, db, symbol: Optional[str] = None) -> int:
+        """Rows der Quelle (insgesamt oder für ein Symbol)"""
+        if symbol is None:
+            return db.fetch_one(f"SELECT COUNT(*) FROM {self.relation}")[0]
+        query, params = self._select(symbol)
+        return db.fetch_one(f"SELECT COUNT(*) FROM ({query}) q", params)[0]
+
+    def fetch(self, db, symbol: str) -> pd.DataFrame:
+        """Ticks eines Symbols im Archiv-Schema"""
+        query, params = self._select(symbol)
+        df = db.fetch_dataframe(query, params)
+        df.columns = list(ARCHIVE_COLUMNS)
+        df['source'] = self.kind
+        return normalize_frame(df)
+
+
+def normalize_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Einheitliche dtypes für das Archiv-Schema"""
+    df['timestamp'] = pd.to_datetime(df['timestamp'])
+    df['time_msc'] = df['time_msc'].astype('int64')
+    df['volume'] = df['volume'].fillna(0).astype('int64')
+    floats = ['bid', 'ask', 'last'] + list(INDICATOR_COLUMNS)
+    df[floats] = df[floats].astype('float64')
+    return df
+
+
+class ArchiveManifest:
+    """manifest.json: ein Eintrag pro Symbol und Tag"""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._lock = threading.Lock()
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        if path.exists():
+            with open(path, 'r', encoding='utf-8') as f:
+                self.entries = json.load(f).get('files', {})
+
+    @staticmethod
+    def key(symbol: str, day: date) -> str:
+        return f"{symbol}/{day.strftime('%Y%m%d')}"
+
+    def get(self, symbol: str, day: date) -> Optional[Dict[str, Any]]:
+        return self.entries.get(self.key(symbol, day))
+
+    def day_entries(self, day: date) -> Dict[str, Dict[str, Any]]:
+        """symbol -> Eintrag für alle Symbols eines Tages"""
+        suffix = day.strftime('%Y%m%d')
+        return {
+            key.split('/')[0]: entry for key, entry in self.entries.items()
+            if key.endswith(f"/{suffix}")
+        }
+
+    def update(self, day: date, entries: Dict[str, Dict[str, Any]]):
+        """Einträge eines Tages setzen und Manifest atomar speichern"""
+        with self._lock:
+            for symbol, entry in entries.items():
+                self.entries[self.key(symbol, day)] = entry
+
+            tmp_path = self.path.with_suffix('.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'files': self.entries}, f, indent=2, sort_keys=True)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+
+
+class TickArchiver:
+    """Archiviert abgelaufene Tick-Tage und liest sie wieder ein"""
+
+    def __init__(
+        self,
+        db,
+        directory: Optional[str] = None,
+        fmt: Optional[str] = None,
+        compression: Optional[str] = None,
+        retention_days: Optional[int] = None
+    ):
+        """
+        Initialisiert den Archiver
+
+        Args:
+            db: DatabaseManager
+            directory: Archiv-Verzeichnis (relativ = zum Projekt-Root)
+            fmt: 'parquet' oder 'feather'
+            compression: Kompression der Dateien (z.B. 'zstd')
+            retention_days: Tage, die in der DB bleiben (None = data.tick_storage_days)
+        """
+        self.logger = get_logger(self.__class__.__name__)
+        self.db = db
+
+        config = get_config()
+        archive_config = config.get('data.tick_archive', {}) or {}
+
+        directory = Path(directory or archive_config.get('directory', 'data/archive/ticks'))
+        if not directory.is_absolute():
+            directory = config.root_dir / directory
+        self.directory = directory
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        self.format = fmt or archive_config.get('format', 'parquet')
+        if self.format not in FORMATS:
+            raise ValueError(f"Unknown archive format: {self.format}")
+        self.compression = compression or archive_config.get('compression', 'zstd')
+        self.retention_days = retention_days or config.get('data.tick_storage_days', 7)
+
+        self.manifest = ArchiveManifest(self.directory / MANIFEST_FILE)
+
+        self.stats = {
+            'days_archived': 0,
+            'files_written': 0,
+            'rows_archived': 0,
+            'tables_dropped': 0,
+            'verify_failures': 0,
+            'errors': 0
+        }
+
+    def _require_engine(self):
+        if parquet is None:
+            raise RuntimeError("pyarrow is required for tick archive files (pip install pyarrow)")
+
+    # ==================== Quellen ====================
+
+    def list_tick_days(self) -> List[date]:
+        """Alle Tage mit Tick-Tabellen in der Datenbank (sortiert)"""
+        rows = self.db.fetch_all(
+            "SELECT table_name FROM information_schema.tables "
+            "WHERE table_schema = 'public' AND table_name LIKE 'ticks%'"
+        )
+        days = set()
+        for (name,) in rows:
+            match = _DAY_TABLE_RE.match(name)
+            if match:
+                days.add(datetime.strptime(match.group(1), '%Y%m%d').date())
+        return sorted(days)
+
+    def expired_days(self, today: Optional[date] = None) -> List[date]:
+        """Tage älter als retention_days"""
+        cutoff = (today or date.today()) - timedelta(days=self.retention_days)
+        return [day for day in self.list_tick_days() if day < cutoff]
+
+    def day_sources(self, day: date) -> List[DaySource]:
+        """
+        Alle Quelltabellen eines Tages
+
+        Args:
+            day: Kalendertag
+
+        Returns:
+            Quellen (Tabellen mit unbekanntem Layout werden ausgelassen)
+        """
+        suffix = day.strftime('%Y%m%d')
+        rows = self.db.fetch_all(
+            "SELECT table_name, array_agg(column_name::text) FROM information_schema.columns "
+            "WHERE table_schema = 'public' AND table_name LIKE %s GROUP BY table_name ORDER BY table_name",
+            (f"ticks%{suffix}",)
+        )
+
+        sources = []
+        for name, columns in rows:
+            if not _DAY_TABLE_RE.match(name):
+                continue
+            if name == f"{COMPACT_TABLE}_p_{suffix}":
+                sources.append(DaySource('compact', name, day))
+            elif name == f"{TICKS_TABLE}_p_{suffix}":
+                sources.append(DaySource('partition', name, day, columns))
+            elif 'mt5_ts' in columns:
+                symbol = name[len('ticks_'):-len(suffix) - 1].upper()
+                sources.append(DaySource('v2', name, day, columns, symbol))
+            elif 'symbol' in columns and 'timestamp' in columns:
+                sources.append(DaySource('v1', name, day, columns))
+            else:
+                self.logger.warning(f"Unknown tick table layout, not archived: {name}")
+        return sources
+
+    # ==================== Archivieren ====================
+
+    def file_path(self, symbol: str, day: date) -> Path:
+        """Archivdatei eines Symbol-Tages"""
+        return self.directory / symbol / f"{symbol}_{day.strftime('%Y%m%d')}{FORMATS[self.format]}"
+
+    def _write_file(self, path: Path, df: pd.DataFrame) -> int:
+        """
+        Schreibt Datei atomar und liest die Row-Anzahl zurück
+
+        Returns:
+            Rows laut Datei
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + '.tmp')
+        df = df.reset_index(drop=True)
+
+        if self.format == 'parquet':
+            df.to_parquet(tmp_path, compression=self.compression, index=False)
+            rows = parquet.ParquetFile(tmp_path).metadata.num_rows
+        else:
+            df.to_feather(tmp_path, compression=self.compression)
+            rows = feather.read_table(tmp_path).num_rows
+
+        os.replace(tmp_path, path)
+        return rows
+
+    def _drop(self, source: DaySource) -> bool:
+        try:
+            self.db.execute(source.drop_sql)
+            self.stats['tables_dropped'] += 1
+            self.logger.info(f"Dropped archived tick table: {source.relation}")
+            return True
+        except Exception as e:
+            log_exception(self.logger, e, f"Failed to drop {source.relation}")
+            self.stats['errors'] += 1
+            return False
+
+    def _matches_manifest(self, source: DaySource, entries: Dict[str, Dict[str, Any]]) -> bool:
+        """True wenn die Quelle genau die im Manifest archivierten Rows enthält"""
+        expected = {
+            symbol: entry['sources'][source.relation]
+            for symbol, entry in entries.items() if source.relation in entry['sources']
+        }
+        if source.count(self.db) != sum(expected.values()):
+            return False
+        return all(source.count(self.db, symbol) == rows for symbol, rows in expected.items())
+
+    def archive_day(self, day: date, drop: bool = True) -> Dict[str, int]:
+        """
+        Archiviert alle Ticks eines Tages (eine Datei pro Symbol)
+
+        Args:
+            day: Kalendertag
+            drop: Quelltabellen nach erfolgreicher Prüfung droppen
+
+        Returns:
+            symbol -> archivierte Rows (leer bei Fehler oder ohne Quellen)
+        """
+        self._require_engine()
+        sources = self.day_sources(day)
+        if not sources:
+            return {}
+
+        # Abbruch nach dem Archivieren (Drop nur teilweise erfolgt): vorhandene
+        # Dateien nicht überschreiben, nur noch unveränderte Quellen droppen
+        existing = self.manifest.day_entries(day)
+        recorded = {relation for entry in existing.values() for relation in entry['sources']}
+        if recorded - {source.relation for source in sources}:
+            for source in sources:
+                if source.relation in recorded and self._matches_manifest(source, existing):
+                    if drop:
+                        self._drop(source)
+                else:
+                    self.logger.error(f"{source.relation} differs from archived {day} - not dropped")
+                    self.stats['verify_failures'] += 1
+            return {}
+
+        frames: Dict[str, List[pd.DataFrame]] = {}
+        source_rows: Dict[str, Dict[str, int]] = {}  # symbol -> relation -> rows
+
+        for source in sources:
+            total = source.count(self.db)
+            fetched = 0
+            for symbol in source.symbols(self.db):
+                df = source.fetch(self.db, symbol)
+                frames.setdefault(symbol, []).append(df)
+                source_rows.setdefault(symbol, {})[source.relation] = len(df)
+                fetched += len(df)
+
+            if fetched != total:
+                self.logger.error(f"{source.relation}: exported {fetched} of {total} rows - day {day} not archived")
+                self.stats['verify_failures'] += 1
+                return {}
+
+        entries = {}
+        for symbol, symbol_frames in frames.items():
+            df = pd.concat(symbol_frames, ignore_index=True).sort_values('time_msc', kind='stable')
+            path = self.file_path(symbol, day)
+            file_rows = self._write_file(path, df)
+
+            if file_rows != len(df):
+                self.logger.error(f"{path.name}: file has {file_rows} of {len(df)} rows - day {day} not archived")
+                self.stats['verify_failures'] += 1
+                return {}
+
+            entries[symbol] = {
+                'file': path.relative_to(self.directory).as_posix(),
+                'format': self.format,
+                'rows': file_rows,
+                'bytes': path.stat().st_size,
+                'first_msc': int(df['time_msc'].iloc[0]),
+                'last_msc': int(df['time_msc'].iloc[-1]),
+                'sources': source_rows[symbol],
+                'archived_at': datetime.now().isoformat(timespec='seconds')
+            }
+            self.stats['files_written'] += 1
+
+        self.manifest.update(day, entries)
+        self.stats['days_archived'] += 1
+        self.stats['rows_archived'] += sum(entry['rows'] for entry in entries.values())
+        self.logger.info(
+            f"✓ Archived {day}: {sum(entry['rows'] for entry in entries.values())} ticks, "
+            f"{len(entries)} files"
+        )
+
+        if drop:
+            for source in sources:
+                self._drop(source)
+
+        return {symbol: entry['rows'] for symbol, entry in entries.items()}
+
+    def run(self, today: Optional[date] = None, drop: bool = True) -> List[date]:
+        """
+        Archiviert alle abgelaufenen Tage
+
+        Args:
+            today: Referenztag (Default: heute)
+            drop: Quelltabellen nach erfolgreicher Prüfung droppen
+
+        Returns:
+            Archivierte Tage
+        """
+        archived = []
+        for day in self.expired_days(today):
+            try:
+                if self.archive_day(day, drop=drop):
+                    archived.append(day)
+            except Exception as e:
+                log_exception(self.logger, e, f"Failed to archive ticks of {day}")
+                self.stats['errors'] += 1
+        return archived
+
+    # ==================== Lesen ====================
+
+    def is_archived(self, symbol: str, day: date) -> bool:
+        return self.manifest.get(symbol, day) is not None
+
+    def read_day(self, symbol: str, day: date) -> pd.DataFrame:
+        """Ticks eines archivierten Symbol-Tages"""
+        self._require_engine()
+        entry = self.manifest.get(symbol, day)
+        path = self.directory / entry['file']
+        if entry['format'] == 'parquet':
+            return pd.read_parquet(path)
+        return pd.read_feather(path)
+
+    def read_ticks(self, symbol: str, start: datetime, end: Optional[datetime] = None) -> pd.DataFrame:
+        """
+        Ticks eines Zeitraums: archivierte Tage aus den Dateien, sonst aus der DB
+
+        Args:
+            symbol: Trading Symbol
+            start: Beginn (inklusive)
+            end: Ende (exklusive, Default: jetzt)
+
+        Returns:
+            DataFrame im Archiv-Schema, sortiert nach time_msc
+        """
+        end = end or datetime.now()
+        frames = []
+        day = start.date()
+        while day <= end.date():
+            if self.is_archived(symbol, day):
+                frames.append(self.read_day(symbol, day))
+            else:
+                for source in self.day_sources(day):
+                    if source.kind == 'v2' and source.symbol != symbol:
+                        continue
+                    frames.append(source.fetch(self.db, symbol))
+            day += timedelta(days=1)
+
+        frames = [df for df in frames if len(df)]
+        if not frames:
+            return pd.DataFrame(columns=list(ARCHIVE_COLUMNS) + ['source'])
+
+        df = pd.concat(frames, ignore_index=True)
+        df = df[(df['timestamp'] >= start) & (df['timestamp'] < end)]
+        return df.sort_values('time_msc', kind='stable').reset_index(drop=True)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Holt Archiver-Statistiken"""
+        return {
+            **self.stats,
+            'files': len(self.manifest.entries),
+            'archive_bytes': sum(entry['bytes'] for entry in self.manifest.entries.values())
+        }
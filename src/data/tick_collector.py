@@ -1,49 +1,128 @@
 """
 Tick Collector
 Sammelt Tick-Daten von MT5 und speichert sie in PostgreSQL
+
+Ticks, die nicht geschrieben werden können (Queue voll, DB nicht
+erreichbar), landen im Spill Journal und werden nachgeschrieben.
 """
 
-import MetaTrader5 as mt5
 import time
 from datetime import datetime, date
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple, Callable
 import threading
-from queue import Queue
+from queue import Queue, Empty, Full
+
+import numpy as np
+
+# MT5 Import mit Fallback (unter Linux FakeMT5 über mt5_module übergeben)
+try:
+    import MetaTrader5 as mt5
+except ImportError:
+    mt5 = None
 
 from ..utils.logger import get_logger, log_exception
 from ..utils.config_loader import get_config
 from .database_manager import get_database
+from .tick_source import create_tick_source
+from .spill_journal import SpillJournal
+from .tick_partitions import TickPartitionManager, partitioning_enabled
+from .tick_compact import CompactTickStore, COMPACT_COLUMNS, compact_enabled
+
+
+def daily_table_sql(table: str) -> str:
+    """
+    DDL für eine Tages-Tabelle ticks_YYYYMMDD
+
+    Args:
+        table: Table Name
+
+    Returns:
+        CREATE TABLE/INDEX SQL
+    """
+    return f"""
+        CREATE TABLE IF NOT EXISTS {table} (
+            id BIGSERIAL PRIMARY KEY,
+            symbol VARCHAR(20) NOT NULL,
+            timestamp TIMESTAMP NOT NULL,
+            bid DECIMAL(10, 5) NOT NULL,
+            ask DECIMAL(10, 5) NOT NULL,
+            last DECIMAL(10, 5),
+            volume BIGINT,
+            time_msc BIGINT
+        );
+
+        CREATE INDEX IF NOT EXISTS idx_{table}_timestamp
+            ON {table} (timestamp DESC);
+
+        CREATE INDEX IF NOT EXISTS idx_{table}_symbol
+            ON {table} (symbol, timestamp DESC);
+    """
 
 
 class TickCollector:
     """Sammelt Tick-Daten von MT5"""
 
-    def __init__(self, symbols: List[str] = None, db_type: str = 'local'):
+    # Spaltenreihenfolge für COPY
+    TICK_COLUMNS = ('symbol', 'timestamp', 'bid', 'ask', 'last', 'volume', 'time_msc')
+
+    def __init__(
+        self,
+        symbols: List[str] = None,
+        db_type: str = 'local',
+        mt5_module: Any = None,
+        fetch_mode: str = None
+    ):
         """
         Initialisiert den Tick Collector
 
         Args:
             symbols: Liste der zu überwachenden Symbols (None = aus Config)
             db_type: Database Type ('local' oder 'remote')
+            mt5_module: MT5 API (None = MetaTrader5, z.B. FakeMT5 für Replay)
+            fetch_mode: 'incremental' oder 'poll' (None = aus Config)
         """
         self.logger = get_logger(self.__class__.__name__)
         self.config = get_config()
         self.db = get_database(db_type)
 
+        # MT5 API + Tick Source
+        self.mt5 = mt5_module or mt5
+        if self.mt5 is None:
+            raise ImportError("MetaTrader5 not available - pass mt5_module (e.g. FakeMT5)")
+        self.tick_source = create_tick_source(self.mt5, fetch_mode)
+
         # Symbols
         self.symbols = symbols or self.config.get_symbols()
 
-        # Tick Queue für Batch Insert
+        # Tick Queue für Batch Insert (Einträge: (symbol, Structured Array))
         self.tick_queue = Queue(maxsize=1000)
         self.batch_size = 100
         self.batch_interval = 5  # Sekunden
 
+        # Spill Journal für nicht schreibbare Ticks
+        self.journal = SpillJournal('tick_collector')
+        self.drain_retry_interval = 5  # Sekunden Backoff nach DB-Fehler
+        self._drain_retry_at = 0.0
+
         # State
         self.is_running = False
         self.mt5_connected = False
         self.current_date = None
         self.current_table = None
 
+        # Partitionierte Tabelle statt ticks_YYYYMMDD: kompakt (data.tick_compact)
+        # oder `ticks` (data.tick_partitioning)
+        self.compact = compact_enabled()
+        if self.compact:
+            self.partitions = CompactTickStore(self.db)
+            self.tick_columns = COMPACT_COLUMNS
+        else:
+            self.partitions = TickPartitionManager(self.db) if partitioning_enabled() else None
+            self.tick_columns = self.TICK_COLUMNS
+
+        # Listener für neue Ticks im selben Prozess (z.B. BarBuilder.on_ticks)
+        self.tick_listeners: List[Callable[[str, np.ndarray], None]] = []
+
         # Threads
         self.collector_thread = None
         self.writer_thread = None
@@ -52,6 +131,8 @@ class TickCollector:
         self.stats = {
             'ticks_collected': 0,
             'ticks_written': 0,
+            'ticks_dropped': 0,
+            'ticks_spilled': 0,
             'errors': 0,
             'start_time': None
         }
@@ -67,20 +148,20 @@ class TickCollector:
             mt5_config = self.config.get_mt5_config()
 
             # Initialize
-            if not mt5.initialize(path=mt5_config.get('path')):
-                error = mt5.last_error()
+            if not self.mt5.initialize(path=mt5_config.get('path')):
+                error = self.mt5.last_error()
                 self.logger.error(f"MT5 initialization failed: {error}")
                 return False
 
             # Login
-            if not mt5.login(
+            if not self.mt5.login(
                 login=mt5_config['login'],
                 password=mt5_config['password'],
                 server=mt5_config['server']
             ):
-                error = mt5.last_error()
+                error = self.mt5.last_error()
                 self.logger.error(f"MT5 login failed: {error}")
-                mt5.shutdown()
+                self.mt5.shutdown()
                 return False
 
             self.logger.info("✓ MT5 connected")
@@ -88,7 +169,7 @@ class TickCollector:
 
             # Enable Symbols
             for symbol in self.symbols:
-                if not mt5.symbol_select(symbol, True):
+                if not self.mt5.symbol_select(symbol, True):
                     self.logger.warning(f"Could not enable symbol: {symbol}")
 
             return True
@@ -100,7 +181,7 @@ class TickCollector:
     def _disconnect_mt5(self):
         """Trennt MT5 Verbindung"""
         if self.mt5_connected:
-            mt5.shutdown()
+            self.mt5.shutdown()
             self.mt5_connected = False
             self.logger.info("MT5 disconnected")
 
@@ -115,33 +196,27 @@ class TickCollector:
         return f"ticks_{today.strftime('%Y%m%d')}"
 
     def _ensure_daily_table(self):
-        """Stellt sicher dass Tabelle für heute existiert"""
+        """Stellt sicher dass Tabelle (bzw. Partition) für heute existiert"""
         today = date.today()
 
         # Check if new day
         if self.current_date != today:
             self.current_date = today
+
+            if self.partitions is not None:
+                self.current_table = self.partitions.table
+                try:
+                    self.partitions.maintain(today)
+                    if self.compact:
+                        self.partitions.register_symbols(self.symbols, self.mt5)
+                except Exception as e:
+                    log_exception(self.logger, e, "Failed to maintain tick partitions")
+                return
+
             self.current_table = self._get_today_table_name()
 
             # Create table if not exists
-            create_sql = f"""
-                CREATE TABLE IF NOT EXISTS {self.current_table} (
-                    id BIGSERIAL PRIMARY KEY,
-                    symbol VARCHAR(20) NOT NULL,
-                    timestamp TIMESTAMP NOT NULL,
-                    bid DECIMAL(10, 5) NOT NULL,
-                    ask DECIMAL(10, 5) NOT NULL,
-                    last DECIMAL(10, 5),
-                    volume BIGINT,
-                    time_msc BIGINT
-                );
-
-                CREATE INDEX IF NOT EXISTS idx_{self.current_table}_timestamp
-                    ON {self.current_table} (timestamp DESC);
-
-                CREATE INDEX IF NOT EXISTS idx_{self.current_table}_symbol
-                    ON {self.current_table} (symbol, timestamp DESC);
-            """
+            create_sql = daily_table_sql(self.current_table)
 
             try:
                 self.db.execute(create_sql)
@@ -165,33 +240,24 @@ class TickCollector:
                 # Ensure daily table exists
                 self._ensure_daily_table()
 
-                # Collect ticks for all symbols
+                # Collect new ticks for all symbols
                 for symbol in self.symbols:
-                    tick = mt5.symbol_info_tick(symbol)
+                    ticks = self.tick_source.fetch(symbol)
 
-                    if tick is None:
+                    if len(ticks) == 0:
                         continue
 
-                    # Tick Data
-                    tick_data = {
-                        'symbol': symbol,
-                        'timestamp': datetime.fromtimestamp(tick.time),
-                        'bid': tick.bid,
-                        'ask': tick.ask,
-                        'last': tick.last,
-                        'volume': tick.volume,
-                        'time_msc': tick.time_msc
-                    }
+                    self._publish(symbol, ticks)
 
                     # Add to queue
                     try:
-                        self.tick_queue.put(tick_data, block=False)
-                        self.stats['ticks_collected'] += 1
-                    except:
-                        # Queue full
-                        pass
+                        self.tick_queue.put((symbol, ticks), block=False)
+                        self.stats['ticks_collected'] += len(ticks)
+                    except Full:
+                        self.stats['ticks_collected'] += len(ticks)
+                        self._spill([(symbol, ticks)])
 
-                # Sleep kurz (ca. 100ms = 10 ticks/sec pro Symbol)
+                # Sleep kurz - im incremental Modus gehen dabei keine Ticks verloren
                 time.sleep(0.1)
 
             except Exception as e:
@@ -201,21 +267,44 @@ class TickCollector:
 
         self.logger.info("Tick collection stopped")
 
+    def add_tick_listener(self, listener: Callable[[str, np.ndarray], None]):
+        """
+        Registriert einen Listener für neue Ticks
+
+        Listener laufen im Collector Thread und sollten schnell sein.
+
+        Args:
+            listener: Callable(symbol, Structured Array)
+        """
+        self.tick_listeners.append(listener)
+
+    def _publish(self, symbol: str, ticks: np.ndarray):
+        """Reicht neue Ticks an alle Listener weiter"""
+        for listener in self.tick_listeners:
+            try:
+                listener(symbol, ticks)
+            except Exception as e:
+                log_exception(self.logger, e, f"Tick listener failed for {symbol}")
+                self.stats['errors'] += 1
+
     def _write_ticks(self):
         """Schreibt Ticks in Database (läuft in eigenem Thread)"""
         self.logger.info("Tick writer started")
 
         batch = []
+        batch_rows = 0
         last_write = time.time()
 
         while self.is_running or not self.tick_queue.empty():
             try:
-                # Get tick from queue (with timeout)
+                # Get ticks from queue (with timeout)
                 try:
-                    tick_data = self.tick_queue.get(timeout=1)
-                    batch.append(tick_data)
-                except:
-                    pass  # Timeout, check if should write
+                    symbol, ticks = self.tick_queue.get(timeout=1)
+                    batch.append((symbol, ticks))
+                    batch_rows += len(ticks)
+                except Empty:
+                    # Leerlauf - Journal nachschreiben
+                    self._drain_journal()
 
                 # Write batch if:
                 # 1. Batch size reached
@@ -223,15 +312,19 @@ class TickCollector:
                 # 3. System stopping
                 current_time = time.time()
                 should_write = (
-                    len(batch) >= self.batch_size or
-                    (len(batch) > 0 and current_time - last_write >= self.batch_interval) or
+                    batch_rows >= self.batch_size or
+                    (batch_rows > 0 and current_time - last_write >= self.batch_interval) or
                     not self.is_running
                 )
 
-                if should_write and len(batch) > 0:
-                    self._write_batch(batch)
-                    self.stats['ticks_written'] += len(batch)
+                if should_write and batch_rows > 0:
+                    if self._write_batch(batch):
+                        self.stats['ticks_written'] += batch_rows
+                        self._drain_journal()
+                    else:
+                        self._spill(batch)
                     batch = []
+                    batch_rows = 0
                     last_write = current_time
 
             except Exception as e:
@@ -241,47 +334,95 @@ class TickCollector:
 
         self.logger.info("Tick writer stopped")
 
-    def _write_batch(self, batch: List[Dict[str, Any]]):
+    def _write_batch(self, batch: List[Tuple[str, np.ndarray]]) -> bool:
         """
         Schreibt Batch von Ticks in Database
 
         Args:
-            batch: Liste von Tick-Daten
+            batch: Liste von (symbol, Structured Array)
+
+        Returns:
+            True wenn erfolgreich geschrieben
         """
         if not batch:
-            return
+            return True
 
         # Ensure table exists
         self._ensure_daily_table()
 
-        # Prepare SQL
-        insert_sql = f"""
-            INSERT INTO {self.current_table}
-                (symbol, timestamp, bid, ask, last, volume, time_msc)
-            VALUES
-                (%s, %s, %s, %s, %s, %s, %s)
-            ON CONFLICT DO NOTHING
-        """
+        values = self._build_rows(batch)
 
-        # Prepare values
-        values = [
-            (
-                tick['symbol'],
-                tick['timestamp'],
-                tick['bid'],
-                tick['ask'],
-                tick['last'],
-                tick['volume'],
-                tick['time_msc']
-            )
-            for tick in batch
-        ]
-
-        # Execute
+        # Execute (COPY - Tabelle hat außer id keinen Unique Key,
+        # ON CONFLICT DO NOTHING war daher wirkungslos)
         try:
-            self.db.execute_many(insert_sql, values)
+            self.db.copy_rows(self.current_table, self.tick_columns, values)
+            return True
         except Exception as e:
-            log_exception(self.logger, e, f"Failed to write batch of {len(batch)} ticks")
+            log_exception(self.logger, e, f"Failed to write batch of {len(values)} ticks")
+            self._drain_retry_at = time.time() + self.drain_retry_interval
+            return False
+
+    def _build_rows(self, batch: List[Tuple[str, np.ndarray]]) -> List[tuple]:
+        """
+        Wandelt Structured Arrays in Rows (Reihenfolge wie tick_columns)
+
+        Args:
+            batch: Liste von (symbol, Structured Array)
+
+        Returns:
+            Liste von Rows
+        """
+        values = []
+        for symbol, ticks in batch:
+            if self.compact:
+                values.extend(self.partitions.encode_ticks(symbol, ticks))
+                continue
+
+            for bid, ask, last, volume, time_msc in ticks[['bid', 'ask', 'last', 'volume', 'time_msc']].tolist():
+                values.append((
+                    symbol,
+                    datetime.fromtimestamp(time_msc / 1000),
+                    bid,
+                    ask,
+                    last,
+                    volume,
+                    time_msc
+                ))
+        return values
+
+    def _spill(self, batch: List[Tuple[str, np.ndarray]]):
+        """
+        Sichert Ticks im Journal statt sie zu verwerfen
+
+        Args:
+            batch: Liste von (symbol, Structured Array)
+        """
+        # Tabelle nach Tick-Datum, damit Replay nach Tageswechsel korrekt landet
+        # (partitioniert: Postgres routet selbst anhand timestamp)
+        by_table: Dict[str, List[tuple]] = {}
+        for row in self._build_rows(batch):
+            if self.partitions is not None:
+                table = self.partitions.table
+            else:
+                table = f"ticks_{row[1].strftime('%Y%m%d')}"
+            by_table.setdefault(table, []).append(row)
+
+        for table, rows in by_table.items():
+            if self.journal.append(table, self.tick_columns, rows):
+                self.stats['ticks_spilled'] += len(rows)
+            else:
+                self.stats['ticks_dropped'] += len(rows)
+
+    def _drain_journal(self):
+        """Schreibt ein Journal-Segment zurück (nicht während Backoff)"""
+        if time.time() < self._drain_retry_at or not self.journal.has_pending():
+            return
+
+        errors_before = self.journal.stats['drain_errors']
+        drained = self.journal.drain(self.db.copy_rows_many)
+        self.stats['ticks_written'] += drained
+        if self.journal.stats['drain_errors'] > errors_before:
+            self._drain_retry_at = time.time() + self.drain_retry_interval
 
     def start(self):
         """Startet den Tick Collector"""
@@ -327,6 +468,7 @@ class TickCollector:
 
         # Disconnect MT5
         self._disconnect_mt5()
+        self.journal.close()
 
         # Log statistics
         self._log_statistics()
@@ -343,6 +485,8 @@ class TickCollector:
             self.logger.info(f"Runtime: {runtime:.0f}s")
             self.logger.info(f"Ticks Collected: {self.stats['ticks_collected']}")
             self.logger.info(f"Ticks Written: {self.stats['ticks_written']}")
+            self.logger.info(f"Ticks Spilled: {self.stats['ticks_spilled']}")
+            self.logger.info(f"Ticks Dropped: {self.stats['ticks_dropped']}")
             self.logger.info(f"Rate: {rate:.1f} ticks/sec")
             self.logger.info(f"Errors: {self.stats['errors']}")
 
@@ -354,6 +498,8 @@ class TickCollector:
             Statistics Dictionary
         """
         stats = self.stats.copy()
+        stats['tick_source'] = self.tick_source.get_stats()
+        stats['journal'] = self.journal.get_stats()
         if stats['start_time']:
             stats['runtime'] = (datetime.now() - stats['start_time']).total_seconds()
         return stats
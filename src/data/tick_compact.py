@@ -0,0 +1,307 @@
+"""
+Compact Tick Storage
+Opt-in kompaktes Tick-Format (data.tick_compact.enabled)
+
+- tick_symbols: symbol_id SMALLINT <-> Symbol + Digits
+- ticks_compact: time_msc BIGINT, bid/ask INTEGER in Punkten (Preis * 10^digits),
+  volume INTEGER, symbol_id SMALLINT - alle Spalten NOT NULL und nach
+  Alignment sortiert (52 Bytes/Row inkl. Item Pointer)
+- tick_indicators: Indikatoren des Collectors V2 als Side-Table (optional),
+  eine Row pro (symbol_id, time_msc) (Unique Index, Writer mit INDICATOR_CONFLICT)
+- Views für bestehende Reader (Spaltennamen wie Tabelle `ticks`):
+  ticks_compact_v (Preise) und ticks_compact_ind_v (+ Indikatoren)
+- Beide Tabellen RANGE-partitioniert auf time_msc (Tages-Partitionen in
+  lokaler Zeit, Retention wie `ticks`)
+
+Digits werden beim ersten Registrieren eines Symbols gespeichert und danach
+nie geändert, damit die Skalierung vorhandener Daten stabil bleibt.
+"""
+
+import threading
+from datetime import date, datetime, time, timedelta
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..utils.config_loader import get_config
+from .tick_partitions import TickPartitionManager, INDICATOR_COLUMNS
+
+COMPACT_TABLE = 'ticks_compact'
+INDICATOR_TABLE = 'tick_indicators'
+SYMBOLS_TABLE = 'tick_symbols'
+COMPACT_VIEW = 'ticks_compact_v'
+COMPACT_INDICATOR_VIEW = 'ticks_compact_ind_v'
+
+# Spaltenreihenfolge für COPY
+COMPACT_COLUMNS = ('time_msc', 'symbol_id', 'bid', 'ask', 'volume')
+COMPACT_INDICATOR_COLUMNS = ('time_msc', 'symbol_id') + INDICATOR_COLUMNS
+
+# Unique Key von tick_indicators: wiederholte Millisekunden (Grenze eines
+# inkrementellen Abrufs, Journal-Replay) behalten die erste Row
+INDICATOR_KEY_INDEX = f'uq_{INDICATOR_TABLE}_symbol_time'
+INDICATOR_CONFLICT = '(symbol_id, time_msc) DO NOTHING'
+
+INT32_MAX = 2 ** 31 - 1
+
+
+def compact_enabled() -> bool:
+    """True wenn Ticks im kompakten Format gespeichert werden"""
+    return bool(get_config().get('data.tick_compact.enabled', False))
+
+
+def to_msc(ts: datetime) -> int:
+    """Timestamp (naiv = lokale Zeit) in Epoch-Millisekunden"""
+    if hasattr(ts, 'to_pydatetime'):
+        # pandas.Timestamp.timestamp() interpretiert naive Zeiten als UTC
+        ts = ts.to_pydatetime()
+    return int(ts.timestamp() * 1000)
+
+
+class CompactTickStore(TickPartitionManager):
+    """Kompakte Tick-Tabellen: Schema, Partitionen, Symbol-IDs, Encoding"""
+
+    table = COMPACT_TABLE
+    range_tables = ((COMPACT_TABLE, 'time_msc'), (INDICATOR_TABLE, 'time_msc'))
+
+    def __init__(
+        self,
+        db,
+        retention_days: Optional[int] = None,
+        premake_days: Optional[int] = None,
+        store_indicators: Optional[bool] = None
+    ):
+        """
+        Initialisiert den Compact Store
+
+        Args:
+            db: DatabaseManager
+            retention_days: Tage, die behalten werden (None = data.tick_storage_days)
+            premake_days: Partitionen so viele Tage im Voraus anlegen
+            store_indicators: Indikatoren in tick_indicators schreiben
+                (None = data.tick_compact.store_indicators)
+        """
+        # Symbol-Subpartitionen gibt es im kompakten Format nicht (symbol_id im Index)
+        super().__init__(db, retention_days, premake_days, subpartition_by_symbol=False)
+
+        compact_config = get_config().get('data.tick_compact', {}) or {}
+        self.default_digits = compact_config.get('default_digits', 5)
+        self.digits_config = compact_config.get('digits', {}) or {}
+        self.store_indicators = (
+            compact_config.get('store_indicators', True) if store_indicators is None else store_indicators
+        )
+
+        # symbol -> (symbol_id, digits)
+        self._symbols: Dict[str, Tuple[int, int]] = {}
+        self._symbol_lock = threading.Lock()
+
+    def ensure_parent(self):
+        """Legt Symbol-Tabelle, beide Parent-Tabellen und die Views an"""
+        if self._parent_ready:
+            return
+
+        indicator_sql = ',\n'.join(f"                {col} DOUBLE PRECISION" for col in INDICATOR_COLUMNS)
+        indicator_select = ''.join(f",\n                i.{col}" for col in INDICATOR_COLUMNS)
+        # Rückrechnung auf Spalten der Tabelle `ticks`
+        tick_select = """
+                s.symbol,
+                to_timestamp(t.time_msc / 1000.0)::timestamp AS timestamp,
+                t.bid / power(10, s.digits) AS bid,
+                t.ask / power(10, s.digits) AS ask,
+                NULL::double precision AS last,
+                t.volume::bigint AS volume,
+                t.time_msc"""
+        sql = f"""
+            CREATE TABLE IF NOT EXISTS {SYMBOLS_TABLE} (
+                symbol_id SMALLSERIAL PRIMARY KEY,
+                symbol VARCHAR(20) NOT NULL UNIQUE,
+                digits SMALLINT NOT NULL
+            );
+
+            -- Spalten nach Alignment sortiert (8, 4, 4, 4, 2 Bytes)
+            CREATE TABLE IF NOT EXISTS {COMPACT_TABLE} (
+                time_msc BIGINT NOT NULL,
+                bid INTEGER NOT NULL,
+                ask INTEGER NOT NULL,
+                volume INTEGER NOT NULL DEFAULT 0,
+                symbol_id SMALLINT NOT NULL
+            ) PARTITION BY RANGE (time_msc);
+
+            CREATE INDEX IF NOT EXISTS idx_{COMPACT_TABLE}_symbol_time
+                ON {COMPACT_TABLE} (symbol_id, time_msc);
+
+            CREATE TABLE IF NOT EXISTS {INDICATOR_TABLE} (
+                time_msc BIGINT NOT NULL,
+                symbol_id SMALLINT NOT NULL,
+{indicator_sql}
+            ) PARTITION BY RANGE (time_msc);
+
+            CREATE OR REPLACE VIEW {COMPACT_VIEW} AS
+            SELECT{tick_select}
+            FROM {COMPACT_TABLE} t
+            JOIN {SYMBOLS_TABLE} s ON s.symbol_id = t.symbol_id;
+
+            -- tick_indicators hat eine Row pro (symbol_id, time_msc) (Unique Index)
+            CREATE OR REPLACE VIEW {COMPACT_INDICATOR_VIEW} AS
+            SELECT{tick_select}{indicator_select}
+            FROM {COMPACT_TABLE} t
+            JOIN {SYMBOLS_TABLE} s ON s.symbol_id = t.symbol_id
+            LEFT JOIN {INDICATOR_TABLE} i
+                ON i.symbol_id = t.symbol_id AND i.time_msc = t.time_msc;
+        """
+        self.db.execute(sql + self._default_sql())
+        self._ensure_indicator_key()
+        self._parent_ready = True
+
+    def _ensure_indicator_key(self):
+        """
+        Unique Index (symbol_id, time_msc) auf tick_indicators
+
+        Bestehende Tabellen hatten nur einen normalen Index: Duplikate werden
+        einmalig entfernt (erste Row bleibt), danach ersetzt der Unique Index
+        den alten Index.
+        """
+        if self.db.fetch_one("SELECT 1 FROM pg_indexes WHERE indexname = %s", (INDICATOR_KEY_INDEX,)):
+            return
+
+        self.logger.info(f"Creating unique index {INDICATOR_KEY_INDEX} (removing duplicate indicator rows)")
+        self.db.execute(f"""
+            DELETE FROM {INDICATOR_TABLE} a
+            USING {INDICATOR_TABLE} b
+            WHERE a.symbol_id = b.symbol_id
+              AND a.time_msc = b.time_msc
+              AND a.tableoid = b.tableoid
+              AND a.ctid > b.ctid;
+
+            DROP INDEX IF EXISTS idx_{INDICATOR_TABLE}_symbol_time;
+
+            CREATE UNIQUE INDEX IF NOT EXISTS {INDICATOR_KEY_INDEX}
+                ON {INDICATOR_TABLE} (symbol_id, time_msc);
+        """)
+
+    @staticmethod
+    def day_bounds_msc(day: date) -> Tuple[int, int]:
+        """
+        Partitionsgrenzen eines Tages in Epoch-ms (lokale Mitternacht)
+
+        Returns:
+            (Start inklusive, Ende exklusive)
+        """
+        start = to_msc(datetime.combine(day, time()))
+        end = to_msc(datetime.combine(day + timedelta(days=1), time()))
+        return start, end
+
+    def _bounds_sql(self, day: date) -> Tuple[str, str]:
+        """Partitionsgrenzen eines Tages als SQL-Literale (Epoch-ms)"""
+        start, end = self.day_bounds_msc(day)
+        return str(start), str(end)
+
+    def _partition_sql(self, day: date) -> str:
+        """DDL für Tick- und Indikator-Partition eines Tages"""
+        start, end = self.day_bounds_msc(day)
+        suffix = day.strftime('%Y%m%d')
+        return f"""
+            CREATE TABLE IF NOT EXISTS {COMPACT_TABLE}_p_{suffix}
+                PARTITION OF {COMPACT_TABLE}
+                FOR VALUES FROM ({start}) TO ({end});
+
+            CREATE TABLE IF NOT EXISTS {INDICATOR_TABLE}_p_{suffix}
+                PARTITION OF {INDICATOR_TABLE}
+                FOR VALUES FROM ({start}) TO ({end});
+        """
+
+    def _drop_sql(self, day: date) -> str:
+        """DDL zum Entfernen beider Partitionen eines Tages"""
+        suffix = day.strftime('%Y%m%d')
+        return f"DROP TABLE IF EXISTS {COMPACT_TABLE}_p_{suffix}, {INDICATOR_TABLE}_p_{suffix}"
+
+    def register_symbol(self, symbol: str, digits: Optional[int] = None) -> Tuple[int, int]:
+        """
+        Registriert Symbol (falls neu) und holt ID + Digits
+
+        Args:
+            symbol: Trading Symbol
+            digits: Nachkommastellen (None = data.tick_compact.digits / default_digits);
+                wird ignoriert wenn das Symbol schon registriert ist
+
+        Returns:
+            (symbol_id, digits)
+        """
+        with self._symbol_lock:
+            if symbol in self._symbols:
+                return self._symbols[symbol]
+
+            if digits is None:
+                digits = self.digits_config.get(symbol, self.default_digits)
+
+            self.ensure_parent()
+            self.db.execute(
+                f"INSERT INTO {SYMBOLS_TABLE} (symbol, digits) VALUES (%s, %s) ON CONFLICT (symbol) DO NOTHING",
+                (symbol, digits)
+            )
+            symbol_id, stored_digits = self.db.fetch_one(
+                f"SELECT symbol_id, digits FROM {SYMBOLS_TABLE} WHERE symbol = %s", (symbol,)
+            )
+            if stored_digits != digits:
+                self.logger.warning(f"{symbol}: using stored digits {stored_digits} (requested {digits})")
+
+            self._symbols[symbol] = (symbol_id, stored_digits)
+            return self._symbols[symbol]
+
+    def register_symbols(self, symbols: Sequence[str], mt5_module: Any = None):
+        """
+        Registriert Symbols, Digits bevorzugt aus MT5 symbol_info
+
+        Args:
+            symbols: Trading Symbols
+            mt5_module: MetaTrader5 Modul (None oder ohne symbol_info = Config)
+        """
+        for symbol in symbols:
+            digits = None
+            if mt5_module is not None and hasattr(mt5_module, 'symbol_info'):
+                info = mt5_module.symbol_info(symbol)
+                if info is not None:
+                    digits = info.digits
+            self.register_symbol(symbol, digits)
+
+    def encode_ticks(self, symbol: str, ticks: np.ndarray) -> List[tuple]:
+        """
+        Wandelt Ticks in kompakte Rows (Reihenfolge wie COMPACT_COLUMNS)
+
+        Args:
+            symbol: Trading Symbol
+            ticks: Structured Array (TICK_DTYPE)
+
+        Returns:
+            Liste von Rows
+        """
+        symbol_id, digits = self.register_symbol(symbol)
+        scale = 10 ** digits
+
+        bid = np.rint(ticks['bid'] * scale).astype(np.int64)
+        ask = np.rint(ticks['ask'] * scale).astype(np.int64)
+        if len(ticks) and max(np.abs(bid).max(), np.abs(ask).max()) > INT32_MAX:
+            raise ValueError(f"{symbol}: price exceeds int32 at {digits} digits")
+
+        n = len(ticks)
+        return list(zip(
+            ticks['time_msc'].tolist(),
+            [symbol_id] * n,
+            bid.tolist(),
+            ask.tolist(),
+            ticks['volume'].tolist()
+        ))
+
+    def encode_indicators(self, symbol: str, time_msc: int, indicators: Dict[str, float]) -> tuple:
+        """
+        Row für tick_indicators (Reihenfolge wie COMPACT_INDICATOR_COLUMNS)
+
+        Args:
+            symbol: Trading Symbol
+            time_msc: Tick-Zeit in ms
+            indicators: Indikator-Werte
+
+        Returns:
+            Row
+        """
+        symbol_id = self.register_symbol(symbol)[0]
+        return (time_msc, symbol_id) + tuple(indicators.get(col) for col in INDICATOR_COLUMNS)
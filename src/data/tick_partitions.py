@@ -0,0 +1,315 @@
+"""
+Tick Partitions
+Verwaltet die deklarativ partitionierte Tick-Tabelle `ticks`
+
+- Parent `ticks` mit RANGE-Partitionierung auf timestamp (ein Partition pro Tag)
+- Optional LIST-Subpartitionierung pro Symbol (+ DEFAULT für neue Symbols)
+- Partitionen werden für die nächsten Tage vorab angelegt
+- DEFAULT-Partition (ticks_default) nimmt Rows ohne Tages-Partition auf
+  (Uhr-Abweichung, maintain() nicht gelaufen) statt den Insert scheitern zu
+  lassen; beim Anlegen der Tages-Partition werden sie dorthin verschoben
+- Retention über data.tick_storage_days: ältere Partitionen werden gedroppt
+  (mit data.tick_archive.enabled vorher archiviert, siehe tick_archive)
+- Reader filtern auf timestamp (+ symbol) und profitieren von Partition Pruning,
+  statt Tabellennamen aus information_schema zu erraten
+
+Aktivierung über data.tick_partitioning.enabled (Default: aus, dann bleiben die
+bisherigen Tagestabellen ticks_YYYYMMDD / ticks_<symbol>_YYYYMMDD aktiv).
+"""
+
+import re
+from datetime import date, datetime, timedelta
+from typing import List, Optional, Sequence, Tuple
+
+from ..utils.logger import get_logger, log_exception
+from ..utils.config_loader import get_config
+
+TICKS_TABLE = 'ticks'
+
+# Indikator-Spalten des Tick Collectors V2 (NULL für Collector V1)
+INDICATOR_COLUMNS = (
+    'ma14', 'ma50', 'ema14', 'ema50', 'wma14', 'wma50',
+    'rsi14', 'rsi28', 'macd_main', 'macd_signal', 'macd_hist',
+    'adx14', 'atr14', 'cci14', 'momentum14', 'stddev14',
+    'bb_upper', 'bb_middle', 'bb_lower'
+)
+
+
+def partitioning_enabled() -> bool:
+    """True wenn Ticks in die partitionierte Tabelle `ticks` geschrieben werden"""
+    return bool(get_config().get('data.tick_partitioning.enabled', False))
+
+
+class TickPartitionManager:
+    """Legt Tages-Partitionen von `ticks` an und entfernt abgelaufene"""
+
+    # Parent-Tabelle (Unterklassen verwalten andere Layouts, z.B. kompakt)
+    table = TICKS_TABLE
+    # (Parent, Partition-Key) aller Tabellen mit Tages-Partitionen
+    range_tables: Tuple[Tuple[str, str], ...] = ((TICKS_TABLE, 'timestamp'),)
+
+    def __init__(
+        self,
+        db,
+        retention_days: Optional[int] = None,
+        premake_days: Optional[int] = None,
+        subpartition_by_symbol: Optional[bool] = None,
+        symbols: Optional[Sequence[str]] = None
+    ):
+        """
+        Initialisiert den Partition Manager
+
+        Args:
+            db: DatabaseManager
+            retention_days: Tage, die behalten werden (None = data.tick_storage_days)
+            premake_days: Partitionen so viele Tage im Voraus anlegen
+            subpartition_by_symbol: Tages-Partitionen zusätzlich nach Symbol aufteilen
+            symbols: Symbols für Subpartitionen (None = aus Config)
+        """
+        self.logger = get_logger(self.__class__.__name__)
+        self.db = db
+
+        config = get_config()
+        partition_config = config.get('data.tick_partitioning', {}) or {}
+        self.retention_days = retention_days or config.get('data.tick_storage_days', 7)
+        self.premake_days = partition_config.get('premake_days', 2) if premake_days is None else premake_days
+        self.subpartition_by_symbol = (
+            partition_config.get('subpartition_by_symbol', False)
+            if subpartition_by_symbol is None else subpartition_by_symbol
+        )
+        self.symbols = list(symbols or config.get_symbols())
+
+        # Bereits angelegte Partitionen (Tage) - spart DDL pro Aufruf
+        self._known_days = set()
+        self._parent_ready = False
+        self._partition_re = re.compile(rf'^{self.table}_p_(\d{{8}})$')
+
+    def partition_name(self, day: date) -> str:
+        """Name der Tages-Partition (z.B. ticks_p_20251014)"""
+        return f"{self.table}_p_{day.strftime('%Y%m%d')}"
+
+    def ensure_parent(self):
+        """Legt die Parent-Tabelle `ticks` an"""
+        if self._parent_ready:
+            return
+
+        indicator_sql = ',\n'.join(f"                {col} DOUBLE PRECISION" for col in INDICATOR_COLUMNS)
+        sql = f"""
+            CREATE TABLE IF NOT EXISTS {TICKS_TABLE} (
+                symbol VARCHAR(20) NOT NULL,
+                timestamp TIMESTAMP NOT NULL,
+                systemzeit TIMESTAMP WITH TIME ZONE,
+                bid DOUBLE PRECISION NOT NULL,
+                ask DOUBLE PRECISION NOT NULL,
+                last DOUBLE PRECISION,
+                volume BIGINT,
+                time_msc BIGINT,
+
+                -- Technical Indicators (Tick Collector V2)
+{indicator_sql}
+            ) PARTITION BY RANGE (timestamp);
+
+            CREATE INDEX IF NOT EXISTS idx_{TICKS_TABLE}_symbol_ts
+                ON {TICKS_TABLE} (symbol, timestamp);
+        """
+        self.db.execute(sql + self._default_sql())
+        self._parent_ready = True
+
+    def _default_sql(self) -> str:
+        """DDL für die DEFAULT-Partitionen der Parent-Tabellen"""
+        return ''.join(f"""
+            CREATE TABLE IF NOT EXISTS {table}_default
+                PARTITION OF {table} DEFAULT;
+        """ for table, _ in self.range_tables)
+
+    def _bounds_sql(self, day: date) -> Tuple[str, str]:
+        """Partitionsgrenzen eines Tages als SQL-Literale (Start inklusive, Ende exklusive)"""
+        return f"'{day.isoformat()}'", f"'{(day + timedelta(days=1)).isoformat()}'"
+
+    def default_rows(self, day: Optional[date] = None) -> int:
+        """
+        Zählt Rows in den DEFAULT-Partitionen
+
+        Args:
+            day: Nur Rows dieses Tages (None = alle)
+
+        Returns:
+            Anzahl Rows über alle Parent-Tabellen
+        """
+        total = 0
+        for table, key in self.range_tables:
+            where = ''
+            if day is not None:
+                start, end = self._bounds_sql(day)
+                where = f" WHERE {key} >= {start} AND {key} < {end}"
+            total += self.db.fetch_one(f"SELECT count(*) FROM {table}_default{where}")[0]
+        return total
+
+    def _move_from_default_sql(self, day: date) -> str:
+        """
+        Legt die Partition eines Tages an und verschiebt dessen Rows aus DEFAULT
+
+        PostgreSQL lehnt eine neue Partition ab, solange DEFAULT Rows in ihrem
+        Bereich enthält. Die Rows werden daher in einer Transaktion
+        zwischengespeichert, gelöscht und nach dem Anlegen über die
+        Parent-Tabelle neu eingefügt.
+        """
+        start, end = self._bounds_sql(day)
+        before, after = [], []
+        for table, key in self.range_tables:
+            where = f"{key} >= {start} AND {key} < {end}"
+            before.append(f"""
+            CREATE TEMP TABLE _moved_{table} ON COMMIT DROP AS
+                SELECT * FROM {table}_default WHERE {where};
+            DELETE FROM {table}_default WHERE {where};
+            """)
+            after.append(f"""
+            INSERT INTO {table} SELECT * FROM _moved_{table};
+            """)
+        return ''.join(before) + self._partition_sql(day) + ''.join(after)
+
+    def ensure_partition(self, day: date):
+        """
+        Legt die Partition für einen Tag an (inkl. Symbol-Subpartitionen)
+
+        Args:
+            day: Kalendertag
+        """
+        if day in self._known_days:
+            return
+
+        self.ensure_parent()
+        moved = self.default_rows(day)
+        if moved:
+            self.logger.warning(f"Moving {moved} rows from DEFAULT into {self.partition_name(day)}")
+            self.db.execute(self._move_from_default_sql(day))
+        else:
+            self.db.execute(self._partition_sql(day))
+        self._known_days.add(day)
+        self.logger.info(f"✓ Tick partition ready: {self.partition_name(day)}")
+
+    def _partition_sql(self, day: date) -> str:
+        """DDL für die Partition eines Tages"""
+        name = self.partition_name(day)
+        start = day.isoformat()
+        end = (day + timedelta(days=1)).isoformat()
+
+        if not self.subpartition_by_symbol:
+            sql = f"""
+                CREATE TABLE IF NOT EXISTS {name}
+                    PARTITION OF {TICKS_TABLE}
+                    FOR VALUES FROM ('{start}') TO ('{end}');
+            """
+        else:
+            statements = [f"""
+                CREATE TABLE IF NOT EXISTS {name}
+                    PARTITION OF {TICKS_TABLE}
+                    FOR VALUES FROM ('{start}') TO ('{end}')
+                    PARTITION BY LIST (symbol);
+            """]
+            for symbol in self.symbols:
+                statements.append(f"""
+                CREATE TABLE IF NOT EXISTS {name}_{symbol.lower()}
+                    PARTITION OF {name} FOR VALUES IN ('{symbol}');
+                """)
+            statements.append(f"""
+                CREATE TABLE IF NOT EXISTS {name}_other
+                    PARTITION OF {name} DEFAULT;
+            """)
+            sql = ''.join(statements)
+
+        return sql
+
+    def _drop_sql(self, day: date) -> str:
+        """DDL zum Entfernen der Partition eines Tages"""
+        # Subpartitionen werden mit der Tages-Partition entfernt
+        return f"DROP TABLE IF EXISTS {self.partition_name(day)}"
+
+    def ensure_partitions(self, start: Optional[date] = None):
+        """
+        Legt Partitionen für start (Default: heute) und die nächsten premake_days an
+
+        Args:
+            start: Erster Tag
+        """
+        start = start or date.today()
+        for offset in range(self.premake_days + 1):
+            self.ensure_partition(start + timedelta(days=offset))
+
+    def list_partitions(self) -> List[str]:
+        """
+        Listet die Tages-Partitionen der Parent-Tabelle
+
+        Returns:
+            Partition-Namen (sortiert, älteste zuerst)
+        """
+        query = """
+            SELECT c.relname
+            FROM pg_inherits i
+            JOIN pg_class c ON c.oid = i.inhrelid
+            JOIN pg_class p ON p.oid = i.inhparent
+            WHERE p.relname = %s
+        """
+        rows = self.db.fetch_all(query, (self.table,))
+        return sorted(name for (name,) in rows if self._partition_re.match(name))
+
+    def drop_expired(self, today: Optional[date] = None) -> List[str]:
+        """
+        Droppt Partitionen älter als retention_days
+
+        Args:
+            today: Referenztag (Default: heute)
+
+        Returns:
+            Gedroppte Partitionen
+        """
+        cutoff = (today or date.today()) - timedelta(days=self.retention_days)
+        dropped = []
+
+        for name in self.list_partitions():
+            day = datetime.strptime(self._partition_re.match(name).group(1), '%Y%m%d').date()
+            if day >= cutoff:
+                continue
+
+            try:
+                self.db.execute(self._drop_sql(day))
+                self._known_days.discard(day)
+                dropped.append(name)
+                self.logger.info(f"Dropped expired tick partition: {name}")
+            except Exception as e:
+                log_exception(self.logger, e, f"Failed to drop tick partition {name}")
+
+        # Abgelaufene Rows ohne Tages-Partition
+        cutoff_start, _ = self._bounds_sql(cutoff)
+        for table, key in self.range_tables:
+            try:
+                self.db.execute(f"DELETE FROM {table}_default WHERE {key} < {cutoff_start}")
+            except Exception as e:
+                log_exception(self.logger, e, f"Failed to purge expired rows from {table}_default")
+
+        return dropped
+
+    def maintain(self, today: Optional[date] = None) -> List[str]:
+        """
+        Vorab-Anlage + Retention (einmal pro Tag aufrufen)
+
+        Args:
+            today: Referenztag (Default: heute)
+
+        Returns:
+            Gedroppte Partitionen
+        """
+        today = today or date.today()
+        self.ensure_partitions(today)
+
+        stray = self.default_rows()
+        if stray:
+            self.logger.warning(
+                f"{stray} rows in DEFAULT partition of {self.table} (no day partition) - "
+                f"moved when the day partition is created, e.g. by backfill"
+            )
+
+        if get_config().get('data.tick_archive.enabled', False):
+            # Retention übernimmt der TickArchiver (archiviert vor dem Drop)
+            return []
+        return self.drop_expired(today)
@@ -0,0 +1,243 @@
+"""
+Tick Sources
+Liefert neue Ticks je Symbol als numpy Structured Arrays
+
+- IncrementalTickSource: holt alle Ticks seit dem letzten time_msc
+  in einem Array-Call (copy_ticks_from), dedupliziert auf time_msc;
+  der erste Abruf startet lookback_seconds vor dem letzten Tick der
+  Quelle (Server-Zeit bzw. Replay-Uhr, nicht die lokale Uhr)
+- PollingTickSource: bisheriges symbol_info_tick Polling, liefert
+  einen Tick nur wenn sich time_msc geändert hat
+"""
+
+from typing import Dict, Any, Optional
+
+import numpy as np
+
+from ..utils.logger import get_logger
+
+# Layout wie von MT5 copy_ticks_* geliefert
+TICK_DTYPE = np.dtype([
+    ('time', '<i8'),
+    ('bid', '<f8'),
+    ('ask', '<f8'),
+    ('last', '<f8'),
+    ('volume', '<u8'),
+    ('time_msc', '<i8'),
+    ('flags', '<u4'),
+    ('volume_real', '<f8')
+])
+
+EMPTY_TICKS = np.empty(0, dtype=TICK_DTYPE)
+
+
+class IncrementalTickSource:
+    """Holt Ticks inkrementell per copy_ticks_from"""
+
+    def __init__(self, mt5_module: Any, lookback_seconds: int = 60, chunk_size: int = 10000, max_chunks: int = 10):
+        """
+        Initialisiert die Tick Source
+
+        Args:
+            mt5_module: MetaTrader5 Modul (oder FakeMT5)
+            lookback_seconds: Start-Fenster beim ersten Abruf pro Symbol
+                (relativ zum letzten Tick der Quelle)
+            chunk_size: Max. Ticks pro copy_ticks_from Call
+            max_chunks: Max. Calls pro fetch (begrenzt Catch-up pro Zyklus)
+        """
+        self.logger = get_logger(self.__class__.__name__)
+        self.mt5 = mt5_module
+        self.lookback_seconds = lookback_seconds
+        self.chunk_size = chunk_size
+        self.max_chunks = max_chunks
+
+        # symbol -> (letzter time_msc, Anzahl bereits gelieferter Ticks mit genau diesem time_msc)
+        self.last_seen: Dict[str, tuple] = {}
+
+        self.stats = {
+            'calls': 0,
+            'ticks': 0,
+            'duplicates_skipped': 0
+        }
+
+    def fetch(self, symbol: str) -> np.ndarray:
+        """
+        Holt alle neuen Ticks für Symbol
+
+        Args:
+            symbol: Trading Symbol
+
+        Returns:
+            Structured Array (TICK_DTYPE), leer wenn keine neuen Ticks
+        """
+        if symbol in self.last_seen:
+            last_msc, seen_at_last = self.last_seen[symbol]
+        else:
+            start_msc = self._start_msc(symbol)
+            if start_msc is None:
+                return EMPTY_TICKS
+            last_msc, seen_at_last = start_msc, 0
+
+        chunks = []
+        count = self.chunk_size
+        for _ in range(self.max_chunks):
+            # copy_ticks_from arbeitet mit Sekunden - ab Sekundengrenze holen
+            # und anschließend auf time_msc filtern
+            raw = self.mt5.copy_ticks_from(symbol, last_msc // 1000, count, self.mt5.COPY_TICKS_ALL)
+            self.stats['calls'] += 1
+
+            if raw is None or len(raw) == 0:
+                break
+
+            new_ticks, last_msc, seen_at_last = self._deduplicate(raw, last_msc, seen_at_last)
+
+            # Weniger als angefordert -> aufgeholt
+            if len(raw) < count:
+                if len(new_ticks):
+                    chunks.append(new_ticks)
+                break
+
+            if len(new_ticks):
+                chunks.append(new_ticks)
+                count = self.chunk_size
+            else:
+                # Mehr als count Ticks innerhalb einer Sekunde bereits geliefert:
+                # Sekundengrenze lässt sich nicht weiter verschieben, Fenster vergrößern
+                count *= 2
+
+        self.last_seen[symbol] = (last_msc, seen_at_last)
+
+        if not chunks:
+            return EMPTY_TICKS
+
+        ticks = np.concatenate(chunks) if len(chunks) > 1 else chunks[0]
+        self.stats['ticks'] += len(ticks)
+        return ticks
+
+    def _start_msc(self, symbol: str) -> Optional[int]:
+        """
+        Startpunkt des ersten Abrufs
+
+        Tick-Zeiten sind Server-Zeit (MT5) bzw. historische Zeit (Replay),
+        deshalb zählt das Start-Fenster vom letzten Tick der Quelle statt
+        von der lokalen Uhr.
+
+        Returns:
+            time_msc des Fensterbeginns, None wenn die Quelle noch keinen Tick hat
+        """
+        tick = self.mt5.symbol_info_tick(symbol)
+        self.stats['calls'] += 1
+        if tick is None:
+            return None
+        return max(int(tick.time_msc) - self.lookback_seconds * 1000, 0)
+
+    def _deduplicate(self, raw: np.ndarray, last_msc: int, seen_at_last: int) -> tuple:
+        """
+        Entfernt bereits gelieferte Ticks
+
+        Mehrere Ticks können denselben time_msc haben. Deshalb wird neben
+        dem letzten time_msc gezählt, wie viele Ticks mit genau diesem
+        Zeitstempel schon geliefert wurden.
+
+        Returns:
+            (neue Ticks, neuer letzter time_msc, Anzahl Ticks mit diesem time_msc)
+        """
+        raw = raw.astype(TICK_DTYPE, copy=False)
+        time_msc = raw['time_msc']
+
+        older = time_msc < last_msc
+        at_boundary = np.flatnonzero(time_msc == last_msc)
+
+        keep = ~older
+        keep[at_boundary[:seen_at_last]] = False
+
+        skipped = int(older.sum()) + min(seen_at_last, len(at_boundary))
+        self.stats['duplicates_skipped'] += skipped
+
+        new_ticks = raw[keep]
+        if len(new_ticks) == 0:
+            return new_ticks, last_msc, seen_at_last
+
+        new_last = int(new_ticks['time_msc'][-1])
+        count_at_new_last = int(np.count_nonzero(new_ticks['time_msc'] == new_last))
+        if new_last == last_msc:
+            count_at_new_last += seen_at_last
+
+        return new_ticks, new_last, count_at_new_last
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Holt Statistiken"""
+        return self.stats.copy()
+
+
+class PollingTickSource:
+    """Pollt symbol_info_tick, liefert nur geänderte Ticks"""
+
+    def __init__(self, mt5_module: Any):
+        """
+        Args:
+            mt5_module: MetaTrader5 Modul (oder FakeMT5)
+        """
+        self.mt5 = mt5_module
+        self.last_time_msc: Dict[str, int] = {}
+        self.stats = {
+            'calls': 0,
+            'ticks': 0,
+            'duplicates_skipped': 0
+        }
+
+    def fetch(self, symbol: str) -> np.ndarray:
+        """
+        Holt aktuellen Tick falls neu
+
+        Args:
+            symbol: Trading Symbol
+
+        Returns:
+            Structured Array mit 0 oder 1 Tick
+        """
+        tick = self.mt5.symbol_info_tick(symbol)
+        self.stats['calls'] += 1
+
+        if tick is None:
+            return EMPTY_TICKS
+
+        if self.last_time_msc.get(symbol) == tick.time_msc:
+            self.stats['duplicates_skipped'] += 1
+            return EMPTY_TICKS
+
+        self.last_time_msc[symbol] = tick.time_msc
+        self.stats['ticks'] += 1
+
+        return np.array([(
+            tick.time, tick.bid, tick.ask, tick.last, tick.volume,
+            tick.time_msc, getattr(tick, 'flags', 0), getattr(tick, 'volume_real', 0.0)
+        )], dtype=TICK_DTYPE)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Holt Statistiken"""
+        return self.stats.copy()
+
+
+def create_tick_source(mt5_module: Any, mode: Optional[str] = None, **kwargs):
+    """
+    Erstellt Tick Source für Modus
+
+    Args:
+        mt5_module: MetaTrader5 Modul (oder FakeMT5)
+        mode: 'incremental' oder 'poll' (None = data.tick_fetch_mode aus Config)
+        **kwargs: Weitere Argumente für IncrementalTickSource
+
+    Returns:
+        Tick Source Instance
+    """
+    if mode is None:
+        from ..utils.config_loader import get_config
+        mode = get_config().get('data.tick_fetch_mode', 'incremental')
+
+    if mode == 'incremental':
+        return IncrementalTickSource(mt5_module, **kwargs)
+    elif mode == 'poll':
+        return PollingTickSource(mt5_module)
+    else:
+        raise ValueError(f"Invalid tick fetch mode: {mode}")
@@ -0,0 +1,256 @@
+"""
+Tick Writer Pool
+Gemeinsame Schreib-Stufe für alle Symbols
+
+- Eine begrenzte Queue für alle Collector
+- Worker gruppieren Rows pro Ziel-Tabelle und schreiben jeden Zyklus
+  in einer einzigen Transaktion (COPY)
+- Backpressure Metriken: Queue-Tiefe, Flush-Latenz, verworfene Rows
+- Optionales Spill Journal: Rows bei voller Queue oder fehlgeschlagenem
+  Flush werden lokal gesichert und nach Recovery zurückgeschrieben
+"""
+
+import threading
+import time
+from collections import defaultdict
+from queue import Queue, Empty, Full
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from ..utils.logger import get_logger, log_exception
+from ..utils.config_loader import get_config
+
+
+class TickWriterPool:
+    """Schreibt Tick-Rows mehrerer Symbols über gemeinsame Worker"""
+
+    def __init__(
+        self,
+        db,
+        workers: Optional[int] = None,
+        queue_size: Optional[int] = None,
+        batch_rows: Optional[int] = None,
+        flush_interval: Optional[float] = None,
+        journal=None,
+        on_conflict: Optional[Dict[str, str]] = None
+    ):
+        """
+        Initialisiert den Writer Pool
+
+        Args:
+            db: DatabaseManager
+            workers: Anzahl Writer Threads (None = data.tick_writer.workers)
+            queue_size: Max. Einträge in der Queue
+            batch_rows: Flush sobald so viele Rows gesammelt sind
+            flush_interval: Spätestens nach so vielen Sekunden flushen
+            journal: SpillJournal für nicht schreibbare Rows (None = verwerfen)
+            on_conflict: Tabelle -> ON CONFLICT Klausel für Tabellen mit
+                Unique Key (siehe DatabaseManager.copy_rows_many)
+        """
+        self.logger = get_logger(self.__class__.__name__)
+        self.db = db
+
+        writer_config = get_config().get('data.tick_writer', {}) or {}
+        self.num_workers = workers or writer_config.get('workers', 1)
+        self.batch_rows = batch_rows or writer_config.get('batch_rows', 500)
+        self.flush_interval = flush_interval or writer_config.get('flush_interval', 1.0)
+
+        self.queue = Queue(maxsize=queue_size or writer_config.get('queue_size', 10000))
+        self.on_conflict = on_conflict or {}
+
+        # Spill Journal + Backoff nach fehlgeschlagenem Drain
+        self.journal = journal
+        self.drain_retry_interval = writer_config.get('drain_retry_interval', 5.0)
+        self._drain_retry_at = 0.0
+
+        # State
+        self.is_running = False
+        self.threads: List[threading.Thread] = []
+        self._lock = threading.Lock()
+
+        # Statistics
+        self.stats = {
+            'rows_submitted': 0,
+            'rows_written': 0,
+            'rows_dropped': 0,
+            'rows_failed': 0,
+            'rows_spilled': 0,
+            'flushes': 0,
+            'flush_errors': 0,
+            'flush_latency_ms_last': 0.0,
+            'flush_latency_ms_max': 0.0,
+            'flush_latency_ms_total': 0.0,
+            'rows_written_by_table': defaultdict(int)
+        }
+
+    def submit(self, table: str, columns: Sequence[str], rows: List[Sequence[Any]]) -> bool:
+        """
+        Übergibt Rows an die Writer (nicht blockierend)
+
+        Args:
+            table: Ziel-Tabelle
+            columns: Spaltennamen
+            rows: Liste von Rows
+
+        Returns:
+            True wenn angenommen (Queue oder Journal), False wenn verworfen
+        """
+        if not rows:
+            return True
+
+        try:
+            self.queue.put((table, tuple(columns), rows), block=False)
+        except Full:
+            if self._spill(table, columns, rows):
+                return True
+            with self._lock:
+                self.stats['rows_dropped'] += len(rows)
+            return False
+
+        with self._lock:
+            self.stats['rows_submitted'] += len(rows)
+        return True
+
+    def _worker_loop(self):
+        """Sammelt Einträge und flusht sie gruppiert (läuft in eigenem Thread)"""
+        groups: Dict[Tuple[str, Tuple[str, ...]], List] = defaultdict(list)
+        pending = 0
+        last_flush = time.time()
+
+        while self.is_running or not self.queue.empty() or pending:
+            try:
+                try:
+                    table, columns, rows = self.queue.get(timeout=min(self.flush_interval, 1.0))
+                    groups[(table, columns)].extend(rows)
+                    pending += len(rows)
+                except Empty:
+                    self._maybe_drain()
+
+                now = time.time()
+                should_flush = pending > 0 and (
+                    pending >= self.batch_rows or
+                    now - last_flush >= self.flush_interval or
+                    not self.is_running
+                )
+
+                if should_flush:
+                    self._flush(groups, pending)
+                    groups = defaultdict(list)
+                    pending = 0
+                    last_flush = now
+
+            except Exception as e:
+                log_exception(self.logger, e, "Error in tick writer worker")
+                time.sleep(1)
+
+    def _flush(self, groups: Dict[Tuple[str, Tuple[str, ...]], List], pending: int):
+        """
+        Schreibt alle Gruppen in einer Transaktion
+
+        Args:
+            groups: (table, columns) -> Rows
+            pending: Anzahl Rows insgesamt
+        """
+        batches = [(table, columns, rows) for (table, columns), rows in groups.items()]
+
+        started = time.perf_counter()
+        try:
+            self._write(batches)
+        except Exception as e:
+            log_exception(self.logger, e, f"Failed to flush {pending} rows into {len(batches)} tables")
+            with self._lock:
+                self.stats['flush_errors'] += 1
+            for table, columns, rows in batches:
+                if not self._spill(table, columns, rows):
+                    with self._lock:
+                        self.stats['rows_failed'] += len(rows)
+            # DB vermutlich nicht erreichbar - Drain erst nach Backoff
+            self._drain_retry_at = time.time() + self.drain_retry_interval
+            return
+
+        latency_ms = (time.perf_counter() - started) * 1000
+        with self._lock:
+            self.stats['flushes'] += 1
+            self.stats['rows_written'] += pending
+            self.stats['flush_latency_ms_last'] = latency_ms
+            self.stats['flush_latency_ms_total'] += latency_ms
+            self.stats['flush_latency_ms_max'] = max(self.stats['flush_latency_ms_max'], latency_ms)
+            for table, _, rows in batches:
+                self.stats['rows_written_by_table'][table] += len(rows)
+
+        # DB erreichbar - Journal nachziehen
+        self._maybe_drain()
+
+    def _write(self, batches: List[Tuple[str, Sequence[str], List]]):
+        """Schreibt Batches in einer Transaktion (auch für den Journal-Drain)"""
+        if self.on_conflict:
+            self.db.copy_rows_many(batches, on_conflict=self.on_conflict)
+        else:
+            self.db.copy_rows_many(batches)
+
+    def _spill(self, table: str, columns: Sequence[str], rows: List[Sequence[Any]]) -> bool:
+        """Sichert Rows im Journal, False wenn kein Journal oder voll"""
+        if self.journal is None or not self.journal.append(table, columns, rows):
+            return False
+        with self._lock:
+            self.stats['rows_spilled'] += len(rows)
+        return True
+
+    def _maybe_drain(self):
+        """Schreibt ein Journal-Segment zurück, falls vorhanden und kein Backoff aktiv"""
+        if self.journal is None or time.time() < self._drain_retry_at:
+            return
+        if not self.journal.has_pending():
+            return
+
+        errors_before = self.journal.stats['drain_errors']
+        self.journal.drain(self._write)
+        if self.journal.stats['drain_errors'] > errors_before:
+            self._drain_retry_at = time.time() + self.drain_retry_interval
+
+    def start(self):
+        """Startet die Writer Threads"""
+        if self.is_running:
+            return
+
+        self.is_running = True
+        self.threads = [
+            threading.Thread(target=self._worker_loop, name=f"TickWriter-{i}", daemon=True)
+            for i in range(self.num_workers)
+        ]
+        for thread in self.threads:
+            thread.start()
+
+        self.logger.info(f"Tick writer pool started ({self.num_workers} workers, queue {self.queue.maxsize})")
+
+    def stop(self, timeout: float = 10):
+        """Stoppt die Writer nach dem Leeren der Queue"""
+        if not self.is_running:
+            return
+
+        self.is_running = False
+        for thread in self.threads:
+            thread.join(timeout=timeout)
+        if self.journal is not None:
+            self.journal.close()
+
+        self.logger.info(f"Tick writer pool stopped: {self.get_stats()}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Holt Backpressure Metriken
+
+        Returns:
+            Statistics Dictionary
+        """
+        with self._lock:
+            stats = dict(self.stats)
+            stats['rows_written_by_table'] = dict(self.stats['rows_written_by_table'])
+
+        stats['queue_depth'] = self.queue.qsize()
+        stats['queue_capacity'] = self.queue.maxsize
+        stats['flush_latency_ms_avg'] = (
+            stats['flush_latency_ms_total'] / stats['flushes'] if stats['flushes'] else 0.0
+        )
+        if self.journal is not None:
+            stats['journal'] = self.journal.get_stats()
+        return stats
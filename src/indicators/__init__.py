@@ -0,0 +1,19 @@
+"""
+Technical Indicators (Batch + Streaming)
+
+Gemeinsame Implementierung für alle Subsysteme (Features, Strategien,
+Tick Collector, Control Center):
+- batch: vektorisierte Funktionen über ganze Reihen (numpy/pandas)
+- streaming: O(1)-Updates pro Wert mit identischer Semantik
+"""
+
+from .batch import (
+    sma, ema, wma, rolling_std, rsi, macd, bollinger_bands,
+    true_range, atr, momentum, cci, stochastic
+)
+from . import streaming
+
+__all__ = [
+    'sma', 'ema', 'wma', 'rolling_std', 'rsi', 'macd', 'bollinger_bands',
+    'true_range', 'atr', 'momentum', 'cci', 'stochastic', 'streaming'
+]
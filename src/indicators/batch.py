@@ -0,0 +1,205 @@
+"""
+Batch Indicators
+Vektorisierte Indikatoren über ganze Reihen, gleiche Semantik wie die
+Streaming-Klassen in streaming.py (Wert i = Streaming-Wert nach Update i)
+
+- Eingabe: numpy Array, Liste oder pandas Series; eine Series kommt als
+  Series mit gleichem Index zurück, sonst ein numpy Array
+- Warm-up ist NaN (Streaming: None)
+- Fenster-Kennzahlen über pandas rolling, np.convolve (WMA) bzw.
+  sliding_window_view in Chunks (CCI), rekursive Glättungen (EMA, Wilder)
+  über pandas ewm (jeweils C-Schleifen)
+
+Semantik:
+- EMA: alpha = 2 / (period + 1), Start mit dem SMA der ersten period Werte
+- RSI/ATR: Wilder-Glättung (alpha = 1 / period), Start mit dem Mittelwert
+  der ersten period Gewinne/Verluste bzw. True Ranges
+- Bollinger Bands/Std: Populations-Standardabweichung (wie np.std)
+- MACD: Signal-Linie als EMA der MACD-Linie
+"""
+
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+# Zeilen pro Chunk für sliding_window_view (begrenzt den Speicher auf chunk * period)
+WINDOW_CHUNK = 65536
+
+
+def _array(values) -> np.ndarray:
+    return np.asarray(values, dtype=np.float64)
+
+
+def _wrap(like, values: np.ndarray):
+    """Ergebnis im Typ der Eingabe (Series mit Index oder Array)"""
+    if isinstance(like, pd.Series):
+        return pd.Series(values, index=like.index)
+    return values
+
+
+def _nan(n: int) -> np.ndarray:
+    return np.full(n, np.nan)
+
+
+def _rolling(x: np.ndarray, period: int):
+    return pd.Series(x).rolling(window=period, min_periods=period)
+
+
+def _convolve(x: np.ndarray, kernel: np.ndarray) -> np.ndarray:
+    """Gleitende gewichtete Summe, Ergebnis an der Position des neuesten Werts"""
+    out = _nan(len(x))
+    if len(x) >= len(kernel):
+        out[len(kernel) - 1:] = np.convolve(x, kernel, mode='valid')
+    return out
+
+
+def _window_apply(x: np.ndarray, period: int, func) -> np.ndarray:
+    """func(windows) -> Wert pro Fenster, chunkweise über sliding_window_view"""
+    out = _nan(len(x))
+    if len(x) < period:
+        return out
+    windows = sliding_window_view(x, period)
+    for start in range(0, len(windows), WINDOW_CHUNK):
+        chunk = windows[start:start + WINDOW_CHUNK]
+        out[start + period - 1:start + period - 1 + len(chunk)] = func(chunk)
+    return out
+
+
+def _smooth(x: np.ndarray, alpha: float, period: int) -> np.ndarray:
+    """
+    Rekursive Glättung y = y + alpha * (x - y), Start mit dem Mittelwert der
+    ersten period gültigen Werte (führende NaN werden übersprungen)
+    """
+    out = _nan(len(x))
+    nan = np.isnan(x)
+    first = int(nan.argmin())
+    if nan[first] or len(x) - first < period:
+        return out
+    start = first + period - 1
+    seeded = x[start:].copy()
+    seeded[0] = x[first:start + 1].mean()
+    out[start:] = pd.Series(seeded).ewm(alpha=alpha, adjust=False).mean().to_numpy()
+    return out
+
+
+def sma(values, period: int):
+    """Simple Moving Average"""
+    x = _array(values)
+    return _wrap(values, _rolling(x, period).mean().to_numpy())
+
+
+def ema(values, period: int):
+    """Exponential Moving Average (Start mit SMA der ersten period Werte)"""
+    x = _array(values)
+    return _wrap(values, _smooth(x, 2.0 / (period + 1), period))
+
+
+def wma(values, period: int):
+    """Linear gewichteter Moving Average (neuester Wert hat Gewicht period)"""
+    x = _array(values)
+    weights = np.arange(period, 0, -1, dtype=np.float64) / (period * (period + 1) / 2.0)
+    return _wrap(values, _convolve(x, weights))
+
+
+def rolling_std(values, period: int):
+    """Rolling Populations-Standardabweichung"""
+    x = _array(values)
+    return _wrap(values, _rolling(x, period).std(ddof=0).to_numpy())
+
+
+def rsi(values, period: int = 14):
+    """Relative Strength Index nach Wilder"""
+    x = _array(values)
+    out = _nan(len(x))
+    if len(x) > period:
+        delta = np.diff(x)
+        avg_gain = _smooth(np.maximum(delta, 0.0), 1.0 / period, period)
+        avg_loss = _smooth(np.maximum(-delta, 0.0), 1.0 / period, period)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            value = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+        out[1:] = np.where(avg_loss == 0, 100.0, value)
+        out[1:][np.isnan(avg_loss)] = np.nan
+    return _wrap(values, out)
+
+
+def macd(values, fast: int = 12, slow: int = 26, signal: int = 9):
+    """
+    Moving Average Convergence Divergence
+
+    Returns:
+        (MACD-Linie, Signal-Linie, Histogramm)
+    """
+    x = _array(values)
+    line = _smooth(x, 2.0 / (fast + 1), fast) - _smooth(x, 2.0 / (slow + 1), slow)
+    signal_line = _smooth(line, 2.0 / (signal + 1), signal)
+    return _wrap(values, line), _wrap(values, signal_line), _wrap(values, line - signal_line)
+
+
+def bollinger_bands(values, period: int = 20, num_std: float = 2.0):
+    """
+    Bollinger Bands (SMA +/- num_std Populations-Standardabweichungen)
+
+    Returns:
+        (upper, middle, lower)
+    """
+    x = _array(values)
+    window = _rolling(x, period)
+    middle = window.mean().to_numpy()
+    band = window.std(ddof=0).to_numpy() * num_std
+    return _wrap(values, middle + band), _wrap(values, middle), _wrap(values, middle - band)
+
+
+def true_range(high, low, close):
+    """True Range (erster Wert: high - low)"""
+    h, l, c = _array(high), _array(low), _array(close)
+    tr = h - l
+    if len(tr) > 1:
+        previous = c[:-1]
+        tr[1:] = np.maximum(tr[1:], np.maximum(np.abs(h[1:] - previous), np.abs(l[1:] - previous)))
+    return _wrap(close, tr)
+
+
+def atr(high, low, close, period: int = 14):
+    """Average True Range (Wilder-Glättung)"""
+    tr = _array(true_range(high, low, close))
+    return _wrap(close, _smooth(tr, 1.0 / period, period))
+
+
+def momentum(values, period: int):
+    """Differenz zum Wert vor period-1 Schritten (wie streaming.Momentum)"""
+    x = _array(values)
+    out = _nan(len(x))
+    if len(x) >= period:
+        out[period - 1:] = x[period - 1:] - x[:len(x) - period + 1]
+    return _wrap(values, out)
+
+
+def cci(values, period: int = 14):
+    """Commodity Channel Index auf einer Preisreihe"""
+    x = _array(values)
+
+    def kernel(windows):
+        mean = windows.mean(axis=1)
+        mad = np.abs(windows - mean[:, None]).mean(axis=1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(mad == 0, 0.0, (windows[:, -1] - mean) / (0.015 * mad))
+
+    return _wrap(values, _window_apply(x, period, kernel))
+
+
+def stochastic(high, low, close, k_period: int = 14, d_period: int = 3) -> Tuple:
+    """
+    Stochastic Oscillator
+
+    Returns:
+        (%K, %D)
+    """
+    h, l, c = _array(high), _array(low), _array(close)
+    highest = _rolling(h, k_period).max().to_numpy()
+    lowest = _rolling(l, k_period).min().to_numpy()
+    with np.errstate(divide='ignore', invalid='ignore'):
+        k = 100.0 * (c - lowest) / (highest - lowest)
+    d = _rolling(k, d_period).mean().to_numpy()
+    return _wrap(close, k), _wrap(close, d)
@@ -0,0 +1,311 @@
+"""
+Streaming Indicators
+Zustandsbehaftete Indikatoren, die pro neuem Wert in O(1) aktualisiert werden
+
+Jede Klasse hat update(value) -> aktueller Wert (None während Warm-up).
+Rolling-Summen werden relativ zum ersten Wert geführt (verschobene Summen),
+damit die Varianz bei Preisen um 1.1 nicht durch Auslöschung verfälscht wird,
+und in festen Abständen aus dem Fenster neu berechnet (gegen Drift).
+"""
+
+from collections import deque
+from math import sqrt
+from typing import Optional, Tuple
+
+# Nach so vielen Updates werden laufende Summen neu aus dem Fenster berechnet
+RESYNC_INTERVAL = 10000
+
+
+class RollingWindow:
+    """Fenster fester Länge mit laufender Summe und Quadratsumme"""
+
+    def __init__(self, period: int):
+        self.period = period
+        self.values = deque(maxlen=period)
+        self.shift = None
+        self.sum = 0.0
+        self.sum_sq = 0.0
+        self.updates = 0
+
+    def update(self, value: float) -> None:
+        if self.shift is None:
+            self.shift = value
+
+        x = value - self.shift
+        if len(self.values) == self.period:
+            old = self.values[0] - self.shift
+            self.sum -= old
+            self.sum_sq -= old * old
+
+        self.values.append(value)
+        self.sum += x
+        self.sum_sq += x * x
+
+        self.updates += 1
+        if self.updates % RESYNC_INTERVAL == 0:
+            self._resync()
+
+    def _resync(self) -> None:
+        """Summen exakt neu berechnen, Shift auf aktuellen Mittelwert setzen"""
+        self.shift = self.values[-1]
+        shifted = [v - self.shift for v in self.values]
+        self.sum = sum(shifted)
+        self.sum_sq = sum(x * x for x in shifted)
+
+    @property
+    def full(self) -> bool:
+        return len(self.values) == self.period
+
+    @property
+    def mean(self) -> Optional[float]:
+        if not self.values:
+            return None
+        return self.shift + self.sum / len(self.values)
+
+    @property
+    def std(self) -> Optional[float]:
+        """Populations-Standardabweichung (wie np.std)"""
+        n = len(self.values)
+        if n == 0:
+            return None
+        mean = self.sum / n
+        return sqrt(max(self.sum_sq / n - mean * mean, 0.0))
+
+
+class SMA:
+    """Simple Moving Average"""
+
+    def __init__(self, period: int):
+        self.window = RollingWindow(period)
+
+    def update(self, value: float) -> Optional[float]:
+        self.window.update(value)
+        return self.window.mean if self.window.full else None
+
+
+class EMA:
+    """Exponential Moving Average, Start mit SMA der ersten period Werte"""
+
+    def __init__(self, period: int):
+        self.period = period
+        self.alpha = 2.0 / (period + 1)
+        self.value = None
+        self._seed_sum = 0.0
+        self._seed_count = 0
+
+    def update(self, value: float) -> Optional[float]:
+        if self.value is None:
+            self._seed_sum += value
+            self._seed_count += 1
+            if self._seed_count == self.period:
+                self.value = self._seed_sum / self.period
+            return self.value
+
+        self.value += self.alpha * (value - self.value)
+        return self.value
+
+
+class WMA:
+    """Linear gewichteter Moving Average (neuester Wert hat Gewicht period)"""
+
+    def __init__(self, period: int):
+        self.period = period
+        self.values = deque(maxlen=period)
+        self.denominator = period * (period + 1) / 2.0
+        self.total = 0.0
+        self.weighted = 0.0
+        self.updates = 0
+
+    def update(self, value: float) -> Optional[float]:
+        if len(self.values) == self.period:
+            # Alle Gewichte sinken um 1, ältester Wert fällt heraus
+            self.weighted += self.period * value - self.total
+            self.total += value - self.values[0]
+        else:
+            self.total += value
+            self.weighted += (len(self.values) + 1) * value
+
+        self.values.append(value)
+
+        self.updates += 1
+        if self.updates % RESYNC_INTERVAL == 0:
+            self.total = sum(self.values)
+            self.weighted = sum((i + 1) * v for i, v in enumerate(self.values))
+
+        if len(self.values) < self.period:
+            return None
+        return self.weighted / self.denominator
+
+
+class RSI:
+    """Relative Strength Index nach Wilder (geglättete Gewinne/Verluste)"""
+
+    def __init__(self, period: int = 14):
+        self.period = period
+        self.prev = None
+        self.avg_gain = None
+        self.avg_loss = None
+        self._seed_gain = 0.0
+        self._seed_loss = 0.0
+        self._seed_count = 0
+        self.value = None
+
+    def update(self, value: float) -> Optional[float]:
+        if self.prev is None:
+            self.prev = value
+            return None
+
+        delta = value - self.prev
+        self.prev = value
+        gain = delta if delta > 0 else 0.0
+        loss = -delta if delta < 0 else 0.0
+
+        if self.avg_gain is None:
+            self._seed_gain += gain
+            self._seed_loss += loss
+            self._seed_count += 1
+            if self._seed_count < self.period:
+                return None
+            self.avg_gain = self._seed_gain / self.period
+            self.avg_loss = self._seed_loss / self.period
+        else:
+            self.avg_gain = (self.avg_gain * (self.period - 1) + gain) / self.period
+            self.avg_loss = (self.avg_loss * (self.period - 1) + loss) / self.period
+
+        if self.avg_loss == 0:
+            self.value = 100.0
+        else:
+            rs = self.avg_gain / self.avg_loss
+            self.value = 100.0 - 100.0 / (1.0 + rs)
+        return self.value
+
+
+class MACD:
+    """MACD mit Signal-Linie als EMA der MACD-Linie"""
+
+    def __init__(self, fast: int = 12, slow: int = 26, signal: int = 9):
+        self.fast = EMA(fast)
+        self.slow = EMA(slow)
+        self.signal = EMA(signal)
+
+    def update(self, value: float) -> Tuple[Optional[float], Optional[float], Optional[float]]:
+        fast = self.fast.update(value)
+        slow = self.slow.update(value)
+        if fast is None or slow is None:
+            return None, None, None
+
+        macd_line = fast - slow
+        signal_line = self.signal.update(macd_line)
+        if signal_line is None:
+            return macd_line, None, None
+        return macd_line, signal_line, macd_line - signal_line
+
+
+class RollingMinMax:
+    """Rolling Minimum/Maximum über monotone Deques"""
+
+    def __init__(self, period: int):
+        self.period = period
+        self.count = 0
+        self._max = deque()  # (index, value), Werte fallend
+        self._min = deque()  # (index, value), Werte steigend
+
+    def update(self, value: float) -> Tuple[Optional[float], Optional[float]]:
+        i = self.count
+        self.count += 1
+
+        while self._max and self._max[-1][1] <= value:
+            self._max.pop()
+        self._max.append((i, value))
+        while self._min and self._min[-1][1] >= value:
+            self._min.pop()
+        self._min.append((i, value))
+
+        expired = i - self.period
+        if self._max[0][0] <= expired:
+            self._max.popleft()
+        if self._min[0][0] <= expired:
+            self._min.popleft()
+
+        if self.count < self.period:
+            return None, None
+        return self._min[0][1], self._max[0][1]
+
+
+class Momentum:
+    """Differenz zum Wert vor period-1 Schritten (prices[-1] - prices[-period])"""
+
+    def __init__(self, period: int):
+        self.values = deque(maxlen=period)
+
+    def update(self, value: float) -> Optional[float]:
+        self.values.append(value)
+        if len(self.values) < self.values.maxlen:
+            return None
+        return value - self.values[0]
+
+
+class CCI:
+    """
+    Commodity Channel Index auf einer Preisreihe
+
+    Mittelwert in O(1); die mittlere absolute Abweichung braucht einen
+    Durchlauf über das (kurze, feste) Fenster.
+    """
+
+    def __init__(self, period: int = 14):
+        self.window = RollingWindow(period)
+
+    def update(self, value: float) -> Optional[float]:
+        self.window.update(value)
+        if not self.window.full:
+            return None
+
+        mean = self.window.mean
+        mad = sum(abs(v - mean) for v in self.window.values) / self.window.period
+        if mad == 0:
+            return 0.0
+        return (value - mean) / (0.015 * mad)
+
+
+class BollingerBands:
+    """Bollinger Bands (SMA +/- num_std Populations-Standardabweichungen)"""
+
+    def __init__(self, period: int = 20, num_std: float = 2.0):
+        self.window = RollingWindow(period)
+        self.num_std = num_std
+
+    def update(self, value: float) -> Tuple[Optional[float], Optional[float], Optional[float]]:
+        self.window.update(value)
+        if not self.window.full:
+            return None, None, None
+        middle = self.window.mean
+        band = self.num_std * self.window.std
+        return middle + band, middle, middle - band
+
+
+class ATR:
+    """Average True Range nach Wilder (Start mit dem Mittel der ersten period True Ranges)"""
+
+    def __init__(self, period: int = 14):
+        self.period = period
+        self.prev_close = None
+        self._seed_sum = 0.0
+        self._seed_count = 0
+        self.value = None
+
+    def update(self, high: float, low: float, close: float) -> Optional[float]:
+        tr = high - low
+        if self.prev_close is not None:
+            tr = max(tr, abs(high - self.prev_close), abs(low - self.prev_close))
+        self.prev_close = close
+
+        if self.value is None:
+            self._seed_sum += tr
+            self._seed_count += 1
+            if self._seed_count < self.period:
+                return None
+            self.value = self._seed_sum / self.period
+        else:
+            self.value = (self.value * (self.period - 1) + tr) / self.period
+        return self.value
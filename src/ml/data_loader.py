@@ -1,7 +1,8 @@
 # -*- coding: utf-8 -*-
 """
 Data Loader for ML Training
-- Loads bar data with labels
+- Loads bar data (OHLCV, indicators, microstructure columns) with labels
+- Loads tick data (archived days from archive files, others from database)
 - Creates sequences (sliding window)
 - Train/Val/Test splits
 - Batch generation
@@ -13,9 +14,12 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 import pandas as pd
 import numpy as np
+from datetime import datetime
 from typing import Tuple, List, Dict, Optional
 from sklearn.model_selection import train_test_split
-from src.data.database_manager import get_database
+from src.data.database_router import get_router
+from src.data.tick_archive import TickArchiver
+from src.data.bar_resampler import MICROSTRUCTURE_COLUMNS
 from src.ml.label_engineering import LabelEngineer
 
 
@@ -36,7 +40,57 @@ class DataLoader:
         """
         self.lookback_window = lookback_window
         self.label_engineer = LabelEngineer(pip_value, min_profit_pips)
-        self.db = get_database('remote')  # Geändert auf 'remote' für trading_db
+        # Bulk reads go to the replica (database.routing), writes to the primary
+        self.db = get_router()
+        self._archiver = None
+        # bars_{symbol} -> vorhandene Mikrostruktur-Spalten
+        self._micro_columns: Dict[str, List[str]] = {}
+
+    def load_tick_data(
+        self,
+        symbol: str,
+        start: datetime,
+        end: Optional[datetime] = None
+    ) -> pd.DataFrame:
+        """
+        Load ticks for a time range
+
+        Days archived by the tick archiver are read from their archive files,
+        all other days from the tick tables in the database.
+
+        Args:
+            symbol: Trading symbol (e.g., 'EURUSD')
+            start: Start of range (inclusive)
+            end: End of range (exclusive, default: now)
+
+        Returns:
+            DataFrame with timestamp, time_msc, bid, ask, last, volume, indicators
+        """
+        if self._archiver is None:
+            self._archiver = TickArchiver(self.db)
+        return self._archiver.read_ticks(symbol, start, end)
+
+    def _existing_micro_columns(self, table: str) -> List[str]:
+        """
+        Microstructure columns that exist in a bar table (checked once per table)
+
+        Tables on a replica or not yet migrated by init_database may lack them.
+
+        Args:
+            table: Bar table name
+
+        Returns:
+            Existing MICROSTRUCTURE_COLUMNS in their canonical order
+        """
+        if table not in self._micro_columns:
+            rows = self.db.fetch_all(
+                "SELECT column_name FROM information_schema.columns "
+                "WHERE table_schema = 'public' AND table_name = %s",
+                (table,)
+            )
+            existing = {row[0] for row in rows}
+            self._micro_columns[table] = [name for name in MICROSTRUCTURE_COLUMNS if name in existing]
+        return self._micro_columns[table]
 
     def load_bar_data(
         self,
@@ -53,44 +107,47 @@ class DataLoader:
             limit: Maximum number of bars to load
 
         Returns:
-            DataFrame with bar data or None
+            DataFrame with bar data or None; microstructure columns missing
+            from the table are NaN
         """
         table = f"bars_{symbol.lower()}"
 
-        sql = f"""
-            SELECT
-                timestamp,
-                timeframe,
-                open,
-                high,
-                low,
-                close,
-                volume,
-                tick_count,
-                rsi14,
-                macd_main,
-                bb_upper,
-                bb_lower,
-                atr14
-            FROM {table}
-            WHERE timeframe = %s
-            ORDER BY timestamp ASC
-        """
-
-        if limit:
-            sql += f" LIMIT {limit}"
-
         try:
-            result = self.db.fetch_all(sql, (timeframe,))
-
-            if not result:
+            micro_columns = self._existing_micro_columns(table)
+
+            sql = f"""
+                SELECT
+                    timestamp,
+                    timeframe,
+                    open,
+                    high,
+                    low,
+                    close,
+                    volume,
+                    tick_count,
+                    rsi14,
+                    macd_main,
+                    bb_upper,
+                    bb_lower,
+                    atr14{''.join(f', {name}' for name in micro_columns)}
+                FROM {table}
+                WHERE timeframe = %s
+                ORDER BY timestamp ASC
+            """
+
+            if limit:
+                sql += f" LIMIT {limit}"
+
+            # Server-side cursor, chunks go straight into column arrays
+            df = self.db.fetch_dataframe(sql, (timeframe,))
+
+            if df.empty:
                 return None
 
-            columns = ['timestamp', 'timeframe', 'open', 'high', 'low', 'close',
-                      'volume', 'tick_count', 'rsi14', 'macd_main',
-                      'bb_upper', 'bb_lower', 'atr14']
+            for name in MICROSTRUCTURE_COLUMNS:
+                if name not in df:
+                    df[name] = np.nan
 
-            df = pd.DataFrame(result, columns=columns)
             return df
 
         except Exception as e:
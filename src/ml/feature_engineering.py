@@ -5,48 +5,253 @@ Feature Engineering for ML Training
 - Normalized indicators
 - Trend features
 - Volatility ratios
+
+add_all_features extracts the input columns once as contiguous float64
+arrays and adds all derived columns in one pass without copying the frame.
+Returns and rolling volatility are computed per symbol (frames from
+DataLoader.load_training_data hold several symbols), so no window crosses
+a symbol boundary. The rolling-window kernel runs on numba when installed
+(modeling.feature_engineering.backend), otherwise on NumPy/pandas.
 """
 
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
 import pandas as pd
 import numpy as np
-from typing import List
+from typing import Dict, List, Optional, Sequence
+
+from src.utils.config_loader import get_config
+
+# numba is optional (JIT kernel for returns/rolling volatility)
+try:
+    import numba
+except ImportError:
+    numba = None
+
+RETURN_PERIODS = (1, 2, 3, 5)
+VOLATILITY_WINDOWS = (5, 10)
+BACKENDS = ('auto', 'numba', 'numpy')
+
+
+def _window_kernel(close, starts, periods, windows, returns, volatility):
+    """
+    Returns and rolling std (ddof=1) of 1-bar returns in one pass
+
+    starts[i] is the first row of the symbol segment of row i; a value is
+    NaN until its lookback lies completely inside the segment.
+    returns/volatility are (len(periods), n) and (len(windows), n) outputs.
+    """
+    n = close.shape[0]
+    change = np.empty(n)
+    for i in range(n):
+        offset = i - starts[i]
+        for j in range(periods.shape[0]):
+            period = periods[j]
+            returns[j, i] = close[i] / close[i - period] - 1.0 if offset >= period else np.nan
+        change[i] = close[i] / close[i - 1] - 1.0 if offset >= 1 else np.nan
+        for j in range(windows.shape[0]):
+            window = windows[j]
+            if offset < window:
+                volatility[j, i] = np.nan
+                continue
+            mean = 0.0
+            for k in range(i - window + 1, i + 1):
+                mean += change[k]
+            mean /= window
+            squares = 0.0
+            for k in range(i - window + 1, i + 1):
+                squares += (change[k] - mean) ** 2
+            volatility[j, i] = np.sqrt(squares / (window - 1))
+
+
+_window_kernel_jit = (
+    numba.njit(cache=True, error_model='numpy')(_window_kernel) if numba is not None else None
+)
+
+
+def _column(df: pd.DataFrame, name: str) -> np.ndarray:
+    """Column as contiguous float64 array (no copy if it already is one)"""
+    return np.ascontiguousarray(df[name].to_numpy(dtype=np.float64))
 
 
 class FeatureEngineer:
     """Creates derived features from raw bar data"""
 
-    def __init__(self):
-        pass
+    def __init__(self, backend: Optional[str] = None):
+        """
+        Args:
+            backend: Rolling-window kernel: 'auto' (numba if installed),
+                'numba' or 'numpy' (default: modeling.feature_engineering.backend)
+        """
+        if backend is None:
+            backend = get_config().get('modeling.feature_engineering.backend', 'auto')
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown feature backend '{backend}' (expected one of {BACKENDS})")
+        if backend == 'numba' and numba is None:
+            raise RuntimeError("numba is required for the 'numba' feature backend (pip install numba)")
+        if backend == 'auto':
+            backend = 'numba' if numba is not None else 'numpy'
+        self.backend = backend
+
+    # ==================== Kernels ====================
+
+    @staticmethod
+    def _price_features(df: pd.DataFrame) -> Dict[str, np.ndarray]:
+        """Row-wise candle features"""
+        open_ = _column(df, 'open')
+        high = _column(df, 'high')
+        low = _column(df, 'low')
+        close = _column(df, 'close')
+
+        return {
+            # Price changes
+            'price_change': (close - open_) / open_,
+            'high_low_range': (high - low) / close,
+            # Candle body and shadows
+            'body_size': np.abs(close - open_) / close,
+            'upper_shadow': (high - np.maximum(open_, close)) / close,
+            'lower_shadow': (np.minimum(open_, close) - low) / close,
+            # Intrabar price position
+            'close_position': (close - low) / (high - low + 1e-10)
+        }
+
+    @staticmethod
+    def _indicator_features(df: pd.DataFrame) -> Dict[str, np.ndarray]:
+        """Normalized indicators (only for indicator columns present in df)"""
+        features = {}
+        close = _column(df, 'close') if 'close' in df.columns else None
 
-    def add_price_features(self, df: pd.DataFrame) -> pd.DataFrame:
+        # RSI normalization (center around 0)
+        if 'rsi14' in df.columns:
+            features['rsi14_norm'] = (_column(df, 'rsi14') - 50) / 50
+
+        # MACD normalization
+        if 'macd_main' in df.columns:
+            macd = _column(df, 'macd_main')
+            features['macd_norm'] = macd / (close + 1e-10)
+            features['macd_signal'] = (macd > 0).astype(int)
+
+        # Bollinger Bands position
+        if all(col in df.columns for col in ['bb_upper', 'bb_lower', 'close']):
+            lower = _column(df, 'bb_lower')
+            bb_range = _column(df, 'bb_upper') - lower + 1e-10
+            features['bb_position'] = (close - lower) / bb_range
+            features['bb_width'] = bb_range / close
+
+        return features
+
+    @staticmethod
+    def _segments(df: pd.DataFrame):
         """
-        Add price-based derived features
+        Symbol segments of df
+
+        Returns:
+            (order, starts): order permutes rows so that each symbol is
+            contiguous (None if it already is), starts[i] is the first
+            (permuted) row of the segment of row i
+        """
+        n = len(df)
+        if 'symbol' not in df.columns or n == 0:
+            return None, np.zeros(n, dtype=np.int64)
+
+        codes, uniques = pd.factorize(df['symbol'], use_na_sentinel=False)
+        order = None
+        if (np.count_nonzero(codes[1:] != codes[:-1]) + 1) != len(uniques):
+            # Interleaved symbols: stable sort keeps time order within a symbol
+            order = np.argsort(codes, kind='stable')
+            codes = codes[order]
+
+        first = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+        starts = np.repeat(first, np.diff(np.r_[first, n])).astype(np.int64)
+        return order, starts
+
+    def _window_features(
+        self,
+        df: pd.DataFrame,
+        periods: Sequence[int] = (),
+        windows: Sequence[int] = ()
+    ) -> Dict[str, np.ndarray]:
+        """
+        Returns and rolling volatility per symbol
 
         Args:
-            df: DataFrame with OHLC data
+            df: DataFrame with close prices (and optional symbol column)
+            periods: Return lookback periods
+            windows: Volatility windows (std of 1-bar returns)
 
         Returns:
-            DataFrame with added features
+            Dictionary return_<period>/volatility_<window> -> array
         """
-        df = df.copy()
+        close = _column(df, 'close')
+        order, starts = self._segments(df)
+        if order is not None:
+            close = close[order]
+
+        n = len(close)
+        periods = np.asarray(periods, dtype=np.int64)
+        windows = np.asarray(windows, dtype=np.int64)
+        returns = np.empty((len(periods), n))
+        volatility = np.empty((len(windows), n))
+
+        if self.backend == 'numba':
+            _window_kernel_jit(close, starts, periods, windows, returns, volatility)
+        else:
+            offset = np.arange(n, dtype=np.int64) - starts
+
+            def pct_change(period):
+                out = np.full(n, np.nan)
+                out[period:] = close[period:] / close[:-period] - 1.0
+                out[offset < period] = np.nan
+                return out
+
+            for j, period in enumerate(periods):
+                returns[j] = pct_change(period)
+            if len(windows):
+                # NaN at every segment start, so no full window crosses a symbol boundary
+                change = pd.Series(pct_change(1))
+                for j, window in enumerate(windows):
+                    volatility[j] = change.rolling(window).std().to_numpy()
+
+        features = {}
+        for name, values in [
+            *((f'return_{period}', returns[j]) for j, period in enumerate(periods)),
+            *((f'volatility_{window}', volatility[j]) for j, window in enumerate(windows))
+        ]:
+            if order is not None:
+                unsorted = np.empty(n)
+                unsorted[order] = values
+                values = unsorted
+            features[name] = values
+        return features
+
+    @staticmethod
+    def _assign(df: pd.DataFrame, features: Dict[str, np.ndarray], inplace: bool = False) -> pd.DataFrame:
+        """Adds feature columns (without copying the existing columns)"""
+        if not inplace:
+            df = df.copy(deep=False)
+        for name, values in features.items():
+            df[name] = values
+        return df
 
-        # Price changes
-        df['price_change'] = (df['close'] - df['open']) / df['open']
-        df['high_low_range'] = (df['high'] - df['low']) / df['close']
+    # ==================== Feature Groups ====================
 
-        # Candle body and shadows
-        df['body_size'] = abs(df['close'] - df['open']) / df['close']
-        df['upper_shadow'] = (df['high'] - df[['open', 'close']].max(axis=1)) / df['close']
-        df['lower_shadow'] = (df[['open', 'close']].min(axis=1) - df['low']) / df['close']
+    def add_price_features(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Add price-based derived features
 
-        # Intrabar price position
-        df['close_position'] = (df['close'] - df['low']) / (df['high'] - df['low'] + 1e-10)
+        Args:
+            df: DataFrame with OHLC data
 
-        return df
+        Returns:
+            DataFrame with added features
+        """
+        return self._assign(df, self._price_features(df))
 
     def add_returns(self, df: pd.DataFrame, periods: List[int] = None) -> pd.DataFrame:
         """
-        Add return features
+        Add return features (per symbol if df has a symbol column)
 
         Args:
             df: DataFrame with close prices
@@ -56,14 +261,9 @@ class FeatureEngineer:
             DataFrame with return features
         """
         if periods is None:
-            periods = [1, 2, 3, 5]
-
-        df = df.copy()
+            periods = list(RETURN_PERIODS)
 
-        for period in periods:
-            df[f'return_{period}'] = df['close'].pct_change(period)
-
-        return df
+        return self._assign(df, self._window_features(df, periods=periods))
 
     def add_normalized_indicators(self, df: pd.DataFrame) -> pd.DataFrame:
         """
@@ -75,24 +275,7 @@ class FeatureEngineer:
         Returns:
             DataFrame with normalized indicators
         """
-        df = df.copy()
-
-        # RSI normalization (center around 0)
-        if 'rsi14' in df.columns:
-            df['rsi14_norm'] = (df['rsi14'] - 50) / 50
-
-        # MACD normalization
-        if 'macd_main' in df.columns:
-            df['macd_norm'] = df['macd_main'] / (df['close'] + 1e-10)
-            df['macd_signal'] = (df['macd_main'] > 0).astype(int)
-
-        # Bollinger Bands position
-        if all(col in df.columns for col in ['bb_upper', 'bb_lower', 'close']):
-            bb_range = df['bb_upper'] - df['bb_lower'] + 1e-10
-            df['bb_position'] = (df['close'] - df['bb_lower']) / bb_range
-            df['bb_width'] = bb_range / df['close']
-
-        return df
+        return self._assign(df, self._indicator_features(df))
 
     def add_trend_features(self, df: pd.DataFrame) -> pd.DataFrame:
         """
@@ -104,17 +287,17 @@ class FeatureEngineer:
         Returns:
             DataFrame with trend features
         """
-        df = df.copy()
+        features = {}
 
         # Price vs volume
         if 'volume' in df.columns:
-            df['price_volume_ratio'] = df['price_change'] * df['volume']
+            features['price_volume_ratio'] = _column(df, 'price_change') * _column(df, 'volume')
 
-        return df
+        return self._assign(df, features)
 
     def add_volatility_features(self, df: pd.DataFrame) -> pd.DataFrame:
         """
-        Add volatility-based features
+        Add volatility-based features (per symbol if df has a symbol column)
 
         Args:
             df: DataFrame with price and ATR data
@@ -122,35 +305,44 @@ class FeatureEngineer:
         Returns:
             DataFrame with volatility features
         """
-        df = df.copy()
+        features = {}
 
         # ATR normalization
         if 'atr14' in df.columns:
-            df['atr_norm'] = df['atr14'] / (df['close'] + 1e-10)
+            features['atr_norm'] = _column(df, 'atr14') / (_column(df, 'close') + 1e-10)
 
         # Rolling volatility
-        df['volatility_5'] = df['close'].pct_change().rolling(5).std()
-        df['volatility_10'] = df['close'].pct_change().rolling(10).std()
+        features.update(self._window_features(df, windows=VOLATILITY_WINDOWS))
 
-        return df
+        return self._assign(df, features)
 
-    def add_all_features(self, df: pd.DataFrame) -> pd.DataFrame:
+    def add_all_features(self, df: pd.DataFrame, inplace: bool = False) -> pd.DataFrame:
         """
-        Add all engineered features
+        Add all engineered features in one pass
+
+        Same columns as the add_* methods in sequence, but the input columns
+        are read once, returns and volatility share one kernel call and the
+        frame is not copied.
 
         Args:
-            df: DataFrame with raw data
+            df: DataFrame with raw data (rows in time order per symbol)
+            inplace: Add the columns to df itself instead of a shallow copy
 
         Returns:
             DataFrame with all features
         """
-        df = self.add_price_features(df)
-        df = self.add_returns(df)
-        df = self.add_normalized_indicators(df)
-        df = self.add_trend_features(df)
-        df = self.add_volatility_features(df)
+        features = self._price_features(df)
+        window = self._window_features(df, periods=RETURN_PERIODS, windows=VOLATILITY_WINDOWS)
 
-        return df
+        features.update((f'return_{period}', window[f'return_{period}']) for period in RETURN_PERIODS)
+        features.update(self._indicator_features(df))
+        if 'volume' in df.columns:
+            features['price_volume_ratio'] = features['price_change'] * _column(df, 'volume')
+        if 'atr14' in df.columns:
+            features['atr_norm'] = _column(df, 'atr14') / (_column(df, 'close') + 1e-10)
+        features.update((f'volatility_{w}', window[f'volatility_{w}']) for w in VOLATILITY_WINDOWS)
+
+        return self._assign(df, features, inplace)
 
     def get_feature_names(self, include_base: bool = True) -> List[str]:
         """
@@ -0,0 +1,589 @@
+"""
+Feature Store
+Benannte, versionierte Feature Sets: eine Definition (Quellspalten +
+compute) für Training und Inference
+
+- Offline: materialize() schreibt die Features einer Symbol/Timeframe-Reihe
+  spaltenweise als Parquet (<path>/<name>/v<version>/<symbol>_<timeframe>.parquet),
+  inkrementell ab der letzten gespeicherten Bar; read_offline() liest
+  Zeitbereiche und Point-in-Time (as_of: nur Bars, die zu diesem Zeitpunkt
+  abgeschlossen waren), join_as_of() hängt an Events die zum Eventzeitpunkt
+  bekannten Features
+- Online: get_online() holt nur die letzten lookback Bars (Prepared
+  Statement) und berechnet sie mit demselben compute
+- Models speichern den Key ihres Feature Sets (z.B. 'indicators:v1');
+  matrix() prüft die Spalten, statt fehlende Features mit 0 zu füllen
+
+Eine geänderte Berechnung bekommt eine neue Version statt die bestehende zu
+ändern; ältere Models rechnen weiter mit der Version, mit der sie trainiert
+wurden.
+
+Konfiguration unter modeling.feature_store (path)
+"""
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+import os
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+# pyarrow ist Engine für die Offline-Materialisierung (Parquet)
+try:
+    import pyarrow.parquet as parquet
+except ImportError:
+    parquet = None
+
+from src.utils.logger import get_logger
+from src.utils.config_loader import get_config
+from src.data.bar_resampler import TIMEFRAME_SECONDS
+from src.ml.feature_engineering import FeatureEngineer
+
+
+class FeatureSet:
+    """Versionierte Feature-Definition (Quelle, Quellspalten, compute)"""
+
+    def __init__(
+        self,
+        name: str,
+        version: int,
+        source: Optional[str],
+        columns: Sequence[str],
+        compute: Callable[[pd.DataFrame], pd.DataFrame],
+        feature_columns: Sequence[str],
+        lookback: int
+    ):
+        """
+        Args:
+            name: Name des Feature Sets
+            version: Version (neue Berechnung = neue Version)
+            source: 'features' (features JOIN bars_{timeframe}), 'bars'
+                (bars_{symbol}) oder None (Daten liefert der Aufrufer)
+            columns: Quellspalten (ohne timestamp)
+            compute: DataFrame (chronologisch) -> DataFrame mit Features
+            feature_columns: Model-Input in dieser Reihenfolge
+            lookback: Zeilen Historie für eine gültige Feature-Zeile
+        """
+        self.name = name
+        self.version = version
+        self.source = source
+        self.columns = list(columns)
+        self.compute = compute
+        self.feature_columns = list(feature_columns)
+        self.lookback = lookback
+
+    @property
+    def key(self) -> str:
+        return f"{self.name}:v{self.version}"
+
+    def build(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Features aus Quellzeilen (chronologisch) berechnen"""
+        return self.compute(df)
+
+    def matrix(self, df: pd.DataFrame, columns: Sequence[str] = None) -> np.ndarray:
+        """
+        Model-Input als float64-Matrix
+
+        Args:
+            df: Berechnete Features
+            columns: Spalten (None = feature_columns; für ältere Models deren
+                gespeicherte feature_columns)
+
+        Returns:
+            Array (Zeilen, Features)
+
+        Raises:
+            ValueError: Wenn Feature-Spalten fehlen
+        """
+        columns = self.feature_columns if columns is None else list(columns)
+        missing = [col for col in columns if col not in df.columns]
+        if missing:
+            raise ValueError(f"Feature set {self.key}: missing feature columns {missing}")
+        return df[columns].to_numpy(dtype=np.float64)
+
+    def __repr__(self) -> str:
+        return f"FeatureSet({self.key}, {len(self.feature_columns)} features)"
+
+
+# ==================== Definitionen ====================
+
+def _indicator_features(df: pd.DataFrame) -> pd.DataFrame:
+    """features-Tabelle + Preisänderungen (ModelTrainer / InferenceEngine)"""
+    df = df.copy(deep=False)
+    for period in (1, 5, 10):
+        df[f'price_change_{period}'] = df['close'].pct_change(period)
+    return df
+
+
+def _bar_features(df: pd.DataFrame) -> pd.DataFrame:
+    """FeatureEngineer über bars_{symbol} (train_model_simple / SignalGenerator)"""
+    return FeatureEngineer().add_all_features(df)
+
+
+def _tick_features(df: pd.DataFrame) -> pd.DataFrame:
+    """Mid-Preis-Features aus bid/ask Ticks (EURUSDMLTrainer / LiveMLPredictor)"""
+    df = df.copy(deep=False)
+    df['bid'] = pd.to_numeric(df['bid'])
+    df['ask'] = pd.to_numeric(df['ask'])
+    df['mid'] = (df['bid'] + df['ask']) / 2
+    df['spread'] = df['ask'] - df['bid']
+
+    # Price changes
+    df['price_change'] = df['mid'].diff()
+    df['price_change_5'] = df['mid'].diff(5)
+    df['price_change_10'] = df['mid'].diff(10)
+
+    # Moving averages
+    df['ma_5'] = df['mid'].rolling(5).mean()
+    df['ma_10'] = df['mid'].rolling(10).mean()
+    df['ma_20'] = df['mid'].rolling(20).mean()
+
+    # Volatility features
+    df['volatility_5'] = df['mid'].rolling(5).std()
+    df['volatility_10'] = df['mid'].rolling(10).std()
+
+    # Trend indicators
+    df['trend_5'] = (df['mid'] > df['ma_5']).astype(int)
+    df['trend_10'] = (df['mid'] > df['ma_10']).astype(int)
+    return df
+
+
+INDICATOR_COLUMNS = [
+    'sma_10', 'sma_20', 'sma_50',
+    'ema_10', 'ema_20',
+    'rsi_14',
+    'macd', 'macd_signal', 'macd_hist',
+    'bb_upper', 'bb_middle', 'bb_lower',
+    'atr_14'
+]
+
+BAR_COLUMNS = [
+    'open', 'high', 'low', 'close', 'volume', 'tick_count',
+    'rsi14', 'macd_main', 'bb_upper', 'bb_lower', 'atr14'
+]
+
+FEATURE_SETS: Dict[str, FeatureSet] = {}
+
+
+def register_feature_set(feature_set: FeatureSet) -> FeatureSet:
+    """Feature Set registrieren (Key name:v<version> muss neu sein)"""
+    if feature_set.key in FEATURE_SETS:
+        raise ValueError(f"Feature set {feature_set.key} already registered")
+    FEATURE_SETS[feature_set.key] = feature_set
+    return feature_set
+
+
+def get_feature_set(key: str) -> FeatureSet:
+    """
+    Holt ein Feature Set
+
+    Args:
+        key: 'name:v<version>' oder 'name' (neueste Version)
+
+    Returns:
+        FeatureSet
+
+    Raises:
+        KeyError: Wenn das Feature Set nicht existiert
+    """
+    if key in FEATURE_SETS:
+        return FEATURE_SETS[key]
+    versions = [fs for fs in FEATURE_SETS.values() if fs.name == key]
+    if not versions:
+        raise KeyError(f"Unknown feature set '{key}' (registered: {sorted(FEATURE_SETS)})")
+    return max(versions, key=lambda fs: fs.version)
+
+
+register_feature_set(FeatureSet(
+    name='indicators',
+    version=1,
+    source='features',
+    columns=['open', 'high', 'low', 'close', 'volume'] + INDICATOR_COLUMNS,
+    compute=_indicator_features,
+    feature_columns=INDICATOR_COLUMNS + ['price_change_1', 'price_change_5', 'price_change_10'],
+    lookback=20
+))
+
+register_feature_set(FeatureSet(
+    name='bar_engineered',
+    version=1,
+    source='bars',
+    columns=BAR_COLUMNS,
+    compute=_bar_features,
+    feature_columns=FeatureEngineer('numpy').get_feature_names(include_base=True),
+    lookback=20
+))
+
+register_feature_set(FeatureSet(
+    name='tick_mid',
+    version=1,
+    source=None,
+    columns=['bid', 'ask', 'time'],
+    compute=_tick_features,
+    feature_columns=[
+        'bid', 'ask', 'spread', 'price_change', 'price_change_5',
+        'price_change_10', 'ma_5', 'ma_10', 'ma_20',
+        'volatility_5', 'volatility_10', 'trend_5', 'trend_10'
+    ],
+    lookback=20
+))
+
+
+def resolve_feature_set(feature_set: Any) -> FeatureSet:
+    """FeatureSet oder Key -> FeatureSet"""
+    return feature_set if isinstance(feature_set, FeatureSet) else get_feature_set(feature_set)
+
+
+# ==================== Store ====================
+
+class FeatureStore:
+    """Offline-Materialisierung und Online-Lookup der Feature Sets"""
+
+    def __init__(self, db=None, path: str = None):
+        """
+        Initialisiert den Feature Store
+
+        Args:
+            db: DatabaseManager des Aufrufers (None = lokale Datenbank beim
+                ersten Zugriff; Offline-Reads brauchen keine)
+            path: Verzeichnis der Offline-Features (None = Config)
+        """
+        self.logger = get_logger(self.__class__.__name__)
+        self._db = db
+        self.path = Path(path or get_config().get('modeling.feature_store.path', 'data/feature_store'))
+
+    @property
+    def db(self):
+        if self._db is None:
+            from src.data.database_manager import get_database
+            self._db = get_database('local')
+        return self._db
+
+    @property
+    def offline_enabled(self) -> bool:
+        """Offline-Materialisierung verfügbar (pyarrow installiert)"""
+        return parquet is not None
+
+    def _require_engine(self):
+        if parquet is None:
+            raise RuntimeError("pyarrow is required for offline feature materialization (pip install pyarrow)")
+
+    # ==================== Quelle ====================
+
+    def source_query(
+        self,
+        feature_set: Any,
+        symbol: str,
+        timeframe: str,
+        start: datetime = None,
+        end: datetime = None,
+        limit: int = None
+    ) -> Tuple[str, tuple]:
+        """
+        SQL + Parameter für die Quellzeilen eines Feature Sets
+
+        Mit limit die letzten limit Zeilen (absteigend), sonst aufsteigend.
+
+        Args:
+            feature_set: FeatureSet oder Key
+            symbol: Trading Symbol
+            timeframe: Timeframe
+            start: Ab Timestamp (inklusiv)
+            end: Bis Timestamp (exklusiv)
+            limit: Nur die letzten limit Zeilen
+
+        Returns:
+            (SQL, Parameter)
+        """
+        fs = resolve_feature_set(feature_set)
+        if fs.source == 'features':
+            columns = ', '.join(
+                ['f.timestamp'] +
+                [f"b.{col}" if col in ('open', 'high', 'low', 'close', 'volume') else f"f.{col}"
+                 for col in fs.columns]
+            )
+            table = f"features f JOIN bars_{timeframe} b ON f.symbol = b.symbol AND f.timestamp = b.timestamp"
+            where, params, time_column = ["f.symbol = %s", "f.timeframe = %s"], [symbol, timeframe], 'f.timestamp'
+        elif fs.source == 'bars':
+            columns = ', '.join(['timestamp'] + fs.columns)
+            table = f"bars_{symbol.lower()}"
+            where, params, time_column = ["timeframe = %s"], [timeframe], 'timestamp'
+        else:
+            raise ValueError(f"Feature set {fs.key} has no database source")
+
+        if start is not None:
+            where.append(f"{time_column} >= %s")
+            params.append(start)
+        if end is not None:
+            where.append(f"{time_column} < %s")
+            params.append(end)
+
+        sql = f"SELECT {columns} FROM {table} WHERE {' AND '.join(where)}"
+        if limit:
+            sql += f" ORDER BY {time_column} DESC LIMIT {int(limit)}"
+        else:
+            sql += f" ORDER BY {time_column} ASC"
+        return sql, tuple(params)
+
+    def fetch_source(
+        self,
+        feature_set: Any,
+        symbol: str,
+        timeframe: str,
+        start: datetime = None,
+        end: datetime = None
+    ) -> pd.DataFrame:
+        """
+        Quellzeilen ab start, davor lookback Zeilen Warm-up (chronologisch)
+
+        Returns:
+            DataFrame (timestamp + Quellspalten)
+        """
+        fs = resolve_feature_set(feature_set)
+        frames = []
+        if start is not None:
+            sql, params = self.source_query(fs, symbol, timeframe, end=start, limit=fs.lookback)
+            frames.append(self.db.fetch_dataframe(sql, params).iloc[::-1])
+        sql, params = self.source_query(fs, symbol, timeframe, start=start, end=end)
+        frames.append(self.db.fetch_dataframe(sql, params))
+        return pd.concat(frames, ignore_index=True)
+
+    def compute(
+        self,
+        feature_set: Any,
+        symbol: str,
+        timeframe: str,
+        start: datetime = None,
+        end: datetime = None
+    ) -> pd.DataFrame:
+        """
+        Features eines Zeitbereichs direkt aus der Datenbank berechnen
+
+        Returns:
+            DataFrame (timestamp, available_at, Quellspalten, Features)
+        """
+        fs = resolve_feature_set(feature_set)
+        df = fs.build(self.fetch_source(fs, symbol, timeframe, start, end))
+        if start is not None:
+            df = df[df['timestamp'] >= start]
+        return self._with_available_at(df.reset_index(drop=True), timeframe)
+
+    @staticmethod
+    def _with_available_at(df: pd.DataFrame, timeframe: str) -> pd.DataFrame:
+        """available_at = Ende der Bar (ab dann sind ihre Features bekannt)"""
+        df = df.copy(deep=False)
+        df['available_at'] = pd.to_datetime(df['timestamp']) + timedelta(seconds=TIMEFRAME_SECONDS[timeframe])
+        return df
+
+    # ==================== Offline ====================
+
+    def offline_path(self, feature_set: Any, symbol: str, timeframe: str) -> Path:
+        fs = resolve_feature_set(feature_set)
+        return self.path / fs.name / f"v{fs.version}" / f"{symbol}_{timeframe}.parquet"
+
+    def materialize(
+        self,
+        feature_set: Any,
+        symbol: str,
+        timeframe: str,
+        start: datetime = None,
+        end: datetime = None
+    ) -> int:
+        """
+        Features einer Reihe offline (Parquet) materialisieren
+
+        Ohne start ab der letzten gespeicherten Bar (sie kann beim letzten
+        Lauf noch offen gewesen sein), ohne Datei über die ganze Historie.
+
+        Args:
+            feature_set: FeatureSet oder Key
+            symbol: Trading Symbol
+            timeframe: Timeframe
+            start: Ab Timestamp (inklusiv)
+            end: Bis Timestamp (exklusiv)
+
+        Returns:
+            Anzahl geschriebener Zeilen
+        """
+        self._require_engine()
+        fs = resolve_feature_set(feature_set)
+        path = self.offline_path(fs, symbol, timeframe)
+
+        stored = None
+        if path.exists():
+            stored = parquet.read_table(path).to_pandas()
+            if start is None and len(stored):
+                start = stored['timestamp'].max().to_pydatetime()
+
+        df = self.compute(fs, symbol, timeframe, start, end)
+        df = df[list(dict.fromkeys(['timestamp', 'available_at'] + fs.columns + fs.feature_columns))]
+
+        if stored is not None and len(stored):
+            # Neu berechneter Bereich ersetzt die gespeicherten Zeilen darin
+            if len(df):
+                keep = (stored['timestamp'] < df['timestamp'].min()) | (stored['timestamp'] > df['timestamp'].max())
+                df = pd.concat([stored[keep], df], ignore_index=True).sort_values('timestamp', kind='stable')
+            else:
+                df = stored
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + '.tmp')
+        df.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, path)
+
+        self.logger.info(f"Materialized {fs.key} {symbol} {timeframe}: {len(df)} rows -> {path}")
+        return len(df)
+
+    def read_offline(
+        self,
+        feature_set: Any,
+        symbol: str,
+        timeframe: str,
+        start: datetime = None,
+        end: datetime = None,
+        as_of: datetime = None,
+        columns: Sequence[str] = None
+    ) -> pd.DataFrame:
+        """
+        Materialisierte Features lesen (spaltenweise, gefiltert beim Lesen)
+
+        Args:
+            feature_set: FeatureSet oder Key
+            symbol: Trading Symbol
+            timeframe: Timeframe
+            start: Ab Timestamp (inklusiv)
+            end: Bis Timestamp (exklusiv)
+            as_of: Point-in-Time: nur Bars, die bis dahin abgeschlossen waren
+            columns: Nur diese Spalten (timestamp/available_at immer)
+
+        Returns:
+            DataFrame (chronologisch)
+        """
+        self._require_engine()
+        path = self.offline_path(feature_set, symbol, timeframe)
+        if not path.exists():
+            raise FileNotFoundError(f"No offline features at {path} (run materialize first)")
+
+        filters = []
+        if start is not None:
+            filters.append(('timestamp', '>=', pd.Timestamp(start)))
+        if end is not None:
+            filters.append(('timestamp', '<', pd.Timestamp(end)))
+        if as_of is not None:
+            filters.append(('available_at', '<=', pd.Timestamp(as_of)))
+        if columns is not None:
+            columns = ['timestamp', 'available_at'] + [c for c in columns if c not in ('timestamp', 'available_at')]
+
+        table = parquet.read_table(path, columns=columns, filters=filters or None)
+        return table.to_pandas().reset_index(drop=True)
+
+    def join_as_of(
+        self,
+        events: pd.DataFrame,
+        feature_set: Any,
+        symbol: str,
+        timeframe: str,
+        on: str = 'timestamp'
+    ) -> pd.DataFrame:
+        """
+        Point-in-Time Join: pro Event die Features der letzten Bar, die zum
+        Eventzeitpunkt abgeschlossen war (keine Features aus der Zukunft)
+
+        Args:
+            events: DataFrame mit Eventzeitpunkten (z.B. Labels, Trades)
+            feature_set: FeatureSet oder Key
+            symbol: Trading Symbol
+            timeframe: Timeframe
+            on: Zeitspalte in events
+
+        Returns:
+            events (nach on sortiert) mit Feature-Spalten (NaN ohne Features)
+        """
+        fs = resolve_feature_set(feature_set)
+        features = self.read_offline(fs, symbol, timeframe, as_of=events[on].max(), columns=fs.feature_columns)
+        features = features.rename(columns={'timestamp': 'feature_timestamp'})
+        features['available_at'] = features['available_at'].astype(events[on].dtype)
+        return pd.merge_asof(
+            events.sort_values(on), features,
+            left_on=on, right_on='available_at', direction='backward'
+        )
+
+    def training_frame(
+        self,
+        feature_set: Any,
+        symbol: str,
+        timeframe: str,
+        start: datetime = None,
+        end: datetime = None
+    ) -> pd.DataFrame:
+        """
+        Features für Training: inkrementell materialisieren und offline lesen;
+        ohne pyarrow direkt aus der Datenbank (gleiches compute)
+
+        Returns:
+            DataFrame (chronologisch)
+        """
+        if not self.offline_enabled:
+            return self.compute(feature_set, symbol, timeframe, start, end)
+        self.materialize(feature_set, symbol, timeframe)
+        return self.read_offline(feature_set, symbol, timeframe, start, end)
+
+    # ==================== Online ====================
+
+    def online_query(self, feature_set: Any, symbol: str, timeframe: str, rows: int = 1) -> Tuple[str, tuple]:
+        """SQL + Parameter für get_online (für async Datenbankzugriff)"""
+        fs = resolve_feature_set(feature_set)
+        return self.source_query(fs, symbol, timeframe, limit=fs.lookback + rows - 1)
+
+    def online_frame(
+        self,
+        feature_set: Any,
+        records: List[Any],
+        timeframe: str,
+        rows: int = 1
+    ) -> Optional[pd.DataFrame]:
+        """
+        Ergebnis von online_query -> die neuesten rows gültigen Feature-Zeilen
+
+        Args:
+            feature_set: FeatureSet oder Key
+            records: Rows (Dictionaries, absteigend)
+            timeframe: Timeframe
+            rows: Anzahl Zeilen
+
+        Returns:
+            DataFrame (chronologisch) oder None
+        """
+        fs = resolve_feature_set(feature_set)
+        if not records:
+            return None
+        df = pd.DataFrame(records[::-1])
+        # NUMERIC kommt als Decimal
+        df = fs.build(df.astype({col: np.float64 for col in fs.columns if col in df.columns}))
+        df = df.dropna(subset=fs.feature_columns).tail(rows)
+        if len(df) == 0:
+            return None
+        df = self._with_available_at(df.reset_index(drop=True), timeframe)
+        df.attrs['feature_set'] = fs.key
+        return df
+
+    def get_online(self, feature_set: Any, symbol: str, timeframe: str, rows: int = 1) -> Optional[pd.DataFrame]:
+        """
+        Neueste Features für Inference (nur lookback + rows Bars lesen)
+
+        Args:
+            feature_set: FeatureSet oder Key
+            symbol: Trading Symbol
+            timeframe: Timeframe
+            rows: Anzahl Feature-Zeilen (z.B. lookback + 1 für flache Features)
+
+        Returns:
+            DataFrame (chronologisch) oder None
+        """
+        sql, params = self.online_query(feature_set, symbol, timeframe, rows)
+        records = self.db.fetch_all_dict(sql, params, prepare=True)
+        return self.online_frame(feature_set, records, timeframe, rows)
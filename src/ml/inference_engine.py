@@ -1,20 +1,41 @@
 """
 ML Inference Engine
 Real-time Predictions mit trainierten Models
+
+Mit database.async.enabled (asyncpg) laufen die Queries aller Symbols und
+Timeframes eines Zyklus parallel statt nacheinander, sonst verteilt der
+WorkScheduler (data.scheduler) sie auf einen Thread-Pool (Deadline pro Zyklus,
+Skip-if-running pro Symbol/Timeframe).
 """
 
+import asyncio
 import pandas as pd
-import numpy as np
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any
 import threading
 import time
 from collections import defaultdict
+from functools import partial
 
 from ..utils.logger import get_logger, log_exception
 from ..utils.config_loader import get_config
 from ..data.database_manager import get_database
+from ..data.async_database_manager import async_enabled
+from ..utils.work_scheduler import WorkScheduler, WorkUnit, scheduler_enabled
 from .model_trainer import ModelTrainer
+from .feature_store import FeatureStore, get_feature_set
+
+# Models ohne feature_set wurden vor dem Feature Store mit diesen Features trainiert
+LEGACY_FEATURE_SET = 'indicators:v1'
+
+PREDICTION_INSERT_SQL = """
+    INSERT INTO model_forecasts
+        (timestamp, symbol, timeframe, prediction_horizon,
+         current_price, predicted_price, signal, confidence,
+         algorithm, model_version)
+    VALUES
+        (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+"""
 
 
 class InferenceEngine:
@@ -31,6 +52,10 @@ class InferenceEngine:
         self.config = get_config()
         self.db = get_database(db_type)
         self.model_trainer = ModelTrainer(db_type)
+        self.feature_store = FeatureStore(self.db)
+
+        # Async DB: ein Event Loop im Inference Thread, Queries parallel
+        self.async_db = get_database(db_type, async_=True) if async_enabled() else None
 
         # Loaded models cache
         self.models = {}  # key: (symbol, timeframe, horizon, algorithm)
@@ -44,6 +69,8 @@ class InferenceEngine:
         # State
         self.is_running = False
         self.inference_thread = None
+        self.scheduler = None  # WorkScheduler (data.scheduler), ab start()
+        self._stats_lock = threading.Lock()  # Stats aus den Scheduler-Threads
 
         # Statistics
         self.stats = {
@@ -90,13 +117,21 @@ class InferenceEngine:
 
         self.logger.info(f"Models loaded: {loaded} successful, {failed} failed")
 
+    def _feature_set(self, symbol: str, timeframe: str) -> str:
+        """Feature Set der geladenen Models eines Symbol/Timeframe"""
+        for horizon in self.horizons:
+            model_info = self.models.get((symbol, timeframe, horizon, self.default_algorithm))
+            if model_info:
+                return model_info.get('feature_set', LEGACY_FEATURE_SET)
+        return LEGACY_FEATURE_SET
+
     def get_latest_features(
         self,
         symbol: str,
         timeframe: str
     ) -> Optional[pd.DataFrame]:
         """
-        Holt neueste Features für Prediction
+        Holt neueste Features für Prediction (Feature Store, Online-Lookup)
 
         Args:
             symbol: Trading Symbol
@@ -106,48 +141,32 @@ class InferenceEngine:
             DataFrame mit Features
         """
         try:
-            query = """
-                SELECT
-                    f.timestamp,
-                    b.close,
-                    f.sma_10, f.sma_20, f.sma_50,
-                    f.ema_10, f.ema_20,
-                    f.rsi_14,
-                    f.macd, f.macd_signal, f.macd_hist,
-                    f.bb_upper, f.bb_middle, f.bb_lower,
-                    f.atr_14
-                FROM features f
-                JOIN bars_{timeframe} b ON f.symbol = b.symbol
-                    AND f.timestamp = b.timestamp
-                WHERE f.symbol = %s
-                  AND f.timeframe = %s
-                ORDER BY f.timestamp DESC
-                LIMIT 20
-            """.format(timeframe=timeframe)
-
-            results = self.db.fetch_all_dict(query, (symbol, timeframe))
-
-            if not results:
-                return None
-
-            # Convert to DataFrame
-            df = pd.DataFrame(results)
-            df = df.sort_values('timestamp')
-
-            # Calculate price changes
-            df['price_change_1'] = df['close'].pct_change(1)
-            df['price_change_5'] = df['close'].pct_change(5)
-            df['price_change_10'] = df['close'].pct_change(10)
-
-            # Drop NaN
-            df = df.dropna()
-
-            return df
+            return self.feature_store.get_online(self._feature_set(symbol, timeframe), symbol, timeframe)
 
         except Exception as e:
             log_exception(self.logger, e, f"Failed to get latest features for {symbol} {timeframe}")
             return None
 
+    async def get_latest_features_async(
+        self,
+        symbol: str,
+        timeframe: str
+    ) -> Optional[pd.DataFrame]:
+        """
+        Holt neueste Features für Prediction (AsyncDatabaseManager)
+
+        Args:
+            symbol: Trading Symbol
+            timeframe: Timeframe
+
+        Returns:
+            DataFrame mit Features
+        """
+        feature_set = self._feature_set(symbol, timeframe)
+        sql, params = self.feature_store.online_query(feature_set, symbol, timeframe)
+        results = await self.async_db.fetch_all_dict(sql, params)
+        return self.feature_store.online_frame(feature_set, results, timeframe)
+
     def predict(
         self,
         symbol: str,
@@ -176,64 +195,12 @@ class InferenceEngine:
                 self.logger.warning(f"Model not found: {key}")
                 return None
 
-            model_info = self.models[key]
-            model = model_info['model']
-            scaler = model_info['scaler']
-            feature_columns = model_info['feature_columns']
-
             # Get latest features
             df = self.get_latest_features(symbol, timeframe)
             if df is None or len(df) == 0:
                 return None
 
-            # Get latest row
-            latest = df.iloc[-1]
-
-            # Prepare features
-            X = []
-            for col in feature_columns:
-                if col in latest:
-                    X.append(float(latest[col]))
-                else:
-                    X.append(0.0)
-
-            X = np.array(X).reshape(1, -1)
-
-            # Scale
-            X_scaled = scaler.transform(X)
-
-            # Predict
-            predicted_price = float(model.predict(X_scaled)[0])
-            current_price = float(latest['close'])
-
-            # Calculate confidence (based on historical model performance)
-            r2_score = model_info['metrics'].get('test_r2', 0.0)
-            confidence = max(0.0, min(1.0, r2_score))  # 0-1 range
-
-            # Determine signal
-            price_change = (predicted_price - current_price) / current_price
-            if abs(price_change) < 0.0001:  # < 0.01%
-                signal = 'HOLD'
-            elif price_change > 0:
-                signal = 'BUY'
-            else:
-                signal = 'SELL'
-
-            # Create prediction
-            prediction = {
-                'symbol': symbol,
-                'timeframe': timeframe,
-                'horizon': horizon,
-                'algorithm': algorithm,
-                'timestamp': datetime.now(),
-                'current_price': current_price,
-                'predicted_price': predicted_price,
-                'price_change_pct': price_change * 100,
-                'signal': signal,
-                'confidence': confidence,
-                'model_version': model_info['version'],
-                'features_timestamp': latest['timestamp']
-            }
+            prediction = self._build_prediction(symbol, timeframe, horizon, algorithm, df)
 
             # Save to database
             self._save_prediction(prediction)
@@ -247,6 +214,82 @@ class InferenceEngine:
             self.stats['errors'] += 1
             return None
 
+    def _build_prediction(
+        self,
+        symbol: str,
+        timeframe: str,
+        horizon: int,
+        algorithm: str,
+        df: pd.DataFrame
+    ) -> Dict[str, Any]:
+        """
+        Berechnet eine Prediction aus den neuesten Features (ohne DB-Zugriff)
+
+        Args:
+            symbol: Trading Symbol
+            timeframe: Timeframe
+            horizon: Prediction Horizon (Sekunden)
+            algorithm: Algorithm
+            df: Features (get_latest_features)
+
+        Returns:
+            Prediction Dictionary
+        """
+        model_info = self.models[(symbol, timeframe, horizon, algorithm)]
+        model = model_info['model']
+        scaler = model_info['scaler']
+        feature_set = get_feature_set(model_info.get('feature_set', LEGACY_FEATURE_SET))
+
+        if df.attrs.get('feature_set', feature_set.key) != feature_set.key:
+            raise ValueError(
+                f"Features are {df.attrs['feature_set']}, model {symbol} {timeframe} {horizon}s "
+                f"was trained on {feature_set.key}"
+            )
+
+        # Get latest row
+        latest = df.iloc[-1]
+
+        # Prepare features (fehlende Spalten sind ein Fehler, keine 0)
+        X = feature_set.matrix(df.iloc[[-1]], model_info['feature_columns'])
+
+        # Scale
+        X_scaled = scaler.transform(X)
+
+        # Predict
+        predicted_price = float(model.predict(X_scaled)[0])
+        current_price = float(latest['close'])
+
+        # Calculate confidence (based on historical model performance)
+        r2_score = model_info['metrics'].get('test_r2', 0.0)
+        confidence = max(0.0, min(1.0, r2_score))  # 0-1 range
+
+        # Determine signal
+        price_change = (predicted_price - current_price) / current_price
+        if abs(price_change) < 0.0001:  # < 0.01%
+            signal = 'HOLD'
+        elif price_change > 0:
+            signal = 'BUY'
+        else:
+            signal = 'SELL'
+
+        # Create prediction
+        prediction = {
+            'symbol': symbol,
+            'timeframe': timeframe,
+            'horizon': horizon,
+            'algorithm': algorithm,
+            'timestamp': datetime.now(),
+            'current_price': current_price,
+            'predicted_price': predicted_price,
+            'price_change_pct': price_change * 100,
+            'signal': signal,
+            'confidence': confidence,
+            'model_version': model_info['version'],
+            'features_timestamp': latest['timestamp']
+        }
+
+        return prediction
+
     def predict_all_horizons(
         self,
         symbol: str,
@@ -271,6 +314,105 @@ class InferenceEngine:
 
         return predictions
 
+    async def predict_all_horizons_async(
+        self,
+        symbol: str,
+        timeframe: str
+    ) -> List[Dict[str, Any]]:
+        """
+        Macht Predictions für alle Horizons (AsyncDatabaseManager)
+
+        Features werden einmal pro Symbol/Timeframe geholt, alle Predictions
+        in einem Batch gespeichert.
+
+        Args:
+            symbol: Trading Symbol
+            timeframe: Timeframe
+
+        Returns:
+            Liste von Predictions
+        """
+        algorithm = self.default_algorithm
+        horizons = [h for h in self.horizons if (symbol, timeframe, h, algorithm) in self.models]
+        if not horizons:
+            return []
+
+        df = await self.get_latest_features_async(symbol, timeframe)
+        if df is None or len(df) == 0:
+            return []
+
+        predictions = []
+        for horizon in horizons:
+            try:
+                predictions.append(self._build_prediction(symbol, timeframe, horizon, algorithm, df))
+            except Exception as e:
+                log_exception(self.logger, e, f"Prediction failed for {symbol} {timeframe} {horizon}s")
+                self.stats['errors'] += 1
+
+        if predictions:
+            await self.async_db.execute_many(
+                PREDICTION_INSERT_SQL, [self._prediction_values(p) for p in predictions]
+            )
+            for prediction in predictions:
+                self.stats['predictions_made'][f"{symbol}_{timeframe}_{prediction['horizon']}s"] += 1
+
+        return predictions
+
+    @staticmethod
+    def _prediction_values(prediction: Dict[str, Any]) -> tuple:
+        """Parameter für PREDICTION_INSERT_SQL"""
+        return (
+            prediction['timestamp'],
+            prediction['symbol'],
+            prediction['timeframe'],
+            prediction['horizon'],
+            prediction['current_price'],
+            prediction['predicted_price'],
+            prediction['signal'],
+            prediction['confidence'],
+            prediction['algorithm'],
+            prediction['model_version']
+        )
+
+    def _predict_from_features(
+        self,
+        symbol: str,
+        timeframe: str,
+        df: Optional[pd.DataFrame]
+    ) -> List[Dict[str, Any]]:
+        """
+        Predictions aller Horizons aus einmal geholten Features (WorkScheduler)
+
+        Args:
+            symbol: Trading Symbol
+            timeframe: Timeframe
+            df: Features (get_latest_features)
+
+        Returns:
+            Liste von Predictions
+        """
+        if df is None or len(df) == 0:
+            return []
+
+        algorithm = self.default_algorithm
+        predictions = []
+        for horizon in self.horizons:
+            if (symbol, timeframe, horizon, algorithm) not in self.models:
+                continue
+            try:
+                prediction = self._build_prediction(symbol, timeframe, horizon, algorithm, df)
+            except Exception as e:
+                log_exception(self.logger, e, f"Prediction failed for {symbol} {timeframe} {horizon}s")
+                with self._stats_lock:
+                    self.stats['errors'] += 1
+                continue
+            self._save_prediction(prediction)
+            with self._stats_lock:
+                self.stats['predictions_made'][f"{symbol}_{timeframe}_{horizon}s"] += 1
+            predictions.append(prediction)
+
+        return predictions
+
     def _save_prediction(self, prediction: Dict[str, Any]):
         """
         Speichert Prediction in Database
@@ -279,27 +421,7 @@ class InferenceEngine:
             prediction: Prediction Dictionary
         """
         try:
-            insert_sql = """
-                INSERT INTO model_forecasts
-                    (timestamp, symbol, timeframe, prediction_horizon,
-                     current_price, predicted_price, signal, confidence,
-                     algorithm, model_version)
-                VALUES
-                    (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-            """
-
-            self.db.execute(insert_sql, (
-                prediction['timestamp'],
-                prediction['symbol'],
-                prediction['timeframe'],
-                prediction['horizon'],
-                prediction['current_price'],
-                prediction['predicted_price'],
-                prediction['signal'],
-                prediction['confidence'],
-                prediction['algorithm'],
-                prediction['model_version']
-            ))
+            self.db.execute(PREDICTION_INSERT_SQL, self._prediction_values(prediction), prepare=True)
 
         except Exception as e:
             log_exception(self.logger, e, "Failed to save prediction to database")
@@ -308,17 +430,35 @@ class InferenceEngine:
         """Inference Loop (läuft in eigenem Thread)"""
         self.logger.info("Inference engine started")
 
+        if self.async_db is not None:
+            asyncio.run(self._async_inference_loop())
+            self.logger.info("Inference engine stopped")
+            return
+
         while self.is_running:
             try:
                 # Make predictions for all symbols and timeframes
-                for symbol in self.symbols:
-                    for timeframe in self.timeframes:
-                        predictions = self.predict_all_horizons(symbol, timeframe)
-
-                        if predictions:
-                            self.logger.info(
-                                f"Made {len(predictions)} predictions for {symbol} {timeframe}"
-                            )
+                if self.scheduler is not None:
+                    results = self.scheduler.run({
+                        (symbol, timeframe): WorkUnit(
+                            io=partial(self.get_latest_features, symbol, timeframe),
+                            store=partial(self._predict_from_features, symbol, timeframe)
+                        )
+                        for symbol in self.symbols
+                        for timeframe in self.timeframes
+                    })
+                else:
+                    results = [
+                        ((symbol, timeframe), self.predict_all_horizons(symbol, timeframe))
+                        for symbol in self.symbols
+                        for timeframe in self.timeframes
+                    ]
+
+                for (symbol, timeframe), predictions in results:
+                    if predictions:
+                        self.logger.info(
+                            f"Made {len(predictions)} predictions for {symbol} {timeframe}"
+                        )
 
                 # Sleep
                 time.sleep(self.prediction_interval)
@@ -329,6 +469,28 @@ class InferenceEngine:
 
         self.logger.info("Inference engine stopped")
 
+    async def _async_inference_loop(self):
+        """Inference Loop mit AsyncDatabaseManager: alle Symbols/Timeframes parallel"""
+        pairs = [(symbol, timeframe) for symbol in self.symbols for timeframe in self.timeframes]
+
+        try:
+            while self.is_running:
+                results = await asyncio.gather(
+                    *(self.predict_all_horizons_async(symbol, timeframe) for symbol, timeframe in pairs),
+                    return_exceptions=True
+                )
+
+                for (symbol, timeframe), result in zip(pairs, results):
+                    if isinstance(result, Exception):
+                        log_exception(self.logger, result, f"Inference failed for {symbol} {timeframe}")
+                        self.stats['errors'] += 1
+                    elif result:
+                        self.logger.info(f"Made {len(result)} predictions for {symbol} {timeframe}")
+
+                await asyncio.sleep(self.prediction_interval)
+        finally:
+            await self.async_db.close()
+
     def start(self):
         """Startet die Inference Engine"""
         if self.is_running:
@@ -346,6 +508,8 @@ class InferenceEngine:
 
         self.is_running = True
         self.stats['start_time'] = datetime.now()
+        if self.async_db is None and scheduler_enabled('inference_engine'):
+            self.scheduler = WorkScheduler('inference_engine')
 
         # Start thread
         self.inference_thread = threading.Thread(target=self._inference_loop, daemon=True)
@@ -366,6 +530,10 @@ class InferenceEngine:
         if self.inference_thread:
             self.inference_thread.join(timeout=10)
 
+        if self.scheduler is not None:
+            self.scheduler.shutdown()
+            self.scheduler = None
+
         # Log statistics
         self._log_statistics()
 
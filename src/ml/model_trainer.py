@@ -20,21 +20,25 @@ import lightgbm as lgb
 from ..utils.logger import get_logger, log_exception
 from ..utils.config_loader import get_config
 from ..data.database_manager import get_database
+from .feature_store import FeatureStore, get_feature_set
 
 
 class ModelTrainer:
     """Trainiert und evaluiert ML-Models für Trading"""
 
-    def __init__(self, db_type: str = 'local'):
+    def __init__(self, db_type: str = 'local', feature_set: str = 'indicators'):
         """
         Initialisiert den Model Trainer
 
         Args:
             db_type: Database Type
+            feature_set: Feature Set (Name = neueste Version, oder name:v<version>)
         """
         self.logger = get_logger(self.__class__.__name__)
         self.config = get_config()
         self.db = get_database(db_type)
+        self.feature_store = FeatureStore(self.db)
+        self.feature_set = get_feature_set(feature_set)
 
         # Model Configuration
         self.horizons = [30, 60, 180, 300, 600]  # Sekunden: 30s, 1m, 3m, 5m, 10m
@@ -45,7 +49,7 @@ class ModelTrainer:
         self.models_dir = Path('models')
         self.models_dir.mkdir(exist_ok=True)
 
-        # Feature columns (werden automatisch erkannt)
+        # Feature columns (aus dem Feature Set)
         self.feature_columns = []
 
     def fetch_training_data(
@@ -66,35 +70,14 @@ class ModelTrainer:
             DataFrame mit Features und Targets
         """
         try:
-            # Fetch features with bars
-            query = """
-                SELECT
-                    f.timestamp,
-                    f.symbol,
-                    b.open, b.high, b.low, b.close, b.volume,
-                    f.sma_10, f.sma_20, f.sma_50,
-                    f.ema_10, f.ema_20,
-                    f.rsi_14,
-                    f.macd, f.macd_signal, f.macd_hist,
-                    f.bb_upper, f.bb_middle, f.bb_lower,
-                    f.atr_14
-                FROM features f
-                JOIN bars_{timeframe} b ON f.symbol = b.symbol
-                    AND f.timestamp = b.timestamp
-                WHERE f.symbol = %s
-                  AND f.timeframe = %s
-                  AND f.timestamp >= NOW() - INTERVAL '{days} days'
-                ORDER BY f.timestamp ASC
-            """.format(timeframe=timeframe, days=days)
-
-            results = self.db.fetch_all_dict(query, (symbol, timeframe))
-
-            if not results or len(results) < 100:
-                self.logger.warning(f"Not enough data for {symbol} {timeframe}: {len(results) if results else 0} rows")
-                return None
+            # Features des Feature Sets (offline materialisiert, gleiches compute wie Inference)
+            df = self.feature_store.training_frame(
+                self.feature_set, symbol, timeframe, start=datetime.now() - timedelta(days=days)
+            )
 
-            # Convert to DataFrame
-            df = pd.DataFrame(results)
+            if len(df) < 100:
+                self.logger.warning(f"Not enough data for {symbol} {timeframe}: {len(df)} rows")
+                return None
 
             # Create target variables for different horizons
             for horizon in self.horizons:
@@ -120,27 +103,15 @@ class ModelTrainer:
         Bereitet Features vor
 
         Args:
-            df: Input DataFrame
+            df: Input DataFrame (training_frame des Feature Sets)
 
         Returns:
             (Feature columns, DataFrame)
         """
-        # Select feature columns (exclude metadata and targets)
-        exclude_cols = ['timestamp', 'symbol', 'open', 'high', 'low', 'close', 'volume']
-        target_cols = [col for col in df.columns if col.startswith(('target_', 'direction_'))]
-
-        feature_cols = [col for col in df.columns
-                       if col not in exclude_cols + target_cols]
-
-        # Add price-based features
-        df['price_change_1'] = df['close'].pct_change(1)
-        df['price_change_5'] = df['close'].pct_change(5)
-        df['price_change_10'] = df['close'].pct_change(10)
-
-        feature_cols.extend(['price_change_1', 'price_change_5', 'price_change_10'])
+        feature_cols = list(self.feature_set.feature_columns)
 
         # Drop NaN again
-        df = df.dropna()
+        df = df.dropna(subset=feature_cols)
 
         return feature_cols, df
 
@@ -182,7 +153,7 @@ class ModelTrainer:
                 return None
 
             # Split data (time-series split)
-            X = df[feature_cols].values
+            X = self.feature_set.matrix(df, feature_cols)
             y = df[target_col].values
 
             # Train/test split (80/20, time-based)
@@ -245,6 +216,7 @@ class ModelTrainer:
                 'model': model,
                 'scaler': scaler,
                 'feature_columns': feature_cols,
+                'feature_set': self.feature_set.key,
                 'symbol': symbol,
                 'timeframe': timeframe,
                 'horizon': horizon,
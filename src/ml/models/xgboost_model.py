@@ -27,6 +27,7 @@ class XGBoostModel:
         self.params = params
         self.model = None
         self.feature_names = None
+        self.feature_set = None  # Feature store key the model was trained on
         self.train_history = {}
 
     @staticmethod
@@ -149,6 +150,7 @@ class XGBoostModel:
         metadata = {
             'params': self.params,
             'feature_names': self.feature_names,
+            'feature_set': self.feature_set,
             'train_history': self.train_history
         }
 
@@ -174,6 +176,7 @@ class XGBoostModel:
                 metadata = pickle.load(f)
                 self.params = metadata.get('params', {})
                 self.feature_names = metadata.get('feature_names')
+                self.feature_set = metadata.get('feature_set')
                 self.train_history = metadata.get('train_history', {})
         except FileNotFoundError:
             print(f"Warning: Metadata file not found at {metadata_path}")
@@ -14,10 +14,13 @@ import json
 
 from src.utils.logger import get_logger
 from src.data.database_manager import get_database
-from src.ml.feature_engineering import FeatureEngineer
+from src.ml.feature_store import FeatureStore, get_feature_set
 
 logger = get_logger('SignalGenerator')
 
+# Models without a feature_set in their metadata were trained on these features
+LEGACY_FEATURE_SET = 'bar_engineered:v1'
+
 
 class SignalGenerator:
     """Generates trading signals from ML model predictions"""
@@ -38,7 +41,7 @@ class SignalGenerator:
         self.confidence_threshold = confidence_threshold
         self.max_signals_per_hour = max_signals_per_hour
         self.db = get_database('local')
-        self.feature_engineer = FeatureEngineer()
+        self.feature_store = FeatureStore(self.db)
 
         # Load models and metadata
         self.models = {}
@@ -102,101 +105,75 @@ class SignalGenerator:
             except Exception as e:
                 logger.error(f"Error loading model {model_file}: {e}")
 
-    def get_latest_features(self, symbol: str, timeframe: str = '1m', lookback: int = 5) -> Optional[pd.DataFrame]:
+    def _feature_set(self, model_name: str) -> str:
+        """Feature set the model was trained on (older models: bar_engineered:v1)"""
+        return self.model_metadata.get(model_name, {}).get('feature_set', LEGACY_FEATURE_SET)
+
+    def get_latest_features(
+        self,
+        symbol: str,
+        timeframe: str = '1m',
+        lookback: int = 5,
+        feature_set: str = LEGACY_FEATURE_SET
+    ) -> Optional[pd.DataFrame]:
         """
-        Fetch latest bars and features from database
+        Fetch latest features from the feature store (online lookup)
 
         Args:
             symbol: Trading symbol (e.g., 'EURUSD')
             timeframe: Bar timeframe
-            lookback: Number of recent bars to fetch
+            lookback: Number of lagged bars the model uses
+            feature_set: Feature set key
 
         Returns:
-            DataFrame with features or None if insufficient data
+            DataFrame with lookback + 1 feature rows or None if insufficient data
         """
         try:
-            bar_table = f"bars_{symbol.lower()}"
-
-            sql = f"""
-                SELECT
-                    timestamp, open, high, low, close, volume, tick_count,
-                    rsi14, macd_main, bb_upper, bb_lower, atr14
-                FROM {bar_table}
-                WHERE timeframe = %s
-                ORDER BY timestamp DESC
-                LIMIT %s
-            """
+            df = self.feature_store.get_online(feature_set, symbol, timeframe, rows=lookback + 1)
 
-            result = self.db.fetch_all(sql, (timeframe, lookback + 1))
-
-            if not result or len(result) < lookback + 1:
-                logger.debug(f"Insufficient data for {symbol}: {len(result) if result else 0} bars")
+            if df is None or len(df) < lookback + 1:
+                logger.debug(f"Insufficient data for {symbol}: {0 if df is None else len(df)} feature rows")
                 return None
 
-            # Convert to DataFrame (reverse to chronological order)
-            df = pd.DataFrame(result[::-1], columns=[
-                'timestamp', 'open', 'high', 'low', 'close', 'volume', 'tick_count',
-                'rsi14', 'macd_main', 'bb_upper', 'bb_lower', 'atr14'
-            ])
-
-            # Add derived features
-            df = self.feature_engineer.add_price_features(df)
-            df = self.feature_engineer.add_return_features(df)
-            df = self.feature_engineer.add_normalized_features(df)
-
             return df
 
         except Exception as e:
             logger.error(f"Error fetching features for {symbol}: {e}")
             return None
 
-    def prepare_features_for_inference(self, df: pd.DataFrame, lookback: int = 5) -> np.ndarray:
+    def prepare_features_for_inference(
+        self,
+        df: pd.DataFrame,
+        lookback: int = 5,
+        feature_set: str = LEGACY_FEATURE_SET
+    ) -> Optional[np.ndarray]:
         """
         Prepare features in the same format as training
 
+        Same layout as DataLoader.create_flat_features:
+        [bar_t, bar_t-1, ..., bar_t-lookback], each with the feature set's columns.
+
         Args:
             df: DataFrame with features
             lookback: Lookback window
+            feature_set: Feature set key
 
         Returns:
             Flattened feature array
         """
-        # Feature columns (must match training)
-        feature_cols = [
-            'open', 'high', 'low', 'close', 'volume',
-            'rsi14', 'macd_main', 'bb_upper', 'bb_lower', 'atr14',
-            'price_change', 'high_low_range', 'body_size',
-            'upper_shadow', 'lower_shadow', 'close_position',
-            'return_1', 'return_2', 'return_3', 'return_5',
-            'rsi_norm', 'macd_norm', 'bb_position',
-            'atr_norm', 'volatility_10'
-        ]
-
-        # Check if we have all required columns
-        missing_cols = [col for col in feature_cols if col not in df.columns]
-        if missing_cols:
-            logger.warning(f"Missing feature columns: {missing_cols}")
-            # Fill missing columns with 0
-            for col in missing_cols:
-                df[col] = 0.0
-
-        # Extract features for last `lookback` bars (including current)
-        flat_features = []
-
         # We need lookback+1 bars to create features with lookback
         if len(df) < lookback + 1:
             logger.error(f"Not enough bars: {len(df)} < {lookback + 1}")
             return None
 
-        # Take last lookback+1 rows
-        recent_df = df.iloc[-(lookback + 1):]
-
-        # Flatten features: [bar_t-5, bar_t-4, ..., bar_t-1, bar_t]
-        for i in range(lookback + 1):
-            row_features = recent_df.iloc[i][feature_cols].values
-            flat_features.extend(row_features)
+        try:
+            values = get_feature_set(feature_set).matrix(df.iloc[-(lookback + 1):])
+        except ValueError as e:
+            logger.error(str(e))
+            return None
 
-        return np.array([flat_features])  # Shape: (1, n_features)
+        # Current bar first, then the lags
+        return values[::-1].reshape(1, -1)  # Shape: (1, n_features)
 
     def make_prediction(self, symbol: str, model_name: Optional[str] = None) -> Optional[Dict]:
         """
@@ -228,13 +205,14 @@ class SignalGenerator:
 
         model = self.models[model_name]
 
-        # Get latest features
-        df = self.get_latest_features(symbol)
+        # Get latest features (feature set the model was trained on)
+        feature_set = self._feature_set(model_name)
+        df = self.get_latest_features(symbol, feature_set=feature_set)
         if df is None:
             return None
 
         # Prepare features for inference
-        X = self.prepare_features_for_inference(df)
+        X = self.prepare_features_for_inference(df, feature_set=feature_set)
         if X is None:
             return None
 
@@ -13,6 +13,11 @@ import numpy as np
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
 import logging
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import indicators
 
 
 class CryptoAdvancedStrategy:
@@ -220,8 +225,8 @@ class CryptoAdvancedStrategy:
             period = 15  # Shorter for crypto volatility
             std_multiplier = 2.5 if 'BTC' in symbol else 2.0
             
-            sma = df['close'].rolling(window=period).mean()
-            std = df['close'].rolling(window=period).std()
+            sma = indicators.sma(df['close'], period)
+            std = indicators.rolling_std(df['close'], period)
             
             upper_band = sma + (std * std_multiplier)
             lower_band = sma - (std * std_multiplier)
@@ -420,24 +425,14 @@ class CryptoAdvancedStrategy:
     def _calculate_rsi(self, prices: pd.Series, period: int = 14) -> Optional[pd.Series]:
         """Berechnet RSI"""
         try:
-            delta = prices.diff()
-            gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-            loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-            rs = gain / loss
-            rsi = 100 - (100 / (1 + rs))
-            return rsi
+            return indicators.rsi(prices, period)
         except Exception:
             return None
     
     def _calculate_macd(self, prices: pd.Series, fast: int = 12, slow: int = 26, signal: int = 9) -> Tuple[Optional[pd.Series], Optional[pd.Series], Optional[pd.Series]]:
         """Berechnet MACD"""
         try:
-            ema_fast = prices.ewm(span=fast).mean()
-            ema_slow = prices.ewm(span=slow).mean()
-            macd_line = ema_fast - ema_slow
-            signal_line = macd_line.ewm(span=signal).mean()
-            histogram = macd_line - signal_line
-            return macd_line, signal_line, histogram
+            return indicators.macd(prices, fast, slow, signal)
         except Exception:
             return None, None, None
 
@@ -520,11 +515,6 @@ class EnhancedStrategyManager:
     def _calculate_rsi(self, prices: pd.Series, period: int = 14) -> Optional[pd.Series]:
         """RSI Calculation"""
         try:
-            delta = prices.diff()
-            gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-            loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-            rs = gain / loss
-            rsi = 100 - (100 / (1 + rs))
-            return rsi
+            return indicators.rsi(prices, period)
         except Exception:
             return None
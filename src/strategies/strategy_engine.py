@@ -7,7 +7,6 @@ Implementiert verschiedene Trading-Strategien mit technischen Indikatoren
 """
 
 import pandas as pd
-import numpy as np
 import logging
 from abc import ABC, abstractmethod
 from typing import Dict, List, Any, Optional, Tuple
@@ -17,6 +16,7 @@ import os
 
 # Import crypto strategy
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import indicators
 try:
     from strategies.crypto_advanced_strategy import CryptoAdvancedStrategy
 except ImportError:
@@ -46,17 +46,15 @@ class TradingStrategy(ABC):
         """Technische Indikatoren hinzufügen - Native Python Implementation"""
         try:
             # Simple Moving Averages
-            df['sma_20'] = df['close'].rolling(window=20).mean()
-            df['sma_50'] = df['close'].rolling(window=50).mean()
+            df['sma_20'] = indicators.sma(df['close'], 20)
+            df['sma_50'] = indicators.sma(df['close'], 50)
             
             # Exponential Moving Averages
-            df['ema_12'] = df['close'].ewm(span=12).mean()
-            df['ema_26'] = df['close'].ewm(span=26).mean()
+            df['ema_12'] = indicators.ema(df['close'], 12)
+            df['ema_26'] = indicators.ema(df['close'], 26)
             
             # MACD
-            df['macd'] = df['ema_12'] - df['ema_26']
-            df['macd_signal'] = df['macd'].ewm(span=9).mean()
-            df['macd_hist'] = df['macd'] - df['macd_signal']
+            df['macd'], df['macd_signal'], df['macd_hist'] = indicators.macd(df['close'], 12, 26, 9)
             
             # RSI
             df['rsi'] = self.calculate_rsi(df['close'], 14)
@@ -82,38 +80,22 @@ class TradingStrategy(ABC):
             return df
     
     def calculate_rsi(self, prices: pd.Series, period: int = 14) -> pd.Series:
-        """RSI Berechnung"""
-        delta = prices.diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-        rs = gain / loss
-        rsi = 100 - (100 / (1 + rs))
-        return rsi
+        """RSI Berechnung (Wilder)"""
+        return indicators.rsi(prices, period)
     
     def calculate_bollinger_bands(self, prices: pd.Series, period: int = 20, std_dev: float = 2) -> Dict[str, pd.Series]:
         """Bollinger Bands Berechnung"""
-        middle = prices.rolling(window=period).mean()
-        std = prices.rolling(window=period).std()
-        upper = middle + (std * std_dev)
-        lower = middle - (std * std_dev)
+        upper, middle, lower = indicators.bollinger_bands(prices, period, std_dev)
         return {'upper': upper, 'middle': middle, 'lower': lower}
     
     def calculate_atr(self, high: pd.Series, low: pd.Series, close: pd.Series, period: int = 14) -> pd.Series:
-        """Average True Range Berechnung"""
-        high_low = high - low
-        high_close_prev = np.abs(high - close.shift())
-        low_close_prev = np.abs(low - close.shift())
-        true_range = pd.concat([high_low, high_close_prev, low_close_prev], axis=1).max(axis=1)
-        atr = true_range.rolling(window=period).mean()
-        return atr
+        """Average True Range Berechnung (Wilder)"""
+        return indicators.atr(high, low, close, period)
     
     def calculate_stochastic(self, high: pd.Series, low: pd.Series, close: pd.Series, 
                            k_period: int = 14, d_period: int = 3) -> Dict[str, pd.Series]:
         """Stochastic Oscillator Berechnung"""
-        lowest_low = low.rolling(window=k_period).min()
-        highest_high = high.rolling(window=k_period).max()
-        k_percent = 100 * ((close - lowest_low) / (highest_high - lowest_low))
-        d_percent = k_percent.rolling(window=d_period).mean()
+        k_percent, d_percent = indicators.stochastic(high, low, close, k_period, d_period)
         return {'%K': k_percent, '%D': d_percent}
 
 class MACDRSIStrategy(TradingStrategy):
@@ -423,15 +405,14 @@ class StrategyManager:
             enhanced_df = df.copy()
             
             # Basic indicators
-            enhanced_df['sma_20'] = enhanced_df['close'].rolling(window=20).mean()
-            enhanced_df['sma_50'] = enhanced_df['close'].rolling(window=50).mean()
-            enhanced_df['ema_12'] = enhanced_df['close'].ewm(span=12).mean()
-            enhanced_df['ema_26'] = enhanced_df['close'].ewm(span=26).mean()
+            close = enhanced_df['close']
+            enhanced_df['sma_20'] = indicators.sma(close, 20)
+            enhanced_df['sma_50'] = indicators.sma(close, 50)
+            enhanced_df['ema_12'] = indicators.ema(close, 12)
+            enhanced_df['ema_26'] = indicators.ema(close, 26)
             
             # MACD
-            enhanced_df['macd'] = enhanced_df['ema_12'] - enhanced_df['ema_26']
-            enhanced_df['macd_signal'] = enhanced_df['macd'].ewm(span=9).mean()
-            enhanced_df['macd_hist'] = enhanced_df['macd'] - enhanced_df['macd_signal']
+            enhanced_df['macd'], enhanced_df['macd_signal'], enhanced_df['macd_hist'] = indicators.macd(close)
             
             # RSI
             enhanced_df['rsi'] = self._calculate_rsi(enhanced_df['close'], 14)
@@ -690,22 +671,14 @@ class StrategyManager:
     def _calculate_rsi(self, prices: pd.Series, period: int = 14) -> pd.Series:
         """RSI Calculation"""
         try:
-            delta = prices.diff()
-            gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-            loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-            rs = gain / loss
-            rsi = 100 - (100 / (1 + rs))
-            return rsi
+            return indicators.rsi(prices, period)
         except Exception:
             return pd.Series([50] * len(prices), index=prices.index)
     
     def _calculate_bollinger_bands(self, prices: pd.Series, period: int = 20, std_dev: float = 2) -> Dict:
         """Bollinger Bands Calculation"""
         try:
-            middle = prices.rolling(window=period).mean()
-            std = prices.rolling(window=period).std()
-            upper = middle + (std * std_dev)
-            lower = middle - (std * std_dev)
+            upper, middle, lower = indicators.bollinger_bands(prices, period, std_dev)
             return {'upper': upper, 'middle': middle, 'lower': lower}
         except Exception:
             return {'upper': prices, 'middle': prices, 'lower': prices}
@@ -713,17 +686,6 @@ class StrategyManager:
     def _calculate_atr(self, df: pd.DataFrame, period: int = 14) -> pd.Series:
         """ATR Calculation"""
         try:
-            high = df['high']
-            low = df['low']
-            close = df['close']
-            prev_close = close.shift(1)
-            
-            tr1 = high - low
-            tr2 = abs(high - prev_close)
-            tr3 = abs(low - prev_close)
-            
-            tr = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
-            atr = tr.rolling(window=period).mean()
-            return atr
+            return indicators.atr(df['high'], df['low'], df['close'], period)
         except Exception:
             return pd.Series([0.001] * len(df), index=df.index)
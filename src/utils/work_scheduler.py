@@ -0,0 +1,183 @@
+"""
+Work Scheduler
+Verteilt die Arbeit eines Zyklus (pro Symbol bzw. Symbol/Timeframe) auf Pools,
+statt sie in einer verschachtelten Schleife nacheinander abzuarbeiten
+
+- Thread-Pool für DB-I/O (Lesen/Schreiben), optional Process-Pool für
+  CPU-lastige pandas-Berechnungen (cpu_workers = 0: Berechnung im Thread)
+- Deadline pro Zyklus: der Zyklus wartet höchstens deadline_seconds; nicht
+  fertige Units laufen weiter, ihr Ergebnis wird im nächsten Zyklus abgeholt
+- Skip-if-running: eine Unit, deren vorheriger Lauf noch nicht fertig ist,
+  wird übersprungen (eine langsame Query staut keine weiteren Läufe auf und
+  hält die übrigen Symbols nicht auf)
+
+Konfiguration unter data.scheduler (pro Subsystem überschreibbar unter
+data.scheduler.<name>): enabled, io_workers, cpu_workers, deadline_seconds.
+Default aus (enabled = false): die Subsysteme laufen dann wie bisher
+nacheinander in ihrer Schleife.
+"""
+
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Hashable, List, NamedTuple, Optional, Tuple
+
+from .logger import get_logger, log_exception
+from .config_loader import get_config
+
+
+class WorkUnit(NamedTuple):
+    """
+    Arbeit eines Keys (z.B. (symbol, timeframe)) in bis zu drei Stufen
+
+    io: liest die Daten (Thread-Pool)
+    cpu: optionale Berechnung auf dem Ergebnis von io; läuft im Process-Pool
+        und muss dafür eine Top-Level-Funktion mit picklebarem Argument und
+        Ergebnis sein
+    store: optionales Schreiben des Ergebnisses (Thread-Pool)
+    """
+    io: Callable[[], Any]
+    cpu: Optional[Callable[[Any], Any]] = None
+    store: Optional[Callable[[Any], Any]] = None
+
+
+def scheduler_enabled(name: str) -> bool:
+    """data.scheduler.enabled (pro Subsystem überschreibbar, Default aus)"""
+    config = get_config()
+    return bool(config.get(f'data.scheduler.{name}.enabled', config.get('data.scheduler.enabled', False)))
+
+
+class WorkScheduler:
+    """Führt die Units eines Zyklus parallel aus (Deadline, Skip-if-running)"""
+
+    def __init__(self, name: str, io_workers: int = None, cpu_workers: int = None, deadline: float = None):
+        """
+        Initialisiert den Scheduler
+
+        Args:
+            name: Subsystem (Thread-Namen, Config data.scheduler.<name>)
+            io_workers: Threads für DB-I/O (None = Config)
+            cpu_workers: Prozesse für cpu-Stufen, 0 = im Thread (None = Config)
+            deadline: Sekunden, die ein Zyklus höchstens wartet (None = Config)
+        """
+        self.logger = get_logger(self.__class__.__name__)
+        self.name = name
+
+        config = get_config()
+
+        def setting(key, default):
+            return config.get(f'data.scheduler.{name}.{key}', config.get(f'data.scheduler.{key}', default))
+
+        self.io_workers = io_workers or setting('io_workers', 4)
+        self.cpu_workers = setting('cpu_workers', 0) if cpu_workers is None else cpu_workers
+        self.deadline = deadline or setting('deadline_seconds', 30)
+
+        self._threads = ThreadPoolExecutor(max_workers=self.io_workers, thread_name_prefix=name)
+        self._processes = None  # erst bei der ersten cpu-Stufe starten
+        self._process_lock = threading.Lock()
+
+        self.running: Dict[Hashable, Future] = {}  # key -> laufende Unit (auch aus Vorzyklen)
+
+        self.stats = {
+            'cycles': 0,
+            'units': 0,
+            'completed': 0,
+            'skipped': 0,
+            'overdue': 0,
+            'errors': 0,
+            'last_cycle_seconds': 0.0
+        }
+
+    def run(self, units: Dict[Hashable, WorkUnit]) -> List[Tuple[Hashable, Any]]:
+        """
+        Führt einen Zyklus aus
+
+        Args:
+            units: Key -> WorkUnit
+
+        Returns:
+            (key, Ergebnis) aller in diesem Zyklus fertig gewordenen Units:
+            zuerst verspätete Units aus Vorzyklen, dann die Units dieses
+            Zyklus, jeweils in Einreichungsreihenfolge (Reihenfolge von units),
+            nicht in Abschlussreihenfolge; fehlgeschlagene Units werden
+            geloggt und fehlen
+        """
+        start = time.monotonic()
+        deadline = start + self.deadline
+        results = []
+
+        # Verspätete Units aus dem Vorzyklus zuerst abholen
+        self._harvest(results)
+
+        skipped = [key for key in units if key in self.running]
+        for key, unit in units.items():
+            if key not in self.running:
+                self.running[key] = self._threads.submit(self._execute, unit)
+                self.stats['units'] += 1
+
+        if skipped:
+            self.stats['skipped'] += len(skipped)
+            self.logger.warning(
+                f"{self.name}: {len(skipped)} units still running since last cycle, skipped: "
+                f"{', '.join(str(key) for key in skipped)}"
+            )
+
+        wait(list(self.running.values()), timeout=max(0.0, deadline - time.monotonic()))
+        self._harvest(results)
+
+        if self.running:
+            self.stats['overdue'] += len(self.running)
+            self.logger.warning(
+                f"{self.name}: {len(self.running)} units over the {self.deadline}s deadline: "
+                f"{', '.join(str(key) for key in self.running)}"
+            )
+
+        self.stats['cycles'] += 1
+        self.stats['last_cycle_seconds'] = time.monotonic() - start
+        return results
+
+    def _execute(self, unit: WorkUnit) -> Any:
+        """io -> cpu -> store einer Unit (läuft im Thread-Pool)"""
+        data = unit.io()
+        if unit.cpu is not None:
+            data = self.compute(unit.cpu, data)
+        if unit.store is not None:
+            data = unit.store(data)
+        return data
+
+    def compute(self, func: Callable[[Any], Any], data: Any) -> Any:
+        """Führt func(data) im Process-Pool aus (ohne cpu_workers im aufrufenden Thread)"""
+        if self.cpu_workers <= 0:
+            return func(data)
+        with self._process_lock:
+            if self._processes is None:
+                self._processes = ProcessPoolExecutor(max_workers=self.cpu_workers)
+        return self._processes.submit(func, data).result()
+
+    def _harvest(self, results: List[Tuple[Hashable, Any]]):
+        """Fertige Units aus running entfernen, Ergebnisse anhängen"""
+        for key, future in list(self.running.items()):
+            if not future.done():
+                continue
+            del self.running[key]
+            try:
+                results.append((key, future.result()))
+                self.stats['completed'] += 1
+            except Exception as e:
+                log_exception(self.logger, e, f"{self.name}: unit {key} failed")
+                self.stats['errors'] += 1
+
+    def shutdown(self):
+        """Pools beenden (laufende Units werden nicht abgewartet, nur laufende cpu-Stufen)"""
+        self._threads.shutdown(wait=False, cancel_futures=True)
+        if self._processes is not None:
+            self._processes.shutdown(wait=True, cancel_futures=True)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Holt Statistiken
+
+        Returns:
+            Dictionary mit Stats (inkl. aktuell laufender Units)
+        """
+        return dict(self.stats, running=len(self.running))